@@ -0,0 +1,102 @@
+"""
+Benchmark: Batch File Tools vs One Call per File
+================================================
+Replays a scripted scaffolding task through the bound worker tools, the way
+a mock agent would issue them, and counts what the ReAct loop pays for it:
+
+    single:  file_exists for every path, read_file for each existing file,
+             then one write_file per file - one tool call per model turn
+    batch:   one stat_files, one read_files and one write_files call
+
+"turns" is the number of model invocations (one per tool-call round plus the
+final answer). "prompt tokens" sums the history re-sent on every turn
+(~4 chars/token, on top of a fixed system prompt), which is where the extra
+round-trips cost the most. "tool I/O" is the wall time spent inside the tools.
+
+Run with:
+    python benchmarks/bench_batch_file_tools.py [new_files] [existing_files]
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from orchestrator_types import WorkerProfile
+from nodes.tools_binding import _bind_tools
+from tools import (
+    read_file_async, read_files_async, write_file_async, write_files_async, file_exists_async, stat_files_async,
+)
+
+SYSTEM_PROMPT_TOKENS = 3000
+TOOLS = [read_file_async, read_files_async, write_file_async, write_files_async, file_exists_async, stat_files_async]
+
+
+def scaffold(new_files: int, existing_files: int):
+    """Paths and contents of a small package: new modules plus existing files that get rewritten."""
+    new = {f"app/module_{i}.py": f'"""Module {i}."""\n\n\ndef handler_{i}(request):\n    return {{"ok": True}}\n' * 4
+           for i in range(new_files)}
+    existing = {f"config/settings_{i}.py": f"DEBUG = False\nNAME = 'service_{i}'\n" for i in range(existing_files)}
+    return new, existing
+
+
+async def replay(strategy: str, new: dict, existing: dict) -> dict:
+    worktree = Path(tempfile.mkdtemp())
+    for path in existing:
+        (worktree / path).parent.mkdir(parents=True, exist_ok=True)
+        (worktree / path).write_text("DEBUG = True\n")
+    tools = {t.name: t for t in _bind_tools(TOOLS, {"worktree_path": str(worktree), "task_id": "task_bench"},
+                                           WorkerProfile.CODER)}
+    targets = {**new, **existing}
+
+    if strategy == "single":
+        rounds = [[("file_exists", {"path": p})] for p in targets]
+        rounds += [[("read_file", {"path": p})] for p in existing]
+        rounds += [[("write_file", {"path": p, "content": c})] for p, c in targets.items()]
+    else:
+        rounds = [
+            [("stat_files", {"paths": list(targets)})],
+            [("read_files", {"paths": list(existing)})],
+            [("write_files", {"files": [{"path": p, "content": c} for p, c in targets.items()]})],
+        ]
+
+    history_chars, prompt_tokens, calls, io_s = 0, 0, 0, 0.0
+    for round_calls in rounds:
+        prompt_tokens += SYSTEM_PROMPT_TOKENS + history_chars // 4
+        for name, args in round_calls:
+            start = time.perf_counter()
+            result = await tools[name].ainvoke(args)
+            io_s += time.perf_counter() - start
+            history_chars += len(str(args)) + len(str(result))
+            calls += 1
+    prompt_tokens += SYSTEM_PROMPT_TOKENS + history_chars // 4  # Final answer turn
+
+    written = sum(1 for p in targets if (worktree / p).exists())
+    shutil.rmtree(worktree, ignore_errors=True)
+    return {"turns": len(rounds) + 1, "calls": calls, "prompt_tokens": prompt_tokens, "io_ms": io_s * 1000,
+            "written": written}
+
+
+def main():
+    new_files = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    existing_files = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    new, existing = scaffold(new_files, existing_files)
+
+    print(f"Scaffolding task: {new_files} new files, {existing_files} existing files rewritten")
+    print(f"  {'strategy':<8} {'turns':>6} {'tool calls':>11} {'prompt tokens':>14} {'tool I/O':>10} {'written':>8}")
+    results = {}
+    for strategy in ("single", "batch"):
+        r = results[strategy] = asyncio.run(replay(strategy, new, existing))
+        print(f"  {strategy:<8} {r['turns']:>6} {r['calls']:>11} {r['prompt_tokens']:>14,} "
+              f"{r['io_ms']:>8.1f}ms {r['written']:>8}")
+    single, batch = results["single"], results["batch"]
+    print(f"\n  turns -{1 - batch['turns'] / single['turns']:.0%}, "
+          f"prompt tokens -{1 - batch['prompt_tokens'] / single['prompt_tokens']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
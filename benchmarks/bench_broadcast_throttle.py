@@ -0,0 +1,111 @@
+"""
+Benchmark: Dashboard Broadcast Volume
+=====================================
+Drives broadcast_state_update with a synthetic 500-task run and measures
+websocket messages/s and bytes/s received by one subscribed client for
+
+  legacy    - full task list in every state_update (previous behaviour)
+  patches   - versioned task patches, every request sent (interval 0)
+  debounced - versioned task patches, coalesced per broadcast_interval_ms
+
+Each dispatch cycle (CYCLE_S, the loop's idle sleep) issues a burst of
+broadcasts the way a busy run does - Phase 1 merge, director, dispatch and
+one per strategist call - and moves a few tasks along planned -> active ->
+complete between them.
+
+Run with:
+    python benchmarks/bench_broadcast_throttle.py [tasks] [cycles]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import OrchestratorConfig
+import api.state as api_state
+from api import dispatch
+from api.state import runs_index
+from api.websocket import ConnectionManager, encode_message
+
+CYCLE_S = 0.1
+BROADCASTS_PER_CYCLE = 6
+DESCRIPTION = "Implement the component described in the design spec with validation and tests. " * 3
+
+
+class CountingWebSocket:
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    async def send_bytes(self, frame):
+        self.messages += 1
+        self.bytes += len(frame)
+
+
+def synthetic_tasks(count: int) -> list:
+    return [{
+        "id": f"task_{i:04d}", "title": f"Task {i}", "component": f"component{i % 25}", "phase": "build",
+        "status": "planned", "description": DESCRIPTION, "depends_on": [f"task_{i - 1:04d}"] if i % 25 else [],
+        "acceptance_criteria": ["Works", "Tested"], "retry_count": 0, "files_modified": [],
+    } for i in range(count)]
+
+
+async def legacy_broadcast(run_id: str, state: dict):
+    """Previous behaviour: full payload on every call, sent straight to each socket."""
+    message = encode_message({
+        "type": "state_update", "run_id": run_id,
+        "payload": {"tasks": state["tasks"], "status": "running", "task_counts": runs_index[run_id]["task_counts"]},
+    })
+    for connection in api_state.manager.subscriptions[run_id]:
+        await connection.send_bytes(message)
+
+
+async def run(mode: str, task_count: int, cycles: int) -> dict:
+    rng = random.Random(7)
+    run_id = f"bench_{mode}"
+    manager = ConnectionManager()
+    api_state.manager = manager
+    client = CountingWebSocket()
+    manager.subscriptions[run_id] = [client]
+
+    interval_ms = 0 if mode == "patches" else OrchestratorConfig().broadcast_interval_ms
+    state = {"tasks": synthetic_tasks(task_count), "orch_config": OrchestratorConfig(broadcast_interval_ms=interval_ms)}
+    runs_index[run_id] = {"status": "running", "task_counts": {}}
+    broadcast = legacy_broadcast if mode == "legacy" else dispatch.broadcast_state_update
+
+    start = time.perf_counter()
+    for _ in range(cycles):
+        for _ in range(BROADCASTS_PER_CYCLE):
+            for task in rng.sample(state["tasks"], 3):
+                task["status"] = {"planned": "active", "active": "complete"}.get(task["status"], task["status"])
+            runs_index[run_id]["task_counts"] = {
+                s: sum(1 for t in state["tasks"] if t["status"] == s) for s in ("planned", "active", "complete")
+            }
+            await broadcast(run_id, state)
+        await asyncio.sleep(CYCLE_S)
+
+    runs_index[run_id]["status"] = "completed"
+    await broadcast(run_id, state)
+    await manager.flush()
+    elapsed = time.perf_counter() - start
+    return {"messages": client.messages, "msg_per_s": client.messages / elapsed,
+            "kb_per_s": client.bytes / elapsed / 1024, "total_kb": client.bytes / 1024}
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    print(f"{task_count} tasks, {cycles} cycles x {BROADCASTS_PER_CYCLE} broadcasts every {CYCLE_S}s\n")
+    print(f"{'':<11}{'messages':>10}{'msg/s':>10}{'KB/s':>12}{'total KB':>12}")
+    for mode in ["legacy", "patches", "debounced"]:
+        row = asyncio.run(run(mode, task_count, cycles))
+        print(f"{mode:<11}{row['messages']:>10}{row['msg_per_s']:>10.1f}{row['kb_per_s']:>12.1f}{row['total_kb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
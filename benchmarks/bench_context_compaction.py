@@ -0,0 +1,105 @@
+"""
+Benchmark: ReAct Context Compaction
+===================================
+Replays recorded worker conversations step by step and compares the prompt
+size sent to the agent with and without compaction.
+
+A "step" is every point where the agent would be invoked again: after each
+tool result. Recorded conversations are the serialized task_memories saved
+in a run's state_json (list of {"type", "content", "tool_calls", ...}).
+
+Run with:
+    python benchmarks/bench_context_compaction.py                  # synthetic conversation
+    python benchmarks/bench_context_compaction.py memories.json    # recorded message list
+    python benchmarks/bench_context_compaction.py state.json       # run state (all task_memories)
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage, convert_to_messages
+
+from config import OrchestratorConfig
+from nodes.context_compaction import compact_messages, estimate_tokens
+
+
+def synthetic_conversation(tool_calls: int = 120, seed: int = 7) -> list:
+    """A coder-style conversation: lots of reads (some repeated), writes and shell runs."""
+    rng = random.Random(seed)
+    files = [f"src/module_{i}.py" for i in range(15)]
+    messages = [
+        SystemMessage(content="You are a coder worker. " * 200),
+        HumanMessage(content="Task: implement the feature\n\nAcceptance Criteria:\n- tests pass"),
+    ]
+    for i in range(tool_calls):
+        call_id = f"call_{i}"
+        kind = rng.choice(["read_file", "read_file", "run_shell", "write_file"])
+        path = rng.choice(files)
+        if kind == "read_file":
+            args, output = {"path": path}, "def f():\n    return 1\n" * rng.randint(50, 400)
+        elif kind == "write_file":
+            args, output = {"path": path, "content": "x = 1\n" * 40}, f"Successfully wrote to {path}"
+        else:
+            args, output = {"command": "pytest -q"}, "collected 40 items\n" + ("." * 80 + "\n") * rng.randint(5, 60)
+        messages.append(AIMessage(content="Let me continue. " * rng.randint(0, 10),
+                                  tool_calls=[{"id": call_id, "name": kind, "args": args}]))
+        messages.append(ToolMessage(content=output, tool_call_id=call_id))
+    messages.append(AIMessage(content="Done."))
+    return messages
+
+
+def load_conversations(path: Path) -> dict:
+    """Load {name: [BaseMessage]} from a recorded message list or a run state."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict) and "state_json" in data:
+        data = json.loads(data["state_json"])
+    if isinstance(data, dict):
+        memories = data.get("task_memories", data)
+        return {tid: convert_to_messages(msgs) for tid, msgs in memories.items() if msgs}
+    return {path.stem: convert_to_messages(data)}
+
+
+def replay(name: str, messages: list, config: OrchestratorConfig) -> None:
+    raw_per_step, compacted_per_step = [], []
+    for end in range(3, len(messages) + 1):
+        if not isinstance(messages[end - 1], ToolMessage):
+            continue
+        history = messages[:end]
+        view, _ = compact_messages(
+            history,
+            keep_recent=config.compaction_keep_recent,
+            role_budgets=config.compaction_role_budgets,
+        )
+        raw_per_step.append(estimate_tokens(history))
+        compacted_per_step.append(estimate_tokens(view))
+
+    if not raw_per_step:
+        print(f"{name}: no tool steps")
+        return
+
+    steps = len(raw_per_step)
+    print(f"\n=== {name} ({len(messages)} messages, {steps} tool steps) ===")
+    print(f"{'step':>6} {'raw tokens':>12} {'compacted':>12}")
+    for i in sorted({0, steps // 4, steps // 2, (3 * steps) // 4, steps - 1}):
+        print(f"{i + 1:>6} {raw_per_step[i]:>12,} {compacted_per_step[i]:>12,}")
+    print(f"  total prompt tokens: raw={sum(raw_per_step):,} compacted={sum(compacted_per_step):,} "
+          f"({100 * (1 - sum(compacted_per_step) / sum(raw_per_step)):.0f}% saved)")
+    print(f"  peak prompt tokens:  raw={max(raw_per_step):,} compacted={max(compacted_per_step):,}")
+
+
+def main() -> None:
+    config = OrchestratorConfig()
+    if len(sys.argv) > 1:
+        conversations = load_conversations(Path(sys.argv[1]))
+    else:
+        conversations = {"synthetic": synthetic_conversation()}
+    for name, messages in conversations.items():
+        replay(name, messages, config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: Dependency Query Pre-filter
+======================================
+Runs resolve_dependency_queries on a synthetic multi-component plan with
+a stub LLM and compares the LLM workload with and without the BM25
+pre-filter: queries sent, prompt size and estimated call latency.
+
+Latency is modelled, not measured (no provider is called). Output tokens
+dominate: every query sent produces one resolution in the response.
+    base + prompt_tokens * prompt_cost + queries_sent * tokens_per_resolution * output_cost
+
+Run with:
+    python benchmarks/bench_dependency_prefilter.py [components] [tasks_per_component]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import OrchestratorConfig
+from orchestrator_types import Task, TaskPhase
+from nodes.director import integration
+from nodes.director.integration import QueryResolutionResponse, resolve_dependency_queries
+
+BASE_LATENCY_S = 1.0
+PER_PROMPT_TOKEN_S = 0.0002
+PER_OUTPUT_TOKEN_S = 0.02
+TOKENS_PER_RESOLUTION = 45
+
+FEATURES = ["auth", "billing", "profile", "search", "notifications", "reports", "admin", "chat", "upload", "settings"]
+ARTIFACTS = [
+    ("Create {f} database models", "SQLAlchemy models and migrations for {f} records"),
+    ("Implement {f} REST API endpoints", "FastAPI routes for {f} CRUD operations"),
+    ("Build {f} page UI", "React components and page layout for {f}"),
+    ("Write {f} API tests", "pytest coverage for the {f} endpoints"),
+    ("Add {f} service layer", "Business logic and validation for {f}"),
+    ("Wire {f} client hooks", "Frontend data fetching hooks calling the {f} API"),
+]
+# Paraphrased queries: most are lexically close, some need semantic matching
+QUERIES = [
+    "{f} REST API endpoints",
+    "Database models for {f}",
+    "{f} service business logic",
+    "Backend support for {f} data",
+    "Anything that lets users manage their {f}",
+]
+
+
+class StubStructuredLLM:
+    """Records prompt sizes; returns no resolutions."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_chars = 0
+        self.queries_sent = 0
+
+    def with_structured_output(self, schema, **kwargs):
+        return self
+
+    async def ainvoke(self, prompt, **kwargs):
+        self.calls += 1
+        self.prompt_chars += len(str(prompt))
+        self.queries_sent += str(prompt).count('"query":')
+        return QueryResolutionResponse(resolutions=[])
+
+
+def synthetic_plan(components: int, tasks_per_component: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    features = (FEATURES * ((components // len(FEATURES)) + 1))[:components]
+    tasks = []
+    for i, feature in enumerate(features):
+        name = feature if i < len(FEATURES) else f"{feature}{i}"
+        for j in range(tasks_per_component):
+            title, desc = ARTIFACTS[j % len(ARTIFACTS)]
+            tasks.append(Task(
+                id=f"task_{name}_{j}", title=title.format(f=name), component=name,
+                phase=TaskPhase.BUILD, description=desc.format(f=name) + ". " + "Details. " * 20,
+            ))
+    for task in tasks:
+        others = [t.component for t in tasks if t.component != task.component]
+        task.dependency_queries = [rng.choice(QUERIES).format(f=rng.choice(others)) for _ in range(2)]
+    return tasks
+
+
+async def run(components: int, tasks_per_component: int, prefilter: bool) -> dict:
+    stub = StubStructuredLLM()
+    integration.get_llm = lambda model_config: stub
+    config = OrchestratorConfig(enable_dependency_prefilter=prefilter)
+    tasks = synthetic_plan(components, tasks_per_component)
+    queries = sum(len(t.dependency_queries) for t in tasks)
+
+    start = time.perf_counter()
+    await resolve_dependency_queries(tasks, {"orch_config": config})
+    cpu_s = time.perf_counter() - start
+
+    prompt_tokens = stub.prompt_chars // 4
+    output_tokens = stub.queries_sent * TOKENS_PER_RESOLUTION
+    llm_s = stub.calls * BASE_LATENCY_S + prompt_tokens * PER_PROMPT_TOKEN_S + output_tokens * PER_OUTPUT_TOKEN_S
+    resolved = sum(len(t.depends_on) for t in tasks)
+    return {"queries": queries, "resolved_locally": resolved, "llm_calls": stub.calls,
+            "queries_sent": stub.queries_sent, "output_tokens": output_tokens,
+            "prompt_tokens": prompt_tokens, "est_latency_s": llm_s + cpu_s, "cpu_ms": cpu_s * 1000}
+
+
+def main():
+    components = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_component = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    baseline = asyncio.run(run(components, per_component, prefilter=False))
+    filtered = asyncio.run(run(components, per_component, prefilter=True))
+
+    print(f"Plan: {components} components x {per_component} tasks, {baseline['queries']} dependency queries\n")
+    print(f"{'':<22}{'baseline':>12}{'prefilter':>12}")
+    for key in ["resolved_locally", "llm_calls", "queries_sent", "prompt_tokens", "output_tokens", "cpu_ms", "est_latency_s"]:
+        print(f"{key:<22}{baseline[key]:>12.1f}{filtered[key]:>12.1f}")
+    saved = 1 - filtered["est_latency_s"] / baseline["est_latency_s"]
+    print(f"\nEstimated resolution latency saved: {saved:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: Guardian Overhead on Worker Wall-Time
+================================================
+Runs _execute_react_loop with a stub agent and a stub guardian model and
+measures worker wall-time with the guardian off, inline (each check awaited
+between chunks) and in the background (checks run concurrently, nudges
+injected at the next chunk boundary).
+
+Latencies are simulated with asyncio.sleep, scaled down so the run is quick:
+    agent:    STEP_S per tool call
+    guardian: GUARDIAN_S per check
+
+Run with:
+    python benchmarks/bench_guardian_overhead.py [tool_calls] [guardian_latency_s]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from config import OrchestratorConfig
+from orchestrator_types import Task, TaskPhase, WorkerProfile
+from nodes import execution, guardian
+
+STEP_S = 0.05
+
+
+class StubAgent:
+    """Makes one tool call per STEP_S until the task's tool-call budget is used."""
+
+    def __init__(self, total_tool_calls: int):
+        self.total = total_tool_calls
+        self.done = 0
+
+    async def ainvoke(self, inputs, config=None):
+        messages = list(inputs["messages"])
+        steps = max(1, (config["recursion_limit"] - 5) // 3)
+        for _ in range(steps):
+            await asyncio.sleep(STEP_S)
+            if self.done >= self.total:
+                messages.append(AIMessage(content="Done."))
+                return {"messages": messages}
+            call_id = f"call_{self.done}"
+            messages.append(AIMessage(content="", tool_calls=[{"id": call_id, "name": "read_file", "args": {"path": "a.py"}}]))
+            messages.append(ToolMessage(content="x = 1\n" * 20, tool_call_id=call_id))
+            self.done += 1
+        return {"messages": messages}
+
+
+class StubGuardianLLM:
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency_s)
+        return AIMessage(content='{"verdict": "on_track", "confidence": 90, "reasoning": "fine", "nudge": null}')
+
+
+async def run(mode: str, tool_calls: int, guardian_latency_s: float) -> float:
+    execution.get_llm = lambda model_config: None
+    execution.create_react_agent = lambda llm, tools: StubAgent(tool_calls)
+    execution.log_llm_request = lambda *a, **k: {"message_count": 0, "total_chars": 0, "estimated_tokens": 0,
+                                                 "tool_count": 0, "log_file": "-"}
+    execution.validate_request_size = lambda *a, **k: None
+    execution.log_llm_response = lambda *a, **k: None
+    guardian.get_llm = lambda model_config: StubGuardianLLM(guardian_latency_s)
+
+    config = OrchestratorConfig(
+        enable_guardian=mode != "off",
+        guardian_background=mode == "background",
+        guardian_check_interval=10,
+        enable_context_compaction=False,
+    )
+    task = Task(id="task_bench", title="Bench", component="bench", phase=TaskPhase.BUILD,
+                description="Benchmark task", assigned_worker_profile=WorkerProfile.CODER)
+
+    start = time.perf_counter()
+    await execution._execute_react_loop(task, [], "system", {"orch_config": config})
+    return time.perf_counter() - start
+
+
+def main():
+    tool_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    guardian_latency_s = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    logging.disable(logging.CRITICAL)  # The stub task "fails" (no files modified) - irrelevant here
+
+    print(f"{tool_calls} tool calls x {STEP_S}s, guardian every 10 calls at {guardian_latency_s}s\n")
+    baseline = None
+    for mode in ["off", "inline", "background"]:
+        wall = asyncio.run(run(mode, tool_calls, guardian_latency_s))
+        baseline = baseline or wall
+        print(f"  guardian {mode:<11} {wall:6.2f}s  (+{(wall / baseline - 1):.0%} vs off)")
+
+
+if __name__ == "__main__":
+    main()
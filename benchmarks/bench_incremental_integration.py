@@ -0,0 +1,135 @@
+"""
+Benchmark: Streaming Plan Integration
+=====================================
+Compares integration prompt size and critical-path latency for
+
+  legacy     - one integrate_plans call after the last planner finishes,
+               existing tasks sent with full descriptions (previous format)
+  monolithic - same single call, existing tasks as compact summaries
+  streaming  - one call per planner as it finishes (compact context,
+               staged), then finalize_integrated_tasks after the last one
+
+against a growing number of existing tasks. A stub LLM echoes the
+proposed tasks back; latency is modelled, not measured:
+    base + prompt_tokens * prompt_cost + returned_tasks * tokens_per_task * output_cost
+Only work after the last planner completes counts toward the critical path.
+
+Run with:
+    python benchmarks/bench_incremental_integration.py [planners] [tasks_per_planner]
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import OrchestratorConfig
+from orchestrator_types import _dict_to_task, task_to_dict
+from nodes.director import integration
+from nodes.director.integration import (
+    IntegratedTaskDefinition, IntegrationResponse, finalize_integrated_tasks, integrate_plans,
+)
+
+BASE_LATENCY_S = 1.0
+PER_PROMPT_TOKEN_S = 0.0002
+PER_OUTPUT_TOKEN_S = 0.02
+TOKENS_PER_TASK = 120
+DESCRIPTION = "Implement the behaviour described in the design spec, including validation, error handling and docs. " * 4
+
+
+class StubIntegrationLLM:
+    """Echoes the current batch back as integrated tasks and records prompt sizes."""
+
+    def __init__(self):
+        self.batch = []
+        self.prompts = []
+
+    def with_structured_output(self, schema, **kwargs):
+        return self
+
+    async def ainvoke(self, prompt, **kwargs):
+        self.prompts.append(len(str(prompt)) // 4)
+        return IntegrationResponse(tasks=[IntegratedTaskDefinition(
+            title=s["title"], component=s["component"], phase=s["phase"], description=s["description"],
+            acceptance_criteria=[], depends_on=[],
+        ) for s in self.batch])
+
+
+def planner_batches(planners: int, per_planner: int) -> list:
+    components = ["foundation"] + [f"feature{i}" for i in range(1, planners)]
+    return [[{
+        "title": f"{'Test' if j % 4 == 3 else 'Build'} {comp} part {j}",
+        "component": comp,
+        "phase": "test" if j % 4 == 3 else "build",
+        "description": DESCRIPTION,
+    } for j in range(per_planner)] for comp in components]
+
+
+def existing_plan(count: int) -> list:
+    return [{
+        "id": f"task_existing_{i}", "title": f"Existing task {i} for module {i % 17}", "component": f"module{i % 17}",
+        "phase": "build", "status": "planned", "description": DESCRIPTION, "depends_on": [f"task_existing_{i - 1}"] if i else [],
+    } for i in range(count)]
+
+
+def legacy_context_tokens(existing: list) -> int:
+    """Size of the existing-task context in the previous prompt format."""
+    legacy = [{k: t[k] for k in ("id", "title", "component", "phase", "status", "description", "depends_on")}
+              for t in existing]
+    return len(str(legacy)) // 4
+
+
+def latency(prompt_tokens: int, returned_tasks: int) -> float:
+    return BASE_LATENCY_S + prompt_tokens * PER_PROMPT_TOKEN_S + returned_tasks * TOKENS_PER_TASK * PER_OUTPUT_TOKEN_S
+
+
+async def run(existing_count: int, planners: int, per_planner: int) -> dict:
+    stub = StubIntegrationLLM()
+    integration.get_llm = lambda model_config: stub
+    batches = planner_batches(planners, per_planner)
+    everything = [s for b in batches for s in b]
+    state = {"orch_config": OrchestratorConfig(), "tasks": existing_plan(existing_count),
+             "objective": "Build the app", "spec": {"content": "Spec " * 500}}
+
+    # Monolithic: single call after the last planner
+    stub.batch = everything
+    await integrate_plans(everything, state)
+    mono_tokens = stub.prompts[-1]
+    compact_context = len(str(integration.select_integration_context(state["tasks"], everything))) // 4
+    legacy_tokens = mono_tokens - compact_context + legacy_context_tokens(state["tasks"])
+
+    # Streaming: one call per planner; only the last batch + finalize is on the critical path
+    staged = []
+    stream_tokens = []
+    for batch in batches:
+        stub.batch = batch
+        result = await integrate_plans(batch, state, staged_tasks=staged, finalize=False)
+        staged += [task_to_dict(t) for t in result]
+        stream_tokens.append(stub.prompts[-1])
+    await finalize_integrated_tasks([_dict_to_task(t) for t in staged], state)
+
+    return {
+        "existing": existing_count,
+        "legacy_prompt": legacy_tokens,
+        "mono_prompt": mono_tokens,
+        "stream_max_prompt": max(stream_tokens),
+        "legacy_critical_s": latency(legacy_tokens, len(everything)),
+        "stream_critical_s": latency(stream_tokens[-1], len(batches[-1])),
+    }
+
+
+def main():
+    planners = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    per_planner = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    print(f"{planners} planners x {per_planner} suggestions\n")
+    header = ["existing", "legacy_prompt", "mono_prompt", "stream_max_prompt", "legacy_critical_s", "stream_critical_s"]
+    print("".join(f"{h:>19}" for h in header))
+    for existing_count in [0, 50, 100, 200, 400]:
+        row = asyncio.run(run(existing_count, planners, per_planner))
+        print("".join(f"{row[h]:>19.1f}" if isinstance(row[h], float) else f"{row[h]:>19}" for h in header))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: JSON Serialization
+=============================
+Times the payloads the server serializes most - checkpoint state_json,
+a full-task websocket frame and the GET /runs/{id} response - with the
+stdlib json module and with the shared serializer (orjson when installed).
+
+Checkpoint encoding is also compared end to end: the previous
+save_run_state encoded every value twice (a serializability probe per
+key, then the whole state) where the current one encodes each value once.
+
+Run with:
+    python benchmarks/bench_serialization.py               # synthetic 500-task run state
+    python benchmarks/bench_serialization.py state.json    # recorded run state (state_json or runs row)
+"""
+
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import serialization
+from serialization import dumps, loads
+
+REPEAT = 5
+
+
+def synthetic_state(task_count: int = 500, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    tasks = [{
+        "id": f"task_{i:04d}", "title": f"Task {i}", "component": f"component{i % 25}", "phase": "build",
+        "status": rng.choice(["planned", "active", "complete"]), "description": "Implement the component. " * 12,
+        "depends_on": [f"task_{i - 1:04d}"] if i % 25 else [], "acceptance_criteria": ["Works", "Tested"],
+        "files_modified": [f"src/module_{i}.py"], "created_at": "2025-01-01T12:00:00", "retry_count": 0,
+    } for i in range(task_count)]
+    memories = {
+        t["id"]: [{"type": "ai", "content": "Let me read the file. " * 5,
+                   "tool_calls": [{"id": f"c{j}", "name": "read_file", "args": {"path": "src/a.py"}}]}
+                  if j % 2 == 0 else {"type": "tool", "content": "def f():\n    return 1\n" * 60, "tool_call_id": f"c{j}"}
+                  for j in range(rng.randint(10, 40))]
+        for t in tasks[:task_count // 2]
+    }
+    return {"objective": "Build the app", "tasks": tasks, "task_memories": memories,
+            "insights": [{"summary": "Use FastAPI"}] * 20, "design_log": [{"decision": "SQLite"}] * 20}
+
+
+def load_state(path: Path) -> dict:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict) and "state_json" in data:
+        data = json.loads(data["state_json"])
+    return data
+
+
+def stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def legacy_checkpoint(state: dict) -> str:
+    """Previous save_run_state: probe each key, then encode the whole state."""
+    state_copy = {}
+    for key, value in state.items():
+        json.dumps(value)
+        state_copy[key] = value
+    return json.dumps(state_copy)
+
+
+def current_checkpoint(state: dict) -> str:
+    fragments = [dumps(str(key)) + b":" + dumps(value) for key, value in state.items()]
+    return (b"{" + b",".join(fragments) + b"}").decode("utf-8")
+
+
+def best_ms(fn, *args) -> float:
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=REPEAT)) * 1000
+
+
+def main():
+    state = load_state(Path(sys.argv[1])) if len(sys.argv) > 1 else synthetic_state()
+    frame = {"type": "state_update", "run_id": "run", "payload": {"tasks": state.get("tasks", []), "status": "running"}}
+    encoded = stdlib_dumps(state)
+
+    print(f"Backend: {serialization.JSON_BACKEND}, state {len(encoded) / 1024:.0f} KB, "
+          f"{len(state.get('tasks', []))} tasks, best of {REPEAT}\n")
+    print(f"{'':<28}{'stdlib ms':>12}{'serializer ms':>15}{'speedup':>10}")
+    rows = [
+        ("checkpoint (save_run_state)", best_ms(legacy_checkpoint, state), best_ms(current_checkpoint, state)),
+        ("checkpoint load", best_ms(json.loads, encoded), best_ms(loads, encoded)),
+        ("websocket task frame", best_ms(stdlib_dumps, frame), best_ms(dumps, frame)),
+        ("GET /runs/{id} response", best_ms(stdlib_dumps, state), best_ms(dumps, state)),
+    ]
+    for name, before, after in rows:
+        print(f"{name:<28}{before:>12.2f}{after:>15.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: Worker Start-Up, Tool Binding and Tool Search
+========================================================
+Measures the per-task cost a worker pays before its first LLM call:
+
+    bind:    _bind_tools for the code worker's tool set. "cold" clears the
+             args-schema cache before every bind (schemas inferred from
+             wrapper signatures each time, the old behaviour); "warm" reuses
+             the schemas inferred by the first bind.
+    search:  ToolRegistry.search_tools over the default registry. "scan"
+             re-implements the old lookup (substring match over every tool's
+             name, description and docs, rendering each match); "index" uses
+             the precomputed renderings and inverted index.
+
+Run with:
+    python benchmarks/bench_tool_binding.py [iterations]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from orchestrator_types import WorkerProfile
+from nodes import tools_binding
+from nodes.shared_tools import report_existing_implementation
+from tools import (
+    read_file_async, read_files_async, search_code_async, write_file_async, edit_file_async,
+    delete_file_async, list_directory_async, file_exists_async, run_python_async, run_shell_async,
+)
+from tools.base import DEFAULT_REGISTRY, DetailLevel
+
+CODE_WORKER_TOOLS = [
+    read_file_async, read_files_async, search_code_async, write_file_async, edit_file_async, delete_file_async,
+    list_directory_async, file_exists_async, run_python_async, run_shell_async, report_existing_implementation,
+]
+QUERIES = ["file", "write_file", "commit", "search", "run python", "directory", "diff", "web"]
+
+
+def scan_search(registry, query: str, detail_level: DetailLevel):
+    query_lower = query.lower()
+    return [
+        tool.to_detail_level(detail_level) for name, tool in registry.tools.items()
+        if query_lower in name.lower() or query_lower in tool.description.lower()
+        or query_lower in tool.detailed_docs.lower()
+    ]
+
+
+def time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    state = {"worktree_path": tempfile.mkdtemp(), "_workspace_path": tempfile.mkdtemp(), "task_id": "task_bench"}
+
+    def bind_cold():
+        tools_binding._ARGS_SCHEMAS.clear()
+        tools_binding._bind_tools(CODE_WORKER_TOOLS, state, WorkerProfile.CODER)
+
+    def bind_warm():
+        tools_binding._bind_tools(CODE_WORKER_TOOLS, state, WorkerProfile.CODER)
+
+    bind_warm()
+    cold, warm = time_per_call(bind_cold, iterations), time_per_call(bind_warm, iterations)
+    print(f"_bind_tools, {len(CODE_WORKER_TOOLS)} code-worker tools ({iterations} binds)")
+    print(f"  cold (schemas inferred)  {cold * 1000:8.2f} ms/task")
+    print(f"  warm (schemas cached)    {warm * 1000:8.2f} ms/task   ({cold / warm:.1f}x)")
+
+    print(f"\nsearch_tools over {len(DEFAULT_REGISTRY.tools)} tools, {len(QUERIES)} queries x 3 detail levels")
+    for label, search in [("scan", lambda q, lvl: scan_search(DEFAULT_REGISTRY, q, lvl)),
+                          ("index", DEFAULT_REGISTRY.search_tools)]:
+        per_round = time_per_call(lambda: [search(q, lvl) for q in QUERIES for lvl in DetailLevel], iterations)
+        print(f"  {label:<6} {per_round / (len(QUERIES) * 3) * 1e6:8.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
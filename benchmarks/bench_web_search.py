@@ -0,0 +1,93 @@
+"""
+Benchmark: Research Web Search, Per-Call vs Cached Fan-Out
+==========================================================
+Simulates several research workers on related topics, each issuing a batch
+of queries (the same queries recur across workers, in varying case and
+punctuation), against the offline StubSearchProvider.
+
+    naive:   one query per tool call, awaited sequentially, a new HTTP
+             session per call (HANDSHAKE_S extra) and no cache
+    client:  one shared WebSearchClient; each worker sends its queries in
+             one search_many call (concurrent, cached, URL de-duplicated)
+
+Latencies are simulated with asyncio.sleep:
+    provider round-trip: latency_s
+    new session setup:   HANDSHAKE_S
+
+Run with:
+    python benchmarks/bench_web_search.py [workers] [latency_s]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools.search_tools import StubSearchProvider, WebSearchClient
+
+HANDSHAKE_S = 0.05
+MAX_RESULTS = 5
+
+TOPICS = ["fastapi", "postgres", "react", "redis", "docker", "oauth"]
+PHRASINGS = [
+    "{t} best practices",
+    "{T}: Best Practices",
+    "{t} authentication guide",
+    "{t} performance tuning",
+    "How to deploy {t}?",
+]
+
+
+def worker_queries(worker: int):
+    """Each worker researches two neighbouring topics from every angle."""
+    topics = [TOPICS[worker % len(TOPICS)], TOPICS[(worker + 1) % len(TOPICS)]]
+    return [p.format(t=t, T=t.title()) for t in topics for p in PHRASINGS]
+
+
+async def naive_worker(queries, latency_s: float):
+    results = []
+    for query in queries:
+        provider = StubSearchProvider(latency_s)  # Fresh tool and session per call
+        await asyncio.sleep(HANDSHAKE_S)
+        results.extend(await provider.search(query, MAX_RESULTS))
+    return results, len(queries)
+
+
+async def client_worker(client: WebSearchClient, queries):
+    return await client.search_many(queries, MAX_RESULTS), 1
+
+
+async def run(mode: str, workers: int, latency_s: float):
+    provider = StubSearchProvider(latency_s)
+    client = WebSearchClient(provider)
+    start = time.perf_counter()
+    if mode == "naive":
+        outcomes = await asyncio.gather(*(naive_worker(worker_queries(w), latency_s) for w in range(workers)))
+        provider_calls = sum(len(worker_queries(w)) for w in range(workers))
+    else:
+        outcomes = await asyncio.gather(*(client_worker(client, worker_queries(w)) for w in range(workers)))
+        provider_calls = provider.calls
+    wall = time.perf_counter() - start
+    results = sum(len(r) for r, _ in outcomes)
+    tool_calls = sum(c for _, c in outcomes)
+    return wall, provider_calls, tool_calls, results
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    latency_s = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    logging.disable(logging.CRITICAL)
+    queries = sum(len(worker_queries(w)) for w in range(workers))
+
+    print(f"{workers} workers, {queries} queries, provider latency {latency_s}s, session setup {HANDSHAKE_S}s\n")
+    print(f"  {'mode':<8} {'wall':>7} {'provider calls':>15} {'tool calls':>11} {'results to LLM':>15}")
+    for mode in ["naive", "client"]:
+        wall, provider_calls, tool_calls, results = asyncio.run(run(mode, workers, latency_s))
+        print(f"  {mode:<8} {wall:6.2f}s {provider_calls:>15} {tool_calls:>11} {results:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -55,6 +55,43 @@ export async function apiClient<T>(
     return response.json();
 }
 
+/**
+ * Stream an NDJSON endpoint, calling onItems with each batch of parsed lines
+ * as it arrives (for progressive rendering of long task conversations)
+ */
+export async function streamNdjson<T>(
+    endpoint: string,
+    onItems: (items: T[]) => void,
+    options: FetchOptions = {}
+): Promise<void> {
+    const { params, ...fetchOptions } = options;
+
+    let url = apiUrl(endpoint);
+    if (params) {
+        const searchParams = new URLSearchParams(params);
+        url += `?${searchParams.toString()}`;
+    }
+
+    const response = await fetch(url, fetchOptions);
+    if (!response.ok || !response.body) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
+        const items = lines.filter(line => line.trim()).map(line => JSON.parse(line) as T);
+        if (items.length) onItems(items);
+    }
+    if (buffer.trim()) onItems([JSON.parse(buffer) as T]);
+}
+
 /**
  * Add a dependency between tasks
  * Makes taskId depend on dependsOnId
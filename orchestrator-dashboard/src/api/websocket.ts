@@ -2,6 +2,8 @@ import { create } from 'zustand';
 
 export type WSMessageType =
     | 'state_update'
+    | 'task_patch'
+    | 'resync'
     | 'task_update'
     | 'log_message'
     | 'human_needed'
@@ -47,6 +49,11 @@ interface WebSocketState {
 type MessageHandler = (msg: WSMessage) => void;
 const messageHandlers = new Map<WSMessageType, Set<MessageHandler>>();
 
+const textDecoder = new TextDecoder();
+
+// Last task-state sequence number seen per run (snapshots reset it, patches must follow it)
+const lastSeq = new Map<string, number>();
+
 export const useWebSocketStore = create<WebSocketState>((set, get) => ({
     socket: null,
     connected: false,
@@ -55,6 +62,8 @@ export const useWebSocketStore = create<WebSocketState>((set, get) => ({
 
     connect: () => {
         const socket = new WebSocket(WS_URL);
+        // Server sends pre-encoded JSON as binary frames
+        socket.binaryType = 'arraybuffer';
 
         socket.onopen = () => {
             set({ connected: true });
@@ -80,9 +89,23 @@ export const useWebSocketStore = create<WebSocketState>((set, get) => ({
         };
 
         socket.onmessage = (event) => {
-            const msg: WSMessage = JSON.parse(event.data);
+            const data = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+            const msg: WSMessage = JSON.parse(data);
             console.log('WS Message received:', msg.type, msg);
 
+            // Versioned task state: a gap in the patch sequence means we missed an update
+            if (msg.run_id && msg.type === 'state_update' && msg.payload.seq !== undefined) {
+                lastSeq.set(msg.run_id, msg.payload.seq);
+            } else if (msg.run_id && msg.type === 'task_patch') {
+                const expected = (lastSeq.get(msg.run_id) ?? 0) + 1;
+                if (msg.payload.seq !== expected) {
+                    console.warn(`Task patch gap for ${msg.run_id}: expected ${expected}, got ${msg.payload.seq}`);
+                    socket.send(JSON.stringify({ type: 'resync', run_id: msg.run_id }));
+                    return;
+                }
+                lastSeq.set(msg.run_id, msg.payload.seq);
+            }
+
             // Add to message history (keep last 100)
             set((state) => ({
                 messages: [...state.messages.slice(-99), msg],
@@ -124,6 +147,7 @@ export const useWebSocketStore = create<WebSocketState>((set, get) => ({
 
         if (subscribedRuns.has(runId)) {
             subscribedRuns.delete(runId);
+            lastSeq.delete(runId);
             set({ subscribedRuns: new Set(subscribedRuns) });
 
             if (socket?.readyState === WebSocket.OPEN) {
@@ -11,6 +11,7 @@ interface RunSummary {
     created_at: string;
     task_counts: Record<string, number>;
     workspace_path?: string;
+    active_slots?: number;
 }
 
 interface PaginatedResponse<T> {
@@ -125,6 +126,11 @@ export function Dashboard() {
                                             </div>
                                         </div>
                                         <div className="flex items-center gap-4">
+                                            {!!run.active_slots && (
+                                                <span className="text-xs text-muted-foreground" title="Worker pool slots in use">
+                                                    {run.active_slots} worker{run.active_slots === 1 ? '' : 's'}
+                                                </span>
+                                            )}
                                             <span className={`px-2 py-1 rounded text-xs font-medium ${run.status === 'running' ? 'bg-blue-100 text-blue-700' :
                                                 run.status === 'replanning' ? 'bg-purple-100 text-purple-700 animate-pulse' :
                                                     run.status === 'completed' ? 'bg-green-100 text-green-700' :
@@ -60,7 +60,7 @@ export function HumanQueue() {
             // Fetch full details for each interrupted run to get tasks
             for (const run of interruptedRuns) {
                 try {
-                    const details = await apiClient<RunSummary>(`/api/runs/${run.run_id}`);
+                    const details = await apiClient<RunSummary>(`/api/runs/${run.run_id}`, { params: { include: 'tasks' } });
                     if (details.tasks) {
                         const waitingFromRun = details.tasks
                             .filter(t => t.status === 'waiting_human')
@@ -89,11 +89,17 @@ export function HumanQueue() {
         fetchWaitingTasks();
 
         // Subscribe to real-time updates - refetch on any state change
-        const unsubscribe = addMessageHandler('state_update', () => {
+        const removeStateUpdateHandler = addMessageHandler('state_update', () => {
+            fetchWaitingTasks();
+        });
+        const removeTaskPatchHandler = addMessageHandler('task_patch', () => {
             fetchWaitingTasks();
         });
 
-        return unsubscribe;
+        return () => {
+            removeStateUpdateHandler();
+            removeTaskPatchHandler();
+        };
     }, [addMessageHandler]);
 
     if (isLoading) {
@@ -1,6 +1,6 @@
 import { useParams } from 'react-router-dom';
 import { useMemo, useState, useEffect } from 'react';
-import { apiClient } from '../api/client';
+import { apiClient, streamNdjson } from '../api/client';
 import { useWebSocketStore } from '../api/websocket';
 import { LayoutGrid, List } from 'lucide-react';
 import { TaskGraph } from '../components/TaskGraph';
@@ -33,6 +33,37 @@ export function RunDetails() {
     const [fetchedMemories, setFetchedMemories] = useState<Record<string, any[]>>({});
     const [loadingMemories, setLoadingMemories] = useState<Set<string>>(new Set());
 
+    // Fetch memories on-demand (GET /runs/{id} no longer includes them)
+    const loadMemories = async (taskId: string) => {
+        if (runId && !fetchedMemories[taskId] && !loadingMemories.has(taskId)) {
+            setLoadingMemories(prev => new Set(prev).add(taskId));
+            try {
+                // Streamed as NDJSON - render messages as they arrive
+                setFetchedMemories(prev => ({ ...prev, [taskId]: [] }));
+                await streamNdjson<any>(
+                    `/api/runs/${runId}/tasks/${taskId}/memories/stream`,
+                    (messages) => setFetchedMemories(prev => ({
+                        ...prev,
+                        [taskId]: [...(prev[taskId] || []), ...messages]
+                    }))
+                );
+            } catch (err) {
+                console.error('Failed to fetch task memories:', err);
+                // Allow a retry on the next expand
+                setFetchedMemories(prev => {
+                    const { [taskId]: _failed, ...rest } = prev;
+                    return rest;
+                });
+            } finally {
+                setLoadingMemories(prev => {
+                    const next = new Set(prev);
+                    next.delete(taskId);
+                    return next;
+                });
+            }
+        }
+    };
+
     const toggleTask = async (taskId: string) => {
         const isExpanding = !expandedTasks.has(taskId);
 
@@ -46,26 +77,8 @@ export function RunDetails() {
             return next;
         });
 
-        // Fetch memories on-demand when expanding (if not already fetched)
-        if (isExpanding && runId && !fetchedMemories[taskId] && !loadingMemories.has(taskId)) {
-            setLoadingMemories(prev => new Set(prev).add(taskId));
-            try {
-                const response = await apiClient<{ task_id: string; messages: any[] }>(
-                    `/api/runs/${runId}/tasks/${taskId}/memories`
-                );
-                setFetchedMemories(prev => ({
-                    ...prev,
-                    [taskId]: response.messages
-                }));
-            } catch (err) {
-                console.error('Failed to fetch task memories:', err);
-            } finally {
-                setLoadingMemories(prev => {
-                    const next = new Set(prev);
-                    next.delete(taskId);
-                    return next;
-                });
-            }
+        if (isExpanding) {
+            await loadMemories(taskId);
         }
     };
 
@@ -122,6 +135,34 @@ export function RunDetails() {
             }
         });
 
+        // Versioned patches: only changed task fields, merged by task id
+        const removeTaskPatchHandler = addMessageHandler('task_patch', (message) => {
+            if (message.run_id === runId) {
+                setRun(prev => {
+                    if (!prev) return prev;
+                    const patches: any[] = message.payload.tasks || [];
+                    const removed = new Set<string>(message.payload.removed || []);
+                    const byId = new Map(patches.map(p => [p.id, p]));
+                    const tasks = prev.tasks
+                        .filter((t: any) => !removed.has(t.id))
+                        .map((t: any) => {
+                            const patch = byId.get(t.id);
+                            if (!patch) return t;
+                            byId.delete(t.id);
+                            return { ...t, ...patch };
+                        });
+                    // Whatever is left are new tasks
+                    byId.forEach(p => tasks.push(p));
+                    return {
+                        ...prev,
+                        status: message.payload.status || prev.status,
+                        tasks,
+                        task_counts: message.payload.task_counts !== undefined ? message.payload.task_counts : prev.task_counts,
+                    };
+                });
+            }
+        });
+
         const removeInterruptHandler = addMessageHandler('interrupted', (message) => {
             if (message.run_id === runId) {
                 console.log('Interrupted event received:', message.payload);
@@ -172,6 +213,7 @@ export function RunDetails() {
 
         return () => {
             removeStateUpdateHandler();
+            removeTaskPatchHandler();
             removeInterruptHandler();
             removeTaskInterruptHandler();
             removeStatusHandler();
@@ -297,7 +339,10 @@ export function RunDetails() {
                 {/* Model Config */}
                 <ModelConfig
                     modelConfig={run.model_config}
-                    onViewDirectorLogs={() => setViewingDirectorLogs(true)}
+                    onViewDirectorLogs={() => {
+                        setViewingDirectorLogs(true);
+                        loadMemories('director');
+                    }}
                 />
 
                 {/* Content Grid */}
@@ -347,6 +392,7 @@ export function RunDetails() {
                                     runId={runId}
                                     onTaskClick={(id) => {
                                         setSelectedTaskId(id);
+                                        loadMemories(id);
                                     }}
                                 />
                             </div>
@@ -406,7 +452,7 @@ export function RunDetails() {
                 {/* Director Logs Modal */}
                 {viewingDirectorLogs && (
                     <DirectorLogsModal
-                        logs={run.task_memories?.['director']}
+                        logs={fetchedMemories['director'] || run.task_memories?.['director']}
                         onClose={() => setViewingDirectorLogs(false)}
                     />
                 )}
@@ -0,0 +1,104 @@
+"""
+Run Broadcast Debouncer
+=======================
+Coalesces bursts of state broadcasts for a run into at most one per interval.
+
+During busy phases Phase 1, the director, dispatch and strategist calls can
+each request a broadcast within a few milliseconds. Only the latest state
+matters, so pending requests are merged and the payload is built once per
+flush. Terminal run status changes, and tasks entering a status that
+needs attention (waiting_human, failed), are flushed immediately.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_RUN_STATUSES = {"completed", "failed", "cancelled", "interrupted"}
+URGENT_TASK_STATUSES = {"waiting_human", "failed"}
+
+
+def _urgent_tasks(state: dict) -> Set[Tuple[str, str]]:
+    """(task id, status) of tasks (objects or dicts) whose status needs a prompt broadcast."""
+    urgent = set()
+    for task in state.get("tasks") or ():
+        if isinstance(task, dict):
+            task_id, status = task.get("id"), task.get("status")
+        else:
+            task_id, status = getattr(task, "id", None), getattr(task, "status", None)
+        status = getattr(status, "value", status)
+        if status in URGENT_TASK_STATUSES:
+            urgent.add((task_id, status))
+    return urgent
+
+
+class RunBroadcastDebouncer:
+    """Per-run debouncer around an async send(run_id, state) callable."""
+
+    def __init__(self, send: Callable[[str, dict], Awaitable[None]], interval_ms: int = 250):
+        self.send = send
+        self.interval_ms = interval_ms
+        self._pending: Dict[str, Tuple[dict, str]] = {}  # run_id -> (latest state, run status)
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._last_flush: Dict[str, float] = {}
+        self._last_status: Dict[str, str] = {}
+        self._urgent_tasks: Dict[str, Set[Tuple[str, str]]] = {}  # run_id -> tasks already waiting_human/failed
+        self.requested = 0
+        self.flushed = 0
+
+    async def update(self, run_id: str, state: dict, status: str, interval_ms: Optional[int] = None):
+        """Record the latest state and flush now or schedule a flush for the end of the interval."""
+        self.requested += 1
+        self._pending[run_id] = (state, status)
+        interval_s = (self.interval_ms if interval_ms is None else interval_ms) / 1000
+
+        terminal_change = status in TERMINAL_RUN_STATUSES and status != self._last_status.get(run_id)
+        urgent = _urgent_tasks(state)
+        task_change = bool(urgent - self._urgent_tasks.get(run_id, set()))
+        self._urgent_tasks[run_id] = urgent
+        if terminal_change or task_change or interval_s <= 0:
+            await self.flush(run_id)
+            return
+
+        if run_id in self._timers:
+            return  # Already scheduled - it will pick up this state
+        wait_s = self._last_flush.get(run_id, 0.0) + interval_s - time.monotonic()
+        if wait_s <= 0:
+            await self.flush(run_id)
+        else:
+            self._timers[run_id] = asyncio.create_task(self._flush_later(run_id, wait_s))
+
+    async def _flush_later(self, run_id: str, delay_s: float):
+        await asyncio.sleep(delay_s)
+        self._timers.pop(run_id, None)
+        try:
+            await self.flush(run_id)
+        except Exception as e:
+            logger.error(f"Deferred broadcast for {run_id} failed: {e}")
+
+    async def flush(self, run_id: str):
+        """Send the pending state for a run, if any."""
+        timer = self._timers.pop(run_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        pending = self._pending.pop(run_id, None)
+        if pending is None:
+            return
+        state, status = pending
+        self._last_flush[run_id] = time.monotonic()
+        self._last_status[run_id] = status
+        self.flushed += 1
+        await self.send(run_id, state)
+
+    def discard(self, run_id: str):
+        """Forget a finished run (pending state is dropped)."""
+        timer = self._timers.pop(run_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._pending.pop(run_id, None)
+        self._last_flush.pop(run_id, None)
+        self._last_status.pop(run_id, None)
+        self._urgent_tasks.pop(run_id, None)
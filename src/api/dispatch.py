@@ -6,19 +6,22 @@ Continuous task dispatch loop and orchestrator execution management.
 
 import asyncio
 import logging
-import platform
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
 from state import tasks_reducer, task_memories_reducer, insights_reducer, design_log_reducer
-from orchestrator_types import task_to_dict, serialize_messages
+from orchestrator_types import serialize_messages
 from config import OrchestratorConfig
 from git_manager import AsyncWorktreeManager as WorktreeManager
 from git_manager import AsyncWorktreeManager as WorktreeManager, initialize_git_repo_async as initialize_git_repo
+from dependency_cache import prepare_workspace_venv
+from metrics import dispatch_metrics
 
 # Import global state
 import api.state as api_state
+from api.broadcast import RunBroadcastDebouncer
 from api.state import runs_index, run_states, get_orchestrator_graph
 
 
@@ -71,6 +74,7 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
         Director → spawn(workers) → poll completions → Director → spawn more...
     """
     from task_queue import TaskCompletionQueue
+    from worker_pool import worker_pool
     from nodes.director_main import director_node
     from nodes.worker import worker_node
     from nodes.strategist import strategist_node
@@ -78,8 +82,25 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
     # Get max concurrent workers from config
     orch_config = state.get("orch_config")
     max_concurrent = getattr(orch_config, "max_concurrent_workers", 5) if orch_config else 5
-    task_queue = TaskCompletionQueue(max_concurrent=max_concurrent)
-    logger.info(f"🔧 Max concurrent workers set to: {max_concurrent}")
+    worker_pool.register(
+        run_id,
+        weight=getattr(orch_config, "scheduler_weight", 1.0) if orch_config else 1.0,
+        min_slots=getattr(orch_config, "min_worker_slots", 0) if orch_config else 0,
+        max_slots=max_concurrent,
+        priority=getattr(orch_config, "scheduler_priority", "normal") if orch_config else "normal",
+    )
+    distributed = bool(getattr(orch_config, "distributed_workers", False)) if orch_config else False
+    if distributed:
+        from distributed_queue import DistributedTaskQueue
+        task_queue = DistributedTaskQueue(
+            run_id, max_concurrent=max_concurrent, pool=worker_pool,
+            max_attempts=getattr(orch_config, "worker_max_attempts", 3)
+        )
+        await task_queue.start()
+        logger.info(f"🌐 Distributed mode: task envelopes are run by remote workers")
+    else:
+        task_queue = TaskCompletionQueue(max_concurrent=max_concurrent, run_id=run_id, pool=worker_pool)
+    logger.info(f"🔧 Max concurrent workers set to: {max_concurrent} (shared pool of {worker_pool.total_slots})")
     iteration = 0
     max_iterations = 500  # Safety limit
 
@@ -237,14 +258,19 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
 
             # ========== PHASE 3: Find and dispatch ready tasks ==========
             ready_tasks = [t for t in state.get("tasks", []) if t.get("status") == "ready"]
+            task_queue.set_demand(len(ready_tasks))
 
-            # Dispatch ready tasks (up to available slots)
+            # Dispatch ready tasks (up to this run's share of the worker pool)
             dispatched = 0
             for task in ready_tasks[:task_queue.available_slots]:
                 task_id = task.get("id")
                 if task_queue.is_running(task_id):
                     continue  # Already running
 
+                # Another run may have taken the slot while we were creating worktrees
+                if task_queue.available_slots <= 0:
+                    break
+
                 # Mark as active
                 task["status"] = "active"
                 task["started_at"] = datetime.now().isoformat()
@@ -260,7 +286,22 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
                 # Spawn worker as background task
                 worker_state = {**state, "task_id": task_id}
                 _heartbeat(run_id, f"ITER_{iteration}_WORKER_SPAWN_{task_id[:8]}")
-                task_queue.spawn(task_id, worker_node(worker_state, run_config))
+                if distributed:
+                    # Remote workers lease the envelope; results come back through Phase 1
+                    try:
+                        spawned = await task_queue.submit(task_id, worker_state, run_config)
+                    except Exception as e:
+                        logger.error(f"Failed to enqueue {task_id[:12]}: {e}")
+                        spawned = False
+                else:
+                    worker_coro = worker_node(worker_state, run_config)
+                    spawned = task_queue.spawn(task_id, worker_coro)
+                    if not spawned:
+                        worker_coro.close()
+                if not spawned:
+                    task["status"] = "ready"
+                    task.pop("started_at", None)
+                    break
                 dispatched += 1
                 activity_occurred = True
 
@@ -438,6 +479,9 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
             if task_queue.has_work:
                 # Wait a bit for workers to complete
                 await task_queue.wait_for_any(timeout=1.0)
+            elif any(t.get("status") == "ready" for t in ready_tasks):
+                # Ready work but no pool slot - wake as soon as another run frees one
+                await task_queue.wait_for_slot(timeout=1.0)
             else:
                 # Small delay to prevent tight loop
                 await asyncio.sleep(0.1)
@@ -469,6 +513,7 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
                 # This prevents constant MySQL writes when the loop is idle
                 if activity_occurred:
                     run_states[run_id] = state.copy()
+                    api_state.bump_run_version(run_id)
 
                     # Persist to database
                     from run_persistence import save_run_state
@@ -546,11 +591,14 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
         except Exception as cancel_err:
             logger.error(f"Error cancelling workers: {cancel_err}")
 
-        # Unregister task queue
+        # Unregister task queue and return this run's share of the worker pool
         api_state.active_task_queues.pop(run_id, None)
+        worker_pool.unregister(run_id)
 
-        # Final broadcast
+        # Final broadcast - send any coalesced state first
         try:
+            await _state_broadcaster.flush(run_id)
+            _state_broadcaster.discard(run_id)
             await api_state.manager.broadcast({"type": "run_list_update", "payload": list(runs_index.values())})
         except Exception as broadcast_err:
             logger.error(f"Error in final broadcast: {broadcast_err}")
@@ -560,27 +608,40 @@ async def continuous_dispatch_loop(run_id: str, state: dict, run_config: dict):
         sys.stderr.flush()
 
 
-async def broadcast_state_update(run_id: str, state: dict):
-    """Broadcast state update to connected clients."""
+async def _send_state_update(run_id: str, state: dict):
+    """Broadcast a versioned task patch to clients subscribed to the run."""
     try:
-        serialized_tasks = [task_to_dict(t) if hasattr(t, "status") else t for t in state.get("tasks", [])]
-
         # NOTE: task_memories (full LLM conversations) are NOT included in broadcasts
         # to prevent frontend memory exhaustion. Frontend should fetch on-demand if needed.
 
-        await api_state.manager.broadcast_to_run(run_id, {
-            "type": "state_update",
-            "payload": {
-                "tasks": serialized_tasks,
-                "status": runs_index[run_id].get("status", "running"),
-                "task_counts": runs_index[run_id].get("task_counts", {}),
-                # task_memories omitted to prevent OOM crashes
-            }
-        })
+        # Subscribers receive only the fields that changed since the last broadcast
+        await api_state.manager.broadcast_state(
+            run_id,
+            state.get("tasks", []),  # Task objects are serialized by broadcast_state
+            status=runs_index[run_id].get("status", "running"),
+            task_counts=runs_index[run_id].get("task_counts", {}),
+        )
     except Exception as e:
         logger.error(f"Failed to broadcast state: {e}")
 
 
+_state_broadcaster = RunBroadcastDebouncer(_send_state_update)
+
+
+async def broadcast_state_update(run_id: str, state: dict):
+    """
+    Request a state broadcast for the run.
+
+    Bursts are coalesced to at most one broadcast per broadcast_interval_ms;
+    terminal run status changes are sent immediately.
+    """
+    api_state.bump_run_version(run_id)
+    orch_config = state.get("orch_config")
+    interval_ms = getattr(orch_config, "broadcast_interval_ms", None) if orch_config else None
+    status = runs_index.get(run_id, {}).get("status", "running")
+    await _state_broadcaster.update(run_id, state, status, interval_ms=interval_ms)
+
+
 async def execute_run_logic(run_id: str, thread_id: str, objective: str, spec: dict, workspace_path):
     """Core execution logic for the run."""
     try:
@@ -597,119 +658,31 @@ async def execute_run_logic(run_id: str, thread_id: str, objective: str, spec: d
             "payload": {"message": "Git repository initialized", "phase": "init"}
         })
 
-        # Create SHARED venv at workspace root (all worktrees will use this)
+        # Create SHARED venv at workspace root (all worktrees will use this),
+        # cloned from a cached template when one matches
         venv_path = workspace_path / ".venv"
-        if not venv_path.exists():
-            await api_state.manager.broadcast_to_run(run_id, {
-                "type": "status",
-                "payload": {"message": "Creating Python virtual environment...", "phase": "init"}
-            })
-            logger.info(f"Creating shared venv at {venv_path}...")
-            try:
-                # Create venv asynchronously
-                process = await asyncio.create_subprocess_exec(
-                    "python", "-m", "venv", str(venv_path),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=str(workspace_path)
-                )
-                try:
-                    await asyncio.wait_for(process.communicate(), timeout=120.0)
-                    if process.returncode != 0:
-                        raise Exception("Venv creation failed")
-                except asyncio.TimeoutError:
-                    process.kill()
-                    await process.wait()
-                    raise Exception("Venv creation timed out")
-
-                logger.info(f"✅ Shared venv created at {venv_path}")
-                await api_state.manager.broadcast_to_run(run_id, {
-                    "type": "status",
-                    "payload": {"message": "Virtual environment created", "phase": "init"}
-                })
 
-                # Install basic packages (requests for test harness pattern)
-                pip_exe = venv_path / "Scripts" / "pip.exe" if platform.system() == "Windows" else venv_path / "bin" / "pip"
-                if pip_exe.exists():
-                    # Install requests
-                    await api_state.manager.broadcast_to_run(run_id, {
-                        "type": "status",
-                        "payload": {"message": "Installing Python packages (requests)...", "phase": "init"}
-                    })
-                    process = await asyncio.create_subprocess_exec(
-                        str(pip_exe), "install", "requests",
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        cwd=str(workspace_path)
-                    )
-                    try:
-                        await asyncio.wait_for(process.communicate(), timeout=120.0)
-                    except asyncio.TimeoutError:
-                        process.kill()
-                        await process.wait()
-
-                    logger.info(f"✅ Installed 'requests' in shared venv")
-                    await api_state.manager.broadcast_to_run(run_id, {
-                        "type": "status",
-                        "payload": {"message": "Python packages installed", "phase": "init"}
-                    })
-
-                    # Install nodeenv and set up Node.js in the venv
-                    await api_state.manager.broadcast_to_run(run_id, {
-                        "type": "status",
-                        "payload": {"message": "Installing Node.js environment (this may take a minute)...", "phase": "init"}
-                    })
-                    logger.info(f"Installing nodeenv for npm support...")
-                    process = await asyncio.create_subprocess_exec(
-                        str(pip_exe), "install", "nodeenv",
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        cwd=str(workspace_path)
-                    )
-                    try:
-                        await asyncio.wait_for(process.communicate(), timeout=120.0)
-                    except asyncio.TimeoutError:
-                        process.kill()
-                        await process.wait()
-
-                    # Add Node.js to the venv using nodeenv -p (prebuilt binaries)
-                    python_exe = venv_path / "Scripts" / "python.exe" if platform.system() == "Windows" else venv_path / "bin" / "python"
-                    try:
-                        process = await asyncio.create_subprocess_exec(
-                            str(python_exe), "-m", "nodeenv", "-p", "--prebuilt",
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE,
-                            cwd=str(workspace_path)
-                        )
-                        await asyncio.wait_for(process.communicate(), timeout=300.0)
-                        logger.info(f"✅ Installed Node.js/npm in shared venv via nodeenv")
-                        await api_state.manager.broadcast_to_run(run_id, {
-                            "type": "status",
-                            "payload": {"message": "Node.js environment ready", "phase": "init"}
-                        })
-                    except asyncio.TimeoutError:
-                        logger.warning(f"nodeenv installation timed out - agents may need npm globally")
-                        await api_state.manager.broadcast_to_run(run_id, {
-                            "type": "status",
-                            "payload": {"message": "Node.js setup timed out (agents will use global npm)", "phase": "init"}
-                        })
-                    except Exception as e:
-                        logger.warning(f"nodeenv installation failed: {e} - agents may need npm globally")
-                        await api_state.manager.broadcast_to_run(run_id, {
-                            "type": "status",
-                            "payload": {"message": "Node.js setup failed (agents will use global npm)", "phase": "init"}
-                        })
-            except asyncio.TimeoutError:
-                logger.warning(f"Venv creation timed out - agents may need to create manually")
-            except Exception as e:
-                logger.warning(f"Venv creation failed: {e} - agents may need to create manually")
-        else:
-            logger.info(f"Shared venv already exists at {venv_path}")
+        async def on_setup_status(message: str):
             await api_state.manager.broadcast_to_run(run_id, {
                 "type": "status",
-                "payload": {"message": "Using existing virtual environment", "phase": "init"}
+                "payload": {"message": message, "phase": "init"}
             })
 
+        setup_start = time.monotonic()
+        try:
+            outcome = await prepare_workspace_venv(venv_path, on_status=on_setup_status)
+        except Exception as e:
+            outcome = "error"
+            logger.warning(f"Venv creation failed: {e} - agents may need to create manually")
+        setup_s = time.monotonic() - setup_start
+        dispatch_metrics.workspace_venv_setups.labels(result=outcome).inc()
+        dispatch_metrics.workspace_setup_duration.labels(result=outcome).observe(setup_s)
+        logger.info(f"[{run_id[:8]}] Workspace venv setup: {outcome} in {setup_s:.1f}s")
+        if outcome == "existing":
+            await on_setup_status("Using existing virtual environment")
+        elif outcome != "error":
+            await on_setup_status(f"Virtual environment ready in {setup_s:.0f}s (dependency cache {outcome})")
+
         # Create config
         config = OrchestratorConfig(mock_mode=False)
 
@@ -0,0 +1,18 @@
+"""
+API Responses
+=============
+Default response class for the orchestrator API.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the shared serializer (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
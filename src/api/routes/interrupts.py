@@ -7,18 +7,17 @@ FastAPI routes for managing task interrupts and human-in-the-loop interventions.
 import asyncio
 import logging
 from datetime import datetime
-from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 
 # Import API modules
 from api.types import HumanResolution
-from api.state import runs_index, running_tasks, run_states, get_orchestrator_graph, manager
+from api.state import runs_index, running_tasks, run_states, get_orchestrator_graph, manager, bump_run_version
+from api.state import load_run_into_index, get_run_state, wait_for_spill, rehydrate_run_state
 from api.dispatch import continuous_dispatch_loop
 
 # Import orchestrator types
 from orchestrator_types import task_to_dict, TaskStatus
-from git_manager import AsyncWorktreeManager as WorktreeManager
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +68,11 @@ async def ensure_run_in_index(run_id: str) -> bool:
         logger.debug(f"Run {run_id} already in index")
         return True
 
-    # Try to find in database
+    # Runs table (single-row lookup)
+    if await load_run_into_index(run_id):
+        return True
+
+    # Try to find in checkpoints (CLI-initiated runs aren't in the runs table)
     logger.info(f"🔍 Looking up run {run_id} in database (CLI-initiated run?)")
     try:
         get_orchestrator_graph()
@@ -130,7 +133,7 @@ async def interrupt_task(run_id: str, task_id: str):
     """
     from api.state import active_task_queues
     
-    if run_id not in runs_index:
+    if run_id not in runs_index and not await load_run_into_index(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
 
     # 1. Cancel only the specific task's worker (not the entire run)
@@ -145,12 +148,10 @@ async def interrupt_task(run_id: str, task_id: str):
 
     # 2. Update state to mark task as waiting_human
     try:
-        from run_persistence import load_run_state, save_run_state
+        from run_persistence import save_run_state
 
         # Try to get state from memory first, then DB
-        state = run_states.get(run_id)
-        if not state:
-            state = await load_run_state(run_id)
+        state = await get_run_state(run_id)
 
         if not state:
              raise HTTPException(status_code=404, detail="State not found")
@@ -215,6 +216,7 @@ async def interrupt_task(run_id: str, task_id: str):
         current_status = runs_index[run_id].get("status", "running")
         await save_run_state(run_id, state, status=current_status)
         run_states[run_id] = state
+        bump_run_version(run_id)
 
         # Broadcast update - send state_update with task change and task_interrupted for modal
         tasks_payload = [task_to_dict(t) if hasattr(t, "status") else t for t in updated_tasks]
@@ -341,58 +343,14 @@ async def resolve_interrupt(run_id: str, resolution: HumanResolution, background
                 # Load current state from database to continue where we left off
                 from run_persistence import load_run_state
 
+                await wait_for_spill(run_id)
                 state = await load_run_state(run_id)
                 if not state:
                     logger.error(f"   No saved state found for run {run_id}")
                     return
 
-                # CRITICAL: Reinitialize _wt_manager after loading from DB
-                # The _wt_manager object is not serializable, so we must recreate it
-                workspace_path = state.get("_workspace_path")
-                worktree_base_path = state.get("_worktree_base_path")  # Path outside workspace
-                logs_base_path = state.get("_logs_base_path")  # Path outside workspace
-                
-                # Get or create config for path generation
-                from config import OrchestratorConfig
-                config_obj = state.get("orch_config") or OrchestratorConfig()
-                
-                if workspace_path and worktree_base_path:
-                    workspace_path_obj = Path(workspace_path)
-                    worktree_base = Path(worktree_base_path)
-                    worktree_base.mkdir(parents=True, exist_ok=True)
-                    wt_manager = WorktreeManager(
-                        repo_path=workspace_path_obj,
-                        worktree_base=worktree_base
-                    )
-                    state["_wt_manager"] = wt_manager
-                    logger.info(f"   Restored _workspace_path: {workspace_path}")
-                    logger.info(f"   Reinitialized _wt_manager at: {worktree_base}")
-                    
-                    # CRITICAL: Recover existing worktrees from disk
-                    tasks = state.get("tasks", [])
-                    task_ids = [t.get("id") for t in tasks if t.get("id")]
-                    recovered = await wt_manager.recover_worktrees(task_ids)
-                    logger.info(f"   Recovered {recovered} worktrees from disk")
-                elif workspace_path:
-                    # OLD RUN: Generate NEW paths using config (outside workspace!)
-                    workspace_path_obj = Path(workspace_path)
-                    worktree_base = config_obj.get_worktree_base(run_id)
-                    worktree_base.mkdir(parents=True, exist_ok=True)
-                    state["_wt_manager"] = WorktreeManager(
-                        repo_path=workspace_path_obj,
-                        worktree_base=worktree_base
-                    )
-                    # Update state with new paths for future restarts
-                    state["_worktree_base_path"] = str(worktree_base)
-                    logger.info(f"   Generated new worktree path for old run: {worktree_base}")
-                else:
-                    logger.warning(f"   ⚠️ _workspace_path not found in loaded state!")
-                
-                # Also fix logs path for old runs
-                if workspace_path and not logs_base_path:
-                    logs_base_path = str(config_obj.get_llm_logs_path(run_id))
-                    state["_logs_base_path"] = logs_base_path
-                    logger.info(f"   Generated new logs path for old run: {logs_base_path}")
+                # CRITICAL: Recreate _wt_manager, paths and config after loading from DB
+                await rehydrate_run_state(run_id, state)
 
                 # Apply the resolution directly to state
                 # The director will process it via pending_resolution
@@ -8,21 +8,26 @@ import asyncio
 import logging
 import uuid
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request
-from pathlib import Path
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 # Import API modules
 from api.types import CreateRunRequest, RunSummary, HumanResolution, PaginatedResponse
 from api.state import runs_index, running_tasks, run_states, get_orchestrator_graph, manager, global_checkpointer
+from api.state import (
+    bump_run_version, run_state_etag, load_run_into_index, get_run_state, wait_for_spill, rehydrate_run_state
+)
 from api.dispatch import run_orchestrator, continuous_dispatch_loop
+from api.responses import FastJSONResponse
 
 # Import orchestrator types
 from orchestrator_types import task_to_dict, serialize_messages, TaskStatus
-from git_manager import AsyncWorktreeManager as WorktreeManager
+from serialization import dumps
+from worker_pool import worker_pool
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +77,11 @@ async def ensure_run_in_index(run_id: str) -> bool:
         logger.debug(f"Run {run_id} already in index")
         return True
 
-    # Try to find in database
+    # Runs table (single-row lookup)
+    if await load_run_into_index(run_id):
+        return True
+
+    # Try to find in checkpoints (CLI-initiated runs aren't in the runs table)
     logger.info(f"🔍 Looking up run {run_id} in database (CLI-initiated run?)")
     try:
         get_orchestrator_graph()
@@ -188,13 +197,10 @@ async def list_runs(
             updated_at=run_data.get("updated_at", ""),
             task_counts=run_data.get("task_counts", {}),
             tags=run_data.get("tags", []),
-            workspace_path=run_data.get("workspace_path", "")
+            workspace_path=run_data.get("workspace_path", ""),
+            active_slots=worker_pool.active_slots(run_id)
         ))
 
-        # Update runs_index for other endpoints
-        if run_id not in runs_index:
-            runs_index[run_id] = run_data
-
     # CRITICAL: Include active runs from in-memory runs_index
     # These may not be in the database yet
     for run_id, run_data in runs_index.items():
@@ -207,7 +213,8 @@ async def list_runs(
                 updated_at=run_data.get("updated_at", ""),
                 task_counts=run_data.get("task_counts", {}),
                 tags=run_data.get("tags", []),
-                workspace_path=run_data.get("workspace_path", "")
+                workspace_path=run_data.get("workspace_path", ""),
+                active_slots=worker_pool.active_slots(run_id)
             ))
 
     # Sort by created_at descending (most recent first)
@@ -293,40 +300,65 @@ async def create_run(request: Request, run_request: CreateRunRequest, background
     return {"run_id": run_id}
 
 
+# Optional sections of GET /runs/{run_id}; task_memories (full LLM conversations) is opt-in
+RUN_SECTIONS = (
+    "spec", "strategy_status", "tasks", "insights", "design_log", "guardian",
+    "workspace_path", "model_config", "task_memories", "interrupt_data",
+)
+DEFAULT_RUN_SECTIONS = tuple(s for s in RUN_SECTIONS if s != "task_memories")
+
+
+def _parse_include(include: Optional[str]) -> tuple:
+    """Parse ?include=a,b into section names (all but task_memories when omitted)."""
+    if not include:
+        return DEFAULT_RUN_SECTIONS
+    sections = tuple(s.strip() for s in include.split(",") if s.strip())
+    if "all" in sections:
+        return RUN_SECTIONS
+    unknown = [s for s in sections if s not in RUN_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections {unknown}; valid: {', '.join(RUN_SECTIONS)}")
+    return sections
+
+
 @router.get("/{run_id}")
 @limiter.limit("100/minute")
-async def get_run(request: Request, run_id: str):
-    from run_persistence import load_run_state
-
-    # Try to refresh from DB if not in memory
+async def get_run(
+    request: Request,
+    run_id: str,
+    include: Optional[str] = Query(
+        default=None,
+        description="Comma-separated sections to return (e.g. tasks,insights; 'all' adds task_memories). "
+                    "Defaults to everything except task_memories."
+    )
+):
+    # Not in memory (evicted, or started by another process): single-row lookup
     if run_id not in runs_index:
-        # Refresh runs_index from database
-        from run_persistence import list_all_runs
-        db_runs = await list_all_runs()
-        for run_data in db_runs:
-            rid = run_data.get("run_id")
-            if rid not in runs_index:
-                runs_index[rid] = run_data
+        await load_run_into_index(run_id)
 
     if run_id not in runs_index:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    run_data = runs_index[run_id]
+    sections = _parse_include(include)
 
-    # First try in-memory state
-    state = run_states.get(run_id)
+    # Unchanged since the client's copy: skip loading and serializing entirely
+    etag = run_state_etag(run_id, ",".join(sections))
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
 
-    # Fallback to database
-    if not state:
-        state = await load_run_state(run_id)
+    run_data = runs_index[run_id]
+
+    # In-memory state, or the database for evicted runs
+    state = await get_run_state(run_id)
 
     if state:
-        # Serialize task memories
+        # Serialize task memories (opt-in - per-task paging via /tasks/{task_id}/memories)
         task_memories = {}
-        raw_memories = state.get("task_memories", {})
-        logger.info(f"🔍 get_run found task_memories for: {list(raw_memories.keys())}")
-        for task_id, messages in raw_memories.items():
-            task_memories[task_id] = serialize_messages(messages)
+        if "task_memories" in sections:
+            raw_memories = state.get("task_memories", {})
+            logger.info(f"🔍 get_run found task_memories for: {list(raw_memories.keys())}")
+            for task_id, messages in raw_memories.items():
+                task_memories[task_id] = serialize_messages(messages)
 
         # Check for interrupt data - prioritize persisted data from state
         interrupt_data = None
@@ -396,25 +428,28 @@ async def get_run(request: Request, run_id: str):
             run_data["interrupt_data"] = interrupt_data
             run_data["status"] = "interrupted"
 
-        return {
-            **run_data,
-            "spec": state.get("spec", {}),
-            "strategy_status": state.get("strategy_status", "active"),
-            "tasks": [task_to_dict(t) if hasattr(t, "status") else t for t in tasks],
-            "insights": state.get("insights", []),
-            "design_log": state.get("design_log", []),
-            "guardian": state.get("guardian", {}),
-            "workspace_path": state.get("_workspace_path", run_data.get("workspace_path", "")),
-            "model_config": _serialize_orch_config(state.get("orch_config")),
-            "task_memories": task_memories,
-            "interrupt_data": interrupt_data
+        section_values = {
+            "spec": lambda: state.get("spec", {}),
+            "strategy_status": lambda: state.get("strategy_status", "active"),
+            "tasks": lambda: [task_to_dict(t) if hasattr(t, "status") else t for t in tasks],
+            "insights": lambda: state.get("insights", []),
+            "design_log": lambda: state.get("design_log", []),
+            "guardian": lambda: state.get("guardian", {}),
+            "workspace_path": lambda: state.get("_workspace_path", run_data.get("workspace_path", "")),
+            "model_config": lambda: _serialize_orch_config(state.get("orch_config")),
+            "task_memories": lambda: task_memories,
+            "interrupt_data": lambda: interrupt_data,
         }
+        # Rendered directly - skips jsonable_encoder on the (large) task lists
+        return FastJSONResponse(
+            {**run_data, **{name: section_values[name]() for name in sections}},
+            headers={"ETag": etag}
+        )
 
     # No state found - return minimal data with default config
     from config import OrchestratorConfig
     logger.warning(f"⚠️ No state found for run {run_id}")
-    return {
-        **run_data,
+    defaults = {
         "spec": {},
         "strategy_status": "unknown",
         "tasks": [],
@@ -424,25 +459,28 @@ async def get_run(request: Request, run_id: str):
         "task_memories": {},
         "model_config": _serialize_orch_config(OrchestratorConfig())  # Use default config
     }
+    return {**run_data, **{name: defaults[name] for name in sections if name in defaults}}
 
 
 @router.get("/{run_id}/tasks/{task_id}/memories")
 @limiter.limit("100/minute")
-async def get_task_memories(request: Request, run_id: str, task_id: str):
+async def get_task_memories(
+    request: Request,
+    run_id: str,
+    task_id: str,
+    offset: int = Query(default=0, ge=0, description="Index of the first message to return"),
+    limit: Optional[int] = Query(default=None, ge=1, description="Max messages to return (default: all)")
+):
     """
     Fetch LLM conversation history (task_memories) for a specific task.
     
     This endpoint allows on-demand fetching of task memories instead of
     sending all memories in every broadcast (which causes OOM crashes).
+    Long conversations can be paged with offset/limit; only the requested
+    slice is serialized.
     """
-    from run_persistence import load_run_state
-    
-    # First try in-memory state
-    state = run_states.get(run_id)
-    
-    # Fallback to database
-    if not state:
-        state = await load_run_state(run_id)
+    # In-memory state, or the database for evicted runs
+    state = await get_run_state(run_id)
     
     if not state:
         raise HTTPException(status_code=404, detail="Run not found")
@@ -453,21 +491,70 @@ async def get_task_memories(request: Request, run_id: str, task_id: str):
     task_messages = raw_memories.get(task_id, [])
     
     if not task_messages:
-        return {"task_id": task_id, "messages": []}
+        return {"task_id": task_id, "messages": [], "total": 0, "offset": offset}
     
-    # Serialize messages
-    serialized = serialize_messages(task_messages)
+    # Serialize only the requested page
+    end = len(task_messages) if limit is None else offset + limit
+    serialized = serialize_messages(task_messages[offset:end])
     
     return {
         "task_id": task_id,
         "messages": serialized,
-        "message_count": len(serialized)
+        "message_count": len(serialized),
+        "total": len(task_messages),
+        "offset": offset
     }
 
 
+@router.get("/{run_id}/tasks/{task_id}/memories/stream")
+@limiter.limit("100/minute")
+async def stream_task_memories(
+    request: Request,
+    run_id: str,
+    task_id: str,
+    offset: int = Query(default=0, ge=0, description="Index of the first message to stream"),
+    limit: Optional[int] = Query(default=None, ge=1, description="Max messages to stream (default: all)")
+):
+    """
+    Stream a task's conversation as NDJSON, one message per line.
+
+    Each line is the serialized message plus its "index" in the conversation;
+    the X-Total-Count header carries the conversation length so clients can
+    render progressively and request further ranges. Messages are serialized
+    one at a time from the in-memory list (not copied), or from the task's
+    slice of state_json when the run isn't in memory.
+    """
+    from run_persistence import load_task_memories
+
+    state = run_states.get(run_id)
+    if state is not None:
+        messages = state.get("task_memories", {}).get(task_id, [])
+    else:
+        if run_id not in runs_index and not await load_run_into_index(run_id):
+            raise HTTPException(status_code=404, detail="Run not found")
+        await wait_for_spill(run_id)
+        messages = await load_task_memories(run_id, task_id) or []
+
+    total = len(messages)
+    end = total if limit is None else min(total, offset + limit)
+
+    async def ndjson_lines():
+        for index in range(offset, end):
+            message = serialize_messages([messages[index]])[0]
+            yield dumps({"index": index, **message}) + b"\n"
+            if (index - offset) % 50 == 49:
+                await asyncio.sleep(0)  # Let other requests in between chunks
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Total-Count": str(total)}
+    )
+
+
 @router.post("/{run_id}/pause")
 async def pause_run(run_id: str):
-    if run_id not in runs_index:
+    if run_id not in runs_index and not await load_run_into_index(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
     runs_index[run_id]["status"] = "paused"
     await manager.broadcast_to_run(run_id, {"type": "state_update", "payload": {"status": "paused"}})
@@ -476,7 +563,7 @@ async def pause_run(run_id: str):
 
 @router.post("/{run_id}/resume")
 async def resume_run(run_id: str):
-    if run_id not in runs_index:
+    if run_id not in runs_index and not await load_run_into_index(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
     runs_index[run_id]["status"] = "running"
     await manager.broadcast_to_run(run_id, {"type": "state_update", "payload": {"status": "running"}})
@@ -484,7 +571,10 @@ async def resume_run(run_id: str):
 
 
 @router.post("/{run_id}/replan")
-async def replan_run(run_id: str):
+async def replan_run(
+    run_id: str,
+    fresh: bool = Query(default=False, description="Bypass the director LLM response cache")
+):
     """
     Trigger a re-planning: Pause all active tasks → LLM reorganizes → Resume with new tree.
 
@@ -494,18 +584,14 @@ async def replan_run(run_id: str):
     3. Set replan_requested flag in shared memory
     4. Restart the dispatch loop (Director will see flag and call _integrate_plans)
     """
-    if run_id not in runs_index:
+    if run_id not in runs_index and not await load_run_into_index(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
 
     try:
-        # 1. Get current state from shared memory
-        state = run_states.get(run_id)
+        # 1. Get current state from shared memory (or the database, if it was evicted)
+        state = await get_run_state(run_id)
         if not state:
-            # Try loading from DB
-            from run_persistence import load_run_state
-            state = await load_run_state(run_id)
-            if not state:
-                raise HTTPException(status_code=404, detail="Run state not found")
+            raise HTTPException(status_code=404, detail="Run state not found")
 
         # 2. Cancel running dispatch loop (this stops all active workers)
         if run_id in running_tasks:
@@ -530,8 +616,12 @@ async def replan_run(run_id: str):
         logger.info(f"🔄 Reset {reset_count} active tasks to PLANNED for reorg")
 
         # 4. Set replan_requested flag in shared memory (Director will see this)
+        # A state reloaded from the database lacks _wt_manager/paths/config - recreate them first
+        await rehydrate_run_state(run_id, state)
         state["replan_requested"] = True
+        state["bypass_llm_cache"] = fresh
         run_states[run_id] = state
+        bump_run_version(run_id)
 
         # 5. Restart dispatch loop with updated state
         run_config = {
@@ -593,7 +683,7 @@ async def cancel_run(run_id: str):
     logger.info(f"   running_tasks keys: {list(running_tasks.keys())}")
     logger.info(f"   active_task_queues keys: {list(active_task_queues.keys())}")
 
-    if run_id not in runs_index:
+    if run_id not in runs_index and not await load_run_into_index(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
 
     # Mark as cancelled FIRST so any still-running code sees it immediately
@@ -671,18 +761,13 @@ async def cancel_run(run_id: str):
 
 
 @router.post("/{run_id}/restart")
-async def restart_run(run_id: str):
+async def restart_run(
+    run_id: str,
+    fresh: bool = Query(default=False, description="Bypass the director LLM response cache")
+):
     """Restart a stopped/crashed/cancelled run from its last state."""
-    from run_persistence import load_run_state
-
-    state = None
-
-    # Try in-memory first
-    if run_id in run_states:
-        state = run_states[run_id]
-    else:
-        # Try database
-        state = await load_run_state(run_id)
+    # Try in-memory first, then the database
+    state = await get_run_state(run_id)
 
     if not state:
         if run_id not in runs_index:
@@ -694,58 +779,14 @@ async def restart_run(run_id: str):
         return {"status": "already_running", "message": "Run is already active"}
 
 
-    # Get workspace and thread info from state
-    workspace_path = state.get("_workspace_path", "")
     thread_id = runs_index.get(run_id, {}).get("thread_id", f"thread_{run_id}")
 
-    # CRITICAL: Reinitialize _wt_manager after loading from DB
-    # The _wt_manager object is not serializable, so we must recreate it
+    # CRITICAL: Recreate _wt_manager, paths and config after loading from DB
     # WITHOUT THIS, workers fall back to main workspace and files leak!
-    workspace_path = state.get("_workspace_path", "")
-    worktree_base_path = state.get("_worktree_base_path")  # Path outside workspace
-    logs_base_path = state.get("_logs_base_path")  # Path outside workspace
-    
-    # Get or create config for path generation
-    from config import OrchestratorConfig
-    config = state.get("orch_config") or OrchestratorConfig()
-    
-    if workspace_path and worktree_base_path:
-        workspace_path_obj = Path(workspace_path)
-        worktree_base = Path(worktree_base_path)
-        worktree_base.mkdir(parents=True, exist_ok=True)
-        wt_manager = WorktreeManager(
-            repo_path=workspace_path_obj,
-            worktree_base=worktree_base
-        )
-        state["_wt_manager"] = wt_manager
-        logger.info(f"   Restored _wt_manager at: {worktree_base}")
-        
-        # CRITICAL: Recover existing worktrees from disk
-        # This re-registers worktrees that were created before the restart
-        tasks = state.get("tasks", [])
-        task_ids = [t.get("id") for t in tasks if t.get("id")]
-        recovered = await wt_manager.recover_worktrees(task_ids)
-        logger.info(f"   Recovered {recovered} worktrees from disk")
-    elif workspace_path:
-        # OLD RUN: Generate NEW paths using config (outside workspace!)
-        workspace_path_obj = Path(workspace_path)
-        worktree_base = config.get_worktree_base(run_id)
-        worktree_base.mkdir(parents=True, exist_ok=True)
-        state["_wt_manager"] = WorktreeManager(
-            repo_path=workspace_path_obj,
-            worktree_base=worktree_base
-        )
-        # Update state with new paths for future restarts
-        state["_worktree_base_path"] = str(worktree_base)
-        logger.info(f"   Generated new worktree path for old run: {worktree_base}")
-    else:
-        logger.warning(f"   ⚠️ _workspace_path not found - workers will use fallback!")
-    
-    # Also fix logs path for old runs
-    if workspace_path and not logs_base_path:
-        logs_base_path = str(config.get_llm_logs_path(run_id))
-        state["_logs_base_path"] = logs_base_path
-        logger.info(f"   Generated new logs path for old run: {logs_base_path}")
+    config = await rehydrate_run_state(run_id, state)
+
+    # Force fresh director plans if requested (cache is still refreshed)
+    state["bypass_llm_cache"] = fresh
 
     # Rebuild run_config
     run_config = {
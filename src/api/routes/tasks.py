@@ -12,7 +12,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 # Import API modules
-from api.state import runs_index, run_states, manager, get_orchestrator_graph
+from api.state import (
+    runs_index, manager, get_orchestrator_graph, bump_run_version, get_run_state, load_run_into_index
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,10 +45,11 @@ async def update_task_dependencies(run_id: str, task_id: str, body: DependencyUp
     - Add dependency: {"add_dependency": "other_task_id"}
     - Remove dependency: {"remove_dependency": "other_task_id"}
     """
-    if run_id not in runs_index:
+    # Idle runs may have been evicted from memory - reload them (and keep them, they are modified below)
+    if run_id not in runs_index and not await load_run_into_index(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
     
-    state = run_states.get(run_id)
+    state = await get_run_state(run_id, keep=True)
     if not state:
         raise HTTPException(status_code=404, detail="Run state not found")
     
@@ -80,6 +83,7 @@ async def update_task_dependencies(run_id: str, task_id: str, body: DependencyUp
                 logger.info(f"Removed dependency: {task_id} no longer depends on {body.remove_dependency}")
         
         task["updated_at"] = datetime.now().isoformat()
+        bump_run_version(run_id)
         
         # Broadcast state update via WebSocket (no replan needed)
         if manager:
@@ -108,7 +112,7 @@ async def update_task_dependencies(run_id: str, task_id: str, body: DependencyUp
 @router.delete("/{task_id}")
 async def delete_task(run_id: str, task_id: str):
     """Mark a task as ABANDONED and trigger replan."""
-    if run_id not in runs_index:
+    if run_id not in runs_index and not await load_run_into_index(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
 
     try:
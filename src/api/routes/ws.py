@@ -7,7 +7,7 @@ WebSocket endpoints for real-time communication.
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from api.state import manager, runs_index
+from api.state import manager, runs_index, run_states, load_run_into_index
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +21,14 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_json()
+            run_id = data.get("run_id")
+            if data.get("type") in ("subscribe", "resync") and run_id and run_id not in runs_index:
+                await load_run_into_index(run_id)  # Not in memory (evicted, or never loaded)
             if data.get("type") == "subscribe":
-                await manager.subscribe(websocket, data.get("run_id"), runs_index)
+                await manager.subscribe(websocket, data.get("run_id"), runs_index, run_states)
+            elif data.get("type") == "resync":
+                # Client saw a gap in the patch sequence - resend the full state
+                await manager.send_snapshot(websocket, data.get("run_id"), runs_index, run_states)
             elif data.get("type") == "unsubscribe":
                 await manager.unsubscribe(websocket, data.get("run_id"))
     except WebSocketDisconnect:
@@ -4,21 +4,230 @@ API State Management
 Centralized state management for the orchestrator API server.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
+import os
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, Set
 from langgraph_definition import create_orchestrator
+from metrics import dispatch_metrics
+from serialization import dumps
 
 logger = logging.getLogger(__name__)
 
+# Finished runs are persisted, so only this many are kept in memory (live runs are never evicted)
+MAX_CACHED_RUNS = int(os.getenv("MAX_CACHED_RUNS", "200"))
+MAX_CACHED_RUN_STATES = int(os.getenv("MAX_CACHED_RUN_STATES", "20"))
+MAX_RUN_STATE_BYTES = int(os.getenv("MAX_RUN_STATE_MB", "512")) * 1024 * 1024
+TERMINAL_RUN_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class BoundedRunCache(dict):
+    """
+    Dict of run_id -> data that evicts least recently used inactive runs.
+
+    Storing or reading a run (item access or get) makes it most recent;
+    membership tests, iteration and peek do not. When the cache exceeds
+    max_entries, or max_bytes as measured by size_of, the oldest entries
+    accepted by is_evictable are dropped and passed to on_evict; runs that
+    are still live are kept even if that leaves the cache over the bound.
+    Evicted runs are reloaded from run_persistence on demand.
+
+    Sizes are measured when a new object is stored. Writing back the same
+    (mutated) object only marks it for re-measuring, which happens at most
+    every size_refresh_s, so hot write-backs don't re-encode the state.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        is_evictable: Callable[[str, Any], bool],
+        max_bytes: Optional[int] = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        size_refresh_s: float = 5.0
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.is_evictable = is_evictable
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.on_evict = on_evict
+        self.size_refresh_s = size_refresh_s
+        self.sizes: Dict[str, int] = {}  # run_id -> estimated resident bytes (when size_of is set)
+        self._stale: Set[str] = set()  # Written back since last measured
+        self._next_measure = 0.0
+        self.evictions = 0
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(self.sizes.values())
+
+    def __setitem__(self, run_id: str, value: Any):
+        same_object = super().get(run_id) is value
+        if run_id in self:
+            super().__delitem__(run_id)
+        super().__setitem__(run_id, value)
+        if self.size_of is not None:
+            self._stale.add(run_id)
+            if not same_object or time.monotonic() >= self._next_measure:
+                self._measure()
+        if self._over_budget():
+            self._evict()
+
+    def __getitem__(self, run_id: str):
+        value = super().pop(run_id)  # KeyError for missing runs, as dict
+        super().__setitem__(run_id, value)
+        return value
+
+    def get(self, run_id: str, default: Any = None):
+        if run_id not in self:
+            return default
+        return self[run_id]
+
+    def peek(self, run_id: str, default: Any = None):
+        """Look up a run without refreshing its recency."""
+        return super().get(run_id, default)
+
+    def __delitem__(self, run_id: str):
+        super().__delitem__(run_id)
+        self._forget(run_id)
+
+    def pop(self, run_id: str, *default):
+        value = super().pop(run_id, *default)
+        self._forget(run_id)
+        return value
+
+    def _measure(self):
+        """Re-measure the runs stored or written back since the last measurement."""
+        for run_id in self._stale:
+            if run_id in self:
+                self.sizes[run_id] = self.size_of(self.peek(run_id))
+                dispatch_metrics.run_state_resident_bytes.labels(run_id=run_id).set(self.sizes[run_id])
+        self._stale.clear()
+        self._next_measure = time.monotonic() + self.size_refresh_s
+
+    def _forget(self, run_id: str):
+        self._stale.discard(run_id)
+        if self.sizes.pop(run_id, None) is not None:
+            try:
+                dispatch_metrics.run_state_resident_bytes.remove(run_id)
+            except KeyError:
+                pass
+
+    def _over_budget(self) -> bool:
+        return len(self) > self.max_entries or (self.max_bytes is not None and self.resident_bytes > self.max_bytes)
+
+    def _evict(self):
+        for run_id, value in [(r, v) for r, v in self.items() if self.is_evictable(r, v)]:
+            if not self._over_budget():
+                break
+            del self[run_id]
+            self.evictions += 1
+            logger.debug(f"Evicted run {run_id} from memory")
+            if self.on_evict is not None:
+                self.on_evict(run_id, value)
+
+
+def _has_live_dispatch(run_id: str) -> bool:
+    task = running_tasks.get(run_id)
+    return task is not None and not task.done()
+
+
+def _is_finished(run_id: str) -> bool:
+    """No dispatch loop running and a terminal status (runs no longer indexed count as finished)."""
+    if _has_live_dispatch(run_id):
+        return False
+    return runs_index.peek(run_id, {}).get("status", "completed") in TERMINAL_RUN_STATUSES
+
+
+def estimate_state_bytes(state: Dict[str, Any]) -> int:
+    """
+    Approximate resident size of a run state.
+
+    task_memories dominate and hold LangChain message objects, so they are
+    measured from message content; everything else by its encoded size.
+    """
+    total = 0
+    for key, value in state.items():
+        if key == "task_memories" and isinstance(value, dict):
+            for messages in value.values():
+                for message in messages or []:
+                    content = message.get("content", "") if isinstance(message, dict) else getattr(message, "content", "")
+                    tool_calls = message.get("tool_calls") if isinstance(message, dict) else getattr(message, "tool_calls", None)
+                    total += 200 + len(content if isinstance(content, str) else str(content))
+                    total += len(str(tool_calls)) if tool_calls else 0
+        elif not key.startswith("_") and key != "orch_config":
+            try:
+                total += len(dumps(value))
+            except (TypeError, ValueError):
+                pass
+    return total
+
+
+# run_id -> save of a spilled run still in flight (reloads wait for it, or they read stale state)
+_pending_spills: Dict[str, asyncio.Task] = {}
+
+
+def _spill_run_state(run_id: str, state: Dict[str, Any]):
+    """Persist an evicted run that isn't finished (paused, interrupted, idle) so it reloads intact."""
+    if runs_index.get(run_id, {}).get("status", "completed") in TERMINAL_RUN_STATUSES:
+        return  # Saved by the dispatch loop when it finished
+    from run_persistence import save_run_state
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning(f"Evicted run {run_id} without an event loop - not spilled")
+        return
+    status = runs_index.get(run_id, {}).get("status", "running")
+    logger.info(f"💾 Spilling idle run {run_id} to the database")
+    save = loop.create_task(save_run_state(run_id, state, status=status))
+    _pending_spills[run_id] = save
+
+    def _done(task: asyncio.Task):
+        if _pending_spills.get(run_id) is task:
+            del _pending_spills[run_id]
+
+    save.add_done_callback(_done)
+
+
+async def wait_for_spill(run_id: str):
+    """Wait until a spilled run's state has reached the database."""
+    save = _pending_spills.get(run_id)
+    if save is None:
+        return
+    try:
+        await asyncio.shield(save)  # A cancelled reader must not cancel the save
+    except Exception as e:
+        logger.warning(f"Spilling run {run_id} failed: {e}")
+
+
 # In-memory storage for runs (in a real app, this would be a DB)
 # We use the LangGraph checkpointing for the actual state, but we need an index
-runs_index: Dict[str, Dict[str, Any]] = {}
+runs_index: Dict[str, Dict[str, Any]] = BoundedRunCache(
+    MAX_CACHED_RUNS, lambda run_id, data: _is_finished(run_id)
+)
 
 # Track running background tasks for cancellation
 running_tasks: Dict[str, Any] = {}  # run_id -> asyncio.Task
 
 # Store full run states for restart capability
-run_states: Dict[str, Dict[str, Any]] = {}  # run_id -> full state dict
+# Size-accounted: runs without a live dispatch loop are spilled to the database
+# beyond MAX_CACHED_RUN_STATES / MAX_RUN_STATE_MB and reloaded on demand
+run_states: Dict[str, Dict[str, Any]] = BoundedRunCache(  # run_id -> full state dict
+    MAX_CACHED_RUN_STATES,
+    lambda run_id, state: not _has_live_dispatch(run_id),
+    max_bytes=MAX_RUN_STATE_BYTES,
+    size_of=estimate_state_bytes,
+    on_evict=_spill_run_state
+)
+
+# Run state version counters - bumped whenever a run's state changes (ETags for GET /runs/{id})
+run_versions: Dict[str, int] = {}
+_instance_id = uuid.uuid4().hex[:8]  # Counters restart with the process, so ETags include the instance
 
 # Global checkpointer (initialized at startup)
 global_checkpointer = None
@@ -32,6 +241,92 @@ active_task_queues: Dict[str, Any] = {}
 
 
 
+def bump_run_version(run_id: str) -> int:
+    """Record that a run's state changed; returns the new version."""
+    run_versions[run_id] = run_versions.get(run_id, 0) + 1
+    return run_versions[run_id]
+
+
+def run_state_etag(run_id: str, variant: str = "") -> str:
+    """Weak ETag for a run's current state version, status and response variant (query params)."""
+    status = runs_index.get(run_id, {}).get("status", "")
+    return f'W/"{_instance_id}-{run_versions.get(run_id, 0)}-{status}-{zlib.crc32(variant.encode()):08x}"'
+
+
+async def load_run_into_index(run_id: str) -> Optional[Dict[str, Any]]:
+    """Single-row lookup of a run missing from runs_index; caches and returns its summary."""
+    from run_persistence import load_run_summary
+
+    summary = await load_run_summary(run_id)
+    if summary:
+        runs_index[run_id] = summary
+    return summary
+
+
+async def get_run_state(run_id: str, keep: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Full state of a run: from run_states, or reloaded from the database if it was evicted.
+
+    Args:
+        run_id: Run to look up
+        keep: Put a reloaded state back into run_states (callers that modify it)
+    """
+    state = run_states.get(run_id)
+    if state:
+        return state
+    from run_persistence import load_run_state
+
+    await wait_for_spill(run_id)
+    state = await load_run_state(run_id)
+    if state and keep:
+        run_states[run_id] = state
+    return state
+
+
+async def rehydrate_run_state(run_id: str, state: Dict[str, Any]):
+    """
+    Recreate the runtime-only fields save_run_state drops, before a dispatch loop runs the state.
+
+    Restores orch_config, the worktree manager (re-registering worktrees
+    already on disk) and the worktree/LLM log paths. Fields that are still
+    present (a state that never left memory) are kept.
+
+    Returns:
+        The run's OrchestratorConfig
+    """
+    from config import OrchestratorConfig
+    from git_manager import AsyncWorktreeManager as WorktreeManager
+
+    config = state.get("orch_config") or OrchestratorConfig()
+    state["orch_config"] = config
+    workspace_path = state.get("_workspace_path")
+
+    if not workspace_path:
+        logger.warning(f"   ⚠️ _workspace_path not found for run {run_id} - workers will use fallback!")
+    elif state.get("_wt_manager") is None:
+        worktree_base_path = state.get("_worktree_base_path")  # Path outside workspace
+        if worktree_base_path:
+            worktree_base = Path(worktree_base_path)
+        else:
+            # Old run, or reloaded from the database: generate the path from config (outside workspace!)
+            worktree_base = config.get_worktree_base(run_id)
+            state["_worktree_base_path"] = str(worktree_base)
+        worktree_base.mkdir(parents=True, exist_ok=True)
+        wt_manager = WorktreeManager(repo_path=Path(workspace_path), worktree_base=worktree_base)
+        state["_wt_manager"] = wt_manager
+        logger.info(f"   Restored _wt_manager at: {worktree_base}")
+
+        # Re-register worktrees created before the state was reloaded
+        task_ids = [t.get("id") for t in state.get("tasks", []) if t.get("id")]
+        recovered = await wt_manager.recover_worktrees(task_ids)
+        logger.info(f"   Recovered {recovered} worktrees from disk")
+
+    if workspace_path and not state.get("_logs_base_path"):
+        state["_logs_base_path"] = str(config.get_llm_logs_path(run_id))
+        logger.info(f"   Generated logs path: {state['_logs_base_path']}")
+    return config
+
+
 def get_orchestrator_graph():
     """Get the orchestrator graph. Checkpointer is initialized at startup."""
     if global_checkpointer is None:
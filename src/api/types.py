@@ -28,6 +28,7 @@ class RunSummary(BaseModel):
     task_counts: Dict[str, int]
     tags: List[str]
     workspace_path: Optional[str] = None
+    active_slots: int = 0  # Worker pool slots held by the run
 
 
 class HumanResolution(BaseModel):
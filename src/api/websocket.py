@@ -2,22 +2,177 @@
 WebSocket Connection Manager
 =============================
 Manages WebSocket connections and broadcasting for the orchestrator dashboard.
+
+Task state is sent as versioned patches: each run has a sequence number,
+and every broadcast carries only the task fields that changed since the
+previous one ("task_patch"). A full snapshot ("state_update" with
+snapshot=True) is sent on subscribe, or when a client reports a gap in
+the sequence ("resync").
+
+Sends never block the caller: each connection has a bounded outbound queue
+drained by its own sender task. Messages are serialized once and the same
+pre-encoded bytes are queued for every recipient (binary frames). A full
+queue drops its oldest task state message (a dropped patch shows up as a
+sequence gap and the client resyncs); other events (interrupts, status,
+logs) are never dropped - if nothing droppable is queued, the client is
+evicted instead. A newer snapshot replaces queued state for the same run.
+A socket whose send fails or stalls, or whose queue overflows, is evicted
+and closed (code 1011), so the client reconnects and resyncs.
 """
 
+import asyncio
+import copy
 import logging
-from typing import List, Dict
+from collections import deque
+from typing import Any, Callable, Deque, List, Dict, Optional, Set, Tuple
 from datetime import datetime
 from fastapi import WebSocket
 
+from metrics import dispatch_metrics
+from orchestrator_types import task_to_dict
+from serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 
+def _copy_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a task dict so in-place edits at any depth don't leak into the shadow."""
+    return copy.deepcopy(task)
+
+
+def diff_tasks(
+    previous: Dict[str, Dict[str, Any]],
+    tasks: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Compute task patches between the last broadcast and the current task list.
+
+    Args:
+        previous: task_id -> task dict as last broadcast
+        tasks: Current task dicts
+
+    Returns:
+        (patches, removed_ids) - new tasks are sent whole, changed tasks as
+        {"id", <changed fields>}, removed tasks by id
+    """
+    patches = []
+    current_ids = set()
+    for task in tasks:
+        task_id = task.get("id")
+        current_ids.add(task_id)
+        old = previous.get(task_id)
+        if old is None:
+            patches.append(task)
+            continue
+        changed = {k: v for k, v in task.items() if old.get(k) != v}
+        changed.update({k: None for k in old if k not in task})
+        if changed:
+            changed["id"] = task_id
+            patches.append(changed)
+    removed = [task_id for task_id in previous if task_id not in current_ids]
+    return patches, removed
+
+
+# Queue kinds carrying run task state - superseded by a newer snapshot of the same run.
+# Snapshots are queued as "snapshot"; other state_update messages (e.g. a status-only
+# update from pause/resume) don't replace queued patches.
+STATE_MESSAGE_TYPES = ("snapshot", "state_update", "task_patch")
+
+
+def encode_message(message: dict) -> bytes:
+    """Serialize a message once for all recipients."""
+    return dumps(message)
+
+
+class ConnectionSender:
+    """Bounded outbound queue for one WebSocket, drained by a dedicated sender task."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_error: Callable[[WebSocket, Exception], None],
+        max_queue: int = 200,
+        send_timeout: float = 10.0
+    ):
+        self.websocket = websocket
+        self.on_error = on_error
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.queue: Deque[Tuple[Optional[str], str, bytes]] = deque()  # (run_id, type, frame)
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, run_id: Optional[str], message_type: str, frame: bytes):
+        """Queue a pre-encoded message without waiting for the socket."""
+        if message_type == "snapshot" and run_id is not None:
+            # A snapshot supersedes any state for the same run still waiting to be sent
+            kept = deque(item for item in self.queue if not (item[0] == run_id and item[1] in STATE_MESSAGE_TYPES))
+            if len(kept) != len(self.queue):
+                dispatch_metrics.ws_messages_dropped.labels(reason="coalesced").inc(len(self.queue) - len(kept))
+                self.queue = kept
+
+        if len(self.queue) >= self.max_queue:
+            # Only task state heals itself (resync on the sequence gap) - drop the oldest of that
+            oldest_state = next((i for i, item in enumerate(self.queue) if item[1] in STATE_MESSAGE_TYPES), None)
+            if oldest_state is None:
+                self._overflow()
+                return
+            del self.queue[oldest_state]
+            dispatch_metrics.ws_messages_dropped.labels(reason="overflow").inc()
+
+        self.queue.append((run_id, message_type, frame))
+        self.idle.clear()
+        self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            if not self.queue:
+                self.idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            _, _, frame = self.queue.popleft()
+            try:
+                await asyncio.wait_for(self.websocket.send_bytes(frame), timeout=self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.queue.clear()
+                self.idle.set()
+                self.on_error(self.websocket, e)
+                return
+
+    def _overflow(self):
+        """The queue is full of events no resync restores: give up on the client rather than lose them."""
+        self.close()
+        self.on_error(self.websocket, OverflowError(f"outbound queue full ({self.max_queue} undroppable events)"))
+
+    def close(self):
+        """Stop the sender task (pending messages are discarded)."""
+        self.queue.clear()
+        self.idle.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+
 class ConnectionManager:
     """Manages WebSocket connections and message broadcasting."""
 
-    def __init__(self):
+    def __init__(self, max_queue: int = 200, send_timeout: float = 10.0, close_timeout: float = 2.0):
         self.active_connections: List[WebSocket] = []
+        self.senders: Dict[WebSocket, ConnectionSender] = {}
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.close_timeout = close_timeout
+        self._closing: Set[asyncio.Task] = set()  # Close handshakes of evicted sockets
         self.subscriptions: Dict[str, List[WebSocket]] = {}  # run_id -> [websockets]
+        # Versioned task state per run - only kept while the run has subscribers
+        self.run_seq: Dict[str, int] = {}  # run_id -> last sequence number sent
+        self.run_shadows: Dict[str, Dict[str, Any]] = {}  # run_id -> {"tasks": {id: dict}, "status", "task_counts"}
 
     async def connect(self, websocket: WebSocket):
         """Accept a new WebSocket connection."""
@@ -25,10 +180,43 @@ class ConnectionManager:
         self.active_connections.append(websocket)
         logger.info(f"WebSocket connected. Total active: {len(self.active_connections)}")
 
+    def _sender(self, websocket: WebSocket) -> ConnectionSender:
+        sender = self.senders.get(websocket)
+        if sender is None:
+            sender = ConnectionSender(websocket, self._evict, self.max_queue, self.send_timeout)
+            self.senders[websocket] = sender
+        return sender
+
+    def _evict(self, websocket: WebSocket, error: Exception):
+        """Drop a socket whose send failed or stalled, and close it so the client reconnects and resyncs."""
+        logger.warning(f"Evicting WebSocket after failed send: {error!r}")
+        dispatch_metrics.ws_connections_evicted.inc()
+        self.disconnect(websocket)
+        try:
+            closing = asyncio.get_running_loop().create_task(self._close_evicted(websocket))
+        except RuntimeError:
+            return
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+
+    async def _close_evicted(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=1011), timeout=self.close_timeout)
+        except Exception as e:
+            # Already closed, or the peer is gone - nothing left to tell it
+            logger.debug(f"Closing evicted WebSocket failed: {e!r}")
+
+    async def flush(self):
+        """Wait until every outbound queue has been sent."""
+        await asyncio.gather(*(sender.idle.wait() for sender in list(self.senders.values())))
+
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        sender = self.senders.pop(websocket, None)
+        if sender is not None:
+            sender.close()
 
         # Remove from subscriptions
         for run_id in list(self.subscriptions.keys()):
@@ -36,10 +224,11 @@ class ConnectionManager:
                 self.subscriptions[run_id].remove(websocket)
                 if not self.subscriptions[run_id]:
                     del self.subscriptions[run_id]
+                    self.run_shadows.pop(run_id, None)
         logger.info(f"WebSocket disconnected. Total active: {len(self.active_connections)}")
 
-    async def subscribe(self, websocket: WebSocket, run_id: str, runs_index: Dict):
-        """Subscribe a WebSocket to updates for a specific run."""
+    async def subscribe(self, websocket: WebSocket, run_id: str, runs_index: Dict, run_states: Optional[Dict] = None):
+        """Subscribe a WebSocket to updates for a specific run and send the initial snapshot."""
         if run_id not in self.subscriptions:
             self.subscriptions[run_id] = []
         if websocket not in self.subscriptions[run_id]:
@@ -47,21 +236,7 @@ class ConnectionManager:
             logger.info(f"Subscribed to {run_id}. Total subscribers: {len(self.subscriptions[run_id])}")
 
             # IMMEDIATELY send current state so client doesn't have to wait for next task update
-            if run_id in runs_index:
-                run_data = runs_index[run_id]
-                try:
-                    await websocket.send_json({
-                        "type": "state_update",
-                        "run_id": run_id,
-                        "timestamp": datetime.now().isoformat(),
-                        "payload": {
-                            "status": run_data.get("status", "running"),
-                            "task_counts": run_data.get("task_counts", {}),
-                            "objective": run_data.get("objective", ""),
-                        }
-                    })
-                except Exception as e:
-                    logger.error(f"Error sending initial state: {e}")
+            await self.send_snapshot(websocket, run_id, runs_index, run_states)
 
     async def unsubscribe(self, websocket: WebSocket, run_id: str):
         """Unsubscribe a WebSocket from updates for a specific run."""
@@ -69,31 +244,129 @@ class ConnectionManager:
             self.subscriptions[run_id].remove(websocket)
             if not self.subscriptions[run_id]:
                 del self.subscriptions[run_id]
+                self.run_shadows.pop(run_id, None)
             logger.info(f"Unsubscribed from {run_id}")
 
+    async def send_snapshot(self, websocket: WebSocket, run_id: str, runs_index: Dict, run_states: Optional[Dict] = None):
+        """Send the full versioned task state of a run to one client (subscribe or resync)."""
+        run_data = runs_index.get(run_id)
+        state = (run_states or {}).get(run_id)
+        if not run_data and not state:
+            return
+
+        try:
+            if state is not None:
+                # Bring the shadow up to date first: other subscribers get the patch,
+                # so everyone continues from the same sequence number
+                await self.broadcast_state(
+                    run_id, state.get("tasks", []),
+                    status=(run_data or {}).get("status", "running"),
+                    task_counts=(run_data or {}).get("task_counts", {}),
+                    exclude=websocket
+                )
+                shadow = self.run_shadows[run_id]
+                payload = {
+                    "seq": self.run_seq[run_id],
+                    "snapshot": True,
+                    "tasks": list(shadow["tasks"].values()),
+                    "status": shadow["status"],
+                    "task_counts": shadow["task_counts"],
+                }
+            else:
+                # Run not loaded in memory - summary only (client fetches details via REST)
+                payload = {
+                    "seq": self.run_seq.get(run_id, 0),
+                    "snapshot": True,
+                    "status": run_data.get("status", "running"),
+                    "task_counts": run_data.get("task_counts", {}),
+                }
+            if run_data:
+                payload["objective"] = run_data.get("objective", "")
+
+            message = {
+                "type": "state_update",
+                "run_id": run_id,
+                "timestamp": datetime.now().isoformat(),
+                "payload": payload
+            }
+            self._sender(websocket).enqueue(run_id, "snapshot", encode_message(message))
+        except Exception as e:
+            logger.error(f"Error sending initial state: {e}")
+
+    async def broadcast_state(
+        self,
+        run_id: str,
+        tasks: List[Any],
+        status: str = "running",
+        task_counts: Optional[Dict[str, Any]] = None,
+        exclude: Optional[WebSocket] = None
+    ):
+        """
+        Broadcast the changes since the last broadcast as a versioned task patch.
+
+        Nothing is computed for runs without subscribers, and nothing is sent
+        when nothing changed. Without a previous broadcast, the current state
+        becomes the baseline (the subscriber receives it as a snapshot).
+        Task objects are serialized with task_to_dict; dicts are used as-is.
+        """
+        if not self.subscriptions.get(run_id):
+            return
+        tasks = [task_to_dict(t) if hasattr(t, "status") else t for t in tasks]
+
+        task_counts = task_counts or {}
+        shadow = self.run_shadows.get(run_id)
+        if shadow is None:
+            self.run_seq[run_id] = self.run_seq.get(run_id, 0) + 1
+            self.run_shadows[run_id] = {
+                "tasks": {t.get("id"): _copy_task(t) for t in tasks},
+                "status": status,
+                "task_counts": dict(task_counts),
+            }
+            return
+
+        patches, removed = diff_tasks(shadow["tasks"], tasks)
+        payload: Dict[str, Any] = {}
+        if patches:
+            payload["tasks"] = patches
+        if removed:
+            payload["removed"] = removed
+        if status != shadow["status"]:
+            payload["status"] = status
+        if task_counts != shadow["task_counts"]:
+            payload["task_counts"] = dict(task_counts)
+        if not payload:
+            return
+
+        self.run_seq[run_id] = self.run_seq.get(run_id, 0) + 1
+        payload["seq"] = self.run_seq[run_id]
+        shadow["tasks"] = {t.get("id"): _copy_task(t) for t in tasks}
+        shadow["status"] = status
+        shadow["task_counts"] = dict(task_counts)
+
+        message = {"type": "task_patch", "payload": payload}
+        await self.broadcast_to_run(run_id, message, exclude=exclude)
+
     async def broadcast(self, message: dict):
-        """Broadcast a message to all connected WebSocket clients."""
+        """Queue a message for all connected WebSocket clients."""
         # Inject timestamp if missing
         if "timestamp" not in message:
             message["timestamp"] = datetime.now().isoformat()
 
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting message: {e}")
+        frame = encode_message(message)
+        for connection in list(self.active_connections):
+            self._sender(connection).enqueue(message.get("run_id"), message.get("type", ""), frame)
 
-    async def broadcast_to_run(self, run_id: str, message: dict):
-        """Broadcast a message to all WebSocket clients subscribed to a specific run."""
+    async def broadcast_to_run(self, run_id: str, message: dict, exclude: Optional[WebSocket] = None):
+        """Queue a message for all WebSocket clients subscribed to a specific run."""
         # Inject run_id and timestamp if missing
         if "run_id" not in message:
             message["run_id"] = run_id
         if "timestamp" not in message:
             message["timestamp"] = datetime.now().isoformat()
 
-        if run_id in self.subscriptions:
-            for connection in self.subscriptions[run_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to run {run_id}: {e}")
+        connections = [c for c in self.subscriptions.get(run_id, []) if c is not exclude]
+        if not connections:
+            return
+        frame = encode_message(message)
+        for connection in connections:
+            self._sender(connection).enqueue(run_id, message.get("type", ""), frame)
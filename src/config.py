@@ -10,6 +10,15 @@ from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 
+# Default context-compaction token budgets per message role
+# (estimated tokens, chars // 4 - same estimate as llm_logger)
+COMPACTION_ROLE_BUDGETS: Dict[str, int] = {
+    "tool": 12000,
+    "ai": 6000,
+    "human": 2000,
+}
+
+
 @dataclass
 class ModelConfig:
     """LLM model configuration."""
@@ -97,7 +106,7 @@ class OrchestratorConfig:
     webhook_config: WebhookConfig = field(default_factory=WebhookConfig)
     
     # Execution limits
-    max_concurrent_workers: int = 5  # Limit parallel LLM calls for rate limits
+    max_concurrent_workers: int = 5  # Limit parallel LLM calls for rate limits (max worker pool slots)
     max_iterations_per_task: int = 10
     max_total_iterations: int = 100
     
@@ -114,13 +123,52 @@ class OrchestratorConfig:
     # Guardian settings (when enable_guardian=True)
     guardian_check_interval: int = 10  # Check every N tool calls
     guardian_context_window: int = 20  # Send last N messages to guardian
+    guardian_background: bool = True  # Run checks concurrently; nudges land at the next chunk boundary
+    guardian_deadline_seconds: float = 60.0  # Background checks older than this are dropped
     guardian_model: ModelConfig = field(default_factory=lambda: ModelConfig(
         provider="anthropic",
         model_name="claude-3-5-haiku-20241022",  # Fast and cheap for monitoring
         temperature=0.3,
         max_tokens=1024
     ))
-    
+
+    # Context compaction (between ReAct chunks)
+    # Stale tool outputs are replaced with digests so prompt size stays flat on long tasks
+    enable_context_compaction: bool = True
+    compaction_interval: int = 10  # Compact every N tool calls (when guardian is off)
+    compaction_keep_recent: int = 10  # Trailing messages always sent verbatim
+    compaction_role_budgets: Dict[str, int] = field(default_factory=lambda: dict(COMPACTION_ROLE_BUDGETS))
+
+    # Director LLM response cache (opt-in)
+    # Reuses spec/decomposition/integration/dependency responses for identical prompts
+    enable_llm_cache: bool = False
+    llm_cache_path: Optional[str] = None  # SQLite file; defaults to llm_cache.db next to orchestrator.db
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600  # Entries older than this are refetched
+    llm_cache_max_entries: int = 500  # LRU eviction beyond this many entries
+    llm_cache_bypass: bool = False  # Force fresh responses (still refreshes cache)
+
+    # Dependency query pre-filter (BM25 before the LLM resolution call)
+    enable_dependency_prefilter: bool = True
+    dependency_prefilter_min_coverage: float = 0.6  # Share of query terms the best match must contain
+    dependency_prefilter_margin: float = 1.5  # Best score must beat runner-up by this ratio
+    dependency_prefilter_candidates: int = 5  # Candidates per ambiguous query sent to the LLM
+
+    # Plan integration
+    enable_incremental_integration: bool = True  # Integrate each planner's plan as it completes
+    integration_context_tasks: int = 40  # Max existing tasks (compact summaries) in the integration prompt
+
+    # Worker pool scheduling (slots shared by all runs, see WORKER_POOL_SLOTS)
+    scheduler_priority: str = "normal"  # "high", "normal" or "low" - higher classes are filled first
+    scheduler_weight: float = 1.0  # Relative share of pool slots within the priority class
+    min_worker_slots: int = 0  # Slots reserved for this run whenever it has ready tasks
+
+    # Distributed workers (tasks are leased from the run database by remote_worker.py processes)
+    distributed_workers: bool = False  # Enqueue task envelopes instead of running workers in-process
+    worker_max_attempts: int = 3  # Leases per envelope before it fails (keep in sync with remote_worker --max-attempts)
+
+    # Dashboard broadcasts
+    broadcast_interval_ms: int = 250  # Min interval between state broadcasts per run (0 = every update)
+
     # Checkpointing
     checkpoint_dir: str = "./checkpoints"
     checkpoint_mode: str = "mysql"  # "sqlite", "postgres", "mysql", or "memory"
@@ -0,0 +1,320 @@
+"""
+Dependency Install Cache
+========================
+Shared, content-addressed caches for workspace setup and agent installs.
+
+Every run used to create its workspace .venv from scratch (python -m venv,
+pip install requests, pip install nodeenv, nodeenv -p), and agents then
+downloaded the same pip and npm packages again in every run. Now:
+
+- pip and npm use shared cache directories (PIP_CACHE_DIR holds pip's HTTP
+  and built-wheel caches, npm_config_cache the npm tarballs), both for
+  setup and for the agents' run_shell/run_python calls (cache_env)
+- the fully set-up venv is kept as a template keyed by a hash of the base
+  interpreter, the package list and the Node.js flag. Later runs clone the
+  template: files are hard-linked, and the few scripts that embed the venv
+  path (shebangs, activate, pyvenv.cfg) are rewritten. This takes seconds,
+  not minutes.
+
+Templates are POSIX-only (Windows launcher .exe files embed the venv path);
+on Windows the shared caches still apply. pip replaces files rather than
+editing them in place, so upgrading packages in a clone leaves the
+template's hard-linked files untouched.
+
+Configuration (environment):
+    DEPENDENCY_CACHE_DIR            cache root (default: dep-cache/ next to orchestrator.db)
+    DEPENDENCY_CACHE_MAX_TEMPLATES  venv templates kept, least recently used evicted (default 4)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the template layout changes - forces a rebuild of every template
+TEMPLATE_FORMAT_VERSION = 1
+
+BASE_PACKAGES = ["requests", "nodeenv"]  # requests: test harness pattern; nodeenv: npm support
+MAX_TEMPLATES = int(os.getenv("DEPENDENCY_CACHE_MAX_TEMPLATES", "4"))
+STEP_TIMEOUT_S = 120.0
+NODEENV_TIMEOUT_S = 300.0
+COMPLETE_MARKER = ".template-complete"
+
+StatusCallback = Callable[[str], Awaitable[None]]
+
+_build_locks: Dict[str, asyncio.Lock] = {}
+
+
+def cache_root() -> Path:
+    """Root of the shared caches (created on first use)."""
+    default = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dep-cache")
+    root = Path(os.getenv("DEPENDENCY_CACHE_DIR", default))
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def cache_env() -> Dict[str, str]:
+    """Environment variables that point pip and npm at the shared caches."""
+    root = cache_root()
+    return {
+        "PIP_CACHE_DIR": str(root / "pip"),
+        "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+        "npm_config_cache": str(root / "npm"),
+    }
+
+
+def _venv_bin(venv_path: Path) -> Path:
+    return venv_path / ("Scripts" if platform.system() == "Windows" else "bin")
+
+
+def template_key(packages: List[str], with_node: bool, python: str = "python") -> str:
+    """Hash of everything that determines a template's contents."""
+    resolved = shutil.which(python) or python
+    real = os.path.realpath(resolved)
+    try:
+        interpreter = f"{real}:{os.stat(real).st_mtime_ns}"
+    except OSError:
+        interpreter = real
+    material = json.dumps({
+        "format": TEMPLATE_FORMAT_VERSION,
+        "interpreter": interpreter,
+        "platform": sys.platform,
+        "packages": sorted(p.strip().lower() for p in packages),
+        "node": with_node,
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+# =============================================================================
+# CLONING
+# =============================================================================
+
+def clone_venv(template: Path, target: Path, built_at: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Clone a venv template to target.
+
+    Regular files are hard-linked (copied across filesystems); files that
+    mention the path the venv was built at are copied with the path
+    rewritten, and absolute symlinks into it are re-pointed at the clone.
+
+    Args:
+        template: Template venv directory
+        target: Venv directory to create
+        built_at: Path the template was created at, if it was moved since
+
+    Returns:
+        {"linked": n, "rewritten": n, "copied": n}
+    """
+    origin = str(built_at or template)
+    old, new = os.fsencode(origin), os.fsencode(str(target))
+    stats = {"linked": 0, "rewritten": 0, "copied": 0}
+    rewrite_dirs = {template / "bin", template / "Scripts"}
+    staging = target.with_name(f".{target.name}.clone-{uuid.uuid4().hex[:8]}")
+
+    try:
+        for dirpath, dirnames, filenames in os.walk(template):
+            src_dir = Path(dirpath)
+            dst_dir = staging / src_dir.relative_to(template)
+            dst_dir.mkdir(parents=True, exist_ok=True)
+            for name in dirnames + filenames:
+                src, dst = src_dir / name, dst_dir / name
+                if name == COMPLETE_MARKER and src_dir == template:
+                    continue
+                if src.is_symlink():
+                    link = os.readlink(src)
+                    if os.path.isabs(link) and link.startswith(origin):
+                        link = str(target) + link[len(origin):]
+                    os.symlink(link, dst)
+                    if name in dirnames:
+                        dirnames.remove(name)  # Don't descend into symlinked dirs
+                    continue
+                if name in dirnames:
+                    continue
+                # Only small text files can embed the path (scripts, activate, pyvenv.cfg, .pth)
+                if src_dir in rewrite_dirs or name in ("pyvenv.cfg",) or name.endswith(".pth"):
+                    data = src.read_bytes()
+                    if old in data:
+                        dst.write_bytes(data.replace(old, new))
+                        shutil.copymode(src, dst)
+                        stats["rewritten"] += 1
+                        continue
+                try:
+                    os.link(src, dst)
+                    stats["linked"] += 1
+                except OSError:
+                    shutil.copy2(src, dst)
+                    stats["copied"] += 1
+        os.rename(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return stats
+
+
+# =============================================================================
+# BUILDING
+# =============================================================================
+
+async def _run_step(argv: List[str], timeout: float, cwd: Optional[Path] = None) -> int:
+    env = {**os.environ, **cache_env()}
+    process = await asyncio.create_subprocess_exec(
+        *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        cwd=str(cwd) if cwd else None, env=env
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        logger.warning(f"{' '.join(argv[:4])} exited {process.returncode}: {stderr.decode(errors='replace')[-500:]}")
+    return process.returncode
+
+
+async def _build_venv(venv_path: Path, packages: List[str], with_node: bool, python: str,
+                      status: StatusCallback) -> bool:
+    """Create a venv and install packages (+ Node.js). Returns False if Node.js setup failed."""
+    await status("Creating Python virtual environment...")
+    try:
+        returncode = await _run_step([python, "-m", "venv", str(venv_path)], STEP_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        raise Exception("Venv creation timed out")
+    if returncode != 0:
+        raise Exception("Venv creation failed")
+    await status("Virtual environment created")
+
+    pip_exe = _venv_bin(venv_path) / ("pip.exe" if platform.system() == "Windows" else "pip")
+    if packages and pip_exe.exists():
+        await status(f"Installing Python packages ({', '.join(packages)})...")
+        try:
+            await _run_step([str(pip_exe), "install", *packages], STEP_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            logger.warning(f"pip install {' '.join(packages)} timed out")
+        await status("Python packages installed")
+
+    if not with_node:
+        return True
+    # Add Node.js to the venv using nodeenv -p (prebuilt binaries)
+    await status("Installing Node.js environment (this may take a minute)...")
+    python_exe = _venv_bin(venv_path) / ("python.exe" if platform.system() == "Windows" else "python")
+    try:
+        returncode = await _run_step([str(python_exe), "-m", "nodeenv", "-p", "--prebuilt"], NODEENV_TIMEOUT_S,
+                                     cwd=venv_path.parent)
+    except asyncio.TimeoutError:
+        logger.warning("nodeenv installation timed out - agents may need npm globally")
+        await status("Node.js setup timed out (agents will use global npm)")
+        return False
+    except Exception as e:
+        logger.warning(f"nodeenv installation failed: {e} - agents may need npm globally")
+        await status("Node.js setup failed (agents will use global npm)")
+        return False
+    if returncode != 0:
+        await status("Node.js setup failed (agents will use global npm)")
+        return False
+    logger.info("✅ Installed Node.js/npm in venv via nodeenv")
+    await status("Node.js environment ready")
+    return True
+
+
+def _evict_templates(templates_dir: Path, keep: Path):
+    templates = sorted(
+        (p for p in templates_dir.iterdir() if p.is_dir() and (p / COMPLETE_MARKER).exists()),
+        key=lambda p: (p / COMPLETE_MARKER).stat().st_mtime, reverse=True
+    )
+    for stale in templates[MAX_TEMPLATES:]:
+        if stale != keep:
+            logger.info(f"Evicting venv template {stale.name}")
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+async def prepare_workspace_venv(
+    venv_path: Path,
+    packages: Optional[List[str]] = None,
+    with_node: bool = True,
+    python: str = "python",
+    on_status: Optional[StatusCallback] = None,
+) -> str:
+    """
+    Make sure venv_path holds a set-up venv, cloning a cached template when possible.
+
+    Args:
+        venv_path: Workspace .venv to create
+        packages: pip packages to install (default: BASE_PACKAGES)
+        with_node: Also install Node.js/npm into the venv via nodeenv
+        python: Interpreter used to create the venv
+        on_status: Async callback for progress messages
+
+    Returns:
+        "existing" (already there), "hit" (cloned from a template),
+        "miss" (built, and cached as a template), or "uncached" (built, not cacheable)
+
+    Raises:
+        Exception: If the venv itself could not be created
+    """
+    async def status(message: str):
+        if on_status:
+            await on_status(message)
+
+    if venv_path.exists():
+        return "existing"
+    packages = BASE_PACKAGES if packages is None else packages
+
+    if os.name != "posix":
+        await _build_venv(venv_path, packages, with_node, python, status)
+        return "uncached"
+
+    templates_dir = cache_root() / "venv-templates"
+    templates_dir.mkdir(exist_ok=True)
+    key = template_key(packages, with_node, python)
+    template = templates_dir / key
+
+    lock = _build_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        outcome = "hit"
+        if not (template / COMPLETE_MARKER).exists():
+            outcome = "miss"
+            staging = templates_dir / f".{key}.build-{uuid.uuid4().hex[:8]}" / ".venv"
+            try:
+                complete = await _build_venv(staging, packages, with_node, python, status)
+                if not complete:
+                    # Usable, but not worth caching: move it into place and let the next run retry
+                    shutil.move(str(staging), str(venv_path))
+                    return "uncached"
+                # The marker goes in before the rename, so a template is published complete or not at all
+                (staging / COMPLETE_MARKER).write_text(json.dumps({
+                    "packages": packages, "node": with_node, "built_at": str(staging)
+                }))
+                if not (template / COMPLETE_MARKER).exists():
+                    await asyncio.to_thread(shutil.rmtree, template, True)  # Leftover of an interrupted build
+                try:
+                    os.rename(staging, template)
+                except OSError:
+                    if not (template / COMPLETE_MARKER).exists():
+                        raise
+                    # Another process published the same template meanwhile - clone theirs
+                    logger.info(f"Venv template {key} was published concurrently - using that one")
+            finally:
+                shutil.rmtree(staging.parent, ignore_errors=True)
+            _evict_templates(templates_dir, keep=template)
+
+        await status("Cloning cached virtual environment..." if outcome == "hit" else "Caching virtual environment...")
+        start = time.monotonic()
+        built_at = json.loads((template / COMPLETE_MARKER).read_text()).get("built_at")
+        stats = await asyncio.to_thread(clone_venv, template, venv_path, Path(built_at) if built_at else None)
+        os.utime(template / COMPLETE_MARKER)  # LRU
+        logger.info(
+            f"✅ Venv {outcome}: cloned template {key} to {venv_path} in {time.monotonic() - start:.1f}s "
+            f"({stats['linked']} linked, {stats['rewritten']} rewritten, {stats['copied']} copied)"
+        )
+    return outcome
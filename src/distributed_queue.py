@@ -0,0 +1,450 @@
+"""
+Agent Orchestrator — Distributed Task Queue
+===========================================
+Durable task queue for running workers in separate processes.
+
+In distributed mode the dispatch loop does not spawn workers itself. It
+enqueues a task envelope (task state, worktree reference, config) into the
+task_envelopes table of the run database, and remote worker processes
+(see remote_worker.py) lease, heartbeat and complete envelopes. Finished
+envelopes are collected by DistributedTaskQueue and handed to Phase 1 of
+the dispatch loop exactly like local worker results.
+
+Envelope lifecycle:
+    queued -> leased -> done | failed -> collected
+    queued | leased -> cancelled
+
+A lease that is not renewed before it expires is taken over by another
+worker, up to max_attempts leases per envelope.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+import typing
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import psycopg
+from psycopg.rows import dict_row
+
+import run_persistence
+from run_persistence import _sqlite_connection, _mysql_connection
+from serialization import dumps_str, loads
+from task_queue import TaskCompletionQueue, CompletedTask
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("done", "failed")
+
+_COLUMNS = "envelope_id, run_id, task_id, status, payload_json, result_json, error, worker_id, attempts, lease_expires_at"
+
+
+# =============================================================================
+# DATABASE ACCESS
+# =============================================================================
+
+async def _execute(query: str, params: tuple = (), fetch: Optional[str] = None):
+    """
+    Run one statement against the run database.
+
+    Queries use "?" placeholders; they are rewritten to "%s" for
+    PostgreSQL and MySQL. fetch is None, "one" or "all" (rows as dicts).
+    """
+    db_type, db_conn_info = run_persistence._get_db_config()
+
+    if db_type == "postgres":
+        async with await psycopg.AsyncConnection.connect(
+            db_conn_info, autocommit=True, row_factory=dict_row
+        ) as conn:
+            cursor = await conn.execute(query.replace("?", "%s"), params)
+            if fetch == "one":
+                return await cursor.fetchone()
+            if fetch == "all":
+                return await cursor.fetchall()
+            return cursor.rowcount
+    elif db_type == "mysql":
+        import aiomysql
+        async with _mysql_connection(db_conn_info) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(query.replace("?", "%s"), params)
+                if fetch == "one":
+                    return await cursor.fetchone()
+                if fetch == "all":
+                    return list(await cursor.fetchall())
+                return cursor.rowcount
+    else:  # sqlite
+        async with _sqlite_connection(db_conn_info) as db:
+            db.row_factory = _sqlite_dict_row
+            cursor = await db.execute(query, params)
+            if fetch == "one":
+                result = await cursor.fetchone()
+            elif fetch == "all":
+                result = await cursor.fetchall()
+            else:
+                result = cursor.rowcount
+            await db.commit()
+            return result
+
+
+def _sqlite_dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+async def init_task_envelopes_table():
+    """Create the task_envelopes table if it doesn't exist."""
+    db_type, _ = run_persistence._get_db_config()
+    if db_type == "mysql":
+        await _execute("""
+            CREATE TABLE IF NOT EXISTS task_envelopes (
+                envelope_id VARCHAR(64) PRIMARY KEY,
+                run_id VARCHAR(255),
+                task_id VARCHAR(255),
+                status VARCHAR(20),
+                payload_json LONGTEXT,
+                result_json LONGTEXT,
+                error TEXT,
+                worker_id VARCHAR(255),
+                attempts INTEGER DEFAULT 0,
+                lease_expires_at DOUBLE,
+                created_at VARCHAR(50),
+                updated_at VARCHAR(50),
+                INDEX idx_task_envelopes_status (status, created_at),
+                INDEX idx_task_envelopes_run (run_id, status)
+            )
+        """)
+    else:
+        lease_type = "DOUBLE PRECISION" if db_type == "postgres" else "REAL"
+        await _execute(f"""
+            CREATE TABLE IF NOT EXISTS task_envelopes (
+                envelope_id TEXT PRIMARY KEY,
+                run_id TEXT,
+                task_id TEXT,
+                status TEXT,
+                payload_json TEXT,
+                result_json TEXT,
+                error TEXT,
+                worker_id TEXT,
+                attempts INTEGER DEFAULT 0,
+                lease_expires_at {lease_type},
+                created_at TEXT,
+                updated_at TEXT
+            )
+        """)
+        await _execute("CREATE INDEX IF NOT EXISTS idx_task_envelopes_status ON task_envelopes (status, created_at)")
+        await _execute("CREATE INDEX IF NOT EXISTS idx_task_envelopes_run ON task_envelopes (run_id, status)")
+    logger.info(f"✅ Task envelopes table initialized ({db_type})")
+
+
+async def enqueue_envelope(run_id: str, task_id: str, payload: Dict[str, Any]) -> str:
+    """Queue a task envelope for remote workers. Returns the envelope id."""
+    envelope_id = uuid.uuid4().hex
+    now = datetime.now().isoformat()
+    await _execute(
+        "INSERT INTO task_envelopes (envelope_id, run_id, task_id, status, payload_json, attempts, created_at, updated_at) "
+        "VALUES (?, ?, ?, 'queued', ?, 0, ?, ?)",
+        (envelope_id, run_id, task_id, dumps_str(payload), now, now)
+    )
+    return envelope_id
+
+
+async def lease_envelope(worker_id: str, lease_seconds: float = 60.0, max_attempts: int = 3) -> Optional[Dict[str, Any]]:
+    """
+    Lease the oldest available envelope (queued, or leased with an expired lease).
+
+    Returns the envelope row with its payload decoded, or None if the queue is empty.
+    """
+    db_type, _ = run_persistence._get_db_config()
+    now = time.time()
+    claimable = (
+        "(status = 'queued' OR (status = 'leased' AND lease_expires_at < ? AND attempts < ?))"
+    )
+    params = (worker_id, now + lease_seconds, datetime.now().isoformat())
+
+    if db_type == "mysql":
+        row = await _lease_mysql(claimable, now, max_attempts, params)
+    else:
+        # Single UPDATE ... RETURNING statement: SQLite serializes writers, PostgreSQL skips locked rows
+        skip_locked = " FOR UPDATE SKIP LOCKED" if db_type == "postgres" else ""
+        row = await _execute(
+            "UPDATE task_envelopes SET status = 'leased', worker_id = ?, lease_expires_at = ?, "
+            "attempts = attempts + 1, updated_at = ? "
+            f"WHERE envelope_id = (SELECT envelope_id FROM task_envelopes WHERE {claimable} "
+            f"ORDER BY created_at LIMIT 1{skip_locked}) "
+            f"RETURNING {_COLUMNS}",
+            params + (now, max_attempts),
+            fetch="one"
+        )
+    if not row:
+        return None
+    row = dict(row)
+    row["payload"] = loads(row.pop("payload_json"))
+    return row
+
+
+async def _lease_mysql(claimable: str, now: float, max_attempts: int, params: tuple) -> Optional[Dict[str, Any]]:
+    import aiomysql
+    _, config = run_persistence._get_db_config()
+    async with _mysql_connection(config) as conn:
+        await conn.begin()
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(
+                    f"SELECT {_COLUMNS} FROM task_envelopes WHERE {claimable.replace('?', '%s')} "
+                    "ORDER BY created_at LIMIT 1 FOR UPDATE SKIP LOCKED",
+                    (now, max_attempts)
+                )
+                row = await cursor.fetchone()
+                if row:
+                    await cursor.execute(
+                        "UPDATE task_envelopes SET status = 'leased', worker_id = %s, lease_expires_at = %s, "
+                        "attempts = attempts + 1, updated_at = %s WHERE envelope_id = %s",
+                        params + (row["envelope_id"],)
+                    )
+                    row.update(status="leased", worker_id=params[0], attempts=row["attempts"] + 1)
+            await conn.commit()
+            return row
+        except Exception:
+            await conn.rollback()
+            raise
+
+
+async def heartbeat_envelope(envelope_id: str, worker_id: str, lease_seconds: float = 60.0) -> bool:
+    """Extend a lease. False means the lease was lost (expired and re-leased, or cancelled)."""
+    updated = await _execute(
+        "UPDATE task_envelopes SET lease_expires_at = ?, updated_at = ? "
+        "WHERE envelope_id = ? AND worker_id = ? AND status = 'leased'",
+        (time.time() + lease_seconds, datetime.now().isoformat(), envelope_id, worker_id)
+    )
+    return bool(updated)
+
+
+async def complete_envelope(envelope_id: str, worker_id: str, result: Any = None, error: Optional[str] = None) -> bool:
+    """Store a worker result (or error). False if the lease was lost and the result discarded."""
+    updated = await _execute(
+        "UPDATE task_envelopes SET status = ?, result_json = ?, error = ?, updated_at = ? "
+        "WHERE envelope_id = ? AND worker_id = ? AND status = 'leased'",
+        ("failed" if error else "done", dumps_str(result) if result is not None else None, error,
+         datetime.now().isoformat(), envelope_id, worker_id)
+    )
+    return bool(updated)
+
+
+async def collect_finished_envelopes(run_id: str, max_attempts: int = 3) -> List[Dict[str, Any]]:
+    """
+    Return finished envelopes of a run and mark them collected.
+
+    Envelopes whose last allowed lease expired are failed first so the
+    dispatch loop sees them.
+    """
+    now = datetime.now().isoformat()
+    await _execute(
+        "UPDATE task_envelopes SET status = 'failed', error = 'Worker lease expired', updated_at = ? "
+        "WHERE run_id = ? AND status = 'leased' AND lease_expires_at < ? AND attempts >= ?",
+        (now, run_id, time.time(), max_attempts)
+    )
+    rows = await _execute(
+        f"SELECT {_COLUMNS} FROM task_envelopes WHERE run_id = ? AND status IN ('done', 'failed')",
+        (run_id,), fetch="all"
+    ) or []
+    for row in rows:
+        await _execute(
+            "UPDATE task_envelopes SET status = 'collected', updated_at = ? WHERE envelope_id = ?",
+            (now, row["envelope_id"])
+        )
+    return [dict(row) for row in rows]
+
+
+async def cancel_envelopes(run_id: str, task_id: Optional[str] = None) -> int:
+    """Cancel queued and leased envelopes of a run (or one of its tasks)."""
+    query = ("UPDATE task_envelopes SET status = 'cancelled', updated_at = ? "
+             "WHERE run_id = ? AND status IN ('queued', 'leased')")
+    params = (datetime.now().isoformat(), run_id)
+    if task_id:
+        query += " AND task_id = ?"
+        params += (task_id,)
+    return await _execute(query, params) or 0
+
+
+# =============================================================================
+# ENVELOPES
+# =============================================================================
+
+def config_to_dict(config) -> Dict[str, Any]:
+    """OrchestratorConfig -> plain dict for an envelope."""
+    return dataclasses.asdict(config) if dataclasses.is_dataclass(config) else {}
+
+
+def config_from_dict(data: Dict[str, Any]):
+    """Rebuild an OrchestratorConfig from config_to_dict output (unknown keys are ignored)."""
+    from config import OrchestratorConfig
+    hints = typing.get_type_hints(OrchestratorConfig)
+    kwargs = {}
+    for name, value in (data or {}).items():
+        if name not in hints:
+            continue
+        nested = _dataclass_type(hints[name])
+        if nested is not None and isinstance(value, dict):
+            value = nested(**value)  # ModelConfig, RetryConfig, ...; plain dict fields pass through
+        kwargs[name] = value
+    return OrchestratorConfig(**kwargs)
+
+
+def _dataclass_type(annotation) -> Optional[type]:
+    """The dataclass a field is declared as (also inside Optional[...]), else None."""
+    if dataclasses.is_dataclass(annotation):
+        return annotation
+    for arg in typing.get_args(annotation):
+        if dataclasses.is_dataclass(arg):
+            return arg
+    return None
+
+
+def build_envelope(state: Dict[str, Any], run_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Payload for one worker: the serializable run state with only this task's
+    memories, the worktree reference and the run config.
+    """
+    from orchestrator_types import serialize_messages
+    task_id = state["task_id"]
+    worker_state = {}
+    for key, value in state.items():
+        if key.startswith("_") or key in ("orch_config", "task_memories"):
+            continue
+        worker_state[key] = value
+    memories = state.get("task_memories", {}).get(task_id)
+    worker_state["task_memories"] = {task_id: serialize_messages(memories)} if memories else {}
+
+    return {
+        "state": worker_state,
+        "worktree": {
+            "workspace_path": state.get("_workspace_path"),
+            "worktree_base_path": state.get("_worktree_base_path"),
+            "logs_base_path": state.get("_logs_base_path"),
+        },
+        "orch_config": config_to_dict(state.get("orch_config")),
+        "run_config": run_config or {},
+    }
+
+
+# =============================================================================
+# DISPATCH-SIDE QUEUE
+# =============================================================================
+
+class DistributedTaskQueue(TaskCompletionQueue):
+    """
+    TaskCompletionQueue whose workers run in remote worker processes.
+
+    Usage:
+        queue = DistributedTaskQueue(run_id, max_concurrent=5)
+        await queue.start()
+        await queue.submit(task_id, worker_state, run_config)
+
+        # Later...
+        await queue.wait_for_any()
+        for completed in queue.collect_completed():
+            apply_result(state, completed)
+    """
+
+    def __init__(self, run_id: str, max_concurrent: int = 5, pool=None,
+                 max_attempts: int = 3, poll_interval: float = 0.25):
+        super().__init__(max_concurrent=max_concurrent, run_id=run_id, pool=pool)
+        self._running: Dict[str, str] = {}  # task_id -> envelope_id
+        self._max_attempts = max_attempts
+        self._poll_interval = poll_interval
+
+    async def start(self):
+        """Create the envelope table and drop envelopes left over from a previous dispatch loop."""
+        await init_task_envelopes_table()
+        stale = await cancel_envelopes(self._run_id)
+        if stale:
+            logger.warning(f"Cancelled {stale} stale envelope(s) for run {self._run_id}")
+
+    def spawn(self, task_id: str, coro) -> bool:
+        raise TypeError("DistributedTaskQueue runs workers remotely - use submit()")
+
+    async def submit(self, task_id: str, state: Dict[str, Any], run_config: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Enqueue a worker envelope.
+
+        Returns:
+            True if queued, False if at capacity
+        """
+        if len(self._running) >= self._max_concurrent or task_id in self._running:
+            return False
+        if self._pool is not None and not self._pool.try_acquire(self._run_id):
+            return False
+        try:
+            envelope_id = await enqueue_envelope(self._run_id, task_id, build_envelope(state, run_config))
+        except Exception:
+            self._release_slot()
+            raise
+        self._running[task_id] = envelope_id
+        logger.info(f"[ENQUEUE] Envelope {envelope_id[:8]} for {task_id} ({len(self._running)}/{self._max_concurrent} active)")
+        return True
+
+    async def poll(self) -> int:
+        """Move finished envelopes into the completed list. Returns how many arrived."""
+        from orchestrator_types import deserialize_messages
+        rows = await collect_finished_envelopes(self._run_id, self._max_attempts)
+        arrived = 0
+        for row in rows:
+            task_id = row["task_id"]
+            if self._running.get(task_id) != row["envelope_id"]:
+                continue  # Cancelled locally or from an earlier dispatch loop
+            self._running.pop(task_id, None)
+            self._release_slot()
+            if row["status"] == "done":
+                result = loads(row["result_json"]) if row["result_json"] else {}
+                if isinstance(result, dict) and result.get("task_memories"):
+                    # Phase 1 and Phoenix expect LangChain messages, as from in-process workers
+                    result["task_memories"] = {
+                        tid: deserialize_messages(msgs) for tid, msgs in result["task_memories"].items()
+                    }
+                self._completed.append(CompletedTask(task_id, result))
+                logger.info(f"[DONE] Remote worker {row['worker_id']} completed {task_id[:12]}")
+            else:
+                self._completed.append(CompletedTask(task_id, None, RuntimeError(row["error"] or "Remote worker failed")))
+                logger.error(f"[FAIL] Remote worker for {task_id[:12]} failed: {row['error']}")
+            arrived += 1
+        return arrived
+
+    async def wait_for_any(self, timeout: float = 0.5) -> None:
+        """Poll the database until at least one envelope finishes, or timeout."""
+        deadline = time.monotonic() + timeout
+        while self._running:
+            try:
+                if await self.poll():
+                    return
+            except Exception as e:
+                logger.error(f"Error polling task envelopes: {e}", exc_info=True)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(self._poll_interval, remaining))
+
+    async def cancel_task(self, task_id: str) -> bool:
+        if task_id not in self._running:
+            return False
+        logger.warning(f"Cancelling remote task {task_id[:12]}")
+        await cancel_envelopes(self._run_id, task_id)
+        self._running.pop(task_id, None)
+        self._release_slot()
+        return True
+
+    async def cancel_all(self):
+        if self._running:
+            logger.warning(f"Cancelling {len(self._running)} remote task(s) for run {self._run_id}")
+            try:
+                await cancel_envelopes(self._run_id)
+            except Exception as e:
+                logger.error(f"Error cancelling task envelopes: {e}")
+        for _ in range(len(self._running)):
+            self._release_slot()
+        self._running.clear()
+
+    def _release_slot(self):
+        if self._pool is not None:
+            self._pool.release(self._run_id)
@@ -0,0 +1,259 @@
+"""
+LLM Response Cache
+==================
+Opt-in, content-hashed cache for deterministic director LLM calls
+(design spec, decomposition, integration, dependency resolution).
+
+After a restart or replan the director often resends exactly the same
+prompt (same objective, spec and suggestions). With the cache enabled,
+those calls are answered from a local SQLite file instead of the provider.
+
+Entries are keyed by (provider, model, temperature, prompt hash, schema
+version), expire after a TTL, and are evicted least-recently-used once the
+table exceeds its entry limit.
+
+Usage:
+    from llm_cache import cached_ainvoke
+
+    response = await cached_ainvoke(
+        structured_llm, prompt_text, state,
+        call_name="integrate_plans", schema=IntegrationResponse,
+    )
+
+Set state["bypass_llm_cache"] = True (or config.llm_cache_bypass) to force
+fresh responses; fresh results still overwrite the cached entry.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Type
+
+import aiosqlite
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored format changes - invalidates every existing entry
+CACHE_FORMAT_VERSION = 1
+
+
+def _default_cache_path() -> str:
+    """Default cache file, next to orchestrator.db."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "llm_cache.db")
+
+
+def _prompt_text(prompt: Any) -> str:
+    """Stable text form of a prompt (string, message list or PromptValue)."""
+    if isinstance(prompt, str):
+        return prompt
+    if hasattr(prompt, "to_messages"):
+        prompt = prompt.to_messages()
+    if isinstance(prompt, list):
+        return json.dumps(
+            [{"type": getattr(m, "type", type(m).__name__), "content": getattr(m, "content", str(m))} for m in prompt],
+            sort_keys=True, default=str
+        )
+    return str(prompt)
+
+
+def schema_version(schema: Optional[Type[BaseModel]]) -> str:
+    """Hash of the schema's JSON schema - changes whenever fields change."""
+    if schema is None:
+        return f"text:v{CACHE_FORMAT_VERSION}"
+    schema_json = json.dumps(schema.model_json_schema(), sort_keys=True)
+    return f"{schema.__name__}:v{CACHE_FORMAT_VERSION}:{hashlib.sha256(schema_json.encode()).hexdigest()[:16]}"
+
+
+def make_cache_key(model_config: Any, prompt: Any, schema: Optional[Type[BaseModel]] = None) -> str:
+    """Build the cache key for (model, temperature, prompt hash, schema version)."""
+    prompt_hash = hashlib.sha256(_prompt_text(prompt).encode("utf-8")).hexdigest()
+    key_material = json.dumps({
+        "provider": getattr(model_config, "provider", None),
+        "model": getattr(model_config, "model_name", None),
+        "temperature": getattr(model_config, "temperature", None),
+        "prompt": prompt_hash,
+        "schema": schema_version(schema),
+    }, sort_keys=True)
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL and LRU eviction."""
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 500):
+        self.db_path = db_path or _default_cache_path()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def _connect(self):
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute("PRAGMA busy_timeout=5000")
+            yield db
+
+    async def _ensure_table(self):
+        if self._initialized:
+            return
+        async with self._init_lock:
+            if self._initialized:
+                return
+            async with self._connect() as db:
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        call_name TEXT,
+                        model TEXT,
+                        schema_version TEXT,
+                        response_json TEXT,
+                        created_at REAL,
+                        last_access REAL,
+                        hits INTEGER DEFAULT 0
+                    )
+                """)
+                await db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+                await db.commit()
+            self._initialized = True
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response JSON, or None on miss/expiry."""
+        await self._ensure_table()
+        now = time.time()
+        async with self._connect() as db:
+            cursor = await db.execute("SELECT response_json, created_at FROM llm_cache WHERE cache_key = ?", (key,))
+            row = await cursor.fetchone()
+            if not row:
+                return None
+            response_json, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                await db.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                await db.commit()
+                return None
+            await db.execute(
+                "UPDATE llm_cache SET last_access = ?, hits = hits + 1 WHERE cache_key = ?", (now, key)
+            )
+            await db.commit()
+            return response_json
+
+    async def set(self, key: str, response_json: str, call_name: str = "", model: str = "", schema: str = ""):
+        """Store a response and evict least-recently-used entries over the limit."""
+        await self._ensure_table()
+        now = time.time()
+        async with self._connect() as db:
+            await db.execute("""
+                INSERT OR REPLACE INTO llm_cache
+                (cache_key, call_name, model, schema_version, response_json, created_at, last_access, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """, (key, call_name, model, schema, response_json, now, now))
+            if self.max_entries:
+                await db.execute("""
+                    DELETE FROM llm_cache WHERE cache_key IN (
+                        SELECT cache_key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+            await db.commit()
+
+    async def clear(self):
+        """Remove every cached response."""
+        await self._ensure_table()
+        async with self._connect() as db:
+            await db.execute("DELETE FROM llm_cache")
+            await db.commit()
+
+
+# Process-wide caches, one per database file
+_caches: Dict[str, LLMResponseCache] = {}
+
+
+def get_response_cache(orch_config: Any) -> LLMResponseCache:
+    """Get (or create) the response cache configured by orch_config."""
+    db_path = getattr(orch_config, "llm_cache_path", None) or _default_cache_path()
+    cache = _caches.get(db_path)
+    if cache is None:
+        cache = LLMResponseCache(
+            db_path=db_path,
+            ttl_seconds=getattr(orch_config, "llm_cache_ttl_seconds", 7 * 24 * 3600),
+            max_entries=getattr(orch_config, "llm_cache_max_entries", 500),
+        )
+        _caches[db_path] = cache
+    return cache
+
+
+async def cached_ainvoke(
+    llm: Any,
+    prompt: Any,
+    state: Dict[str, Any],
+    call_name: str,
+    schema: Optional[Type[BaseModel]] = None,
+    model_config: Any = None,
+    **invoke_kwargs
+) -> Any:
+    """
+    Invoke an LLM through the response cache (when enabled).
+
+    Args:
+        llm: LLM or structured-output runnable
+        prompt: Prompt passed to ainvoke (string, messages or PromptValue)
+        state: Orchestrator state (orch_config, bypass_llm_cache)
+        call_name: Label for logs/metrics (e.g. "integrate_plans")
+        schema: Pydantic schema for structured output, None for plain text
+        model_config: Model config used for the key (defaults to director_model)
+        **invoke_kwargs: Passed through to ainvoke
+
+    Returns:
+        Parsed schema instance for structured calls, AIMessage-like response for text calls
+    """
+    from config import OrchestratorConfig
+    from metrics import llm_metrics
+
+    orch_config = state.get("orch_config") or OrchestratorConfig()
+    if not getattr(orch_config, "enable_llm_cache", False):
+        return await llm.ainvoke(prompt, **invoke_kwargs)
+
+    model_config = model_config or orch_config.director_model
+    bypass = bool(state.get("bypass_llm_cache") or getattr(orch_config, "llm_cache_bypass", False))
+    cache = get_response_cache(orch_config)
+    key = make_cache_key(model_config, prompt, schema)
+
+    if not bypass:
+        try:
+            cached = await cache.get(key)
+        except Exception as e:
+            logger.warning(f"[LLM CACHE] Lookup failed for {call_name}: {e}")
+            cached = None
+
+        if cached is not None:
+            try:
+                response = schema.model_validate_json(cached) if schema else AIMessage(content=json.loads(cached))
+                llm_metrics.cache_lookups_total.labels(call=call_name, result="hit").inc()
+                logger.info(f"[LLM CACHE] HIT {call_name} ({key[:12]})")
+                return response
+            except Exception as e:
+                logger.warning(f"[LLM CACHE] Discarding unreadable entry for {call_name}: {e}")
+
+    llm_metrics.cache_lookups_total.labels(call=call_name, result="bypass" if bypass else "miss").inc()
+    response = await llm.ainvoke(prompt, **invoke_kwargs)
+
+    try:
+        if schema:
+            response_json = response.model_dump_json()
+        else:
+            response_json = json.dumps(response.content if hasattr(response, "content") else str(response))
+        await cache.set(
+            key, response_json, call_name=call_name,
+            model=f"{getattr(model_config, 'provider', '')}/{getattr(model_config, 'model_name', '')}",
+            schema=schema_version(schema)
+        )
+        logger.info(f"[LLM CACHE] {'REFRESH' if bypass else 'STORE'} {call_name} ({key[:12]})")
+    except Exception as e:
+        logger.warning(f"[LLM CACHE] Failed to store {call_name}: {e}")
+
+    return response
@@ -123,6 +123,42 @@ def validate_request_size(stats: Dict[str, Any], max_chars: int = 100000) -> Non
         )
 
 
+def log_tool_savings(
+    task_id: str,
+    entry: Dict[str, Any],
+    workspace_path: Optional[str] = None,
+    logs_base_path: Optional[str] = None
+) -> None:
+    """
+    Append one token-savings record (e.g. edit_file instead of write_file) to the task's log.
+
+    Records go to tool_savings.jsonl next to the request/response logs and
+    are totalled in the next response log.
+    """
+    log_dir = _get_log_dir(task_id, workspace_path, logs_base_path)
+    record = {"timestamp": datetime.now().isoformat(), "task_id": task_id, **entry}
+    with open(log_dir / "tool_savings.jsonl", 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _summarize_tool_savings(log_dir: Path) -> Dict[str, Any]:
+    """Totals of tool_savings.jsonl per tool."""
+    totals: Dict[str, Any] = {}
+    path = log_dir / "tool_savings.jsonl"
+    if not path.exists():
+        return totals
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            tool = totals.setdefault(record.get("tool", "unknown"), {"calls": 0, "estimated_tokens_saved": 0})
+            tool["calls"] += 1
+            tool["estimated_tokens_saved"] += record.get("tokens_saved", 0)
+    return totals
+
+
 def log_llm_response(
     task_id: str,
     result: Any,
@@ -166,7 +202,8 @@ def log_llm_response(
         "files_modified": files_modified or [],
         "file_count": len(files_modified) if files_modified else 0,
         "messages": messages,
-        "message_count": len(messages)
+        "message_count": len(messages),
+        "tool_savings": _summarize_tool_savings(log_dir)
     }
     
     with open(log_file, 'w', encoding='utf-8') as f:
@@ -245,6 +245,13 @@ class LLMMetrics:
             ['model', 'provider', 'error_type']
         )
 
+        # Response cache (director calls)
+        self.cache_lookups_total = Counter(
+            'llm_cache_lookups_total',
+            'LLM response cache lookups',
+            ['call', 'result']  # result: hit, miss, bypass
+        )
+
     @contextmanager
     def track_request(self, model: str, provider: str):
         """Context manager to track an LLM request"""
@@ -315,6 +322,92 @@ class DispatchMetrics:
             buckets=[0, 1, 2, 5, 10, 20]
         )
 
+        self.ws_messages_dropped = Counter(
+            'dispatch_ws_messages_dropped_total',
+            'WebSocket messages dropped from a client outbound queue',
+            ['reason']  # coalesced, overflow
+        )
+
+        self.ws_connections_evicted = Counter(
+            'dispatch_ws_connections_evicted_total',
+            'WebSocket clients evicted after a failed or stalled send'
+        )
+
+        self.workspace_venv_setups = Counter(
+            'dispatch_workspace_venv_setups_total',
+            'Workspace venv setups by dependency cache outcome',
+            ['result']  # existing, hit, miss, uncached, error
+        )
+
+        self.workspace_setup_duration = Histogram(
+            'dispatch_workspace_setup_duration_seconds',
+            'Time to set up a workspace venv',
+            ['result'],
+            buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0]
+        )
+
+        self.run_state_resident_bytes = Gauge(
+            'run_state_resident_bytes',
+            'Estimated bytes of run state held in memory',
+            ['run_id']
+        )
+
+        self.worker_slots_active = Gauge(
+            'dispatch_worker_slots_active',
+            'Worker pool slots held by each run',
+            ['run_id']
+        )
+
+
+# =============================================================================
+# TOOL METRICS
+# =============================================================================
+
+class ToolMetrics:
+    """Metrics for worker and QA tools"""
+
+    def __init__(self):
+        self.file_cache_requests = Counter(
+            'tool_file_cache_requests_total',
+            'File content cache lookups',
+            ['result']  # hit, miss
+        )
+
+        self.file_cache_hit_ratio = Gauge(
+            'tool_file_cache_hit_ratio',
+            'Share of file content cache lookups served from memory'
+        )
+
+        self.file_cache_bytes = Gauge(
+            'tool_file_cache_bytes',
+            'Bytes of file content held by all worktree caches'
+        )
+
+        self.web_search_requests = Counter(
+            'tool_web_search_requests_total',
+            'Web search queries by cache outcome',
+            ['result']  # hit, miss, coalesced
+        )
+
+        self.sandbox_cpu_seconds = Counter(
+            'tool_sandbox_cpu_seconds_total',
+            'CPU time used by run_shell/run_python processes',
+            ['task_id', 'tool']
+        )
+
+        self.sandbox_peak_memory_bytes = Histogram(
+            'tool_sandbox_peak_memory_bytes',
+            'Peak memory of one run_shell/run_python call',
+            ['tool'],
+            buckets=[16e6, 64e6, 256e6, 512e6, 1e9, 2e9, 4e9, 8e9]
+        )
+
+        self.sandbox_limit_hits = Counter(
+            'tool_sandbox_limit_hits_total',
+            'run_shell/run_python calls stopped by a resource limit or timeout',
+            ['task_id', 'limit']  # memory, pids, cpu, timeout
+        )
+
 
 # =============================================================================
 # GLOBAL INSTANCES
@@ -324,6 +417,7 @@ git_metrics = GitMetrics()
 task_metrics = TaskMetrics()
 llm_metrics = LLMMetrics()
 dispatch_metrics = DispatchMetrics()
+tool_metrics = ToolMetrics()
 
 
 # =============================================================================
@@ -0,0 +1,222 @@
+"""
+Context compaction for long ReAct loops.
+
+The ReAct loop re-sends the whole conversation on every chunk, so large
+read_file results and shell outputs stay in context long after the agent
+has moved on. Between chunks we build a compacted VIEW of the history:
+
+- Superseded reads: when the same file is read again later, the older
+  read result is replaced with a one-line marker.
+- Stale tool outputs: older tool results are replaced with the same digest
+  lines Phoenix uses for retry summaries (_extract_conversation_digest).
+- Per-role token budgets: walking newest → oldest, once a role's budget
+  is spent, older messages of that role are compacted.
+
+The full history is never modified - only the messages sent to the agent.
+Message count and tool_call/ToolMessage pairing are preserved, so the
+provider always sees a well-formed conversation.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from config import COMPACTION_ROLE_BUDGETS
+from .director.phoenix_summary import _extract_conversation_digest
+
+logger = logging.getLogger(__name__)
+
+# Tools whose results are keyed by file path for read deduplication
+READ_TOOLS = {"read_file"}
+WRITE_TOOLS = {"write_file", "write_files", "edit_file", "append_file", "delete_file"}
+
+COMPACTED_MARKER = "[compacted]"
+
+
+@dataclass
+class CompactionStats:
+    """What a compaction pass did (for logging and benchmarks)."""
+    original_chars: int = 0
+    compacted_chars: int = 0
+    messages_compacted: int = 0
+    reads_deduplicated: int = 0
+    per_role_tokens: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def saved_chars(self) -> int:
+        return self.original_chars - self.compacted_chars
+
+
+def estimate_tokens(messages: List[BaseMessage]) -> int:
+    """Estimate prompt tokens for a message list (chars // 4)."""
+    return sum(len(str(m.content)) for m in messages if hasattr(m, "content")) // 4
+
+
+def _role_of(msg: BaseMessage) -> Optional[str]:
+    if isinstance(msg, ToolMessage):
+        return "tool"
+    if isinstance(msg, AIMessage):
+        return "ai"
+    if isinstance(msg, HumanMessage):
+        return "human"
+    return None
+
+
+def _normalize_path(path: str) -> str:
+    """Normalize a tool path argument the same way tools_binding tracks reads."""
+    return str(path).replace("\\", "/").lower().strip("/")
+
+
+def _index_tool_calls(messages: List[BaseMessage]) -> Dict[str, Dict[str, Any]]:
+    """Map tool_call_id -> tool call dict from AIMessages."""
+    calls = {}
+    for msg in messages:
+        if isinstance(msg, AIMessage) and msg.tool_calls:
+            for tc in msg.tool_calls:
+                if tc.get("id"):
+                    calls[tc["id"]] = tc
+    return calls
+
+
+def _written_paths(name: str, args: Dict[str, Any]) -> List[str]:
+    """Paths a write tool call targets (write_files carries one per item in args["files"])."""
+    if name == "write_files":
+        return [f["path"] for f in args.get("files") or [] if isinstance(f, dict) and f.get("path")]
+    return [args["path"]] if args.get("path") else []
+
+
+def _find_superseded_reads(messages: List[BaseMessage], calls: Dict[str, Dict[str, Any]]) -> Dict[int, str]:
+    """
+    Find read_file results that are no longer current.
+
+    A read is superseded when the same path and line window is read again
+    later, or the path is written afterwards (the content the agent saw is
+    stale either way).
+
+    Returns:
+        Dict of message index -> path for superseded read results
+    """
+    latest_read: Dict[Tuple[str, Any, Any], int] = {}  # (path, start_line, end_line) -> message index
+    superseded: Dict[int, str] = {}
+
+    for idx, msg in enumerate(messages):
+        if not isinstance(msg, ToolMessage):
+            continue
+        tc = calls.get(msg.tool_call_id)
+        if not tc:
+            continue
+        name = tc.get("name")
+        args = tc.get("args") or {}
+
+        if name in READ_TOOLS and args.get("path"):
+            # Only a re-read of the same line window replaces an earlier one
+            path = args["path"]
+            key = (_normalize_path(path), args.get("start_line"), args.get("end_line"))
+            if key in latest_read:
+                superseded[latest_read[key]] = path
+            latest_read[key] = idx
+        elif name in WRITE_TOOLS:
+            for path in _written_paths(name, args):
+                norm = _normalize_path(path)
+                for key in [k for k in latest_read if k[0] == norm]:
+                    superseded[latest_read.pop(key)] = path
+
+    return superseded
+
+
+def _digest_tool_message(msg: ToolMessage, tc: Optional[Dict[str, Any]]) -> str:
+    """Replace a tool result with its Phoenix digest line(s)."""
+    digest_input: List[BaseMessage] = []
+    if tc:
+        digest_input.append(AIMessage(content="", tool_calls=[tc]))
+    digest_input.append(msg)
+    digest = _extract_conversation_digest(digest_input)
+    return f"{COMPACTED_MARKER} Output removed to save context - re-run the tool if you need it again.\n{digest}"
+
+
+def _truncate_text(content: str, keep_chars: int = 300) -> str:
+    return f"{content[:keep_chars]}... {COMPACTED_MARKER} ({len(content)} chars)"
+
+
+def compact_messages(
+    messages: List[BaseMessage],
+    keep_recent: int = 10,
+    role_budgets: Optional[Dict[str, int]] = None,
+    min_chars: int = 500,
+) -> Tuple[List[BaseMessage], CompactionStats]:
+    """
+    Build a compacted view of a ReAct conversation.
+
+    Args:
+        messages: Full conversation history (not modified)
+        keep_recent: Number of trailing messages always kept verbatim
+            (superseded reads are still collapsed)
+        role_budgets: Token budget per role ("tool", "ai", "human");
+            defaults to config.COMPACTION_ROLE_BUDGETS
+        min_chars: Messages shorter than this are never compacted
+
+    Returns:
+        (compacted message list, CompactionStats)
+    """
+    budgets = {**COMPACTION_ROLE_BUDGETS, **(role_budgets or {})}
+    stats = CompactionStats(original_chars=sum(len(str(m.content)) for m in messages))
+
+    calls = _index_tool_calls(messages)
+    superseded = _find_superseded_reads(messages, calls)
+
+    # System prompt and the initial task message are never compacted
+    protected = set()
+    first_human_seen = False
+    for idx, msg in enumerate(messages):
+        if isinstance(msg, SystemMessage):
+            protected.add(idx)
+        elif isinstance(msg, HumanMessage) and not first_human_seen:
+            protected.add(idx)
+            first_human_seen = True
+    recent_start = max(0, len(messages) - keep_recent)
+
+    compacted: List[BaseMessage] = list(messages)
+    spent: Dict[str, int] = {role: 0 for role in budgets}
+
+    # Walk newest -> oldest so recent context gets the budget first
+    for idx in range(len(messages) - 1, -1, -1):
+        msg = messages[idx]
+        role = _role_of(msg)
+        content = msg.content
+
+        if idx in superseded:
+            new_content = (
+                f"{COMPACTED_MARKER} Superseded: '{superseded[idx]}' was read again or modified later "
+                f"in this conversation - see the newer result."
+            )
+            if len(str(content)) > len(new_content):
+                compacted[idx] = msg.model_copy(update={"content": new_content})
+                stats.reads_deduplicated += 1
+                stats.messages_compacted += 1
+            continue
+
+        if role is None or idx in protected or not isinstance(content, str):
+            continue
+        if content.startswith(COMPACTED_MARKER):
+            continue
+
+        cost = len(content) // 4
+        spent[role] = spent.get(role, 0) + cost
+
+        if idx >= recent_start or spent[role] <= budgets.get(role, 0) or len(content) < min_chars:
+            continue
+
+        if isinstance(msg, ToolMessage):
+            new_content = _digest_tool_message(msg, calls.get(msg.tool_call_id))
+        else:
+            new_content = _truncate_text(content)
+
+        if len(new_content) < len(content):
+            compacted[idx] = msg.model_copy(update={"content": new_content})
+            stats.messages_compacted += 1
+
+    stats.compacted_chars = sum(len(str(m.content)) for m in compacted)
+    stats.per_role_tokens = spent
+    return compacted, stats
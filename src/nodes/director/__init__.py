@@ -6,7 +6,7 @@ Main director node for task decomposition, integration, and orchestration.
 
 # Re-export all functions for clean imports
 from .decomposition import mock_decompose, decompose_objective, TaskDefinition, DecompositionResponse
-from .integration import integrate_plans, IntegratedTaskDefinition, IntegrationResponse, RejectedTask
+from .integration import integrate_plans, finalize_integrated_tasks, IntegratedTaskDefinition, IntegrationResponse, RejectedTask
 from .readiness import evaluate_readiness
 from .hitl import process_human_resolution
 from .graph_utils import detect_and_break_cycles
@@ -20,6 +20,7 @@ __all__ = [
     "DecompositionResponse",
     # Integration
     "integrate_plans",
+    "finalize_integrated_tasks",
     "IntegratedTaskDefinition",
     "IntegrationResponse",
     "RejectedTask",
@@ -15,6 +15,7 @@ from langchain_core.prompts import ChatPromptTemplate
 
 from orchestrator_types import Task, TaskStatus, TaskPhase, WorkerProfile
 from llm_client import get_llm
+from llm_cache import cached_ainvoke
 from .integration import broadcast_progress
 
 logger = logging.getLogger(__name__)
@@ -746,7 +747,10 @@ Be specific enough that multiple workers can implement different features simult
         logger.info(f"Director spec request logged: {request_log}")
 
     try:
-        spec_response = await llm.ainvoke(spec_prompt.format(objective=objective, project_context=project_context))
+        spec_response = await cached_ainvoke(
+            llm, spec_prompt.format(objective=objective, project_context=project_context),
+            state, call_name="design_spec"
+        )
         spec_content = str(spec_response.content)
 
         # LOG: Director spec response
@@ -849,10 +853,10 @@ Be specific enough that multiple workers can implement different features simult
         # Use first 500 chars of spec as summary
         spec_summary = spec_content[:500] + "..." if len(spec_content) > 500 else spec_content
 
-        response = await structured_llm.ainvoke(decomp_prompt.format(
+        response = await cached_ainvoke(structured_llm, decomp_prompt.format(
             objective=objective,
             spec_summary=spec_summary
-        ))
+        ), state, call_name="decompose_objective", schema=DecompositionResponse)
 
         tasks = []
         for t_def in response.tasks:
@@ -0,0 +1,155 @@
+"""
+Director Module - Dependency Matching
+=====================================
+Lexical (BM25) pre-filter for dependency query resolution.
+
+Most dependency queries name their provider almost verbatim
+("User profile API endpoint" -> "Create user profile API endpoint").
+Ranking candidate tasks with BM25 over title, description and component
+lets those queries resolve deterministically; only ambiguous queries are
+sent to the LLM, together with their top-ranked candidates.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Words that carry no matching signal in dependency queries
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "into",
+    "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "with", "all",
+    "completed", "complete", "done", "finished", "ready", "task", "tasks", "must", "needs",
+    "need", "should", "implemented", "implementation", "working", "existing", "available",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed and plurals folded."""
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in STOPWORDS or len(token) < 2:
+            continue
+        # Cheap plural folding: "endpoints" -> "endpoint", "models" -> "model"
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over task documents (title weighted above description)."""
+
+    def __init__(self, documents: List[Dict[str, Any]], k1: float = 1.5, b: float = 0.75, title_weight: int = 2):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self._term_freqs: List[Counter] = []
+        self._lengths: List[int] = []
+        doc_freq: Counter = Counter()
+
+        for doc in documents:
+            tokens = (
+                tokenize(doc.get("title", "")) * title_weight
+                + tokenize(doc.get("component", ""))
+                + tokenize(doc.get("description", ""))
+            )
+            tf = Counter(tokens)
+            self._term_freqs.append(tf)
+            self._lengths.append(len(tokens))
+            doc_freq.update(tf.keys())
+
+        n = len(documents)
+        self._avg_length = (sum(self._lengths) / n) if n else 0.0
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+    def score(self, query_tokens: List[str], index: int) -> float:
+        """BM25 score of one document for the query tokens."""
+        tf = self._term_freqs[index]
+        length_norm = 1 - self.b + self.b * (self._lengths[index] / self._avg_length if self._avg_length else 0)
+        total = 0.0
+        for term in set(query_tokens):
+            freq = tf.get(term)
+            if not freq:
+                continue
+            total += self._idf[term] * (freq * (self.k1 + 1)) / (freq + self.k1 * length_norm)
+        return total
+
+    def rank(self, query: str, exclude_ids: Optional[set] = None, top_k: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """Top-k (document, score) pairs with a positive score, best first."""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        scored = []
+        for i, doc in enumerate(self.documents):
+            if exclude_ids and doc.get("id") in exclude_ids:
+                continue
+            s = self.score(query_tokens, i)
+            if s > 0:
+                scored.append((doc, s))
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored[:top_k]
+
+    def coverage(self, query: str, doc: Dict[str, Any]) -> float:
+        """Fraction of query tokens found in the document's title/component/description."""
+        query_tokens = set(tokenize(query))
+        if not query_tokens:
+            return 0.0
+        doc_tokens = set(tokenize(f"{doc.get('title', '')} {doc.get('component', '')} {doc.get('description', '')}"))
+        return len(query_tokens & doc_tokens) / len(query_tokens)
+
+
+@dataclass
+class QueryMatch:
+    """Pre-filter outcome for one dependency query."""
+    query: Dict[str, Any]  # {"task_title", "task_id", "query"}
+    candidates: List[Tuple[Dict[str, Any], float]] = field(default_factory=list)
+    match: Optional[Dict[str, Any]] = None  # Set when the match is unambiguous
+
+    @property
+    def ambiguous(self) -> bool:
+        return self.match is None
+
+
+def prefilter_queries(
+    queries: List[Dict[str, Any]],
+    documents: List[Dict[str, Any]],
+    min_coverage: float = 0.6,
+    margin: float = 1.5,
+    top_k: int = 5,
+) -> List[QueryMatch]:
+    """
+    Rank candidate tasks for each query and resolve the unambiguous ones.
+
+    A query is resolved without the LLM when its best candidate covers at
+    least min_coverage of the query's terms and outscores the runner-up by
+    the given margin. Everything else stays ambiguous.
+
+    Args:
+        queries: [{"task_title", "task_id", "query"}] entries
+        documents: Candidate tasks [{"id", "title", "component", "description", ...}]
+        min_coverage: Required share of query terms present in the best candidate
+        margin: Required ratio between best and second-best scores
+        top_k: Candidates kept per query (sent to the LLM when ambiguous)
+
+    Returns:
+        One QueryMatch per query, in input order
+    """
+    index = BM25Index(documents)
+    results = []
+    for q in queries:
+        ranked = index.rank(q["query"], exclude_ids={q.get("task_id")}, top_k=top_k)
+        result = QueryMatch(query=q, candidates=ranked)
+        if ranked:
+            best_doc, best_score = ranked[0]
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            if index.coverage(q["query"], best_doc) >= min_coverage and best_score >= runner_up * margin:
+                result.match = best_doc
+        results.append(result)
+    return results
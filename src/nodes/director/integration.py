@@ -7,17 +7,20 @@ Resolves cross-component dependencies and validates scope.
 
 import json
 import logging
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage
 
 from orchestrator_types import Task, TaskStatus, TaskPhase, WorkerProfile
 from llm_client import get_llm
+from llm_cache import cached_ainvoke
 from .graph_utils import detect_and_break_cycles
+from .dependency_matching import BM25Index, prefilter_queries, tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -338,6 +341,44 @@ async def resolve_dependency_queries(tasks: List[Task], state: Dict[str, Any]) -
 
     logger.info(f"Resolving {len(tasks_with_queries)} feature-to-feature dependency queries")
 
+    # PRE-FILTER: Resolve lexically unambiguous queries with BM25, send the rest to the LLM
+    llm_queries = tasks_with_queries
+    candidate_tasks = all_tasks_for_matching
+    if orch_config.enable_dependency_prefilter and all_tasks_for_matching:
+        task_by_id = {t.id: t for t in tasks}
+        matches = prefilter_queries(
+            tasks_with_queries,
+            all_tasks_for_matching,
+            min_coverage=orch_config.dependency_prefilter_min_coverage,
+            margin=orch_config.dependency_prefilter_margin,
+            top_k=orch_config.dependency_prefilter_candidates,
+        )
+
+        llm_queries = []
+        for m in matches:
+            if m.ambiguous:
+                llm_queries.append({**m.query, "candidates": [doc["title"] for doc, _ in m.candidates]})
+                continue
+            task = task_by_id.get(m.query["task_id"])
+            if task and m.match["id"] not in task.depends_on:
+                task.depends_on.append(m.match["id"])
+            logger.info(f"✅ Resolved '{m.query['query']}' → '{m.match['title']}' (BM25)")
+
+        logger.info(f"🔎 BM25 pre-filter: {len(tasks_with_queries) - len(llm_queries)} resolved, "
+                    f"{len(llm_queries)} ambiguous → LLM")
+
+        if not llm_queries:
+            return tasks
+
+        # Only send ranked candidates, unless some query had no lexical match at all.
+        # Candidate titles already carry the ranking, so descriptions are trimmed.
+        if all(q["candidates"] for q in llm_queries):
+            candidate_titles = {title for q in llm_queries for title in q["candidates"]}
+            candidate_tasks = [
+                {**t, "description": t["description"][:200]}
+                for t in all_tasks_for_matching if t["title"] in candidate_titles
+            ]
+
     # Build prompt for query resolution
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are resolving cross-component dependencies using semantic matching.
@@ -352,6 +393,7 @@ YOUR JOB: For each dependency query, find the task that best satisfies it.
 
 MATCHING RULES:
 - Use SEMANTIC understanding, not exact string matching
+- Each query lists "candidates" ranked by keyword overlap; prefer them, but any available task may match
 - "Backend API endpoint for user profile data" matches "Create user profile API endpoint"
 - "Completed database schema setup" matches "Initialize SQLite database with user tables"
 - If NO task satisfies the query, return "MISSING" as the matched_task_title
@@ -384,10 +426,11 @@ Resolve each dependency query to a task title.""")
     structured_llm = llm.with_structured_output(QueryResolutionResponse)
 
     try:
-        response = await structured_llm.ainvoke(prompt.format(
-            tasks_with_queries=json.dumps(tasks_with_queries, indent=2),
-            all_tasks=json.dumps(all_tasks_for_matching, indent=2)
-        ), config={"callbacks": []})
+        response = await cached_ainvoke(structured_llm, prompt.format(
+            tasks_with_queries=json.dumps(llm_queries, indent=2),
+            all_tasks=json.dumps(candidate_tasks, indent=2)
+        ), state, call_name="resolve_dependency_queries", schema=QueryResolutionResponse,
+            config={"callbacks": []})
 
         # Apply resolutions to task dependencies
         title_to_id_map = {t["title"].lower(): t["id"] for t in all_tasks_for_matching}
@@ -397,7 +440,7 @@ Resolve each dependency query to a task title.""")
         for resolution in response.resolutions:
             # Find the task that has this query
             task = next((t for t in tasks if t.id == next(
-                (tq["task_id"] for tq in tasks_with_queries if tq["query"] == resolution.query), None
+                (tq["task_id"] for tq in llm_queries if tq["query"] == resolution.query), None
             )), None)
 
             if not task:
@@ -430,7 +473,60 @@ Resolve each dependency query to a task title.""")
         return tasks
 
 
-async def integrate_plans(suggestions: List[Dict[str, Any]], state: Dict[str, Any]) -> List[Task]:
+def select_integration_context(
+    existing_tasks: List[Dict[str, Any]],
+    suggestions: List[Dict[str, Any]],
+    limit: int = 40
+) -> List[Dict[str, Any]]:
+    """
+    Compact summaries of the existing tasks most relevant to a batch of suggestions.
+
+    Only id, title, component and depends_on are sent. When more than `limit`
+    active/pending tasks exist, they are ranked by BM25 against the suggested
+    titles and components (same-component tasks first) so the integration
+    prompt stays bounded as the plan grows.
+
+    Args:
+        existing_tasks: Task dicts already in the plan (state tasks + staged tasks)
+        suggestions: Proposed task dicts being integrated
+        limit: Maximum number of existing tasks to include
+
+    Returns:
+        List of {"id", "title", "component", "depends_on"} dicts
+    """
+    suggestion_titles = {s.get("title", "").lower() for s in suggestions}
+    candidates = [
+        t for t in existing_tasks
+        if t.get("status") in [TaskStatus.ACTIVE, TaskStatus.PLANNED, TaskStatus.READY]
+        and t.get("title", "Untitled").lower() not in suggestion_titles  # Reorg: inputs aren't context
+    ]
+
+    if len(candidates) > limit:
+        index = BM25Index(candidates)
+        components = {s.get("component", "").lower() for s in suggestions}
+        queries = [tokenize(f"{s.get('title', '')} {s.get('component', '')}") for s in suggestions]
+        scores = [max((index.score(q, i) for q in queries), default=0.0) for i in range(len(candidates))]
+        ranked = sorted(
+            range(len(candidates)),
+            key=lambda i: ((candidates[i].get("component") or "").lower() in components, scores[i]),
+            reverse=True
+        )
+        candidates = [candidates[i] for i in sorted(ranked[:limit])]
+
+    return [{
+        "id": t.get("id"),
+        "title": t.get("title", "Untitled"),
+        "component": t.get("component"),
+        "depends_on": t.get("depends_on", [])
+    } for t in candidates]
+
+
+async def integrate_plans(
+    suggestions: List[Dict[str, Any]],
+    state: Dict[str, Any],
+    staged_tasks: Optional[List[Dict[str, Any]]] = None,
+    finalize: bool = True
+) -> List[Task]:
     """
     Integrate proposed tasks from multiple planners into a cohesive plan.
     Resolves cross-component dependencies and validates scope against design spec.
@@ -438,6 +534,10 @@ async def integrate_plans(suggestions: List[Dict[str, Any]], state: Dict[str, An
     Args:
         suggestions: List of suggested tasks from planners/workers
         state: Current orchestrator state (for config, workspace_path, etc.)
+        staged_tasks: Task dicts integrated from earlier planners but not yet
+            added to the plan (streaming integration) - used as context
+        finalize: Run the linking/dependency passes (see finalize_integrated_tasks).
+            False returns Pass 1 output only, for staging.
 
     Returns:
         List of integrated Task objects with resolved dependencies
@@ -474,25 +574,12 @@ async def integrate_plans(suggestions: List[Dict[str, Any]], state: Dict[str, An
     spec_content = spec.get("content", "No design specification available")
     objective = state.get("objective", "")
 
-    # Get existing active/pending tasks for context
-    existing_tasks = state.get("tasks", [])
-    relevant_existing_tasks = []
-
-    for t_dict in existing_tasks:
-        status = t_dict.get("status")
-        if status in [TaskStatus.ACTIVE, TaskStatus.PLANNED, TaskStatus.READY]:
-            # Get title (with backwards compatibility fallback)
-            title = t_dict.get("title", "Untitled")
-
-            relevant_existing_tasks.append({
-                "id": t_dict.get("id"),
-                "title": title,
-                "component": t_dict.get("component"),
-                "phase": t_dict.get("phase"),
-                "status": status,
-                "description": t_dict.get("description", ""),
-                "depends_on": t_dict.get("depends_on", [])
-            })
+    # Get existing active/pending tasks for context (compact summaries, most relevant first)
+    staged_tasks = staged_tasks or []
+    existing_tasks = state.get("tasks", []) + staged_tasks
+    relevant_existing_tasks = select_integration_context(
+        existing_tasks, suggestions, limit=orch_config.integration_context_tasks
+    )
 
     logger.info(f"Including {len(relevant_existing_tasks)} active/pending tasks in integration context")
 
@@ -504,7 +591,7 @@ OBJECTIVE: {objective}
 DESIGN SPECIFICATION (THE SCOPE BOUNDARY):
 {spec_content}
 
-EXISTING ACTIVE/PENDING TASKS (THE RUNNING SYSTEM):
+EXISTING ACTIVE/PENDING TASKS (THE RUNNING SYSTEM - id, title, component, depends_on of the most relevant tasks):
 {existing_tasks_json}
 
 INPUT: Proposed tasks from planners and workers.
@@ -536,7 +623,9 @@ YOUR JOB (PASS 1: DEDUPLICATION & SCOPE VALIDATION ONLY):
    - DO NOT try to wire cross-component dependencies yourself - that happens in a separate pass
 
 4. **Output**:
-   - Return the COMPLETE deduplicated task list
+   - Return the COMPLETE deduplicated list of PROPOSED tasks
+   - Do NOT repeat existing tasks - they are already in the plan. Drop proposed tasks that duplicate one.
+   - You may reference existing tasks by EXACT title in `depends_on`
    - Use EXACT task titles in `depends_on` fields
    - Preserve dependency_queries for later resolution
 
@@ -547,7 +636,7 @@ If you fail to include any test tasks, your response will be REJECTED and you wi
 
 CRITICAL RULES:
 - Design spec defines what to build. Tests for those features are always valid.
-- Include all valid existing tasks in your output.
+- Existing tasks are context only - never include them in your output.
 - Do NOT over-merge tests! Backend unit tests ≠ Frontend unit tests.
 
 🚨🚨🚨 ABSOLUTE CRITICAL - NO CIRCULAR DEPENDENCIES 🚨🚨🚨
@@ -598,12 +687,19 @@ SAFE patterns:
         logger.info(f"Director request logged: {request_log} ({len(tasks_input)} new + {len(relevant_existing_tasks)} existing)")
 
     try:
-        response = await structured_llm.ainvoke(prompt.format(
+        prompt_text = prompt.format(
             objective=objective,
             spec_content=spec_content[:3000],  # Truncate if too long
             tasks_json=str(tasks_input),
             existing_tasks_json=str(relevant_existing_tasks)
-        ), config={"callbacks": []})
+        )
+        call_start = time.perf_counter()
+        response = await cached_ainvoke(
+            structured_llm, prompt_text, state,
+            call_name="integrate_plans", schema=IntegrationResponse, config={"callbacks": []}
+        )
+        logger.info(f"[INTEGRATION] {len(tasks_input)} suggestions + {len(relevant_existing_tasks)} context tasks: "
+                    f"~{len(prompt_text) // 4} prompt tokens, {time.perf_counter() - call_start:.1f}s")
 
         # LOG: Director integration response
         if logs_base_path:
@@ -659,12 +755,13 @@ Reread the instructions carefully and provide a complete task list INCLUDING TES
                     ("user", retry_user_message)
                 ])
 
-                response = await structured_llm.ainvoke(retry_prompt.format(
+                response = await cached_ainvoke(structured_llm, retry_prompt.format(
                     objective=objective,
                     spec_content=spec_content[:3000],
                     tasks_json=str(tasks_input),
                     existing_tasks_json=str(relevant_existing_tasks)
-                ), config={"callbacks": []})
+                ), state, call_name="integrate_plans_retry", schema=IntegrationResponse,
+                    config={"callbacks": []})
 
                 # Check again
                 test_tasks = [t for t in response.tasks if hasattr(t, 'phase') and t.phase.lower() == 'test']
@@ -745,12 +842,22 @@ Reread the instructions carefully and provide a complete task list INCLUDING TES
                     break
 
     # Pre-populate map with EXISTING tasks (to allow linking to completed tasks)
-    existing_tasks = state.get("tasks", [])
     for t in existing_tasks:
         t_title = t.get("title", "")
         if t_title:
             title_to_id_map[t_title.lower()] = t["id"]
 
+    # Existing tasks echoed back by the LLM are already in the plan - don't re-emit them
+    # (reorg passes existing tasks as suggestions; those are still returned)
+    suggestion_titles = {s.get("title", "").lower() for s in suggestions}
+    already_planned = [
+        t_def for t_def in response.tasks
+        if t_def.title.lower() in title_to_id_map and t_def.title.lower() not in suggestion_titles
+    ]
+    if already_planned:
+        logger.info(f"Skipping {len(already_planned)} task(s) already in the plan")
+        response.tasks = [t_def for t_def in response.tasks if t_def not in already_planned]
+
     # Create IDs and Map Titles for NEW tasks
     for t_def in response.tasks:
         # Check if title already exists in map (case-insensitive)
@@ -824,6 +931,32 @@ Reread the instructions carefully and provide a complete task list INCLUDING TES
     logger.info(f"Pass 1 complete: Deduplicated {len(new_tasks)} tasks")
     await broadcast_progress(state, f"✓ Deduplicated {len(new_tasks)} tasks from planners", "integration")
 
+    if not finalize:
+        return new_tasks
+
+    return await finalize_integrated_tasks(new_tasks, state)
+
+
+async def finalize_integrated_tasks(new_tasks: List[Task], state: Dict[str, Any]) -> List[Task]:
+    """
+    Run the post-deduplication passes over an integrated task list.
+
+    Pass 1.5 links feature roots to foundation, Pass 2 resolves dependency
+    queries, then cycles are broken and (optionally) transitive edges removed.
+    Streaming integration calls this once over all staged planner batches.
+
+    Args:
+        new_tasks: Deduplicated Task objects (Pass 1 output)
+        state: Current orchestrator state
+
+    Returns:
+        List of Task objects with resolved dependencies
+    """
+    orch_config = state.get("orch_config")
+    if not orch_config:
+        from config import OrchestratorConfig
+        orch_config = OrchestratorConfig()
+
     # PASS 1.5 (DETERMINISTIC): Link feature root tasks to last foundation task
     # This is done in CODE, not by LLM, to guarantee the tree structure
     logger.info("Pass 1.5: Linking feature components to foundation (deterministic)...")
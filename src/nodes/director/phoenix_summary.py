@@ -162,6 +162,15 @@ def _extract_conversation_digest(messages: List[BaseMessage]) -> str:
                         path = args.get('path', '?')
                         content_len = len(args.get('content', ''))
                         digest_lines.append(f"[Tool] {tool_name}('{path}', {content_len} chars)")
+                    elif tool_name == 'write_files':
+                        files = [f for f in args.get('files') or [] if isinstance(f, dict)]
+                        paths = ', '.join(f"'{f.get('path', '?')}'" for f in files)
+                        content_len = sum(len(f.get('content', '')) for f in files)
+                        digest_lines.append(f"[Tool] {tool_name}({paths}, {content_len} chars)")
+                    elif tool_name == 'edit_file':
+                        path = args.get('path', '?')
+                        hunks = len(args.get('edits') or []) or str(args.get('diff', '')).count('@@ -')
+                        digest_lines.append(f"[Tool] {tool_name}('{path}', {hunks} hunks)")
                     elif tool_name == 'read_file':
                         path = args.get('path', '?')
                         digest_lines.append(f"[Tool] {tool_name}('{path}')")
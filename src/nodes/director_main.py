@@ -31,6 +31,7 @@ from .director import (
     mock_decompose,
     decompose_objective,
     integrate_plans,
+    finalize_integrated_tasks,
     evaluate_readiness,
     process_human_resolution,
     detect_and_break_cycles,
@@ -419,10 +420,46 @@ Read the failure details below carefully and fix the issues.
     # Only print waiting message when count changes
     prev_active_planners = state.get("_prev_active_planners", -1)
 
+    # Planner plans integrated early (streaming integration) but not yet added to the plan
+    staged_plan_tasks = state.get("_staged_plan_tasks", [])
+    staged_changed = False
+
     if active_planners:
         if len(active_planners) != prev_active_planners:
             logger.info(f"Director: Waiting for {len(active_planners)} planners to complete before integrating plans")
-        # Don't process suggestions until all planners complete - skip to end
+
+        # STREAMING INTEGRATION: Deduplicate each finished planner's plan now, while others run.
+        # Results are staged (not dispatched) until all planners complete, so the final
+        # integration only has the last batch left plus the cheap linking passes.
+        from config import OrchestratorConfig
+        orch_config = state.get("orch_config") or OrchestratorConfig()
+        if orch_config.enable_incremental_integration:
+            for planner in planner_tasks:
+                if planner.status not in [TaskStatus.COMPLETE, TaskStatus.FAILED, TaskStatus.AWAITING_QA]:
+                    continue
+                raw_task = next((t for t in tasks if t["id"] == planner.id), None)
+                if not raw_task or not raw_task.get("suggested_tasks"):
+                    continue
+
+                logger.info(f"Director: Integrating plan from '{planner.title}' "
+                            f"({len(raw_task['suggested_tasks'])} suggestions, {len(active_planners)} planners still running)")
+                try:
+                    batch = await integrate_plans(
+                        raw_task["suggested_tasks"], state,
+                        staged_tasks=staged_plan_tasks, finalize=False
+                    )
+                    staged_plan_tasks = staged_plan_tasks + [task_to_dict(t) for t in batch]
+                    staged_changed = True
+                    raw_task["suggested_tasks"] = []
+                    updates.append(raw_task)
+                except Exception as e:
+                    logger.error(f"Director Error: Streaming integration failed for '{planner.title}': {e}")
+                    break  # Leave remaining suggestions for the final integration
+
+            if staged_changed:
+                # Keep state in sync immediately: suggestions were cleared in place above
+                state["_staged_plan_tasks"] = staged_plan_tasks
+                logger.info(f"Director: {len(staged_plan_tasks)} tasks staged for final integration")
     elif replan_requested:
         # MANUAL REPLAN TRIGGER
         # User says dependency tree is wrong - ask LLM to rebuild depends_on relationships
@@ -553,11 +590,23 @@ Tasks with no dependencies should map to empty array: {{"task_xxx": []}}
                     all_suggestions.extend(raw_task["suggested_tasks"])
                     tasks_with_suggestions.append(raw_task)
 
-        if all_suggestions:
-            logger.info(f"Director: Integrating {len(all_suggestions)} task suggestions")
+        if all_suggestions or staged_plan_tasks:
+            logger.info(f"Director: Integrating {len(all_suggestions)} task suggestions"
+                        + (f" + {len(staged_plan_tasks)} staged tasks" if staged_plan_tasks else ""))
 
             try:
-                new_tasks = await integrate_plans(all_suggestions, state)
+                if staged_plan_tasks:
+                    batch = await integrate_plans(
+                        all_suggestions, state, staged_tasks=staged_plan_tasks, finalize=False
+                    ) if all_suggestions else []
+                    new_tasks = await finalize_integrated_tasks(
+                        [_dict_to_task(t) for t in staged_plan_tasks] + batch, state
+                    )
+                    staged_plan_tasks = []
+                    staged_changed = True
+                    state["_staged_plan_tasks"] = []
+                else:
+                    new_tasks = await integrate_plans(all_suggestions, state)
                 updates.extend([task_to_dict(t) for t in new_tasks])
 
                 # Clear suggestions so we don't re-process
@@ -713,10 +762,17 @@ All feature work has finished. Now verify EVERYTHING works together.
     if updates:
         result["tasks"] = updates
 
+    if staged_changed:
+        result["_staged_plan_tasks"] = staged_plan_tasks
+
     # Only clear replan_requested if it was set
     if state.get("replan_requested"):
         result["replan_requested"] = False
 
+    # A "fresh" replan or restart only bypasses the LLM response cache for one director pass
+    if state.get("bypass_llm_cache"):
+        result["bypass_llm_cache"] = False
+
     # Save state for log de-duplication
     result["_director_prev_counts"] = current_counts
     if 'active_planners' in locals():
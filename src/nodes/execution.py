@@ -3,6 +3,10 @@ React loop execution for worker agents.
 
 Includes Guardian integration for drift detection - every N tool calls,
 the guardian checks if the agent is on track and can inject nudges.
+By default the check runs in the background while the agent continues;
+its nudge is injected at the next chunk boundary.
+With context compaction enabled, stale tool outputs are digested between
+chunks so the prompt does not grow without bound.
 """
 
 import logging
@@ -18,7 +22,8 @@ from config import OrchestratorConfig, ModelConfig
 from llm_logger import log_llm_request, validate_request_size, log_llm_response
 
 from .utils import _detect_modified_files_via_git, _mock_execution
-from .guardian import check_agent_alignment
+from .guardian import check_agent_alignment, BackgroundGuardian
+from .context_compaction import compact_messages, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,26 @@ def _count_tool_calls(messages: List[BaseMessage]) -> int:
     return count
 
 
+async def _run_chunk_to_tool_budget(agent, messages: List[BaseMessage], max_tool_calls: int,
+                                    recursion_limit: int) -> Dict[str, Any]:
+    """
+    Run the agent until it finishes or has made max_tool_calls tool calls.
+
+    The chunk stops right after the tool results come back, before the
+    agent's next LLM turn - ending at the recursion limit instead would
+    spend one LLM call per chunk on a "need more steps" reply.
+    """
+    result = {"messages": messages}
+    async for result in agent.astream(
+        {"messages": messages}, config={"recursion_limit": recursion_limit}, stream_mode="values"
+    ):
+        new_messages = result["messages"][len(messages):]
+        if (new_messages and isinstance(new_messages[-1], ToolMessage)
+                and _count_tool_calls(new_messages) >= max_tool_calls):
+            break
+    return result
+
+
 async def _execute_react_loop(
     task: Task,
     tools: List[Callable],
@@ -112,12 +137,28 @@ async def _execute_react_loop(
 
     # NOTE: The recursion_limit=150 is the circuit breaker for infinite loops.
     # With guardian enabled, we run in smaller chunks and check alignment between chunks.
+    # With context compaction enabled, chunk boundaries are also where the context is compacted.
 
     # Check if guardian is enabled
     guardian_enabled = orch_config.enable_guardian
-    check_interval = orch_config.guardian_check_interval if guardian_enabled else 150
+    compaction_enabled = getattr(orch_config, "enable_context_compaction", False)
+    # Chunks that exist only so the context can be compacted end on their tool-call budget
+    compaction_chunks = compaction_enabled and not guardian_enabled
+    if guardian_enabled:
+        check_interval = orch_config.guardian_check_interval
+    elif compaction_chunks:
+        # Chunk the loop so the context can be compacted between chunks
+        check_interval = orch_config.compaction_interval
+    else:
+        check_interval = 150
     total_limit = 150  # Overall limit
 
+    # Background guardian: checks run concurrently, never blocking the agent
+    background_guardian = (
+        BackgroundGuardian(task, orch_config)
+        if guardian_enabled and orch_config.guardian_background else None
+    )
+
     # Invoke agent - with guardian, we run in chunks
     try:
         current_messages = inputs["messages"].copy()
@@ -134,16 +175,34 @@ async def _execute_react_loop(
                 logger.warning(f"  [AGENT] Reached total iteration limit ({total_limit})")
                 break
 
+            # Compact the context sent to the agent (current_messages keeps the full history)
+            agent_messages = current_messages
+            if compaction_enabled and total_tool_calls > 0:
+                agent_messages, compaction_stats = compact_messages(
+                    current_messages,
+                    keep_recent=orch_config.compaction_keep_recent,
+                    role_budgets=orch_config.compaction_role_budgets,
+                )
+                if compaction_stats.messages_compacted:
+                    logger.info(
+                        f"  [COMPACT] {compaction_stats.messages_compacted} msgs compacted "
+                        f"({compaction_stats.reads_deduplicated} superseded reads): "
+                        f"~{compaction_stats.original_chars // 4} → ~{estimate_tokens(agent_messages)} tokens"
+                    )
+
             # Run agent for this chunk
             # NOTE: LangGraph counts ALL graph steps (reasoning + tool calls + responses), not just tool calls
             # Each tool call = ~3 graph steps (think → call → result), so multiply by 3
             # Add small buffer for final response
-            chunk_inputs = {"messages": current_messages}
+            chunk_inputs = {"messages": agent_messages}
             recursion_limit = (chunk_limit * 3) + 5
-            result = await agent.ainvoke(chunk_inputs, config={"recursion_limit": recursion_limit})
+            if compaction_chunks:
+                result = await _run_chunk_to_tool_budget(agent, agent_messages, chunk_limit, recursion_limit)
+            else:
+                result = await agent.ainvoke(chunk_inputs, config={"recursion_limit": recursion_limit})
 
-            # Update message history
-            current_messages = result["messages"]
+            # Update message history - the agent returns its input followed by the new messages
+            current_messages = current_messages + result["messages"][len(agent_messages):]
             new_tool_calls = _count_tool_calls(current_messages)
             tool_calls_this_chunk = new_tool_calls - total_tool_calls
             total_tool_calls = new_tool_calls
@@ -159,18 +218,29 @@ async def _execute_react_loop(
             # This is the PERFECT time for guardian to check in and provide guidance
             if agent_done and last_msg and hasattr(last_msg, 'content'):
                 content = str(last_msg.content).lower()
-                if "need more steps" in content or ("sorry" in content and "steps" in content):
+                hit_step_limit = "need more steps" in content or ("sorry" in content and "steps" in content)
+                if hit_step_limit and compaction_chunks and total_tool_calls < total_limit:
+                    # Compaction chunk that ran out of steps before its tool budget (not a
+                    # stuck agent): drop the notice and resume from the last tool result
+                    agent_done = False
+                    current_messages.pop()
+                    logger.info(f"  [COMPACT] Chunk boundary after {total_tool_calls} tool calls")
+                elif hit_step_limit:
                     logger.warning(f"  [AGENT] Hit recursion limit - invoking guardian for guidance...")
                     agent_done = False  # Force continuation
 
                     # Guardian check at recursion limit - agent needs help continuing
                     if orch_config.enable_guardian:
-                        nudge = await check_agent_alignment(
-                            task=task,
-                            messages=current_messages,
-                            config=orch_config,
-                            iteration_count=total_tool_calls
-                        )
+                        if background_guardian:
+                            # Use a finished background check if there is one - don't wait
+                            nudge = background_guardian.collect()
+                        else:
+                            nudge = await check_agent_alignment(
+                                task=task,
+                                messages=current_messages,
+                                config=orch_config,
+                                iteration_count=total_tool_calls
+                            )
                         if nudge:
                             nudge_msg = HumanMessage(content=f"[GUIDANCE]: {nudge.message}")
                             current_messages.append(nudge_msg)
@@ -191,7 +261,18 @@ async def _execute_react_loop(
                 break
 
             # Guardian check every N tool calls
-            if guardian_enabled and (total_tool_calls - last_check_at) >= check_interval:
+            if background_guardian:
+                # Inject the nudge of a check that finished during this chunk (drift only)
+                nudge = background_guardian.collect()
+                if nudge:
+                    current_messages.append(HumanMessage(content=f"[GUIDANCE]: {nudge.message}"))
+                    logger.info(f"  [GUARDIAN] Injected nudge into conversation")
+
+                if (total_tool_calls - last_check_at) >= check_interval:
+                    last_check_at = total_tool_calls
+                    background_guardian.start_check(current_messages, total_tool_calls)
+
+            elif guardian_enabled and (total_tool_calls - last_check_at) >= check_interval:
                 last_check_at = total_tool_calls
 
                 nudge = await check_agent_alignment(
@@ -207,15 +288,27 @@ async def _execute_react_loop(
                     current_messages.append(nudge_msg)
                     logger.info(f"  [GUARDIAN] Injected nudge into conversation")
 
+            elif (total_tool_calls - last_check_at) >= check_interval:
+                # Chunking for compaction only - open the next chunk window
+                last_check_at = total_tool_calls
+
             # Safety: if no tool calls happened in this chunk, agent might be stuck
             if tool_calls_this_chunk == 0 and not agent_done:
                 logger.warning(f"  [AGENT] No tool calls in chunk - agent may be stuck")
                 break
 
+        if background_guardian:
+            await background_guardian.cancel()
+            logger.info(f"  [GUARDIAN] {background_guardian.checks_started} background checks, "
+                        f"{background_guardian.checks_dropped} dropped past deadline")
+
         # Ensure result contains all messages including any injected nudges
         result["messages"] = current_messages
 
     except Exception as e:
+        if background_guardian:
+            await background_guardian.cancel()
+
         # Handle errors gracefully - return AAR instead of crashing
         error_type = type(e).__name__
         error_msg = str(e)
@@ -318,7 +411,7 @@ async def _execute_react_loop(
                     # Get the corresponding ToolMessage result
                     tool_result = tool_results.get(tool_call_id) if tool_call_id else None
 
-                    if tc["name"] in ["write_file", "append_file"]:
+                    if tc["name"] in ["write_file", "edit_file", "append_file"]:
                         path = tc["args"].get("path")
                         logger.info(f"  [DEBUG] {tc['name']} call: id={tool_call_id}, path={path}, has_result={tool_result is not None}")
                         if path:
@@ -334,6 +427,18 @@ async def _execute_react_loop(
                             else:
                                 # No result found - might be a partial execution, don't count it
                                 logger.info(f"  [SKIP] No result found for {tc['name']} call to {path}")
+                    elif tc["name"] == "write_files":
+                        # One result line per file: "<path>: Successfully wrote ..." or "<path>: Error/BLOCKED ..."
+                        result_lines = str(tool_result.content).splitlines() if tool_result else []
+                        for item in tc["args"].get("files") or []:
+                            path = item.get("path") if isinstance(item, dict) else None
+                            if not path:
+                                continue
+                            if any(line.startswith(f"{path}: Successfully") for line in result_lines):
+                                files_modified.append(path)
+                                logger.info(f"  [TRACKED] write_files: {path}")
+                            else:
+                                logger.info(f"  [SKIP] write_files did not write {path}")
 
     # Parse tool calls for task creation and completion markers (not file operations)
     # Build a map of tool_call_id -> ToolMessage for success checking
@@ -4,10 +4,13 @@ Agent Orchestrator — Guardian Node
 Version 2.0 — December 2025
 
 Guardian monitors agent execution and injects nudges when agents drift off-course.
-Called synchronously every N tool calls during ReAct loop execution.
+Called every N tool calls during ReAct loop execution - either inline, or in the
+background (BackgroundGuardian) so the agent never waits on the guardian model.
 """
 
+import asyncio
 import logging
+import time
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
@@ -203,6 +206,80 @@ async def check_agent_alignment(
         return None
 
 
+class BackgroundGuardian:
+    """
+    Runs alignment checks concurrently with the ReAct loop.
+
+    start_check() snapshots the recent messages and launches the check as an
+    asyncio task; the agent keeps working. collect() is called at each chunk
+    boundary and returns the nudge once the check has finished (None if the
+    agent is on track or the check is still running). Checks that outlive
+    the deadline are cancelled and dropped.
+    """
+
+    def __init__(self, task: Task, config: OrchestratorConfig, deadline_seconds: Optional[float] = None):
+        self.task = task
+        self.config = config
+        self.deadline_seconds = deadline_seconds if deadline_seconds is not None else config.guardian_deadline_seconds
+        self._pending: Optional[asyncio.Task] = None
+        self._started_at = 0.0
+        self._started_iteration = 0
+        self.checks_started = 0
+        self.checks_dropped = 0
+
+    @property
+    def in_flight(self) -> bool:
+        return self._pending is not None and not self._pending.done()
+
+    def start_check(self, messages: List[BaseMessage], iteration_count: int) -> bool:
+        """Launch a check on a snapshot of recent messages. Skipped if one is already running."""
+        if self.in_flight:
+            logger.info(f"  [GUARDIAN] Previous check still running - skipping check at iteration {iteration_count}")
+            return False
+
+        snapshot = list(messages[-self.config.guardian_context_window:])
+        self._pending = asyncio.create_task(
+            check_agent_alignment(self.task, snapshot, self.config, iteration_count)
+        )
+        self._started_at = time.monotonic()
+        self._started_iteration = iteration_count
+        self.checks_started += 1
+        return True
+
+    def collect(self) -> Optional[GuardianNudge]:
+        """Non-blocking: the finished check's nudge, or None (running, on track, or dropped)."""
+        if self._pending is None:
+            return None
+
+        if self._pending.done():
+            pending, self._pending = self._pending, None
+            if pending.cancelled() or pending.exception():
+                return None
+            nudge = pending.result()
+            if nudge:
+                logger.info(f"  [GUARDIAN] Background check from iteration {self._started_iteration} "
+                            f"finished after {time.monotonic() - self._started_at:.1f}s with a nudge")
+            return nudge
+
+        if time.monotonic() - self._started_at > self.deadline_seconds:
+            logger.warning(f"  [GUARDIAN] Check from iteration {self._started_iteration} exceeded "
+                           f"{self.deadline_seconds:.0f}s deadline - dropped")
+            self._pending.cancel()
+            self._pending = None
+            self.checks_dropped += 1
+        return None
+
+    async def cancel(self):
+        """Cancel any in-flight check (agent finished or failed)."""
+        if self.in_flight:
+            self._pending.cancel()
+            try:
+                await self._pending
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._pending = None
+
+
 def guardian_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Guardian graph node (for future use if we add guardian as graph node).
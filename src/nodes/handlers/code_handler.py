@@ -18,10 +18,15 @@ logger = logging.getLogger(__name__)
 # Import tools (ASYNC versions for non-blocking execution)
 from tools import (
     read_file_async as read_file,
+    read_files_async as read_files,
+    search_code_async as search_code,
     write_file_async as write_file,
+    write_files_async as write_files,
+    edit_file_async as edit_file,
     delete_file_async as delete_file,
     list_directory_async as list_directory,
     file_exists_async as file_exists,
+    stat_files_async as stat_files,
     run_python_async as run_python,
     run_shell_async as run_shell
 )
@@ -35,8 +40,8 @@ async def _code_handler(task: Task, state: Dict[str, Any], config: Dict[str, Any
     """Coding tasks (async)."""
     # Tools for code workers - includes execution for verification
     tools = [
-        read_file, write_file, delete_file, list_directory, file_exists,
-        run_python, run_shell, report_existing_implementation
+        read_file, read_files, write_file, write_files, edit_file, delete_file, list_directory, search_code,
+        file_exists, stat_files, run_python, run_shell, report_existing_implementation
     ]
 
     # Bind tools to worktree
@@ -141,10 +146,10 @@ CRITICAL INSTRUCTIONS:
 1. **THE SPEC IS THE BIBLE**: Check `design_spec.md` in the project root. You MUST follow it exactly for API routes, data models, and file structure.
 2. BEFORE coding, check agents-work/plans/ folder for any relevant plans.
 3. Read any plan files to understand the intended design and architecture.
-4. Use `list_directory` and `read_file` to explore the codebase FIRST.
+4. Use `list_directory`, `search_code` and `read_file` to explore the codebase FIRST.
 5. **🚨 ALWAYS CHECK IF FILE EXISTS BEFORE CREATING 🚨**:
-   - **BEFORE calling write_file, ALWAYS call file_exists first!**
-   - If file exists: READ it, then EXTEND/MODIFY it (never recreate!)
+   - **BEFORE calling write_file, ALWAYS call file_exists first!** (use `stat_files` to check many paths in one call)
+   - If file exists: READ it, then EXTEND/MODIFY it with `edit_file` (never recreate!)
    - If file doesn't exist: Create it with write_file
    - **Phoenix retries get a fresh worktree with ALL previously merged files**
    - Creating a file that already exists will cause add/add merge conflicts
@@ -154,7 +159,8 @@ CRITICAL INSTRUCTIONS:
    - This tool is ONLY for pre-existing code that you FOUND, NOT code you just created
    - **CRITICAL**: If YOU wrote files in THIS session, DO NOT call this tool - your work needs to be committed!
    - Only use this to avoid duplicate work when another agent already finished the task
-7. If the feature does NOT exist, use `write_file` to create or modify files.
+7. If the feature does NOT exist, use `write_file` to create files and `edit_file` to change existing ones.
+   When creating several files, send them in ONE `write_files` call instead of one `write_file` call each.
 8. DO NOT output code in the chat. Only use the tools.
 9. You are working in a real file system. Your changes are persistent.
 10. Keep your chat responses extremely concise (e.g., "Reading file...", "Writing index.html...").
@@ -12,7 +12,10 @@ from orchestrator_types import Task, WorkerProfile, WorkerResult
 # Import tools (ASYNC versions for non-blocking execution)
 from tools import (
     read_file_async as read_file,
+    read_files_async as read_files,
+    search_code_async as search_code,
     write_file_async as write_file,
+    edit_file_async as edit_file,
     list_directory_async as list_directory,
     file_exists_async as file_exists,
     run_shell_async as run_shell
@@ -32,7 +35,7 @@ async def _merge_handler(task: Task, state: Dict[str, Any], config: Dict[str, An
     """
     # Tools for merge workers - read/write files, shell for git operations
     tools = [
-        read_file, write_file, list_directory, file_exists, run_shell
+        read_file, read_files, write_file, edit_file, list_directory, search_code, file_exists, run_shell
     ]
 
     # Bind tools to worktree
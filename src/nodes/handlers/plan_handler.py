@@ -13,9 +13,14 @@ logger = logging.getLogger(__name__)
 # Import tools (ASYNC versions for non-blocking execution)
 from tools import (
     read_file_async as read_file,
+    read_files_async as read_files,
+    search_code_async as search_code,
     write_file_async as write_file,
+    write_files_async as write_files,
+    edit_file_async as edit_file,
     list_directory_async as list_directory,
-    file_exists_async as file_exists
+    file_exists_async as file_exists,
+    stat_files_async as stat_files
 )
 
 from ..tools_binding import _bind_tools
@@ -36,7 +41,7 @@ async def _plan_handler(task: Task, state: Dict[str, Any], config: Dict[str, Any
     if planner_count >= MAX_PLANNERS:
         logger.warning(f"Max planner limit reached ({MAX_PLANNERS}). Forcing direct task creation.")
 
-    tools = [read_file, write_file, list_directory, file_exists, create_subtasks]
+    tools = [read_file, read_files, write_file, write_files, edit_file, list_directory, search_code, file_exists, stat_files, create_subtasks]
     tools = _bind_tools(tools, state, WorkerProfile.PLANNER)
 
     # Platform-specific shell warning
@@ -12,10 +12,13 @@ from orchestrator_types import Task, WorkerProfile, WorkerResult
 # Import tools (ASYNC versions for non-blocking execution)
 from tools import (
     read_file_async as read_file,
+    read_files_async as read_files,
+    search_code_async as search_code,
     write_file_async as write_file,
+    edit_file_async as edit_file,
     list_directory_async as list_directory
 )
-from tools.search_tools import get_tavily_search_tool
+from tools.search_tools import get_web_search_tool
 
 from ..tools_binding import _bind_tools
 from ..execution import _execute_react_loop
@@ -29,25 +32,25 @@ async def _research_handler(task: Task, state: Dict[str, Any], config: Dict[str,
     
     Workflow:
     1. Agent analyzes task and formulates search queries
-    2. Uses Tavily search to gather information
+    2. Uses web search (cached, several queries per call) to gather information
     3. Synthesizes findings into a comprehensive report
     4. Saves report to research-results/ directory
     """
     logger.info(f"Research handler: Starting research for task {task.id}")
     
-    # Get Tavily search tool
+    # Get web search tool (shared client: one HTTP session and query cache for all workers)
     try:
-        search_tool = get_tavily_search_tool(max_results=5)
+        search_tool = get_web_search_tool(max_results=5)
     except ValueError as e:
         logger.error(f"Failed to initialize search tool: {e}")
         # Provide fallback with limited tools
         search_tool = None
     
     # Build tool list
-    tools = [read_file, write_file, list_directory]
+    tools = [read_file, read_files, write_file, edit_file, list_directory, search_code]
     if search_tool:
         tools.append(search_tool)
-        logger.info("✅ Tavily search tool enabled")
+        logger.info("✅ Web search tool enabled")
     else:
         logger.warning("⚠️ Search tool unavailable - research will be limited")
     
@@ -60,9 +63,9 @@ Your goal is to gather comprehensive information on the given topic and synthesi
 
 ## Research Process:
 1. **Understand the Topic**: Break down the research question into key aspects
-2. **Search**: Use the tavily_search_results tool to find relevant information
+2. **Search**: Use the web_search tool to find relevant information
    - Formulate specific, targeted queries
-   - Search multiple times from different angles if needed
+   - Pass several queries from different angles in ONE call; results are merged and de-duplicated
 3. **Analyze**: Review search results critically
    - Look for authoritative sources
    - Cross-reference information
@@ -81,7 +84,7 @@ Your goal is to gather comprehensive information on the given topic and synthesi
 - Keep it actionable and relevant to the task
 
 ## Available Tools:
-- `tavily_search_results`: Search the web (returns title, url, content, score)
+- `web_search`: Search the web with a list of queries (returns title, url, snippet, score)
 - `write_file`: Save your research report
 - `read_file`: Read existing files if needed
 - `list_directory`: Check directory contents
@@ -19,11 +19,16 @@ from orchestrator_types import Task, WorkerProfile, WorkerResult, AAR
 # Import tools (ASYNC versions for non-blocking execution)
 from tools import (
     read_file_async as read_file,
+    read_files_async as read_files,
+    search_code_async as search_code,
     write_file_async as write_file,
+    write_files_async as write_files,
+    edit_file_async as edit_file,
     list_directory_async as list_directory,
     run_python_async as run_python,
     run_shell_async as run_shell,
-    file_exists_async as file_exists
+    file_exists_async as file_exists,
+    stat_files_async as stat_files
 )
 
 from ..tools_binding import _bind_tools
@@ -44,7 +49,7 @@ async def _test_architect_handler(task: Task, state: Dict[str, Any], config: Dic
     - Writes tests that MUST FAIL initially
     - Verifies RED state before passing to Code Worker
     """
-    tools = [read_file, write_file, list_directory, run_python, run_shell, file_exists, create_subtasks]
+    tools = [read_file, read_files, write_file, write_files, edit_file, list_directory, search_code, run_python, run_shell, file_exists, stat_files, create_subtasks]
     tools = _bind_tools(tools, state, WorkerProfile.TEST_ARCHITECT)
 
     # Shared venv path at workspace root (not in worktree)
@@ -10,7 +10,11 @@ from orchestrator_types import Task, WorkerProfile, WorkerResult
 # Import tools (ASYNC versions for non-blocking execution)
 from tools import (
     read_file_async as read_file,
+    read_files_async as read_files,
+    search_code_async as search_code,
     write_file_async as write_file,
+    write_files_async as write_files,
+    edit_file_async as edit_file,
     list_directory_async as list_directory,
     run_python_async as run_python,
     run_shell_async as run_shell
@@ -27,7 +31,7 @@ PLATFORM = f"OS - {platform.system()}, Release: {platform.release()}"
 async def _test_handler(task: Task, state: Dict[str, Any], config: Dict[str, Any] = None) -> WorkerResult:
     """Testing tasks (async)."""
     # Tester now has create_subtasks to reject work and request fixes
-    tools = [read_file, write_file, list_directory, run_python, run_shell, create_subtasks]
+    tools = [read_file, read_files, write_file, write_files, edit_file, list_directory, search_code, run_python, run_shell, create_subtasks]
     tools = _bind_tools(tools, state, WorkerProfile.TESTER)
 
     # Shared venv path at workspace root (not in worktree)
@@ -9,7 +9,11 @@ from orchestrator_types import Task, WorkerProfile, WorkerResult
 # Import tools (ASYNC versions for non-blocking execution)
 from tools import (
     read_file_async as read_file,
+    read_files_async as read_files,
+    search_code_async as search_code,
     write_file_async as write_file,
+    write_files_async as write_files,
+    edit_file_async as edit_file,
     list_directory_async as list_directory
 )
 
@@ -19,7 +23,7 @@ from ..execution import _execute_react_loop
 
 async def _write_handler(task: Task, state: Dict[str, Any], config: Dict[str, Any] = None) -> WorkerResult:
     """Writing tasks (async)."""
-    tools = [read_file, write_file, list_directory]
+    tools = [read_file, read_files, write_file, write_files, edit_file, list_directory, search_code]
     tools = _bind_tools(tools, state, WorkerProfile.WRITER)
 
     system_prompt = """You are a technical writer.
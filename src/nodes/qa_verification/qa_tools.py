@@ -11,6 +11,8 @@ from typing import List, Optional
 from pathlib import Path
 from langchain_core.tools import tool
 
+from tools.file_cache import read_text_cached
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,7 +61,8 @@ def create_qa_tools(worktree_path: str, workspace_path: str = None):
             if not full_path.is_file():
                 return f"ERROR: {file_path} is not a file"
             
-            content = full_path.read_text(encoding="utf-8", errors="ignore")
+            # Shared with the worker that wrote the worktree - unchanged files are served from memory
+            content = read_text_cached(full_path, root=worktree_path, errors="ignore")
             
             # Truncate very long files
             if len(content) > 5000:
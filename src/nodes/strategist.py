@@ -7,6 +7,7 @@ QA evaluation node with LLM-based test result evaluation.
 Now includes TDD validation for Red/Green verification.
 """
 
+import asyncio
 import logging
 import uuid
 import os
@@ -17,6 +18,8 @@ from state import OrchestratorState
 from llm_client import get_llm
 from langchain_core.messages import SystemMessage, HumanMessage
 from orchestrator_types import TaskStatus, TaskPhase, WorkerProfile
+from tools.file_cache import read_text_cached
+from tools.file_index import get_file_index
 
 # Import QA Agent for verification
 from .qa_verification.qa_agent import run_qa_agent
@@ -47,7 +50,7 @@ async def _validate_tdd_red_phase(task: Dict[str, Any], workspace_path: str, con
         }
 
     try:
-        content = test_spec_path.read_text(encoding="utf-8")
+        content = read_text_cached(test_spec_path, root=workspace_path)
 
         # Check for RED verification section
         content_lower = content.lower()
@@ -143,7 +146,7 @@ async def _validate_tdd_green_phase(task: Dict[str, Any], workspace_path: str, c
     # 1. Check test results file (worktree only)
     if test_results_path and test_results_path.exists():
         try:
-            test_content = test_results_path.read_text(encoding="utf-8")
+            test_content = read_text_cached(test_results_path, root=task_worktree_path)
             logger.info(f"  [TDD] Read test results file: {test_results_path}")
         except Exception as e:
             logger.warning(f"  [TDD] Error reading test results: {e}")
@@ -585,6 +588,22 @@ def _rewire_dependencies_for_merge(
     return updated_count
 
 
+def _merged_file_owners(workspace_path: str, files_modified: List[str], branch: str) -> Dict[str, str]:
+    """
+    filesystem_index entries for a task merged to main.
+
+    Maps each file the task modified that still exists on main (checked
+    against the workspace file index) to the task's branch.
+    """
+    index = get_file_index(workspace_path)
+    owners = {}
+    for path in files_modified:
+        rel_path = os.path.relpath(Path(workspace_path) / path, workspace_path).replace("\\", "/")
+        if not rel_path.startswith("..") and rel_path in index:
+            owners[rel_path] = branch
+    return owners
+
+
 async def _evaluate_test_results_with_llm(task: Dict[str, Any], test_results_content: str, objective: str, config: Any) -> Dict[str, Any]:
     """
     Use LLM to evaluate test results against acceptance criteria AND original objective (async version).
@@ -801,6 +820,7 @@ async def strategist_node(state: Dict[str, Any], config: RunnableConfig = None)
     workspace_path = state.get("_workspace_path")
     
     task_memories = {}
+    filesystem_index = dict(state.get("filesystem_index") or {})
 
     # CRITICAL: Import copy for creating task copies
     # Strategist should NOT modify state directly - dispatch is the sole place for that
@@ -920,7 +940,7 @@ async def strategist_node(state: Dict[str, Any], config: RunnableConfig = None)
 
                 elif test_results_path and test_results_path.exists():
                     try:
-                        test_content = test_results_path.read_text(encoding="utf-8")
+                        test_content = read_text_cached(test_results_path)
 
                         # TDD: Check for trivial tests (anti-pattern)
                         triviality_check = _check_test_triviality(test_content)
@@ -1220,6 +1240,12 @@ async def strategist_node(state: Dict[str, Any], config: RunnableConfig = None)
                                 merge_result = await wt_manager.merge_to_main(task_id)
                                 if merge_result.success:
                                     logger.info(f"  [MERGED] Task {task_id} merged successfully to main")
+                                    info = wt_manager.worktrees.get(task_id)
+                                    if info and workspace_path:
+                                        filesystem_index.update(await asyncio.to_thread(
+                                            _merged_file_owners, workspace_path,
+                                            (task.get("aar") or {}).get("files_modified", []), info.branch_name
+                                        ))
                                 elif merge_result.conflict and not is_merge_task:
                                     # Merge conflict after successful rebase - spawn merge agent
                                     logger.warning(f"  [MERGE CONFLICT] Spawning merge agent for {task_id}")
@@ -1324,4 +1350,9 @@ async def strategist_node(state: Dict[str, Any], config: RunnableConfig = None)
             # Continue - this section is informational only
 
     logger.info("STRATEGIST NODE: Returning normally")
-    return {"tasks": updates, "task_memories": task_memories} if updates else {}
+    if not updates:
+        return {}
+    result = {"tasks": updates, "task_memories": task_memories}
+    if filesystem_index != (state.get("filesystem_index") or {}):
+        result["filesystem_index"] = filesystem_index
+    return result
@@ -4,44 +4,187 @@ Tool binding and wrapper functions for worker agents.
 
 import logging
 import os
-from typing import List, Callable, Dict, Any, Set
+from typing import List, Callable, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from langchain_core.tools import StructuredTool
 
+from llm_logger import log_tool_savings
 from orchestrator_types import WorkerProfile
 
 logger = logging.getLogger(__name__)
 
 
-def _create_read_file_wrapper(tool, worktree_path, workspace_path, files_read: Set[str]):
-    """Create read_file wrapper that tracks which files have been read."""
+class ReadTracker:
+    """
+    Which files - and which line ranges of them - the agent has read this session.
+
+    read_file can return a window of a file, so a path counts as read as soon
+    as any part of it was seen, but overwriting it with write_file requires
+    every line to have been read in full. A line longer than max_bytes is
+    only ever seen in pieces, so a file with one never counts as fully read.
+    """
+
+    def __init__(self):
+        self._ranges: Dict[str, List[Tuple[int, int]]] = {}  # path -> merged (start, end) line ranges
+        self._total_lines: Dict[str, int] = {}
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        return path.replace("\\", "/").lower().strip("/")
+
+    def record_window(self, window):
+        """Record a FileWindow returned by read_file."""
+        key = self.normalize(window.path)
+        self._total_lines[key] = window.total_lines
+        ranges = self._ranges.setdefault(key, [])
+        first, last = window.whole_lines  # A line cut by max_bytes was only partly seen
+        if window.complete:
+            ranges[:] = [(1, max(window.total_lines, 1))]
+        elif last >= first:
+            self._add_range(ranges, first, last)
+        logger.debug(f"  [READ TRACKER] '{key}' lines {self.describe(key)} ({len(self._ranges)} files read)")
+
+    def mark_full(self, path: str, total_lines: int):
+        """The agent knows the whole file (e.g. it just wrote it)."""
+        key = self.normalize(path)
+        self._total_lines[key] = total_lines
+        self._ranges[key] = [(1, max(total_lines, 1))]
+
+    def apply_edit(self, path: str, line_edits: List[Tuple[int, int, int]], total_lines: int):
+        """
+        Account for an edit_file patch.
+
+        The edited regions count as read (the hunks showed their old content),
+        and ranges read earlier are shifted to the file's new line numbers.
+        """
+        key = self.normalize(path)
+
+        def shift(line: int) -> int:
+            # Old line outside every edit -> its new line number
+            return line + sum(count - (end - start + 1) for start, end, count in line_edits if end < line)
+
+        ranges = []
+        for lo, hi in self._ranges.get(key, []):
+            cur = lo
+            for start, end, _ in line_edits:
+                if start > hi:
+                    break
+                if end < cur and not (end == start - 1 and start > cur):
+                    continue
+                if start > cur:
+                    ranges.append((shift(cur), shift(start - 1)))
+                cur = max(cur, end + 1)
+            if cur <= hi:
+                ranges.append((shift(cur), shift(hi)))
+
+        delta = 0
+        for start, end, count in line_edits:
+            if count:
+                ranges.append((start + delta, start + delta + count - 1))
+            delta += count - (end - start + 1)
+
+        self._total_lines[key] = total_lines
+        self._ranges[key] = []
+        for lo, hi in ranges:
+            self._add_range(self._ranges[key], lo, hi)
+        logger.debug(f"  [READ TRACKER] '{key}' edited, lines {self.describe(key)} known")
+
+    def covers(self, path: str, start: int = 1, end: Optional[int] = None) -> bool:
+        """True if lines start..end (default: to the end of the file) were all read."""
+        key = self.normalize(path)
+        if key not in self._ranges:
+            return False
+        end = self._total_lines.get(key, 0) if end is None else end
+        if end < start:
+            return True
+        return any(lo <= start and end <= hi for lo, hi in self._ranges[key])
+
+    def describe(self, path: str) -> str:
+        key = self.normalize(path)
+        seen = ", ".join(f"{lo}-{hi}" for lo, hi in self._ranges.get(key, [])) or "none"
+        return f"{seen} of {self._total_lines.get(key, 0)}"
+
+    @staticmethod
+    def _add_range(ranges: List[Tuple[int, int]], start: int, end: int):
+        merged = []
+        for lo, hi in sorted(ranges + [(start, end)]):
+            if merged and lo <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        ranges[:] = merged
+
+    def __contains__(self, path: str) -> bool:
+        return self.normalize(path) in self._ranges
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+
+def _create_read_file_wrapper(tool, worktree_path, workspace_path, files_read: ReadTracker):
+    """Create read_file wrapper that tracks which files (and lines) have been read."""
     # additional_roots allows access to main workspace (for .venv, etc.)
     additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
     
-    async def read_file_wrapper(path: str, encoding: str = "utf-8"):
-        """Read the contents of a file."""
-        # Normalize path for tracking
-        normalized = path.replace("\\", "/").lower().strip("/")
-        files_read.add(normalized)
-        logger.debug(f"  [READ TRACKER] Added '{normalized}' to files_read ({len(files_read)} total)")
-        return await tool(path, encoding, root=worktree_path, additional_roots=additional_roots)
+    async def read_file_wrapper(path: str, encoding: str = "utf-8", start_line: Optional[int] = None,
+                                end_line: Optional[int] = None, max_bytes: Optional[int] = None,
+                                line_offset: int = 0):
+        """Read a file, or lines start_line..end_line of it. Large files are returned in windows with size and line-count metadata."""
+        return await tool(path, encoding, root=worktree_path, additional_roots=additional_roots,
+                          start_line=start_line, end_line=end_line, max_bytes=max_bytes,
+                          on_window=files_read.record_window, line_offset=line_offset)
     return read_file_wrapper
 
 
-def _create_write_file_wrapper(tool, worktree_path, workspace_path, files_read: Set[str]):
+def _create_read_files_wrapper(tool, worktree_path, workspace_path, files_read: ReadTracker):
+    """Create read_files wrapper (batch read) that tracks every file read."""
+    additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
+
+    async def read_files_wrapper(paths: List[str], encoding: str = "utf-8"):
+        """Read several small files in one call."""
+        return await tool(paths, encoding, root=worktree_path, additional_roots=additional_roots,
+                          on_window=files_read.record_window)
+    return read_files_wrapper
+
+
+def _write_guard(path: str, worktree_path, files_read: ReadTracker) -> Optional[str]:
+    """Why a full overwrite of path must be refused: "unread", "partial", or None if it is allowed."""
+    if not (Path(worktree_path) / path.lstrip("/\\")).exists():
+        return None
+    if path not in files_read:
+        return "unread"
+    if not files_read.covers(path):
+        return "partial"
+    return None
+
+
+def _lines_written(content: str) -> int:
+    return content.count("\n") + (0 if content.endswith("\n") or not content else 1)
+
+
+def _create_write_file_wrapper(tool, worktree_path, workspace_path, files_read: ReadTracker):
     """Create write_file wrapper that enforces read-before-write for existing files."""
     additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
     
     async def write_file_wrapper(path: str, content: str, encoding: str = "utf-8"):
         """Write content to a file. MUST read existing files first!"""
-        # Normalize path for tracking
-        normalized = path.replace("\\", "/").lower().strip("/")
-        
-        # Check if file exists in worktree
-        full_path = Path(worktree_path) / path.lstrip("/\\")
-        
-        if full_path.exists() and normalized not in files_read:
+        blocked = _write_guard(path, worktree_path, files_read)
+
+        if blocked == "partial":
+            # Only part of the file was read - a full overwrite would drop lines the agent never saw
+            logger.warning(f"  [WRITE GUARD] ❌ BLOCKED write to '{path}' - only lines {files_read.describe(path)} were read")
+            return (
+                f"❌ WRITE BLOCKED: write_file replaces all of '{path}', but you have only read lines "
+                f"{files_read.describe(path)}.\n\n"
+                f"REQUIRED ACTION: use edit_file('{path}', edits=[...]) to change only the lines you read, "
+                f"or read the remaining lines with read_file('{path}', start_line=...) first."
+            )
+
+        if blocked == "unread":
             # File exists but was NOT read first - reject!
             logger.warning(f"  [WRITE GUARD] ❌ BLOCKED write to '{path}' - file exists but was not read first!")
             return (
@@ -54,7 +197,7 @@ def _create_write_file_wrapper(tool, worktree_path, workspace_path, files_read:
             )
         
         # Either file doesn't exist, or it was read - allow write
-        is_new_file = not full_path.exists()
+        is_new_file = not (Path(worktree_path) / path.lstrip("/\\")).exists()
         if is_new_file:
             logger.info(f"  [WRITE GUARD] ✅ Allowing write to '{path}' (new file)")
         else:
@@ -64,12 +207,64 @@ def _create_write_file_wrapper(tool, worktree_path, workspace_path, files_read:
         
         # After successful write, add to files_read so future writes are allowed
         # This prevents: write new file → need to read it → write again
-        files_read.add(normalized)
+        files_read.mark_full(path, _lines_written(content))
         
         return result
     return write_file_wrapper
 
 
+def _create_write_files_wrapper(tool, worktree_path, workspace_path, files_read: ReadTracker):
+    """Create write_files wrapper (batch write) that applies the read-before-write guard to each file."""
+    additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
+
+    def guard(path: str) -> Optional[str]:
+        blocked = _write_guard(path, worktree_path, files_read)
+        if blocked:
+            logger.warning(f"  [WRITE GUARD] ❌ BLOCKED batch write to '{path}' ({blocked})")
+        if blocked == "partial":
+            return (f"only lines {files_read.describe(path)} were read; use edit_file or read the rest "
+                    f"with read_file('{path}', start_line=...) first")
+        if blocked == "unread":
+            return f"file exists but was not read; call read_file('{path}') first"
+        return None
+
+    async def write_files_wrapper(files: List[Dict[str, str]], encoding: str = "utf-8"):
+        """Write several files in one call: files=[{path, content}]. Existing files must be read first."""
+        return await tool(files, encoding, root=worktree_path, additional_roots=additional_roots, guard=guard,
+                          on_written=lambda path, content: files_read.mark_full(path, _lines_written(content)))
+    return write_files_wrapper
+
+
+def _create_edit_file_wrapper(tool, worktree_path, workspace_path, files_read: ReadTracker,
+                              on_savings: Optional[Callable[[Dict[str, Any]], None]] = None):
+    """Create edit_file wrapper: patches count as reads of the edited region, savings vs write_file are logged."""
+    additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
+
+    async def edit_file_wrapper(path: str, edits: Optional[List[Dict[str, str]]] = None,
+                                diff: Optional[str] = None, encoding: str = "utf-8"):
+        """Change part of a file with search/replace hunks or a unified diff, without rewriting it."""
+        fully_read = files_read.covers(path)
+        applied = []
+        result = await tool(path, edits, diff, encoding, root=worktree_path, additional_roots=additional_roots,
+                            on_applied=applied.append)
+        if not applied:
+            return result
+
+        edit = applied[0]
+        files_read.apply_edit(path, edit.line_edits, edit.total_lines)
+        # write_file would have sent the whole new file, after a full read_file if the agent had not read it yet
+        write_chars = edit.new_chars + (0 if fully_read else edit.old_chars)
+        edit_chars = len(str(edits or diff)) + len(result)
+        saved = (write_chars - edit_chars) // 4
+        logger.info(f"  [EDIT] {path}: {edit.hunks} hunk(s), ~{saved} tokens saved vs write_file")
+        if on_savings:
+            on_savings({"tool": "edit_file", "path": path, "hunks": edit.hunks,
+                        "write_file_tokens": write_chars // 4, "edit_file_tokens": edit_chars // 4,
+                        "tokens_saved": saved})
+        return result
+    return edit_file_wrapper
+
+
 def _create_append_file_wrapper(tool, worktree_path, workspace_path):
     additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
     
@@ -88,6 +283,17 @@ def _create_list_directory_wrapper(tool, worktree_path, workspace_path):
     return list_directory_wrapper
 
 
+def _create_search_code_wrapper(tool, worktree_path, workspace_path):
+    additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
+
+    async def search_code_wrapper(query: str, mode: str = "regex", path: str = ".", glob: Optional[str] = None,
+                                  case_sensitive: bool = False, max_results: int = 50):
+        """Search code by regex, literal text or symbol name (mode="symbol" finds defs, classes and exports)."""
+        return await tool(query, mode, path, glob, case_sensitive, max_results,
+                          root=worktree_path, additional_roots=additional_roots)
+    return search_code_wrapper
+
+
 def _create_file_exists_wrapper(tool, worktree_path, workspace_path):
     additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
     
@@ -97,6 +303,15 @@ def _create_file_exists_wrapper(tool, worktree_path, workspace_path):
     return file_exists_wrapper
 
 
+def _create_stat_files_wrapper(tool, worktree_path, workspace_path):
+    additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
+
+    async def stat_files_wrapper(paths: List[str]):
+        """Check several paths in one call: existence, type and size."""
+        return await tool(paths, root=worktree_path, additional_roots=additional_roots)
+    return stat_files_wrapper
+
+
 def _create_delete_file_wrapper(tool, worktree_path, workspace_path):
     additional_roots = [workspace_path] if workspace_path and str(workspace_path) != str(worktree_path) else None
     
@@ -106,17 +321,17 @@ def _create_delete_file_wrapper(tool, worktree_path, workspace_path):
     return delete_file_wrapper
 
 
-def _create_run_python_wrapper(tool, worktree_path, workspace_path=None):
+def _create_run_python_wrapper(tool, worktree_path, workspace_path=None, task_id=None):
     async def run_python_wrapper(code: str, timeout: int = 30):
         """Execute Python code using shared venv if available."""
-        return await tool(code, timeout, cwd=worktree_path, workspace_path=workspace_path)
+        return await tool(code, timeout, cwd=worktree_path, workspace_path=workspace_path, task_id=task_id)
     return run_python_wrapper
 
 
-def _create_run_shell_wrapper(tool, worktree_path, workspace_path=None):
+def _create_run_shell_wrapper(tool, worktree_path, workspace_path=None, task_id=None):
     async def run_shell_wrapper(command: str, timeout: int = 30):
         """Execute shell command using workspace venv."""
-        return await tool(command, timeout, cwd=worktree_path, workspace_path=workspace_path)
+        return await tool(command, timeout, cwd=worktree_path, workspace_path=workspace_path, task_id=task_id)
     return run_shell_wrapper
 
 
@@ -127,6 +342,32 @@ def _create_subtasks_wrapper(tool, worktree_path):
     return create_subtasks_wrapper
 
 
+# Argument schemas inferred from wrapper signatures, keyed by (tool name, wrapper code).
+# Every task binds fresh wrapper closures with the same signature, so pydantic model
+# creation only happens the first time each tool is bound in the process.
+_ARGS_SCHEMAS: Dict[Tuple[str, Any], Any] = {}
+
+_FS_TOOLS = frozenset([
+    "read_file", "read_files", "write_file", "write_files", "edit_file", "append_file", "list_directory",
+    "file_exists", "stat_files", "delete_file", "search_code", "read_file_async", "read_files_async",
+    "write_file_async", "write_files_async", "edit_file_async", "append_file_async", "list_directory_async",
+    "file_exists_async", "stat_files_async", "delete_file_async", "search_code_async",
+])
+
+
+def _structured_tool(func: Callable, name: str, description: str, is_async: bool = True, **kwargs) -> StructuredTool:
+    """StructuredTool over func, reusing the args schema inferred the first time this tool was bound."""
+    key = (name, getattr(func, "__code__", None))
+    schema = _ARGS_SCHEMAS.get(key) if key[1] is not None else None
+    tool = StructuredTool.from_function(
+        func=func, coroutine=func if is_async else None, name=name, description=description,
+        args_schema=schema, **kwargs
+    )
+    if schema is None and key[1] is not None:
+        _ARGS_SCHEMAS[key] = tool.args_schema
+    return tool
+
+
 def _bind_tools(tools: List[Callable], state: Dict[str, Any], profile: WorkerProfile = None) -> List[Callable]:
     """
     Bind tools to the worktree context.
@@ -157,70 +398,100 @@ def _bind_tools(tools: List[Callable], state: Dict[str, Any], profile: WorkerPro
         logger.debug(f"Main workspace path: {workspace_path}")
 
     # Track which files have been read this session (for read-before-write enforcement)
-    files_read: Set[str] = set()
+    files_read = ReadTracker()
+
+    def log_savings(entry: Dict[str, Any]):
+        try:
+            log_tool_savings(state.get("task_id") or "unknown", entry, workspace_path=workspace_path,
+                             logs_base_path=state.get("_logs_base_path"))
+        except Exception as e:
+            logger.warning(f"  [LOG ERROR] Could not record tool savings: {e}")
     
     bound_tools = []
     for tool in tools:
+        # Ready-made LangChain tools (e.g. web_search) have no __name__ and are passed through
+        name = getattr(tool, "__name__", None)
         # Check if tool accepts 'root' argument (filesystem tools)
         # NOTE: Handle both sync names (read_file) and async names (read_file_async)
-        fs_tools = ["read_file", "write_file", "append_file", "list_directory", "file_exists", "delete_file",
-                    "read_file_async", "write_file_async", "append_file_async", "list_directory_async",
-                    "file_exists_async", "delete_file_async"]
-        if tool.__name__ in fs_tools:
+        if name in _FS_TOOLS:
 
             # Use factory functions to avoid closure loop variable capture issues
-            # NOTE: Pass coroutine= directly - LangChain infers schema from the async function signature
-            if tool.__name__ in ["read_file", "read_file_async"]:
+            # NOTE: The wrapper is both func and coroutine; its schema is inferred once (see _structured_tool)
+            if name in ["read_file", "read_file_async"]:
                 wrapper = _create_read_file_wrapper(tool, worktree_path, workspace_path, files_read)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="read_file", description="Read the contents of a file.", handle_tool_error=True))
+                bound_tools.append(_structured_tool(wrapper, name="read_file", description="Read the contents of a file. Use start_line/end_line to page through large files.", handle_tool_error=True))
 
-            elif tool.__name__ in ["write_file", "write_file_async"]:
+            elif name in ["read_files", "read_files_async"]:
+                wrapper = _create_read_files_wrapper(tool, worktree_path, workspace_path, files_read)
+                bound_tools.append(_structured_tool(wrapper, name="read_files", description="Read several small files in one call.", handle_tool_error=True))
+
+            elif name in ["write_file", "write_file_async"]:
                 wrapper = _create_write_file_wrapper(tool, worktree_path, workspace_path, files_read)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="write_file", description="Write content to a file. MUST read existing files first!", handle_tool_error=True))
+                bound_tools.append(_structured_tool(wrapper, name="write_file", description="Write content to a file. MUST read existing files first!", handle_tool_error=True))
+
+            elif name in ["write_files", "write_files_async"]:
+                wrapper = _create_write_files_wrapper(tool, worktree_path, workspace_path, files_read)
+                bound_tools.append(_structured_tool(wrapper, name="write_files", description="Write several files in one call: files=[{path, content}]. Existing files must be read first; each file succeeds or fails on its own.", handle_tool_error=True))
+
+            elif name in ["edit_file", "edit_file_async"]:
+                wrapper = _create_edit_file_wrapper(tool, worktree_path, workspace_path, files_read, on_savings=log_savings)
+                bound_tools.append(_structured_tool(wrapper, name="edit_file", description="Change part of a file: edits=[{search, replace}] (each search must match exactly once) or a unified diff. Prefer this over write_file for existing files.", handle_tool_error=True))
 
-            elif tool.__name__ in ["append_file", "append_file_async"]:
+            elif name in ["append_file", "append_file_async"]:
                 wrapper = _create_append_file_wrapper(tool, worktree_path, workspace_path)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="append_file", description="Append content to an existing file.", handle_tool_error=True))
+                bound_tools.append(_structured_tool(wrapper, name="append_file", description="Append content to an existing file.", handle_tool_error=True))
 
-            elif tool.__name__ in ["list_directory", "list_directory_async"]:
+            elif name in ["list_directory", "list_directory_async"]:
                 wrapper = _create_list_directory_wrapper(tool, worktree_path, workspace_path)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="list_directory", description="List files and directories.", handle_tool_error=True))
+                bound_tools.append(_structured_tool(wrapper, name="list_directory", description="List files and directories.", handle_tool_error=True))
 
-            elif tool.__name__ in ["file_exists", "file_exists_async"]:
+            elif name in ["search_code", "search_code_async"]:
+                wrapper = _create_search_code_wrapper(tool, worktree_path, workspace_path)
+                bound_tools.append(_structured_tool(wrapper, name="search_code", description="Search code by regex, literal text or symbol name. Returns path:line snippets.", handle_tool_error=True))
+
+            elif name in ["file_exists", "file_exists_async"]:
                 wrapper = _create_file_exists_wrapper(tool, worktree_path, workspace_path)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="file_exists", description="Check if a file or directory exists.", handle_tool_error=True))
+                bound_tools.append(_structured_tool(wrapper, name="file_exists", description="Check if a file or directory exists.", handle_tool_error=True))
+
+            elif name in ["stat_files", "stat_files_async"]:
+                wrapper = _create_stat_files_wrapper(tool, worktree_path, workspace_path)
+                bound_tools.append(_structured_tool(wrapper, name="stat_files", description="Check several paths in one call: whether each exists, its type and size.", handle_tool_error=True))
 
-            elif tool.__name__ in ["delete_file", "delete_file_async"]:
+            elif name in ["delete_file", "delete_file_async"]:
                 wrapper = _create_delete_file_wrapper(tool, worktree_path, workspace_path)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="delete_file", description="Delete a file.", handle_tool_error=True))
+                bound_tools.append(_structured_tool(wrapper, name="delete_file", description="Delete a file.", handle_tool_error=True))
 
-        elif tool.__name__ in ["run_python", "run_shell", "run_python_async", "run_shell_async"]:
+        elif name in ["run_python", "run_shell", "run_python_async", "run_shell_async"]:
             workspace_path = state.get("_workspace_path")  # For shared venv lookup
-            if tool.__name__ in ["run_python", "run_python_async"]:
-                wrapper = _create_run_python_wrapper(tool, worktree_path, workspace_path=workspace_path)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="run_python", description="Execute Python code using shared venv if available.", handle_tool_error=True))
-            elif tool.__name__ in ["run_shell", "run_shell_async"]:
-                wrapper = _create_run_shell_wrapper(tool, worktree_path, workspace_path=workspace_path)
-                bound_tools.append(StructuredTool.from_function(func=wrapper, coroutine=wrapper, name="run_shell", description="Execute shell command using workspace venv.", handle_tool_error=True))
-
-        elif tool.__name__ == "create_subtasks":
+            if name in ["run_python", "run_python_async"]:
+                wrapper = _create_run_python_wrapper(tool, worktree_path, workspace_path=workspace_path,
+                                                     task_id=state.get("task_id"))
+                bound_tools.append(_structured_tool(wrapper, name="run_python", description="Execute Python code using shared venv if available.", handle_tool_error=True))
+            elif name in ["run_shell", "run_shell_async"]:
+                wrapper = _create_run_shell_wrapper(tool, worktree_path, workspace_path=workspace_path,
+                                                    task_id=state.get("task_id"))
+                bound_tools.append(_structured_tool(wrapper, name="run_shell", description="Execute shell command using workspace venv.", handle_tool_error=True))
+
+        elif name == "create_subtasks":
              # Allow Planners, Testers, and Coders to create subtasks
              if profile in [WorkerProfile.PLANNER, WorkerProfile.TESTER, WorkerProfile.CODER]:
-                 bound_tools.append(StructuredTool.from_function(
-                     func=tool,
+                 bound_tools.append(_structured_tool(
+                     tool,
                      name="create_subtasks",
-                     description="Create COMMIT-LEVEL subtasks to be executed by other workers. Each task should be one atomic, reviewable change."
+                     description="Create COMMIT-LEVEL subtasks to be executed by other workers. Each task should be one atomic, reviewable change.",
+                     is_async=False
                  ))
              else:
                  # Skip for other profiles
                  pass
 
-        elif tool.__name__ == "report_existing_implementation":
+        elif name == "report_existing_implementation":
             # Convert plain function to StructuredTool for proper LLM usage
-            bound_tools.append(StructuredTool.from_function(
-                func=tool,
+            bound_tools.append(_structured_tool(
+                tool,
                 name="report_existing_implementation",
-                description="Report that existing code already implements the required feature. ONLY use if you made ZERO modifications."
+                description="Report that existing code already implements the required feature. ONLY use if you made ZERO modifications.",
+                is_async=False
             ))
 
         else:
@@ -895,6 +895,28 @@ def serialize_messages(messages: List[Any]) -> List[Dict[str, Any]]:
         
     return serialized
 
+
+def deserialize_messages(messages: List[Any]) -> List[BaseMessage]:
+    """Rebuild LangChain messages from serialize_messages dicts (messages that aren't dicts pass through)."""
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+    rebuilt = []
+    for msg in messages or []:
+        if not isinstance(msg, dict):
+            rebuilt.append(msg)
+            continue
+        kind, content = msg.get("type"), msg.get("content", "")
+        extra = {"name": msg["name"]} if msg.get("name") else {}
+        if kind == "ai":
+            rebuilt.append(AIMessage(content=content, tool_calls=msg.get("tool_calls") or [], **extra))
+        elif kind == "tool":
+            rebuilt.append(ToolMessage(content=content, tool_call_id=msg.get("tool_call_id", ""), **extra))
+        elif kind == "system":
+            rebuilt.append(SystemMessage(content=content, **extra))
+        else:
+            rebuilt.append(HumanMessage(content=content, **extra))
+    return rebuilt
+
 def _dict_to_suggested_task(data: Dict[str, Any]) -> SuggestedTask:
     return SuggestedTask(
         suggested_id=data["suggested_id"],
@@ -1082,4 +1104,5 @@ __all__ = [
     "blackboard_to_dict",
     "dict_to_blackboard",
     "serialize_messages",
+    "deserialize_messages",
 ]
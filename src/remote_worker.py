@@ -0,0 +1,164 @@
+"""
+Agent Orchestrator — Remote Worker
+==================================
+Worker process for distributed mode (OrchestratorConfig.distributed_workers).
+
+Leases task envelopes from the run database, runs worker_node on each one,
+keeps the lease alive with heartbeats and stores the result for the
+dispatch loop to merge. Start as many processes as the machine (or the
+shared database and filesystem) allows:
+
+    python src/remote_worker.py --concurrency 2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from distributed_queue import (
+    init_task_envelopes_table, lease_envelope, heartbeat_envelope, complete_envelope, config_from_dict
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def execute_envelope(envelope: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the worker state from an envelope and run worker_node on it."""
+    from git_manager import AsyncWorktreeManager
+    from nodes.worker import worker_node
+    from orchestrator_types import deserialize_messages, serialize_messages
+
+    payload = envelope["payload"]
+    worktree = payload.get("worktree", {})
+    state = dict(payload["state"])
+    state["orch_config"] = config_from_dict(payload.get("orch_config"))
+    state["task_memories"] = {tid: deserialize_messages(msgs) for tid, msgs in state.get("task_memories", {}).items()}
+    state["_workspace_path"] = worktree.get("workspace_path")
+    state["_worktree_base_path"] = worktree.get("worktree_base_path")
+    state["_logs_base_path"] = worktree.get("logs_base_path")
+
+    if worktree.get("workspace_path") and worktree.get("worktree_base_path"):
+        wt_manager = AsyncWorktreeManager(
+            repo_path=Path(worktree["workspace_path"]),
+            worktree_base=Path(worktree["worktree_base_path"])
+        )
+        # The dispatch loop already created the task worktree - register it here
+        await wt_manager.recover_worktrees([envelope["task_id"]])
+        state["_wt_manager"] = wt_manager
+
+    result = await worker_node(state, payload.get("run_config"))
+    if result.get("task_memories"):
+        result["task_memories"] = {tid: serialize_messages(msgs) for tid, msgs in result["task_memories"].items()}
+    return result
+
+
+async def _run_envelope(envelope: Dict[str, Any], worker_id: str, lease_seconds: float,
+                        execute: Callable[[Dict[str, Any]], Awaitable[Any]]):
+    """Run one leased envelope with a heartbeat; give up if the lease is lost."""
+    envelope_id = envelope["envelope_id"]
+    task_id = envelope["task_id"]
+    logger.info(f"[LEASE] {worker_id} took {task_id} (envelope {envelope_id[:8]}, attempt {envelope['attempts']})")
+
+    job = asyncio.create_task(execute(envelope))
+    while not job.done():
+        await asyncio.wait({job}, timeout=lease_seconds / 3)
+        if job.done():
+            break
+        try:
+            still_ours = await heartbeat_envelope(envelope_id, worker_id, lease_seconds)
+        except Exception as e:
+            logger.warning(f"Heartbeat for {task_id} failed: {e}")
+            continue
+        if not still_ours:
+            logger.warning(f"[LOST] Lease on {task_id} lost (cancelled or expired) - abandoning")
+            job.cancel()
+            await asyncio.gather(job, return_exceptions=True)
+            return
+
+    try:
+        result = job.result()
+        stored = await complete_envelope(envelope_id, worker_id, result=result)
+    except Exception as e:
+        logger.error(f"[FAIL] {task_id}: {e}", exc_info=True)
+        stored = await complete_envelope(envelope_id, worker_id, error=f"{type(e).__name__}: {e}")
+    if not stored:
+        logger.warning(f"Result for {task_id} discarded - lease no longer held")
+
+
+async def run_worker(worker_id: Optional[str] = None, concurrency: int = 1, lease_seconds: float = 60.0,
+                     max_attempts: int = 3, poll_interval: float = 1.0, max_envelopes: Optional[int] = None,
+                     idle_exit: Optional[float] = None,
+                     execute: Callable[[Dict[str, Any]], Awaitable[Any]] = execute_envelope) -> int:
+    """
+    Lease and run envelopes until stopped.
+
+    Args:
+        max_envelopes: Exit after this many envelopes (None = run forever)
+        idle_exit: Exit after this many seconds without work (None = run forever)
+
+    Returns:
+        Number of envelopes processed
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    await init_task_envelopes_table()
+    logger.info(f"🚀 Remote worker {worker_id} started (concurrency {concurrency})")
+
+    running = set()
+    processed = 0
+    idle_since = asyncio.get_running_loop().time()
+    while max_envelopes is None or processed + len(running) < max_envelopes:
+        envelope = None
+        if len(running) < concurrency:
+            try:
+                envelope = await lease_envelope(worker_id, lease_seconds, max_attempts)
+            except Exception as e:
+                logger.error(f"Failed to lease envelope: {e}")
+        if envelope:
+            running.add(asyncio.create_task(_run_envelope(envelope, worker_id, lease_seconds, execute)))
+            idle_since = asyncio.get_running_loop().time()
+            continue
+
+        if running:
+            done, running = await asyncio.wait(running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            processed += len(done)
+            idle_since = asyncio.get_running_loop().time()
+        else:
+            if idle_exit is not None and asyncio.get_running_loop().time() - idle_since >= idle_exit:
+                break
+            await asyncio.sleep(poll_interval)
+
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+        processed += len(running)
+    logger.info(f"🏁 Remote worker {worker_id} stopped after {processed} envelope(s)")
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent Orchestrator remote worker")
+    parser.add_argument("--worker-id", type=str, help="Worker name (default host:pid)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Envelopes run at once by this process")
+    parser.add_argument("--lease-seconds", type=float, default=60.0, help="Lease length; renewed every third of it")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Leases per envelope before it is failed")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls when idle")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_worker(
+        worker_id=args.worker_id,
+        concurrency=args.concurrency,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        poll_interval=args.poll_interval,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,12 @@ Backend is selected via config.checkpoint_mode.
 import psycopg
 from psycopg.rows import dict_row
 import aiosqlite
-import json
 import os
 import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from orchestrator_types import serialize_messages
+from serialization import dumps, dumps_str, loads
 
 logger = logging.getLogger(__name__)
 
@@ -188,23 +188,23 @@ async def save_run_state(run_id: str, state: Dict[str, Any], status: str = "runn
         db_type, db_conn_info = _get_db_config()
         
         # Serialize state to JSON (exclude non-serializable objects)
-        state_copy = {}
+        # Each value is encoded exactly once and the fragments joined into one object
+        fragments = []
         for key, value in state.items():
             if key.startswith('_') or key in ['orch_config']:
                 continue
             if key == "task_memories":
                 try:
-                    state_copy[key] = {tid: serialize_messages(msgs) for tid, msgs in value.items()}
+                    value = {tid: serialize_messages(msgs) for tid, msgs in value.items()}
                 except Exception as e:
                     logger.error(f"Failed to serialize task_memories: {e}")
-                continue
+                    continue
             try:
-                json.dumps(value)
-                state_copy[key] = value
+                fragments.append(dumps(str(key)) + b":" + dumps(value))
             except (TypeError, ValueError):
                 logger.debug(f"Skipping non-serializable key: {key}")
         
-        state_json = json.dumps(state_copy)
+        state_json = (b"{" + b",".join(fragments) + b"}").decode("utf-8")
         objective = state.get("objective", "")
         thread_id = state.get("run_id", run_id)
         workspace_path = state.get("_workspace_path", "")
@@ -219,7 +219,7 @@ async def save_run_state(run_id: str, state: Dict[str, Any], status: str = "runn
             "complete": len([t for t in tasks if t.get("status") == "complete"]),
             "failed": len([t for t in tasks if t.get("status") == "failed"]),
         }
-        task_counts_json = json.dumps(task_counts)
+        task_counts_json = dumps_str(task_counts)
         
         if db_type == "postgres":
             async with await psycopg.AsyncConnection.connect(
@@ -276,7 +276,7 @@ async def load_run_state(run_id: str) -> Optional[Dict[str, Any]]:
                 )
                 row = await cursor.fetchone()
                 if row and row["state_json"]:
-                    state = json.loads(row["state_json"])
+                    state = loads(row["state_json"])
                     if row["workspace_path"]:
                         state["_workspace_path"] = row["workspace_path"]
                     return state
@@ -288,7 +288,7 @@ async def load_run_state(run_id: str) -> Optional[Dict[str, Any]]:
                     )
                     row = await cursor.fetchone()
                     if row and row["state_json"]:
-                        state = json.loads(row["state_json"])
+                        state = loads(row["state_json"])
                         if row["workspace_path"]:
                             state["_workspace_path"] = row["workspace_path"]
                         return state
@@ -299,7 +299,7 @@ async def load_run_state(run_id: str) -> Optional[Dict[str, Any]]:
                 )
                 row = await cursor.fetchone()
                 if row and row[0]:
-                    state = json.loads(row[0])
+                    state = loads(row[0])
                     if row[1]:
                         state["_workspace_path"] = row[1]
                     return state
@@ -308,6 +308,50 @@ async def load_run_state(run_id: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Failed to load run state: {e}")
         return None
 
+async def load_task_memories(run_id: str, task_id: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load one task's serialized messages without parsing the rest of the run state.
+
+    The database extracts task_memories[task_id] from state_json, so only
+    that conversation is transferred and decoded.
+    """
+    try:
+        db_type, db_conn_info = _get_db_config()
+        json_path = '$.task_memories."' + task_id.replace('"', '\\"') + '"'
+        raw = None
+
+        if db_type == "postgres":
+            async with await psycopg.AsyncConnection.connect(
+                db_conn_info, autocommit=True, row_factory=dict_row
+            ) as conn:
+                cursor = await conn.execute(
+                    "SELECT (state_json::json -> 'task_memories' -> %s)::text AS memories FROM runs WHERE run_id = %s",
+                    (task_id, run_id)
+                )
+                row = await cursor.fetchone()
+                raw = row["memories"] if row else None
+        elif db_type == "mysql":
+            async with _mysql_connection(db_conn_info) as conn:
+                async with conn.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute(
+                        "SELECT JSON_EXTRACT(state_json, %s) AS memories FROM runs WHERE run_id = %s",
+                        (json_path, run_id)
+                    )
+                    row = await cursor.fetchone()
+                    raw = row["memories"] if row else None
+        else:  # sqlite
+            async with _sqlite_connection(db_conn_info) as db:
+                cursor = await db.execute(
+                    "SELECT json_extract(state_json, ?) FROM runs WHERE run_id = ?", (json_path, run_id)
+                )
+                row = await cursor.fetchone()
+                raw = row[0] if row else None
+
+        return loads(raw) if raw else None
+    except Exception as e:
+        logger.error(f"Failed to load task memories: {e}")
+        return None
+
 async def load_run_summary(run_id: str) -> Optional[Dict[str, Any]]:
     """Load run summary (without full state) for list display."""
     try:
@@ -328,7 +372,7 @@ async def load_run_summary(run_id: str) -> Optional[Dict[str, Any]]:
                         "objective": row["objective"], "status": row["status"],
                         "created_at": row["created_at"], "updated_at": row["updated_at"],
                         "workspace_path": row["workspace_path"],
-                        "task_counts": json.loads(row["task_counts_json"]) if row["task_counts_json"] else {},
+                        "task_counts": loads(row["task_counts_json"]) if row["task_counts_json"] else {},
                         "tags": []
                     }
         elif db_type == "mysql":
@@ -345,7 +389,7 @@ async def load_run_summary(run_id: str) -> Optional[Dict[str, Any]]:
                             "objective": row["objective"], "status": row["status"],
                             "created_at": row["created_at"], "updated_at": row["updated_at"],
                             "workspace_path": row["workspace_path"],
-                            "task_counts": json.loads(row["task_counts_json"]) if row["task_counts_json"] else {},
+                            "task_counts": loads(row["task_counts_json"]) if row["task_counts_json"] else {},
                             "tags": []
                         }
         else:  # sqlite
@@ -359,7 +403,7 @@ async def load_run_summary(run_id: str) -> Optional[Dict[str, Any]]:
                     return {
                         "run_id": row[0], "thread_id": row[1], "objective": row[2], "status": row[3],
                         "created_at": row[4], "updated_at": row[5], "workspace_path": row[6],
-                        "task_counts": json.loads(row[7]) if row[7] else {},
+                        "task_counts": loads(row[7]) if row[7] else {},
                         "tags": []
                     }
         return None
@@ -386,7 +430,7 @@ async def list_all_runs() -> List[Dict[str, Any]]:
                     "objective": row["objective"], "status": row["status"],
                     "created_at": row["created_at"], "updated_at": row["updated_at"],
                     "workspace_path": row["workspace_path"],
-                    "task_counts": json.loads(row["task_counts_json"]) if row["task_counts_json"] else {},
+                    "task_counts": loads(row["task_counts_json"]) if row["task_counts_json"] else {},
                     "tags": []
                 } for row in rows]
         elif db_type == "mysql":
@@ -402,7 +446,7 @@ async def list_all_runs() -> List[Dict[str, Any]]:
                         "objective": row["objective"], "status": row["status"],
                         "created_at": row["created_at"], "updated_at": row["updated_at"],
                         "workspace_path": row["workspace_path"],
-                        "task_counts": json.loads(row["task_counts_json"]) if row["task_counts_json"] else {},
+                        "task_counts": loads(row["task_counts_json"]) if row["task_counts_json"] else {},
                         "tags": []
                     } for row in rows]
         else:  # sqlite
@@ -415,7 +459,7 @@ async def list_all_runs() -> List[Dict[str, Any]]:
                 return [{
                     "run_id": row[0], "thread_id": row[1], "objective": row[2], "status": row[3],
                     "created_at": row[4], "updated_at": row[5], "workspace_path": row[6],
-                    "task_counts": json.loads(row[7]) if row[7] else {},
+                    "task_counts": loads(row[7]) if row[7] else {},
                     "tags": []
                 } for row in rows]
     except Exception as e:
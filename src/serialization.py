@@ -0,0 +1,78 @@
+"""
+JSON Serialization
+==================
+One JSON codec for checkpoints, websocket frames and API responses.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Both backends produce the same output for the types found in
+run state: datetimes (ISO 8601), enums (their value), dataclasses,
+pydantic models, sets and paths.
+
+Usage:
+    from serialization import dumps, dumps_str, loads
+
+    frame = dumps(message)         # bytes - websocket frames, responses
+    state_json = dumps_str(state)  # str - TEXT columns
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+JSON_BACKEND = "orjson" if ORJSON_AVAILABLE else "json"
+
+
+def _default(obj: Any) -> Any:
+    """Encode types neither backend handles natively."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Parse JSON from bytes or str."""
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return _stdlib_dumps(obj)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Parse JSON from bytes or str."""
+        return json.loads(data)
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize to a JSON string (for TEXT columns)."""
+    return dumps(obj).decode("utf-8")
@@ -101,6 +101,7 @@ from orchestrator_types import worker_result_to_dict, task_to_dict, TaskStatus,
 from api.websocket import ConnectionManager
 from api.types import CreateRunRequest, RunSummary, HumanResolution
 from api.dispatch import run_orchestrator, continuous_dispatch_loop, broadcast_state_update
+from api.responses import FastJSONResponse
 import api.state as api_state
 
 # Configure logging
@@ -349,7 +350,7 @@ async def lifespan(app: FastAPI):
         await conn.close()
         logger.info("SQLite database connection closed")
 
-app = FastAPI(title="Agent Orchestrator API", lifespan=lifespan)
+app = FastAPI(title="Agent Orchestrator API", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Rate limiting setup
 limiter = Limiter(key_func=get_remote_address)
@@ -420,7 +421,11 @@ async def ensure_run_in_index(run_id: str) -> bool:
         logger.debug(f"Run {run_id} already in index")
         return True
     
-    # Try to find in database
+    # Runs table (single-row lookup)
+    if await api_state.load_run_into_index(run_id):
+        return True
+    
+    # Try to find in checkpoints (CLI-initiated runs aren't in the runs table)
     logger.info(f"🔍 Looking up run {run_id} in database (CLI-initiated run?)")
     try:
         get_orchestrator_graph()
@@ -642,6 +647,7 @@ async def _stream_and_broadcast(orchestrator, input_data, run_config, run_id):
                     
                     # Also save to in-memory state
                     run_states[run_id] = current_state
+                    api_state.bump_run_version(run_id)
                     
                     # Broadcast interrupt notification to frontend
                     await manager.broadcast_to_run(run_id, {
@@ -5,6 +5,9 @@ Version 1.0 — December 2025
 
 Background task queue for continuous dispatch.
 Tracks running workers and collects their results without blocking.
+
+When given a WorkerPool, every spawn also takes a slot from the
+process-wide budget so concurrent runs share one worker limit.
 """
 
 import asyncio
@@ -38,11 +41,13 @@ class TaskCompletionQueue:
             apply_result(state, completed)
     """
     
-    def __init__(self, max_concurrent: int = 5):
+    def __init__(self, max_concurrent: int = 5, run_id: Optional[str] = None, pool=None):
         self._running: Dict[str, asyncio.Task] = {}
         self._completed: List[CompletedTask] = []
         self._max_concurrent = max_concurrent
         self._lock = asyncio.Lock()
+        self._run_id = run_id
+        self._pool = pool  # Optional WorkerPool shared with other runs
     
     def spawn(self, task_id: str, coro) -> bool:
         """
@@ -61,8 +66,16 @@ class TaskCompletionQueue:
         if task_id in self._running:
             logger.warning(f"Task {task_id} already running, skipping spawn")
             return False
-        
+
+        if self._pool is not None:
+            if not self._pool.try_acquire(self._run_id):
+                logger.info(f"[SPAWN] No worker pool slot for {task_id[:12]}, deferring")
+                return False
+
         async_task = asyncio.create_task(self._wrap(task_id, coro))
+        if self._pool is not None:
+            # Done callback (not _wrap's finally) so tasks cancelled before they start still release
+            async_task.add_done_callback(lambda _: self._pool.release(self._run_id))
         self._running[task_id] = async_task
         logger.info(f"[SPAWN] Background worker for {task_id} ({len(self._running)}/{self._max_concurrent} active)")
         return True
@@ -95,7 +108,22 @@ class TaskCompletionQueue:
     @property
     def available_slots(self) -> int:
         """Number of workers we can still spawn."""
-        return self._max_concurrent - len(self._running)
+        local = self._max_concurrent - len(self._running)
+        if self._pool is None:
+            return local
+        return min(local, self._pool.available_slots(self._run_id))
+
+    def set_demand(self, ready: int):
+        """Report how many tasks are ready to dispatch (drives the pool's fair share)."""
+        if self._pool is not None:
+            self._pool.set_demand(self._run_id, ready)
+
+    async def wait_for_slot(self, timeout: float = 1.0) -> None:
+        """Wait for another run to release a pool slot, or timeout."""
+        if self._pool is None:
+            await asyncio.sleep(min(timeout, 0.1))
+            return
+        await self._pool.wait_for_release(timeout=timeout)
     
     @property
     def has_work(self) -> bool:
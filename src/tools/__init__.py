@@ -11,9 +11,11 @@ from .base import ToolDefinition, ToolRegistry, ToolCategory, DetailLevel
 
 # Async implementations
 from .filesystem_async import (
-    read_file_async, write_file_async, append_file_async,
-    list_directory_async, file_exists_async, delete_file_async
+    read_file_async, read_files_async, write_file_async, write_files_async, append_file_async,
+    list_directory_async, file_exists_async, stat_files_async, delete_file_async
 )
+from .code_search import search_code_async
+from .file_edit import edit_file_async
 from .code_execution_async import run_python_async, run_shell_async
 from .git_async import (
     git_commit_async, git_status_async, git_diff_async,
@@ -29,11 +31,16 @@ __all__ = [
 
     # Filesystem (async)
     "read_file_async",
+    "read_files_async",
     "write_file_async",
+    "write_files_async",
+    "edit_file_async",
     "append_file_async",
     "list_directory_async",
     "file_exists_async",
+    "stat_files_async",
     "delete_file_async",
+    "search_code_async",
 
     # Code Execution (async)
     "run_python_async",
@@ -39,9 +39,11 @@ Workers use progressive disclosure:
 3. Import only the specific tools needed
 """
 
+import re
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 from pathlib import Path
 
 
@@ -152,8 +154,10 @@ for detailed documentation before using.
 File and directory operations within the task's git worktree.
 - read_file: Read contents of a file
 - write_file: Write content to a file (creates or overwrites)
+- edit_file: Change part of a file with search/replace hunks or a unified diff
 - append_file: Append content to existing file
 - list_directory: List files and directories
+- search_code: Search code by regex, literal text or symbol name
 - file_exists: Check if a file exists
 - delete_file: Delete a file (requires confirmation)
 
@@ -218,14 +222,30 @@ Read the contents of a file.
 **Parameters:**
 - `path` (string, required): Relative path to the file
 - `encoding` (string, optional): File encoding. Default: "utf-8"
+- `start_line` (int, optional): First line to return (1-based)
+- `end_line` (int, optional): Last line to return (inclusive)
+- `max_bytes` (int, optional): Cap on returned content. Default: 48000
+- `line_offset` (int, optional): Byte offset into `start_line` to start at. Continues a
+  single line longer than `max_bytes` (minified bundles, one-line JSON)
 
-**Returns:** File contents as string
+**Returns:** File contents as string. Partial reads start with a header giving
+the file size, line count and the line to continue from.
 
 **Example:**
 ```python
 content = read_file(path="src/main.py")
+chunk = read_file(path="logs/build.log", start_line=2000, end_line=2200)
 ```
 
+### read_files
+
+Read several small files in one call.
+
+**Parameters:**
+- `paths` (list, required): Relative paths (at most 20)
+
+**Returns:** Each file's contents under a `=== path ===` heading (16000 bytes per file)
+
 ### write_file
 
 Write content to a file. Creates the file if it doesn't exist, overwrites if it does.
@@ -242,6 +262,25 @@ Write content to a file. Creates the file if it doesn't exist, overwrites if it
 write_file(path="src/utils.py", content="def helper():\\n    pass")
 ```
 
+### write_files
+
+Write several files in one call (at most 20). Use this instead of many
+`write_file` calls when scaffolding.
+
+**Parameters:**
+- `files` (list, required): `[{"path": "...", "content": "..."}]`
+- `encoding` (string, optional): File encoding. Default: "utf-8"
+
+Each file is written or rejected on its own. Existing files must have been read
+in full first, as with `write_file`.
+
+**Returns:** One `path: result` line per file and a count of files written
+
+**Example:**
+```python
+write_files(files=[{"path": "app/__init__.py", "content": ""}, {"path": "app/main.py", "content": "..."}])
+```
+
 ### append_file
 
 Append content to an existing file.
@@ -259,7 +298,7 @@ List files and directories at a path.
 **Parameters:**
 - `path` (string, optional): Directory path. Default: "." (current)
 - `recursive` (bool, optional): Include subdirectories. Default: false
-- `pattern` (string, optional): Glob pattern filter. Default: "*"
+- `pattern` (string, optional): Glob pattern filter on names. Default: "*". A pattern containing "/" matches paths below `path` instead (`**` spans directories, e.g. "**/test_*.py"); `recursive` and `max_depth` are then ignored
 - `max_depth` (int, optional): Maximum recursion depth. Default: 3
 - `max_results` (int, optional): Maximum results. Default: 500
 
@@ -270,6 +309,7 @@ List files and directories at a path.
 **Example:**
 ```python
 files = list_directory(path="src", recursive=True, pattern="*.py")
+tests = list_directory(pattern="tests/**/test_*.py")
 ```
 
 ### file_exists
@@ -281,6 +321,15 @@ Check if a file or directory exists.
 
 **Returns:** Boolean
 
+### stat_files
+
+Check several paths in one call (at most 20).
+
+**Parameters:**
+- `paths` (list, required): Paths to check
+
+**Returns:** One line per path: `file, N bytes`, `directory` or `not found`
+
 ### delete_file
 
 Delete a file. **Requires confirmation.**
@@ -290,6 +339,55 @@ Delete a file. **Requires confirmation.**
 - `confirm` (bool, required): Must be True to proceed
 
 **Returns:** Success confirmation
+
+### edit_file
+
+Change part of an existing file without sending all of it. Prefer this over
+`write_file` for edits to existing files.
+
+**Parameters:**
+- `path` (string, required): Relative path to the file
+- `edits` (list, optional): `[{"search": "...", "replace": "..."}]`. Each search text
+  must match the file exactly once. Include enough surrounding lines to make it unique
+- `diff` (string, optional): A unified diff (`@@ -start,count +start,count @@` hunks) instead of `edits`
+- `encoding` (string, optional): File encoding. Default: "utf-8"
+
+All hunks apply or none do. If a search text is missing or ambiguous, or a diff's
+context does not match, nothing is written and the conflict is reported.
+The edited lines count as read, so no full `read_file` is needed first.
+
+**Returns:** Summary of the changed line ranges (new numbering) and the new line count
+
+**Example:**
+```python
+edit_file(path="src/config.py", edits=[{"search": "TIMEOUT = 30", "replace": "TIMEOUT = 60"}])
+```
+
+### search_code
+
+Search the worktree's code in one call instead of listing and reading files.
+
+**Parameters:**
+- `query` (string, required): Regex, literal text or symbol name
+- `mode` (string, optional): "regex", "literal" or "symbol". Default: "regex"
+- `path` (string, optional): Directory to search under. Default: "." (whole worktree)
+- `glob` (string, optional): Only search matching files, e.g. "*.py" or "src/**/*.ts"
+- `case_sensitive` (bool, optional): Default: false
+- `max_results` (int, optional): Default: 50, at most 200
+
+**Symbol mode** finds Python classes, functions and methods (`Router.add`) and
+JS/TS exports. Exact name matches come first, then names containing the query.
+
+`^` and `$` match at the start and end of each line, as in grep. A match that
+runs across lines is reported as `path:first-last: snippet`.
+
+**Returns:** One `path:line: snippet` line per match and a match count
+
+**Example:**
+```python
+hits = search_code(query="def handle_request", glob="*.py")
+defs = search_code(query="UserService", mode="symbol")
+```
 """
 
 FILESYSTEM_TOOLS: List[ToolDefinition] = [
@@ -301,9 +399,24 @@ FILESYSTEM_TOOLS: List[ToolDefinition] = [
         parameters=[
             ToolParameter(name="path", type="string", description="Relative path to the file"),
             ToolParameter(name="encoding", type="string", description="File encoding", required=False, default="utf-8"),
+            ToolParameter(name="start_line", type="int", description="First line to return (1-based)", required=False),
+            ToolParameter(name="end_line", type="int", description="Last line to return (inclusive)", required=False),
+            ToolParameter(name="max_bytes", type="int", description="Cap on returned content", required=False, default=48000),
+            ToolParameter(name="line_offset", type="int", description="Byte offset into start_line (continues a cut line)", required=False, default=0),
+        ],
+        returns="File contents as string (partial reads start with a size/line-count header)",
+        examples=['read_file(path="src/main.py")', 'read_file(path="logs/build.log", start_line=2000, end_line=2200)'],
+    ),
+    ToolDefinition(
+        name="read_files",
+        category=ToolCategory.FILESYSTEM,
+        description="Read several small files in one call",
+        detailed_docs="Read up to 20 files at once. Each file is capped at 16000 bytes.",
+        parameters=[
+            ToolParameter(name="paths", type="list", description="Relative paths to the files"),
         ],
-        returns="File contents as string",
-        examples=['read_file(path="src/main.py")'],
+        returns="Each file's contents under a '=== path ===' heading",
+        examples=['read_files(paths=["src/models.py", "src/schemas.py"])'],
     ),
     ToolDefinition(
         name="write_file",
@@ -319,6 +432,34 @@ FILESYSTEM_TOOLS: List[ToolDefinition] = [
         examples=['write_file(path="src/utils.py", content="def helper():\\n    pass")'],
         is_destructive=True,
     ),
+    ToolDefinition(
+        name="edit_file",
+        category=ToolCategory.FILESYSTEM,
+        description="Change part of a file with search/replace hunks or a unified diff",
+        detailed_docs="Apply search/replace hunks (each search must match exactly once) or a unified diff atomically. Conflicts leave the file untouched.",
+        parameters=[
+            ToolParameter(name="path", type="string", description="Relative path to the file"),
+            ToolParameter(name="edits", type="list", description='[{"search": old text, "replace": new text}]', required=False),
+            ToolParameter(name="diff", type="string", description="Unified diff instead of edits", required=False),
+            ToolParameter(name="encoding", type="string", description="File encoding", required=False, default="utf-8"),
+        ],
+        returns="Changed line ranges and new line count, or the conflict that stopped the edit",
+        examples=['edit_file(path="src/config.py", edits=[{"search": "TIMEOUT = 30", "replace": "TIMEOUT = 60"}])'],
+        is_destructive=True,
+    ),
+    ToolDefinition(
+        name="write_files",
+        category=ToolCategory.FILESYSTEM,
+        description="Write several files in one call",
+        detailed_docs="Write up to 20 files at once. Each file is written or rejected on its own; existing files must be read first.",
+        parameters=[
+            ToolParameter(name="files", type="list", description='[{"path": relative path, "content": content}]'),
+            ToolParameter(name="encoding", type="string", description="File encoding", required=False, default="utf-8"),
+        ],
+        returns="One 'path: result' line per file and a count of files written",
+        examples=['write_files(files=[{"path": "app/__init__.py", "content": ""}, {"path": "app/main.py", "content": "..."}])'],
+        is_destructive=True,
+    ),
     ToolDefinition(
         name="append_file",
         category=ToolCategory.FILESYSTEM,
@@ -339,12 +480,29 @@ FILESYSTEM_TOOLS: List[ToolDefinition] = [
         parameters=[
             ToolParameter(name="path", type="string", description="Directory path", required=False, default="."),
             ToolParameter(name="recursive", type="bool", description="Include subdirectories", required=False, default=False),
-            ToolParameter(name="pattern", type="string", description="Glob pattern filter", required=False, default="*"),
+            ToolParameter(name="pattern", type="string", description="Glob pattern filter (with / it matches paths, ** spans dirs)", required=False, default="*"),
             ToolParameter(name="max_depth", type="int", description="Max recursion depth", required=False, default=3),
             ToolParameter(name="max_results", type="int", description="Max results to return", required=False, default=500),
         ],
         returns="List of file/directory names (truncated at 500)",
-        examples=['list_directory(path="src", recursive=True, pattern="*.py")'],
+        examples=['list_directory(path="src", recursive=True, pattern="*.py")', 'list_directory(pattern="tests/**/test_*.py")'],
+    ),
+    ToolDefinition(
+        name="search_code",
+        category=ToolCategory.FILESYSTEM,
+        description="Search code by regex, literal text or symbol name",
+        detailed_docs="Grep the worktree (regex or literal) or look up Python defs/classes and JS/TS exports. Returns path:line snippets, capped at max_results.",
+        parameters=[
+            ToolParameter(name="query", type="string", description="Regex, literal text or symbol name"),
+            ToolParameter(name="mode", type="string", description="Search mode", required=False, default="regex",
+                          enum_values=["regex", "literal", "symbol"]),
+            ToolParameter(name="path", type="string", description="Directory to search under", required=False, default="."),
+            ToolParameter(name="glob", type="string", description="Only search files matching this glob", required=False),
+            ToolParameter(name="case_sensitive", type="bool", description="Match case exactly", required=False, default=False),
+            ToolParameter(name="max_results", type="int", description="Max matches to return (<= 200)", required=False, default=50),
+        ],
+        returns="path:line: snippet lines followed by a match count",
+        examples=['search_code(query="def handle_request", glob="*.py")', 'search_code(query="UserService", mode="symbol")'],
     ),
     ToolDefinition(
         name="file_exists",
@@ -356,6 +514,17 @@ FILESYSTEM_TOOLS: List[ToolDefinition] = [
         ],
         returns="Boolean indicating existence",
     ),
+    ToolDefinition(
+        name="stat_files",
+        category=ToolCategory.FILESYSTEM,
+        description="Check several paths in one call",
+        detailed_docs="Check up to 20 paths at once: whether each exists, whether it is a file or directory, and its size.",
+        parameters=[
+            ToolParameter(name="paths", type="list", description="Paths to check"),
+        ],
+        returns="One 'path: file, N bytes' / 'directory' / 'not found' line per path",
+        examples=['stat_files(paths=["requirements.txt", "src", "tests/test_api.py"])'],
+    ),
     ToolDefinition(
         name="delete_file",
         category=ToolCategory.FILESYSTEM,
@@ -730,27 +899,63 @@ CODE_EXECUTION_TOOLS: List[ToolDefinition] = [
 # TOOL REGISTRY
 # =============================================================================
 
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+
+def _tokenize(text: str, split_compounds: bool = True) -> Set[str]:
+    """Lowercase word tokens; with split_compounds, read_file also yields read and file."""
+    tokens = set(_TOKEN.findall(text.lower()))
+    if split_compounds:
+        tokens |= {part for token in tokens if "_" in token for part in token.split("_") if part}
+    return tokens
+
+
 @dataclass
 class ToolRegistry:
     """
     Registry of all available tools.
     
     Supports progressive disclosure via search_tools.
+
+    Every detail-level rendering is computed once at registration, and an
+    inverted index maps name/description/docs tokens to tool names, so a
+    search is a few dictionary lookups instead of a scan of every tool's docs.
+    Returned schemas are shared - treat them as read-only.
     """
     tools: Dict[str, ToolDefinition] = field(default_factory=dict)
     categories: Dict[ToolCategory, List[str]] = field(default_factory=dict)
+    _renderings: Dict[str, Dict[DetailLevel, Union[str, Dict[str, Any]]]] = field(default_factory=dict, repr=False)
+    _index: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+    _sorted_tokens: List[str] = field(default_factory=list, repr=False)
+    _order: Dict[str, int] = field(default_factory=dict, repr=False)
     
     def register(self, tool: ToolDefinition) -> None:
         """Register a tool."""
+        if tool.name in self.tools:
+            self._unindex(tool.name)
+        else:
+            self._order[tool.name] = len(self._order)
         self.tools[tool.name] = tool
         if tool.category not in self.categories:
             self.categories[tool.category] = []
-        self.categories[tool.category].append(tool.name)
+        if tool.name not in self.categories[tool.category]:
+            self.categories[tool.category].append(tool.name)
+
+        self._renderings[tool.name] = {level: tool.to_detail_level(level) for level in DetailLevel}
+        for token in _tokenize(f"{tool.name} {tool.description} {tool.detailed_docs}"):
+            self._index.setdefault(token, set()).add(tool.name)
+        self._sorted_tokens = sorted(self._index)
     
     def register_all(self, tools: List[ToolDefinition]) -> None:
         """Register multiple tools."""
         for tool in tools:
             self.register(tool)
+
+    def _unindex(self, name: str) -> None:
+        for token in [t for t, names in self._index.items() if name in names]:
+            self._index[token].discard(name)
+            if not self._index[token]:
+                del self._index[token]
     
     def get_index(self) -> str:
         """Get the TOOLS_INDEX.md content."""
@@ -765,6 +970,15 @@ class ToolRegistry:
             ToolCategory.CODE_EXECUTION: CODE_EXECUTION_TOOL_MD,
         }
         return docs.get(category, f"# {category.value}\n\nNo documentation available.")
+
+    def _matching(self, term: str) -> Set[str]:
+        """Tools with an indexed token starting with term."""
+        matches: Set[str] = set()
+        i = bisect_left(self._sorted_tokens, term)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(term):
+            matches |= self._index[self._sorted_tokens[i]]
+            i += 1
+        return matches
     
     def search_tools(
         self, 
@@ -779,28 +993,28 @@ class ToolRegistry:
         without loading all definitions upfront.
         
         Args:
-            query: Search terms (matched against name and description)
+            query: Search terms (matched against name, description and docs;
+                every term must match the start of a word, e.g. "file" matches "files")
             detail_level: How much detail to return
             category: Optional category filter
             
         Returns:
-            List of tool info at the specified detail level
+            List of tool info at the specified detail level, in registration order
         """
-        query_lower = query.lower()
-        results = []
-        
-        for name, tool in self.tools.items():
-            # Filter by category if specified
-            if category and tool.category != category:
-                continue
-            
-            # Match against name and description
-            if (query_lower in name.lower() or 
-                query_lower in tool.description.lower() or
-                query_lower in tool.detailed_docs.lower()):
-                results.append(tool.to_detail_level(detail_level))
-        
-        return results
+        terms = _tokenize(query, split_compounds=False)
+        if not terms:
+            return []
+
+        names: Optional[Set[str]] = None
+        for term in terms:
+            names = self._matching(term) if names is None else names & self._matching(term)
+            if not names:
+                return []
+        if category:
+            names = {n for n in names if self.tools[n].category == category}
+
+        level = DetailLevel(detail_level)
+        return [self._renderings[n][level] for n in sorted(names, key=self._order.__getitem__)]
     
     def get_tool(self, name: str) -> Optional[ToolDefinition]:
         """Get a specific tool by name."""
@@ -838,7 +1052,8 @@ SEARCH_TOOLS_DEFINITION = ToolDefinition(
     description="Find available tools matching a query",
     detailed_docs="""
 Search for tools by keyword. Use this to discover tools without loading all 
-definitions upfront.
+definitions upfront. Every term must match the start of a word in a tool's
+name, description or docs ("file" matches read_file and "files").
 
 **Detail levels:**
 - `name_only`: Just tool names (minimal tokens)
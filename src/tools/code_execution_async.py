@@ -4,18 +4,25 @@ Agent Orchestrator — Async Code Execution Tools
 Version 2.0 — December 2025
 
 Async implementation of code execution tools.
+
+Processes run through the execution backend in sandbox.py, which applies
+per-call CPU, memory and process limits and records resource usage.
+pip and npm inside them use the shared caches in dependency_cache.py.
 """
 
-import asyncio
 import sys
 import os
 import platform
-from typing import Tuple
+
+from dependency_cache import cache_env
+
+from .sandbox import get_execution_backend
 
 PLATFORM = f"OS - {platform.system()}, Release: {platform.release()}"
 
 
-async def run_python_async(code: str, timeout: int = 30, cwd: str = None, workspace_path: str = None) -> str:
+async def run_python_async(code: str, timeout: int = 30, cwd: str = None, workspace_path: str = None,
+                           task_id: str = None) -> str:
     f"""
     Execute Python code asynchronously in a subprocess.
     
@@ -24,6 +31,7 @@ async def run_python_async(code: str, timeout: int = 30, cwd: str = None, worksp
         timeout: Max execution time in seconds
         cwd: Directory to execute in (default: current working directory)
         workspace_path: Path to workspace root (for finding shared venv)
+        task_id: Task the call belongs to (labels resource-usage metrics)
         
     Returns:
         Combined stdout and stderr
@@ -46,79 +54,30 @@ async def run_python_async(code: str, timeout: int = 30, cwd: str = None, worksp
         if venv_python.exists():
             python_exe = str(venv_python)
     
-    env = os.environ.copy()
+    env = {**os.environ, **cache_env()}  # Shared pip/npm caches across worktrees and runs
     if cwd:
         env["PYTHONPATH"] = str(cwd) + os.pathsep + env.get("PYTHONPATH", "")
     
     try:
-        # Create process with proper process group handling
-        if platform.system() == 'Windows':
-            import subprocess
-            process = await asyncio.create_subprocess_exec(
-                python_exe, "-c", code,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=cwd or os.getcwd(),
-                env=env,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
-            )
-        else:
-            process = await asyncio.create_subprocess_exec(
-                python_exe, "-c", code,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=cwd or os.getcwd(),
-                env=env,
-                preexec_fn=os.setsid
-            )
-        
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            # Kill the subprocess tree safely
-            if platform.system() == 'Windows':
-                # CRITICAL: Do NOT use CTRL_BREAK_EVENT - it kills the parent console too!
-                # Use taskkill /T to kill process tree, or just process.kill()
-                import subprocess as sp
-                try:
-                    # taskkill /T kills the process AND its children
-                    # /F = force, /T = tree (children), /PID = process ID
-                    sp.run(['taskkill', '/F', '/T', '/PID', str(process.pid)], 
-                           capture_output=True, timeout=5)
-                except Exception:
-                    pass
-                try:
-                    process.kill()
-                except (ProcessLookupError, OSError):
-                    pass
-            else:
-                import signal
-                try:
-                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-                except (ProcessLookupError, OSError, PermissionError):
-                    # Process group may not exist or we don't have permission
-                    try:
-                        process.kill()
-                    except (ProcessLookupError, OSError):
-                        pass
-
-            await process.wait()
+        result = await get_execution_backend().run(
+            [python_exe, "-c", code], cwd=cwd, env=env, timeout=timeout, task_id=task_id, tool="run_python"
+        )
+        if result.timed_out:
             return f"Error: Execution timed out after {timeout} seconds (killed process and children)"
         
         output = []
-        stdout_str = stdout.decode("utf-8", errors="replace") if stdout else ""
-        stderr_str = stderr.decode("utf-8", errors="replace") if stderr else ""
+        stdout_str = result.stdout.decode("utf-8", errors="replace")
+        stderr_str = result.stderr.decode("utf-8", errors="replace")
         
         if stdout_str:
             output.append(f"STDOUT:\n{stdout_str}")
         if stderr_str:
             output.append(f"STDERR:\n{stderr_str}")
         
-        if process.returncode != 0:
-            output.append(f"Exit Code: {process.returncode}")
+        if result.returncode != 0:
+            output.append(f"Exit Code: {result.returncode}")
+        if result.limit_note():
+            output.append(result.limit_note())
         
         return "\n".join(output) if output else "No output"
         
@@ -126,7 +85,8 @@ async def run_python_async(code: str, timeout: int = 30, cwd: str = None, worksp
         return f"Error executing code: {str(e)}"
 
 
-async def run_shell_async(command: str, timeout: int = 30, cwd: str = None, workspace_path: str = None) -> str:
+async def run_shell_async(command: str, timeout: int = 30, cwd: str = None, workspace_path: str = None,
+                          task_id: str = None) -> str:
     f"""
     Execute shell command asynchronously.
 
@@ -135,6 +95,7 @@ async def run_shell_async(command: str, timeout: int = 30, cwd: str = None, work
         timeout: Max execution time in seconds
         cwd: Directory to execute in (default: current working directory)
         workspace_path: Path to workspace root (for finding workspace venv)
+        task_id: Task the call belongs to (labels resource-usage metrics)
 
     Returns:
         Combined stdout and stderr
@@ -146,7 +107,7 @@ async def run_shell_async(command: str, timeout: int = 30, cwd: str = None, work
     """
     from pathlib import Path
 
-    env = os.environ.copy()
+    env = {**os.environ, **cache_env()}  # Shared pip/npm caches across worktrees and runs
     if cwd:
         env["PYTHONPATH"] = str(cwd) + os.pathsep + env.get("PYTHONPATH", "")
 
@@ -162,74 +123,22 @@ async def run_shell_async(command: str, timeout: int = 30, cwd: str = None, work
             env["PATH"] = str(venv_bin) + os.pathsep + env.get("PATH", "")
     
     try:
-        # Create process with proper process group handling
-        if platform.system() == 'Windows':
-            # Windows: Use CREATE_NEW_PROCESS_GROUP
-            import subprocess
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=cwd or os.getcwd(),
-                env=env,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
-            )
-        else:
-            # Unix: Use process group
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=cwd or os.getcwd(),
-                env=env,
-                preexec_fn=os.setsid
-            )
-        
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            # Kill the subprocess tree safely
-            if platform.system() == 'Windows':
-                # CRITICAL: Do NOT use CTRL_BREAK_EVENT - it kills the parent console too!
-                # Use taskkill /T to kill process tree, or just process.kill()
-                import subprocess as sp
-                try:
-                    # taskkill /T kills the process AND its children
-                    # /F = force, /T = tree (children), /PID = process ID
-                    sp.run(['taskkill', '/F', '/T', '/PID', str(process.pid)], 
-                           capture_output=True, timeout=5)
-                except Exception:
-                    pass
-                try:
-                    process.kill()
-                except (ProcessLookupError, OSError):
-                    pass
-            else:
-                # Unix: Kill process group
-                import signal
-                try:
-                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-                except (ProcessLookupError, OSError, PermissionError):
-                    # Process group may not exist or we don't have permission
-                    try:
-                        process.kill()
-                    except (ProcessLookupError, OSError):
-                        pass
-
-            await process.wait()
+        result = await get_execution_backend().run(
+            command, shell=True, cwd=cwd, env=env, timeout=timeout, task_id=task_id, tool="run_shell"
+        )
+        if result.timed_out:
             return f"Error: Command timed out after {timeout} seconds (killed process and children)"
         
         output = []
-        stdout_str = stdout.decode("utf-8", errors="replace") if stdout else ""
-        stderr_str = stderr.decode("utf-8", errors="replace") if stderr else ""
+        stdout_str = result.stdout.decode("utf-8", errors="replace")
+        stderr_str = result.stderr.decode("utf-8", errors="replace")
         
         if stdout_str:
             output.append(stdout_str)
         if stderr_str:
             output.append(stderr_str)
+        if result.limit_note():
+            output.append(result.limit_note())
         
         return "\n".join(output) if output else "No output"
         
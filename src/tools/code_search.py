@@ -0,0 +1,360 @@
+"""
+Agent Orchestrator — Code Search
+================================
+search_code tool: regex, literal and symbol search over a worktree.
+
+Without it, workers find a function by listing directories and reading
+files one by one, which costs a tool call and many tokens per step.
+search_code answers in one call with file:line snippets.
+
+It reuses the incremental pieces already kept per worktree:
+- the file list comes from the worktree's file index (tools.file_index)
+- file contents come from the worktree file cache (tools.file_cache)
+- symbol tables are parsed once per file version: Python defs and classes
+  via ast, JS/TS exports via a line-based parser
+"""
+
+import ast
+import asyncio
+import fnmatch
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .file_cache import get_worktree_cache
+from .file_index import get_file_index, glob_to_regex
+from .filesystem_async import _get_workspace_root, _is_safe_path
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DEFAULT_RESULTS = 50
+SEARCH_MAX_RESULTS = 200
+SEARCH_MAX_MATCHES_PER_FILE = 10
+SEARCH_MAX_FILE_BYTES = 1_000_000  # Larger files (bundles, logs, data) are skipped
+SNIPPET_CHARS = 200
+MAX_CODE_INDEXES = int(os.getenv("MAX_FILE_INDEXES", "32"))
+
+PYTHON_EXTENSIONS = {".py", ".pyi"}
+JS_EXTENSIONS = {".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".mts", ".cts"}
+
+# (line, kind, name) - name is qualified for methods (Class.method)
+Symbol = Tuple[int, str, str]
+
+
+# =============================================================================
+# SYMBOL PARSERS
+# =============================================================================
+
+def parse_python_symbols(source: str) -> List[Symbol]:
+    """Classes, functions and methods (qualified), plus module-level assignments."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    symbols: List[Symbol] = []
+
+    def visit(node: ast.AST, prefix: str):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                symbols.append((child.lineno, "class", prefix + child.name))
+                visit(child, f"{prefix}{child.name}.")
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if prefix and isinstance(node, ast.ClassDef) else "function"
+                symbols.append((child.lineno, kind, prefix + child.name))
+                visit(child, f"{prefix}{child.name}.")
+
+    visit(tree, "")
+    for node in tree.body:
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target] if isinstance(node, ast.AnnAssign) else []
+        for target in targets:
+            if isinstance(target, ast.Name):
+                symbols.append((node.lineno, "variable", target.id))
+    symbols.sort()
+    return symbols
+
+
+_JS_DECLARATION = re.compile(
+    r"^\s*export\s+(?:declare\s+)?(default\s+)?(?:abstract\s+)?(?:async\s+)?"
+    r"(function\s*\*?|class|const|let|var|interface|type|enum|namespace)\s+([A-Za-z_$][\w$]*)"
+)
+_JS_DEFAULT_NAME = re.compile(r"^\s*export\s+default\s+([A-Za-z_$][\w$]*)\s*;?\s*$")
+_JS_EXPORT_LIST = re.compile(r"^\s*export\s+(?:type\s+)?\{([^}]*)\}")
+_JS_COMMONJS = re.compile(r"^\s*(?:module\.)?exports\.([A-Za-z_$][\w$]*)\s*=")
+_JS_KINDS = {"const": "variable", "let": "variable", "var": "variable"}
+
+
+def parse_js_symbols(source: str) -> List[Symbol]:
+    """Exported names of a JS/TS module (ES export statements and CommonJS exports.x =)."""
+    symbols: List[Symbol] = []
+    for lineno, line in enumerate(source.splitlines(), start=1):
+        if "export" not in line:
+            continue
+        match = _JS_DECLARATION.match(line)
+        if match:
+            keyword = match.group(2).split()[0].rstrip("*")
+            symbols.append((lineno, _JS_KINDS.get(keyword, keyword), match.group(3)))
+            continue
+        match = _JS_DEFAULT_NAME.match(line) or _JS_COMMONJS.match(line)
+        if match:
+            symbols.append((lineno, "export", match.group(1)))
+            continue
+        match = _JS_EXPORT_LIST.match(line)
+        if match:
+            for item in match.group(1).split(","):
+                # "a as b" exports b
+                name = item.strip().split()[-1] if item.strip() else ""
+                if name and name != "default":
+                    symbols.append((lineno, "export", name))
+    return symbols
+
+
+def _symbol_parser(path: str):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in PYTHON_EXTENSIONS:
+        return parse_python_symbols
+    if ext in JS_EXTENSIONS:
+        return parse_js_symbols
+    return None
+
+
+# =============================================================================
+# PER-WORKTREE INDEX
+# =============================================================================
+
+class CodeIndex:
+    """Search over one worktree; symbol tables are reparsed only when a file changes."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.files = get_file_index(self.root)
+        self.contents = get_worktree_cache(self.root)
+        self._symbols: Dict[str, Tuple[Tuple[int, int, int], List[Symbol]]] = {}
+        self._lock = threading.Lock()
+        self.parses = 0
+
+    def _candidates(self, rel_dir: str, file_glob: Optional[str]) -> List[str]:
+        paths = self.files.files(rel_dir)
+        if not file_glob:
+            return paths
+        if "/" in file_glob:
+            regex = glob_to_regex(file_glob.lstrip("/"))
+            return [p for p in paths if regex.match(p)]
+        return [p for p in paths if fnmatch.fnmatch(p.rsplit("/", 1)[-1], file_glob)]
+
+    def _load(self, rel_path: str) -> Optional[Tuple[Tuple[int, int, int], str]]:
+        """(stat signature, text) of a searchable file; None for large, binary or vanished files."""
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            stat = os.stat(full_path)
+            if stat.st_size > SEARCH_MAX_FILE_BYTES:
+                return None
+            data = self.contents.read(full_path)
+        except OSError:
+            return None
+        if b"\x00" in data[:8192]:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino), data.decode("utf-8", errors="replace")
+
+    def grep(self, regex: "re.Pattern", rel_dir: str = "", file_glob: Optional[str] = None,
+             max_results: int = SEARCH_DEFAULT_RESULTS) -> Tuple[List[Tuple[str, int, int, str]], int, bool]:
+        """
+        Lines matching regex (compile it with re.MULTILINE so ^ and $ anchor at lines).
+
+        A match that runs across line breaks (e.g. through \\s) is reported once,
+        with the first and last line it covers.
+
+        Returns:
+            ([(path, first line, last line, text of first line)], number of files with matches,
+            whether max_results cut the search)
+        """
+        hits: List[Tuple[str, int, int, str]] = []
+        files_matched = 0
+        for rel_path in self._candidates(rel_dir, file_glob):
+            loaded = self._load(rel_path)
+            if loaded is None:
+                continue
+            text = loaded[1]
+            # One pass over the whole file; most files have no match at all
+            match = regex.search(text)
+            if match is None:
+                continue
+            files_matched += 1
+            line_no, pos, per_file = 1, 0, 0
+            while match is not None:
+                line_no += text.count("\n", pos, match.start())
+                line_start = text.rfind("\n", 0, match.start()) + 1
+                first_end = text.find("\n", match.start())
+                first_end = len(text) if first_end < 0 else first_end
+                # Line breaks inside the match (a trailing one still belongs to the first line)
+                last = max(match.end() - 1, match.start())
+                end_line_no = line_no + text.count("\n", match.start(), last)
+                line_end = text.find("\n", last)
+                line_end = len(text) if line_end < 0 else line_end
+                hits.append((rel_path, line_no, end_line_no, text[line_start:first_end]))
+                per_file += 1
+                if len(hits) >= max_results:
+                    return hits, files_matched, True
+                if per_file >= SEARCH_MAX_MATCHES_PER_FILE or line_end >= len(text):
+                    break
+                # One hit per line: continue from the line after the match
+                line_no = end_line_no + 1
+                pos = line_end + 1
+                match = regex.search(text, pos)
+        return hits, files_matched, False
+
+    def symbols(self, rel_path: str) -> List[Symbol]:
+        """Symbol table of one file (cached per file version)."""
+        parser = _symbol_parser(rel_path)
+        if parser is None:
+            return []
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return []
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            cached = self._symbols.get(rel_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        loaded = self._load(rel_path)
+        symbols = parser(loaded[1]) if loaded else []
+        self.parses += 1
+        with self._lock:
+            self._symbols[rel_path] = (loaded[0] if loaded else signature, symbols)
+        return symbols
+
+    def find_symbols(self, query: str, rel_dir: str = "", file_glob: Optional[str] = None,
+                     max_results: int = SEARCH_DEFAULT_RESULTS) -> Tuple[List[Tuple[str, int, str, str]], bool]:
+        """
+        Symbols named query: exact (or glob) matches first, then names containing it.
+
+        Returns:
+            ([(path, line, kind, qualified name)], whether max_results cut the list)
+        """
+        needle = query.lower()
+        is_glob = any(c in query for c in "*?[")
+        exact, partial = [], []
+        for rel_path in self._candidates(rel_dir, file_glob):
+            for line, kind, name in self.symbols(rel_path):
+                short = name.rsplit(".", 1)[-1].lower()
+                if is_glob:
+                    if fnmatch.fnmatch(short, needle) or fnmatch.fnmatch(name.lower(), needle):
+                        exact.append((rel_path, line, kind, name))
+                elif short == needle or name.lower() == needle:
+                    exact.append((rel_path, line, kind, name))
+                elif needle in name.lower():
+                    partial.append((rel_path, line, kind, name))
+        results = exact + partial
+        return results[:max_results], len(results) > max_results
+
+    def line(self, rel_path: str, line_no: int) -> str:
+        loaded = self._load(rel_path)
+        if loaded is None:
+            return ""
+        lines = loaded[1].splitlines()
+        return lines[line_no - 1] if 0 < line_no <= len(lines) else ""
+
+
+_indexes: "OrderedDict[str, CodeIndex]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def get_code_index(root) -> CodeIndex:
+    """The shared code index for a worktree (least recently used worktree evicted)."""
+    key = os.path.abspath(root)
+    with _registry_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = CodeIndex(key)
+            while len(_indexes) > MAX_CODE_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
+
+
+# =============================================================================
+# TOOL
+# =============================================================================
+
+def _snippet(text: str) -> str:
+    text = text.strip()
+    return text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS] + "..."
+
+
+async def search_code_async(
+    query: str,
+    mode: str = "regex",
+    path: str = ".",
+    glob: Optional[str] = None,
+    case_sensitive: bool = False,
+    max_results: int = SEARCH_DEFAULT_RESULTS,
+    root: Optional[Path] = None,
+    additional_roots: List[Path] = None
+) -> str:
+    """
+    Search the worktree's code.
+
+    Args:
+        query: Regex, literal text or symbol name (depending on mode)
+        mode: "regex" (default), "literal" or "symbol"
+        path: Directory to search under (default: whole worktree)
+        glob: Only search files matching this glob ("*.py", or "src/**/*.ts")
+        case_sensitive: Match case exactly (regex/literal modes)
+        max_results: Maximum matches to return (capped at 200)
+        root: Optional workspace root override
+        additional_roots: Additional allowed paths
+
+    Returns:
+        One "path:line: snippet" line per match ("path:first-last: ..." for a match
+        spanning lines), followed by a summary
+    """
+    if not _is_safe_path(path, root, additional_roots):
+        raise ValueError(f"Access denied: {path} is outside workspace")
+    if not query:
+        return "Error: query is empty."
+    if mode not in ("regex", "literal", "symbol"):
+        return f"Error: unknown mode '{mode}' (use regex, literal or symbol)."
+
+    workspace_root = _get_workspace_root(root)
+    target = os.path.abspath(workspace_root / path.lstrip("/\\"))
+    rel_dir = os.path.relpath(target, workspace_root)
+    if rel_dir == ".." or rel_dir.startswith(".." + os.sep):
+        index, rel_dir = get_code_index(target), ""
+    else:
+        index = get_code_index(workspace_root)
+        rel_dir = "" if rel_dir == "." else rel_dir.replace("\\", "/")
+    if not os.path.isdir(target):
+        return f"Directory not found: {path}"
+    max_results = max(1, min(max_results, SEARCH_MAX_RESULTS))
+
+    def _search() -> str:
+        if mode == "symbol":
+            found, truncated = index.find_symbols(query, rel_dir, glob, max_results)
+            if not found:
+                return f"No symbols matching '{query}'."
+            lines = [f"{p}:{n}: [{kind} {name}] {_snippet(index.line(p, n))}" for p, n, kind, name in found]
+            summary = f"[{len(found)} symbol(s)]"
+        else:
+            pattern = re.escape(query) if mode == "literal" else query
+            try:
+                # MULTILINE: results are per line like grep, so ^ and $ anchor at line boundaries
+                regex = re.compile(pattern, re.MULTILINE | (0 if case_sensitive else re.IGNORECASE))
+            except re.error as e:
+                return f"Error: invalid regex '{query}': {e}. Use mode='literal' for plain text."
+            found, files_matched, truncated = index.grep(regex, rel_dir, glob, max_results)
+            if not found:
+                return f"No matches for '{query}'."
+            lines = [f"{p}:{n}{'' if end == n else f'-{end}'}: {_snippet(text)}" for p, n, end, text in found]
+            summary = f"[{len(found)} match(es) in {files_matched} file(s)]"
+        if truncated:
+            summary += f" (stopped at {max_results} results - narrow the query with path or glob)"
+        return "\n".join(lines) + "\n\n" + summary
+
+    return await asyncio.to_thread(_search)
@@ -0,0 +1,176 @@
+"""
+Agent Orchestrator — Worktree File Cache
+========================================
+In-memory cache of file contents, one per worktree.
+
+Workers, the QA agent and the strategist re-read the same specs, interface
+files and tests many times. Reads through the cache still stat the file,
+but only open and read it when (mtime_ns, size, inode) changed since the
+cached copy. Each worktree cache is an LRU bounded in bytes; writes through
+the filesystem tools invalidate the entry explicitly (mtime granularity can
+hide a same-size rewrite).
+
+Usage:
+    from tools.file_cache import get_worktree_cache
+
+    data = get_worktree_cache(worktree_path).read(full_path)  # bytes
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from metrics import tool_metrics
+
+logger = logging.getLogger(__name__)
+
+FILE_CACHE_BYTES = int(os.getenv("FILE_CACHE_MB", "16")) * 1024 * 1024  # Per worktree
+FILE_CACHE_MAX_ENTRY_BYTES = 1_000_000  # Larger files are not cached (read_file maps them instead)
+MAX_WORKTREE_CACHES = int(os.getenv("MAX_WORKTREE_FILE_CACHES", "32"))
+
+PathLike = Union[str, Path]
+
+
+def _key(path: PathLike) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class FileContentCache:
+    """Byte-bounded LRU of file contents keyed by path and (mtime_ns, size, inode)."""
+
+    def __init__(self, root: PathLike, max_bytes: int = FILE_CACHE_BYTES,
+                 max_entry_bytes: int = FILE_CACHE_MAX_ENTRY_BYTES):
+        self.root = _key(root)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int, int], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()  # Reads run in worker threads (asyncio.to_thread)
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def read(self, path: PathLike) -> bytes:
+        """Return the file's bytes, from memory when the file is unchanged."""
+        key = _key(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _record(hit=True)
+                return entry[1]
+
+        with open(key, "rb") as f:
+            data = f.read()
+
+        with self._lock:
+            self.misses += 1
+            _record(hit=False)
+            self._drop(key)
+            # Only cache what matches the stat we keyed on (the file may have changed mid-read)
+            if len(data) == stat.st_size and len(data) <= self.max_entry_bytes:
+                self._entries[key] = (signature, data)
+                self.resident_bytes += len(data)
+                _adjust_resident(len(data))
+                while self.resident_bytes > self.max_bytes and self._entries:
+                    self._drop(next(iter(self._entries)))
+        return data
+
+    def invalidate(self, path: PathLike):
+        """Forget a file (call after writing or deleting it)."""
+        with self._lock:
+            self._drop(_key(path))
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.resident_bytes -= len(entry[1])
+            _adjust_resident(-len(entry[1]))
+
+    def __contains__(self, path: PathLike) -> bool:
+        return _key(path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# =============================================================================
+# PER-WORKTREE REGISTRY
+# =============================================================================
+
+_caches: "OrderedDict[str, FileContentCache]" = OrderedDict()
+_registry_lock = threading.Lock()
+_totals = {"hits": 0, "misses": 0, "bytes": 0}
+
+
+def _record(hit: bool):
+    _totals["hits" if hit else "misses"] += 1
+    tool_metrics.file_cache_requests.labels(result="hit" if hit else "miss").inc()
+    tool_metrics.file_cache_hit_ratio.set(_totals["hits"] / (_totals["hits"] + _totals["misses"]))
+
+
+def _adjust_resident(delta: int):
+    _totals["bytes"] += delta
+    tool_metrics.file_cache_bytes.set(_totals["bytes"])
+
+
+def get_worktree_cache(root: PathLike) -> FileContentCache:
+    """The shared cache for a worktree (created on first use, least recently used worktree evicted)."""
+    key = _key(root)
+    with _registry_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = FileContentCache(key)
+            while len(_caches) > MAX_WORKTREE_CACHES:
+                _, evicted = _caches.popitem(last=False)
+                evicted.clear()
+        else:
+            _caches.move_to_end(key)
+        return cache
+
+
+def find_worktree_cache(path: PathLike) -> Optional[FileContentCache]:
+    """The registered cache whose worktree contains path, if any."""
+    key = _key(path)
+    with _registry_lock:
+        for root, cache in _caches.items():
+            if key == root or key.startswith(root + os.sep):
+                return cache
+    return None
+
+
+def invalidate_path(path: PathLike):
+    """Drop a file from every worktree cache (a cache may hold files from additional roots)."""
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidate(path)
+
+
+def read_text_cached(path: PathLike, root: Optional[PathLike] = None, encoding: str = "utf-8",
+                     errors: str = "strict") -> str:
+    """
+    Path.read_text through the worktree cache.
+
+    Uses the cache for root, or the registered worktree containing path;
+    falls back to a plain read when neither exists.
+    """
+    cache = get_worktree_cache(root) if root else find_worktree_cache(path)
+    data = cache.read(path) if cache else Path(path).read_bytes()
+    return data.decode(encoding, errors=errors)
@@ -0,0 +1,303 @@
+"""
+Agent Orchestrator — Patch-Based File Editing
+=============================================
+edit_file tool: change part of a file without rewriting all of it.
+
+With write_file, editing one line of a 2,000-line file means reading the
+whole file and sending it back. edit_file takes either search/replace hunks
+or a unified diff, and returns a short summary instead of the content.
+
+Edits are applied atomically. Every hunk is located first and the file is
+only replaced (temp file + os.replace) if all of them apply. A hunk
+conflicts, and nothing is written, if:
+- its search text is missing
+- its search text matches more than once
+- a diff hunk's context differs from the file
+- two hunks overlap
+- the file changed on disk while the edit was being made
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .file_cache import invalidate_path
+from .filesystem_async import _get_workspace_root, _is_safe_path
+
+# (start_line, end_line, new_line_count): old lines start..end (1-based, inclusive;
+# end = start - 1 for a pure insertion) were replaced by new_line_count lines
+LineEdit = Tuple[int, int, int]
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class EditConflict(Exception):
+    """A hunk could not be applied; the file is left untouched."""
+
+
+@dataclass
+class EditResult:
+    """What edit_file changed (passed to on_applied for read tracking and token accounting)."""
+    path: str
+    line_edits: List[LineEdit]
+    old_chars: int
+    new_chars: int
+    total_lines: int
+    added_lines: int = 0
+    removed_lines: int = 0
+    hunks: int = 0
+
+    def summary(self) -> str:
+        regions = ", ".join(
+            f"{start}-{start + count - 1}" if count else f"{start} (deleted)"
+            for start, count in _new_regions(self.line_edits)
+        )
+        return (
+            f"Edited {self.path}: {self.hunks} hunk(s) applied, +{self.added_lines} -{self.removed_lines} lines. "
+            f"Changed lines (new numbering): {regions}. File now has {self.total_lines} lines."
+        )
+
+
+@dataclass
+class _Change:
+    start: int  # Character offsets into the original text
+    end: int
+    replacement: str
+    label: str = ""
+
+
+def _count_lines(text: str) -> int:
+    return text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+
+
+def _new_regions(line_edits: List[LineEdit]) -> List[Tuple[int, int]]:
+    """(first new line, line count) of each edit after all edits are applied."""
+    regions, delta = [], 0
+    for start, end, count in line_edits:
+        regions.append((start + delta, count))
+        delta += count - (end - start + 1)
+    return regions
+
+
+# =============================================================================
+# HUNK LOCATION
+# =============================================================================
+
+def _locate_search_replace(text: str, edits: List[Dict[str, Any]]) -> List[_Change]:
+    changes = []
+    for i, edit in enumerate(edits, start=1):
+        search = edit.get("search")
+        replace = edit.get("replace")
+        if search is None or replace is None:
+            raise EditConflict(f"hunk {i}: each edit needs 'search' and 'replace'")
+        if search == "":
+            raise EditConflict(f"hunk {i}: 'search' is empty - use write_file or append_file to add whole files")
+
+        count = text.count(search)
+        if count == 0:
+            hint = ""
+            first = next((ln.strip() for ln in search.splitlines() if ln.strip()), "")
+            if first:
+                lines = [n for n, ln in enumerate(text.splitlines(), start=1) if ln.strip() == first]
+                if lines:
+                    hint = f" (its first line appears at line {lines[0]}, but the lines after it differ - re-read that region)"
+            raise EditConflict(f"hunk {i}: search text not found{hint}")
+        if count > 1:
+            positions, pos = [], text.find(search)
+            while pos >= 0 and len(positions) < 5:
+                positions.append(str(text.count("\n", 0, pos) + 1))
+                pos = text.find(search, pos + 1)
+            raise EditConflict(
+                f"hunk {i}: search text matches {count} places (lines {', '.join(positions)}) - "
+                f"include more surrounding lines so it is unique"
+            )
+        pos = text.find(search)
+        changes.append(_Change(pos, pos + len(search), replace, f"hunk {i}"))
+    return changes
+
+
+def _parse_unified_diff(diff: str) -> List[Tuple[int, List[str], List[str]]]:
+    """[(old start line, old lines, new lines)] for each @@ hunk; file headers are ignored."""
+    hunks = []
+    current = None
+    for line in diff.splitlines():
+        header = _HUNK_HEADER.match(line)
+        if header:
+            current = (int(header.group(1)), [], [])
+            hunks.append(current)
+        elif current is None or line.startswith(("--- ", "+++ ", "\\")):
+            continue
+        elif line.startswith("-"):
+            current[1].append(line[1:])
+        elif line.startswith("+"):
+            current[2].append(line[1:])
+        else:
+            # Context line (some tools drop the leading space of blank context lines)
+            current[1].append(line[1:] if line.startswith(" ") else line)
+            current[2].append(line[1:] if line.startswith(" ") else line)
+    if not hunks:
+        raise EditConflict("diff has no @@ hunks")
+    return hunks
+
+
+def _locate_diff(text: str, diff: str) -> List[_Change]:
+    lines = text.splitlines(keepends=True)
+    stripped = [ln.rstrip("\r\n") for ln in lines]
+    offsets = [0]
+    for ln in lines:
+        offsets.append(offsets[-1] + len(ln))
+    newline = "\r\n" if "\r\n" in text else "\n"
+
+    changes = []
+    for i, (old_start, old_lines, new_lines) in enumerate(_parse_unified_diff(diff), start=1):
+        expected = max(old_start - 1, 0) if old_lines else min(old_start, len(lines))
+        n = len(old_lines)
+        if n == 0:
+            at = expected
+        else:
+            # Exact position first, then the nearest place the old lines match (the file may have shifted)
+            candidates = [p for p in range(len(lines) - n + 1) if stripped[p:p + n] == old_lines]
+            if not candidates:
+                raise EditConflict(
+                    f"hunk {i} (@@ -{old_start}): context/removed lines do not match the file - re-read lines "
+                    f"{old_start}-{old_start + n - 1}"
+                )
+            at = min(candidates, key=lambda p: abs(p - expected))
+        replacement = newline.join(new_lines)
+        if new_lines:
+            if n and lines[at + n - 1].endswith("\n") or not n and at < len(lines):
+                replacement += newline
+            elif not n and text and not text.endswith("\n"):
+                # Appending after a last line that has no newline
+                replacement = newline + replacement
+        changes.append(_Change(offsets[at], offsets[at + n], replacement, f"hunk {i}"))
+    return changes
+
+
+# =============================================================================
+# APPLICATION
+# =============================================================================
+
+def apply_edits(text: str, edits: Optional[List[Dict[str, Any]]] = None,
+                diff: Optional[str] = None) -> Tuple[str, List[LineEdit], int]:
+    """
+    Apply search/replace edits or a unified diff to text.
+
+    Returns:
+        (new text, line edits in old-file numbering, number of hunks)
+
+    Raises:
+        EditConflict: If any hunk does not apply (nothing is changed)
+    """
+    if bool(edits) == bool(diff):
+        raise EditConflict("pass either 'edits' (search/replace hunks) or 'diff' (unified diff)")
+    changes = _locate_search_replace(text, edits) if edits else _locate_diff(text, diff)
+    changes.sort(key=lambda c: (c.start, c.end))
+    for prev, nxt in zip(changes, changes[1:]):
+        if nxt.start < prev.end:
+            raise EditConflict(f"{prev.label} and {nxt.label} overlap")
+
+    # Whole-line regions touched by each change, merged when two changes share a line
+    line_edits: List[LineEdit] = []
+    pieces, last = [], 0
+    for change in changes:
+        pieces.append(text[last:change.start])
+        pieces.append(change.replacement)
+        last = change.end
+
+        line_start = text.rfind("\n", 0, change.start) + 1
+        line_end = text.find("\n", max(change.end - 1, change.start))
+        line_end = len(text) if line_end < 0 else line_end + 1
+        if change.end > change.start and text[change.end - 1] == "\n":
+            line_end = change.end
+        start = text.count("\n", 0, line_start) + 1
+        old_count = _count_lines(text[line_start:line_end])
+        region = text[line_start:change.start] + change.replacement + text[change.end:line_end]
+        edit = (start, start + old_count - 1, _count_lines(region))
+        if line_edits and edit[0] <= line_edits[-1][1]:
+            p_start, p_end, p_count = line_edits.pop()
+            overlap = p_end - edit[0] + 1
+            edit = (p_start, max(p_end, edit[1]), p_count + edit[2] - overlap)
+        line_edits.append(edit)
+    pieces.append(text[last:])
+    return "".join(pieces), line_edits, len(changes)
+
+
+def _edit_file_sync(path: str, target_path: Path, edits, diff, encoding: str) -> EditResult:
+    stat = os.stat(target_path)
+    with open(target_path, "rb") as f:
+        data = f.read()
+    text = data.decode(encoding)
+    new_text, line_edits, hunks = apply_edits(text, edits, diff)
+
+    removed = sum(end - start + 1 for start, end, _ in line_edits)
+    added = sum(count for _, _, count in line_edits)
+    result = EditResult(
+        path=path, line_edits=line_edits, old_chars=len(text), new_chars=len(new_text),
+        total_lines=_count_lines(new_text), added_lines=added, removed_lines=removed, hunks=hunks
+    )
+    if new_text == text:
+        return result
+
+    fd, tmp_path = tempfile.mkstemp(dir=target_path.parent, prefix=f".{target_path.name}.", suffix=".edit")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(new_text.encode(encoding))
+        os.chmod(tmp_path, stat.st_mode & 0o7777)
+        # Last check before the swap: another writer got in while we were editing
+        current = os.stat(target_path)
+        if (current.st_mtime_ns, current.st_size) != (stat.st_mtime_ns, stat.st_size):
+            raise EditConflict(f"{path} changed on disk during the edit - re-read it and retry")
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return result
+
+
+async def edit_file_async(
+    path: str,
+    edits: Optional[List[Dict[str, Any]]] = None,
+    diff: Optional[str] = None,
+    encoding: str = "utf-8",
+    root: Optional[Path] = None,
+    additional_roots: List[Path] = None,
+    on_applied: Optional[Callable[[EditResult], None]] = None
+) -> str:
+    """
+    Apply search/replace hunks or a unified diff to an existing file.
+
+    Args:
+        path: Relative path to the file
+        edits: [{"search": exact existing text, "replace": new text}, ...]; each search must match once
+        diff: Unified diff (@@ hunks) against the current file, instead of edits
+        encoding: File encoding (default: utf-8)
+        root: Optional workspace root override
+        additional_roots: Additional allowed paths
+        on_applied: Called with the EditResult after a successful edit
+
+    Returns:
+        Compact summary of the changed line ranges, or the conflict that stopped the edit
+    """
+    if not path:
+        raise ValueError("ERROR: 'path' parameter is required!")
+    if not _is_safe_path(path, root, additional_roots):
+        raise ValueError(f"Access denied: {path} is outside workspace")
+
+    target_path = _get_workspace_root(root) / path.lstrip('/\\')
+    if not target_path.is_file():
+        return f"File not found: {path}. Use write_file to create new files."
+
+    try:
+        result = await asyncio.to_thread(_edit_file_sync, path, target_path, edits, diff, encoding)
+    except EditConflict as e:
+        return f"❌ EDIT CONFLICT - nothing was changed: {e}"
+    invalidate_path(target_path)
+    if on_applied:
+        on_applied(result)
+    return result.summary()
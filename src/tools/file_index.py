@@ -0,0 +1,420 @@
+"""
+Agent Orchestrator — Workspace File Index
+=========================================
+In-memory index of the files and directories in a worktree, one per root.
+
+Agents call list_directory constantly, and a fresh os.walk of a large
+worktree is slow. The index scans each directory once. After that it only
+rescans directories that changed. On Linux it learns about changes from
+inotify. Elsewhere, or once the watch limit is reached, it compares each
+directory's mtime. Excluded directories (node_modules, venvs, caches) are
+never scanned or watched.
+
+Usage:
+    from tools.file_index import get_file_index
+
+    index = get_file_index(worktree_path)
+    paths, truncated = index.list("src", recursive=True, pattern="*.py")
+    paths, truncated = index.glob("src/**/test_*.py")
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Directories to always exclude (token killers)
+EXCLUDED_DIRS = {
+    'node_modules', 'venv', '.venv', '__pycache__', '.git', '.svn',
+    'dist', 'build', '.tox', '.pytest_cache', '.mypy_cache',
+    'site-packages', '.eggs', '*.egg-info', 'coverage', '.coverage',
+    '.idea', '.vscode', 'htmlcov'
+}
+
+FILE_INDEX_BACKEND = os.getenv("FILE_INDEX_BACKEND", "auto")  # auto | inotify | stat
+MAX_FILE_INDEXES = int(os.getenv("MAX_FILE_INDEXES", "32"))
+# Directory mtimes have coarse granularity: a directory changed this recently
+# before it was scanned is rescanned on the next query (stat backend only)
+RACY_WINDOW_NS = 1_000_000_000
+
+PathLike = Union[str, Path]
+
+
+def _is_excluded(name: str) -> bool:
+    return name in EXCLUDED_DIRS or any(
+        fnmatch.fnmatchcase(name, ex) for ex in EXCLUDED_DIRS if '*' in ex
+    )
+
+
+def _join(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+def glob_to_regex(pattern: str) -> "re.Pattern":
+    """Compile a path glob: * and ? stay within one path segment, ** spans segments."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+# =============================================================================
+# INOTIFY (Linux, via libc)
+# =============================================================================
+
+class _Inotify:
+    """Non-blocking inotify descriptor; events are drained on each query, no thread needed."""
+
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+                  IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    _EVENT = struct.Struct("iIII")
+
+    _libc = None
+
+    def __init__(self):
+        libc = self._load_libc()
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._libc = libc
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            cls._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        return cls._libc
+
+    def add_watch(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def rm_watch(self, wd: int):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> Iterator[Tuple[int, int]]:
+        """Yield (wd, mask) for every queued event."""
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + self._EVENT.size <= len(buf):
+                wd, mask, _cookie, name_len = self._EVENT.unpack_from(buf, offset)
+                offset += self._EVENT.size + name_len
+                yield wd, mask
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class _Dir:
+    __slots__ = ("files", "dirs", "mtime_ns", "scanned_ns", "wd")
+
+    def __init__(self, files: List[str], dirs: List[str], mtime_ns: int, scanned_ns: int, wd: int):
+        self.files = files
+        self.dirs = dirs
+        self.mtime_ns = mtime_ns
+        self.scanned_ns = scanned_ns
+        self.wd = wd
+
+
+class WorkspaceFileIndex:
+    """Per-root directory listing cache, refreshed incrementally."""
+
+    def __init__(self, root: PathLike, backend: str = FILE_INDEX_BACKEND):
+        self.root = os.path.abspath(root)
+        self._dirs: Dict[str, _Dir] = {}  # rel dir ("" = root) -> listing
+        self._dirty = set()
+        self._wd_to_dir: Dict[int, str] = {}
+        self._lock = threading.Lock()  # Queries run in worker threads (asyncio.to_thread)
+        self.scans = 0
+        self._inotify: Optional[_Inotify] = None
+        if backend != "stat" and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                if backend == "inotify":
+                    raise
+                logger.debug(f"inotify unavailable, using mtime scans: {e}")
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify else "stat"
+
+    def close(self):
+        with self._lock:
+            if self._inotify:
+                self._inotify.close()
+                self._inotify = None
+            self._dirs.clear()
+            self._wd_to_dir.clear()
+
+    # ---------------------------------------------------------------- refresh
+
+    def _scan(self, rel_dir: str) -> Optional[_Dir]:
+        full = os.path.join(self.root, rel_dir)
+        wd = -1
+        if self._inotify:
+            # Watch before listing so nothing created in between is missed
+            try:
+                wd = self._inotify.add_watch(full)
+                self._wd_to_dir[wd] = rel_dir
+            except OSError as e:
+                if not os.path.isdir(full):
+                    return None
+                logger.warning(f"⚠️ File index for {self.root} falling back to mtime scans: {e}")
+                self._inotify.close()
+                self._inotify = None
+                self._wd_to_dir.clear()
+
+        scanned_ns = time.time_ns()
+        files, dirs = [], []
+        try:
+            mtime_ns = os.stat(full).st_mtime_ns
+            with os.scandir(full) as entries:
+                for entry in entries:
+                    # Symlinked directories are listed but not followed (as os.walk does)
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _is_excluded(entry.name):
+                            dirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return None
+        self.scans += 1
+        files.sort()
+        dirs.sort()
+        return _Dir(files, dirs, mtime_ns, scanned_ns, wd)
+
+    def _drop(self, rel_dir: str):
+        """Forget a directory and everything indexed below it."""
+        prefix = rel_dir + "/"
+        for key in [k for k in self._dirs if k == rel_dir or k.startswith(prefix) or not rel_dir]:
+            entry = self._dirs.pop(key)
+            if entry.wd >= 0:
+                self._wd_to_dir.pop(entry.wd, None)
+                if self._inotify:
+                    self._inotify.rm_watch(entry.wd)
+
+    def _rescan(self, rel_dir: str):
+        old = self._dirs.get(rel_dir)
+        new = self._scan(rel_dir)
+        if old is not None:
+            if old.wd >= 0 and (new is None or new.wd != old.wd):
+                self._wd_to_dir.pop(old.wd, None)
+            for name in set(old.dirs) - set(new.dirs if new else ()):
+                self._drop(_join(rel_dir, name))
+        if new is None:
+            self._dirs.pop(rel_dir, None)
+        else:
+            self._dirs[rel_dir] = new
+
+    def _drain_events(self):
+        if not self._inotify:
+            return
+        for wd, mask in self._inotify.read_events():
+            if mask & _Inotify.IN_Q_OVERFLOW:
+                self._dirty.update(self._dirs)
+                continue
+            rel_dir = self._wd_to_dir.get(wd)
+            if rel_dir is None:
+                continue
+            if mask & _Inotify.IN_IGNORED:
+                self._wd_to_dir.pop(wd, None)
+                entry = self._dirs.get(rel_dir)
+                if entry is not None and entry.wd == wd:
+                    entry.wd = -1
+            self._dirty.add(rel_dir)
+
+    def _listing(self, rel_dir: str) -> Optional[_Dir]:
+        """The up-to-date listing of one directory (scanned on first use)."""
+        entry = self._dirs.get(rel_dir)
+        if entry is not None and rel_dir not in self._dirty:
+            if self._inotify and entry.wd >= 0:
+                return entry
+            try:
+                mtime_ns = os.stat(os.path.join(self.root, rel_dir)).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns == entry.mtime_ns and entry.scanned_ns - mtime_ns > RACY_WINDOW_NS:
+                return entry
+        self._dirty.discard(rel_dir)
+        self._rescan(rel_dir)
+        return self._dirs.get(rel_dir)
+
+    # ---------------------------------------------------------------- queries
+
+    def _walk(self, rel_dir: str, max_depth: Optional[int],
+              descend: Optional[Callable[[str], bool]] = None) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Yield (rel_dir, files, dirs) top-down, directories within max_depth levels of rel_dir."""
+        stack = [(rel_dir, 0)]
+        while stack:
+            current, depth = stack.pop()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            entry = self._listing(current)
+            if entry is None:
+                continue
+            yield current, entry.files, entry.dirs
+            children = (_join(current, d) for d in reversed(entry.dirs))
+            stack.extend((child, depth + 1) for child in children if descend is None or descend(child))
+
+    def _normalize(self, rel_dir: str) -> str:
+        rel_dir = rel_dir.replace("\\", "/").strip("/")
+        return "" if rel_dir == "." else rel_dir
+
+    def list(self, rel_dir: str = "", recursive: bool = False, pattern: str = "*",
+             max_depth: int = 3, max_results: int = 500) -> Tuple[List[str], bool]:
+        """
+        Files and directories under rel_dir whose name matches pattern.
+
+        Returns:
+            (sorted paths relative to the index root, whether max_results cut the list)
+        """
+        rel_dir = self._normalize(rel_dir)
+        depth = max_depth if recursive else min(max_depth, 1)
+        with self._lock:
+            self._drain_events()
+            results = [
+                _join(current, name)
+                for current, files, dirs in self._walk(rel_dir, depth)
+                for name in files + dirs
+                if fnmatch.fnmatch(name, pattern)
+            ]
+        results.sort()
+        return results[:max_results], len(results) > max_results
+
+    def glob(self, pattern: str, rel_dir: str = "", max_results: int = 500) -> Tuple[List[str], bool]:
+        """Files and directories whose path relative to rel_dir matches a path glob (** spans directories)."""
+        rel_dir = self._normalize(rel_dir)
+        pattern = pattern.replace("\\", "/").lstrip("/")
+        regex = glob_to_regex(pattern)
+        # Only walk below the literal leading segments of the pattern
+        literal = []
+        for segment in pattern.split("/")[:-1]:
+            if any(c in segment for c in "*?["):
+                break
+            literal.append(segment)
+        start = _join(rel_dir, "/".join(literal)) if literal else rel_dir
+        max_depth = None if "**" in pattern else pattern.count("/") - len(literal) + 1
+        offset = len(rel_dir) + 1 if rel_dir else 0
+        with self._lock:
+            self._drain_events()
+            results = [
+                path
+                for current, files, dirs in self._walk(start, max_depth)
+                for path in (_join(current, name) for name in files + dirs)
+                if regex.match(path[offset:])
+            ]
+        results.sort()
+        return results[:max_results], len(results) > max_results
+
+    def prefix(self, prefix: str, max_results: Optional[int] = None) -> List[str]:
+        """Every indexed file whose path relative to the root starts with prefix."""
+        prefix = prefix.replace("\\", "/").lstrip("/")
+        start = prefix.rsplit("/", 1)[0] if "/" in prefix else ""
+
+        def descend(path: str) -> bool:
+            return path.startswith(prefix) or prefix.startswith(path + "/")
+
+        with self._lock:
+            self._drain_events()
+            results = [
+                path
+                for current, files, _ in self._walk(start, None, descend)
+                for path in (_join(current, name) for name in files)
+                if path.startswith(prefix)
+            ]
+        results.sort()
+        return results[:max_results] if max_results is not None else results
+
+    def files(self, rel_dir: str = "") -> List[str]:
+        """Every indexed file below rel_dir."""
+        rel_dir = self._normalize(rel_dir)
+        return self.prefix(rel_dir + "/" if rel_dir else "")
+
+    def __contains__(self, rel_path: str) -> bool:
+        rel_path = self._normalize(rel_path)
+        parent, _, name = rel_path.rpartition("/")
+        with self._lock:
+            self._drain_events()
+            entry = self._listing(parent)
+        return entry is not None and (name in entry.files or name in entry.dirs)
+
+
+# =============================================================================
+# PER-ROOT REGISTRY
+# =============================================================================
+
+_indexes: "OrderedDict[str, WorkspaceFileIndex]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def get_file_index(root: PathLike) -> WorkspaceFileIndex:
+    """The shared index for a root (created on first use, least recently used root evicted)."""
+    key = os.path.abspath(root)
+    with _registry_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = WorkspaceFileIndex(key)
+            while len(_indexes) > MAX_FILE_INDEXES:
+                _, evicted = _indexes.popitem(last=False)
+                evicted.close()
+        else:
+            _indexes.move_to_end(key)
+        return index
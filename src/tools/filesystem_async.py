@@ -11,8 +11,13 @@ The sync versions in filesystem.py are kept for backwards compatibility.
 
 import os
 import asyncio
+import mmap
+import stat as stat_module
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
 try:
     import aiofiles
@@ -23,9 +28,22 @@ except ImportError:
 
 import platform
 
+from .file_cache import get_worktree_cache, invalidate_path
+from .file_index import get_file_index
+
 WORKSPACE_ROOT = Path(os.getcwd())
 PLATFORM = f"OS - {platform.system()}, Release: {platform.release()}"
 
+# read_file windowing
+DEFAULT_MAX_READ_BYTES = 48_000  # Per read - keeps one file well under the 100K-char request limit
+READ_FILES_MAX_BYTES = 16_000  # Per file in a read_files batch
+READ_FILES_MAX_PATHS = 20
+BATCH_MAX_ITEMS = 20  # write_files / stat_files
+BATCH_CONCURRENCY = 8  # File operations in flight per batch call
+MMAP_THRESHOLD_BYTES = 1_000_000  # Larger files are line-indexed through mmap instead of read whole
+LINE_INDEX_STRIDE = 256  # Sparse line index keeps the offset of every Nth line
+LINE_INDEX_CACHE_SIZE = 32
+
 
 def _get_workspace_root(root: Optional[Path] = None) -> Path:
     """Get workspace root from argument or default."""
@@ -92,37 +110,293 @@ def _is_safe_path(path: str, root: Optional[Path] = None, additional_roots: List
         return False
 
 
-async def read_file_async(path: str, encoding: str = "utf-8", root: Optional[Path] = None, additional_roots: List[Path] = None) -> str:
+T = TypeVar("T")
+
+
+async def _gather_limited(items: List[T], op: Callable[[T], Awaitable[str]]) -> List[object]:
+    """Run op over items, at most BATCH_CONCURRENCY at a time. Exceptions are returned in place of results."""
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(item: T) -> str:
+        async with semaphore:
+            return await op(item)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+
+def _check_batch(items: list, noun: str, tool: str, max_items: int = BATCH_MAX_ITEMS):
+    if not items:
+        raise ValueError(f"ERROR: '{noun}' must list at least one file!")
+    if len(items) > max_items:
+        raise ValueError(f"ERROR: {tool} takes at most {max_items} {noun}, got {len(items)}")
+
+
+@dataclass
+class FileWindow:
+    """A line window of a file plus the metadata the agent needs to page through it."""
+    path: str
+    content: str
+    size: int  # File size in bytes
+    total_lines: int
+    start_line: int  # 1-based, inclusive
+    end_line: int  # 1-based, inclusive (start_line - 1 when the window is empty)
+    truncated: bool = False  # Cut short by max_bytes
+    line_offset: int = 0  # Bytes of start_line skipped (continuing a line cut by max_bytes)
+    end_offset: Optional[int] = None  # Set when end_line was cut by max_bytes: bytes of it shown, from its start
+
+    @property
+    def complete(self) -> bool:
+        """True if the window is the whole file."""
+        return self.start_line <= 1 and self.end_line >= self.total_lines and not self.truncated \
+            and not self.line_offset
+
+    @property
+    def whole_lines(self) -> Tuple[int, int]:
+        """(first, last) lines shown in full - a line cut at either end doesn't count."""
+        return (self.start_line + (1 if self.line_offset else 0),
+                self.end_line - (1 if self.end_offset is not None else 0))
+
+
+# (path, mtime_ns, size) -> (checkpoint offsets, total lines)
+_line_index_cache: "OrderedDict[Tuple[str, int, int], Tuple[array, int]]" = OrderedDict()
+
+
+def _build_line_index(mm) -> Tuple[array, int]:
+    """Byte offset of line 1, 1 + STRIDE, 1 + 2 * STRIDE, ... and the total line count."""
+    checkpoints = array("Q", [0])
+    find = mm.find
+    size = len(mm)
+    pos = 0
+    newlines = 0
+    while True:
+        nl = find(b"\n", pos)
+        if nl < 0:
+            break
+        pos = nl + 1
+        newlines += 1
+        if newlines % LINE_INDEX_STRIDE == 0:
+            checkpoints.append(pos)
+    total_lines = newlines + (1 if pos < size else 0)
+    return checkpoints, total_lines
+
+
+def _line_offset(mm, checkpoints: array, line: int) -> int:
+    """Byte offset where 1-based line starts (len(mm) past the last line)."""
+    slot = min((line - 1) // LINE_INDEX_STRIDE, len(checkpoints) - 1)
+    pos = checkpoints[slot]
+    for _ in range(line - 1 - slot * LINE_INDEX_STRIDE):
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            return len(mm)
+        pos = nl + 1
+    return pos
+
+
+def _cached_line_index(target_path: Path, stat: os.stat_result, mm) -> Tuple[array, int]:
+    key = (str(target_path), stat.st_mtime_ns, stat.st_size)
+    index = _line_index_cache.get(key)
+    if index is None:
+        index = _line_index_cache[key] = _build_line_index(mm)
+        while len(_line_index_cache) > LINE_INDEX_CACHE_SIZE:
+            _line_index_cache.popitem(last=False)
+    else:
+        _line_index_cache.move_to_end(key)
+    return index
+
+
+def _cap_bytes(data: bytes, max_bytes: int) -> Tuple[bytes, bool]:
+    """Cut data to max_bytes, at the last line break when there is one (else at a UTF-8 character boundary)."""
+    if len(data) <= max_bytes:
+        return data, False
+    cut = data.rfind(b"\n", 0, max_bytes)
+    if cut >= 0:
+        return data[:cut + 1], True
+    cut = max_bytes
+    while cut > 0 and (data[cut] & 0xC0) == 0x80:  # Continuation byte - don't split the character
+        cut -= 1
+    return data[:cut or max_bytes], True
+
+
+def _read_window_sync(path: str, target_path: Path, encoding: str, start_line: Optional[int],
+                      end_line: Optional[int], max_bytes: int, cache_root: Path, line_offset: int = 0) -> FileWindow:
+    stat = target_path.stat()
+    start = max(start_line or 1, 1)
+    line_offset = max(line_offset or 0, 0)
+
+    if stat.st_size == 0:
+        return FileWindow(path, "", 0, 0, 1, 0)
+
+    if stat.st_size < MMAP_THRESHOLD_BYTES:
+        # Small files come from the worktree cache (re-read only when mtime/size/inode change)
+        content = get_worktree_cache(cache_root).read(target_path)
+        lines = content.splitlines(keepends=True)
+        total_lines = len(lines)
+        end = min(end_line or total_lines, total_lines)
+        if start == 1 and end == total_lines and not line_offset:
+            data = content
+        elif start <= end:
+            data = lines[start - 1][line_offset:] + b"".join(lines[start:end])
+        else:
+            data = b""
+    else:
+        with open(target_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            checkpoints, total_lines = _cached_line_index(target_path, stat, mm)
+            end = min(end_line or total_lines, total_lines)
+            if start <= end:
+                begin = _line_offset(mm, checkpoints, start)
+                if line_offset:
+                    line_end = mm.find(b"\n", begin)
+                    begin = min(begin + line_offset, line_end if line_end >= 0 else len(mm))
+                # Never copy more than the byte cap (plus one line break to find a clean cut)
+                stop = min(_line_offset(mm, checkpoints, end + 1), begin + max_bytes + 1)
+                data = mm[begin:stop]
+            else:
+                data = b""
+
+    data, truncated = _cap_bytes(data, max_bytes)
+    end_offset = None
+    if start > end:
+        end = start - 1
+    elif truncated:
+        end = start + data.count(b"\n") - 1 if data.endswith(b"\n") else start + data.count(b"\n")
+        if not data.endswith(b"\n"):
+            # Cut inside a line (one longer than max_bytes) - say where it continues
+            end_offset = len(data) - (data.rfind(b"\n") + 1) + (line_offset if end == start else 0)
+    return FileWindow(path, data.decode(encoding, errors="replace"), stat.st_size, total_lines, start, end, truncated,
+                      line_offset if start <= end else 0, end_offset)
+
+
+async def read_file_window_async(
+    path: str,
+    encoding: str = "utf-8",
+    root: Optional[Path] = None,
+    additional_roots: List[Path] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    line_offset: int = 0
+) -> FileWindow:
+    """
+    Read a line window of a file.
+
+    Files under MMAP_THRESHOLD_BYTES are read whole and split; larger files
+    are mapped and only the requested lines are copied, using a sparse line
+    index cached per (path, mtime, size).
+
+    Raises:
+        ValueError: path outside the workspace
+        FileNotFoundError / IsADirectoryError
+    """
+    if not _is_safe_path(path, root, additional_roots):
+        raise ValueError(f"Access denied: {path} is outside workspace")
+
+    target_path = _get_workspace_root(root) / path.lstrip('/\\')
+    if not target_path.exists():
+        raise FileNotFoundError(path)
+    if target_path.is_dir():
+        raise IsADirectoryError(path)
+
+    return await asyncio.to_thread(
+        _read_window_sync, path, target_path, encoding, start_line, end_line, max_bytes or DEFAULT_MAX_READ_BYTES,
+        _get_workspace_root(root), line_offset
+    )
+
+
+def format_file_window(window: FileWindow) -> str:
+    """Tool output for a window: the content as-is for whole files, with a metadata header otherwise."""
+    if window.complete:
+        return window.content
+    header = (f"[{window.path}: {window.size:,} bytes, {window.total_lines:,} lines | "
+              f"showing lines {window.start_line}-{window.end_line}")
+    if window.line_offset:
+        header += f" (line {window.start_line} from byte {window.line_offset})"
+    if window.truncated:
+        header += ", cut at max_bytes"
+    if window.end_offset is not None:
+        header += (f" | line {window.end_line} continues: start_line={window.end_line}, "
+                   f"line_offset={window.end_offset}")
+    elif window.end_line < window.total_lines:
+        header += f" | continue with start_line={window.end_line + 1}"
+    return f"{header}]\n{window.content}"
+
+
+async def read_file_async(
+    path: str,
+    encoding: str = "utf-8",
+    root: Optional[Path] = None,
+    additional_roots: List[Path] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    on_window: Optional[Callable[[FileWindow], None]] = None,
+    line_offset: int = 0
+) -> str:
     """
     Read the contents of a file asynchronously.
-    
+
+    Whole files up to max_bytes are returned unchanged. Larger files and
+    explicit line windows come back with a one-line header giving the file
+    size, line count, the lines shown and where to continue.
+
     Args:
         path: Relative path to the file
         encoding: File encoding (default: utf-8)
         root: Optional workspace root override
         additional_roots: Additional allowed paths (e.g., main workspace for .venv)
-    
+        start_line: First line to return (1-based, default 1)
+        end_line: Last line to return (inclusive, default end of file)
+        max_bytes: Cap on returned content (default DEFAULT_MAX_READ_BYTES)
+        on_window: Called with the FileWindow that was read (read tracking)
+        line_offset: Byte offset into start_line to begin at (continues a line cut by max_bytes)
+
     Returns:
         File contents as string
     """
-    if not _is_safe_path(path, root, additional_roots):
-        raise ValueError(f"Access denied: {path} is outside workspace")
-    
-    normalized_path = path.lstrip('/\\')
-    target_path = _get_workspace_root(root) / normalized_path
-    
-    if not target_path.exists():
+    try:
+        window = await read_file_window_async(path, encoding, root, additional_roots, start_line, end_line, max_bytes,
+                                              line_offset)
+    except FileNotFoundError:
         return f"File not found: {path}"
-    
-    if target_path.is_dir():
+    except IsADirectoryError:
         return f"Error: {path} is a directory, not a file. Use list_directory instead."
-    
-    if AIOFILES_AVAILABLE:
-        async with aiofiles.open(target_path, mode='r', encoding=encoding) as f:
-            return await f.read()
-    else:
-        # Fallback to thread pool
-        return await asyncio.to_thread(_read_file_sync, target_path, encoding)
+
+    if on_window:
+        on_window(window)
+    return format_file_window(window)
+
+
+async def read_files_async(
+    paths: List[str],
+    encoding: str = "utf-8",
+    root: Optional[Path] = None,
+    additional_roots: List[Path] = None,
+    max_bytes: Optional[int] = None,
+    on_window: Optional[Callable[[FileWindow], None]] = None
+) -> str:
+    """
+    Read several small files in one call.
+
+    Args:
+        paths: Relative paths (at most READ_FILES_MAX_PATHS)
+        encoding: File encoding (default: utf-8)
+        root: Optional workspace root override
+        additional_roots: Additional allowed paths
+        max_bytes: Cap per file (default READ_FILES_MAX_BYTES)
+        on_window: Called with each FileWindow that was read
+
+    Returns:
+        Each file under a "=== path ===" heading
+    """
+    _check_batch(paths, "paths", "read_files", READ_FILES_MAX_PATHS)
+
+    results = await _gather_limited(paths, lambda p: read_file_async(
+        p, encoding, root, additional_roots, max_bytes=max_bytes or READ_FILES_MAX_BYTES, on_window=on_window
+    ))
+    sections = []
+    for p, result in zip(paths, results):
+        body = f"Error: {result}" if isinstance(result, Exception) else result
+        sections.append(f"=== {p} ===\n{body}")
+    return "\n\n".join(sections)
 
 
 async def write_file_async(path: str, content: str, encoding: str = "utf-8", root: Optional[Path] = None, additional_roots: List[Path] = None) -> str:
@@ -160,9 +434,62 @@ async def write_file_async(path: str, content: str, encoding: str = "utf-8", roo
     else:
         await asyncio.to_thread(_write_file_sync, target_path, content, encoding)
     
+    invalidate_path(target_path)
     return f"Successfully wrote {len(content)} bytes to {path}"
 
 
+async def write_files_async(
+    files: List[Dict[str, str]],
+    encoding: str = "utf-8",
+    root: Optional[Path] = None,
+    additional_roots: List[Path] = None,
+    guard: Optional[Callable[[str], Optional[str]]] = None,
+    on_written: Optional[Callable[[str, str], None]] = None
+) -> str:
+    """
+    Write several files in one call. Each file succeeds or fails on its own.
+
+    Args:
+        files: [{"path": ..., "content": ...}] (at most BATCH_MAX_ITEMS)
+        encoding: File encoding (default: utf-8)
+        root: Optional workspace root override
+        additional_roots: Additional allowed paths
+        guard: Called with each path before writing; a returned message blocks that file
+        on_written: Called with (path, content) for each file written
+
+    Returns:
+        One "path: result" line per file, in the order given
+    """
+    _check_batch(files, "files", "write_files")
+    for i, item in enumerate(files):
+        if not isinstance(item, dict) or not item.get("path") or item.get("content") is None:
+            raise ValueError(f"ERROR: files[{i}] needs a 'path' and a 'content'")
+    seen = set()
+    for item in files:
+        key = item["path"].replace("\\", "/").strip("/").lower()
+        if key in seen:
+            raise ValueError(f"ERROR: '{item['path']}' appears more than once in files")
+        seen.add(key)
+
+    async def write(item: Dict[str, str]) -> str:
+        path, content = item["path"], item["content"]
+        blocked = guard(path) if guard else None
+        if blocked:
+            return f"BLOCKED - {blocked}"
+        result = await write_file_async(path, content, encoding, root, additional_roots)
+        if on_written:
+            on_written(path, content)
+        return result
+
+    results = await _gather_limited(files, write)
+    lines = []
+    for item, result in zip(files, results):
+        body = f"Error: {result}" if isinstance(result, Exception) else result
+        lines.append(f"{item['path']}: {body}")
+    written = sum(1 for r in results if isinstance(r, str) and r.startswith("Successfully"))
+    return "\n".join(lines) + f"\n\n{written}/{len(files)} files written"
+
+
 async def append_file_async(path: str, content: str, encoding: str = "utf-8", root: Optional[Path] = None, additional_roots: List[Path] = None) -> str:
     """
     Append content to an existing file asynchronously.
@@ -192,6 +519,7 @@ async def append_file_async(path: str, content: str, encoding: str = "utf-8", ro
     else:
         await asyncio.to_thread(_append_file_sync, target_path, content, encoding)
     
+    invalidate_path(target_path)
     return f"Successfully appended to {path}"
 
 
@@ -210,7 +538,7 @@ async def list_directory_async(
     Args:
         path: Directory path (default: ".")
         recursive: Include subdirectories (default: False)
-        pattern: Glob pattern (default: "*")
+        pattern: Name glob (default: "*"), or a path glob such as "src/**/*.py"
         root: Optional workspace root override
         max_depth: Maximum recursion depth (default: 3, prevents deep venv/node_modules)
         max_results: Maximum number of results to return (default: 500)
@@ -229,53 +557,29 @@ async def list_directory_async(
     if not target_path.exists():
         return [f"Directory not found: {path}"]
     
-    # Directories to always exclude (token killers)
-    EXCLUDED_DIRS = {
-        'node_modules', 'venv', '.venv', '__pycache__', '.git', '.svn',
-        'dist', 'build', '.tox', '.pytest_cache', '.mypy_cache',
-        'site-packages', '.eggs', '*.egg-info', 'coverage', '.coverage',
-        '.idea', '.vscode', 'htmlcov'
-    }
-    
-    # Walk directory with depth limit and exclusions
-    def _do_walk():
-        import fnmatch
-        results = []
-        base_depth = len(target_path.parts)
-        
-        for root_dir, dirs, files in os.walk(target_path):
-            root_path = Path(root_dir)
-            current_depth = len(root_path.parts) - base_depth
-            
-            # Depth limit
-            if current_depth >= max_depth:
-                dirs[:] = []  # Don't recurse deeper
-                continue
-            
-            # Exclude problematic directories (modifies dirs in-place)
-            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS and 
-                       not any(fnmatch.fnmatch(d, ex) for ex in EXCLUDED_DIRS if '*' in ex)]
-            
-            # If not recursive, clear dirs to stop after first level
-            if not recursive:
-                dirs[:] = []
-            
-            # Match files and dirs against pattern
-            for name in files + dirs:
-                if fnmatch.fnmatch(name, pattern):
-                    full_path = root_path / name
-                    rel_path = os.path.relpath(full_path, workspace_root)
-                    rel_path = rel_path.replace("\\", "/")
-                    results.append(rel_path)
-                    
-                    # Limit results to prevent token explosion
-                    if len(results) >= max_results:
-                        results.append(f"... (truncated at {max_results} results, use pattern to filter)")
-                        return results
-        
-        return sorted(results) if results else ["Directory is empty."]
-    
-    return await asyncio.to_thread(_do_walk)
+    # Served from the worktree's file index (excluded dirs are never indexed)
+    def _do_list():
+        rel_dir = os.path.relpath(target_path, workspace_root)
+        if rel_dir == ".." or rel_dir.startswith(".." + os.sep):
+            # Additional root outside the workspace - index it on its own
+            index, rel_dir = get_file_index(target_path), ""
+        else:
+            index = get_file_index(workspace_root)
+
+        if "/" in pattern:
+            results, truncated = index.glob(pattern, rel_dir=rel_dir, max_results=max_results)
+        else:
+            results, truncated = index.list(rel_dir, recursive=recursive, pattern=pattern,
+                                            max_depth=max_depth, max_results=max_results)
+        if index.root != os.path.abspath(workspace_root):
+            results = [os.path.relpath(os.path.join(index.root, p), workspace_root).replace("\\", "/")
+                       for p in results]
+        if truncated:
+            # Limit results to prevent token explosion
+            results.append(f"... (truncated at {max_results} results, use pattern to filter)")
+        return results if results else ["Directory is empty."]
+
+    return await asyncio.to_thread(_do_list)
 
 
 async def file_exists_async(path: str, root: Optional[Path] = None, additional_roots: List[Path] = None) -> bool:
@@ -301,6 +605,41 @@ async def file_exists_async(path: str, root: Optional[Path] = None, additional_r
         return await asyncio.to_thread(target_path.exists)
 
 
+async def stat_files_async(paths: List[str], root: Optional[Path] = None, additional_roots: List[Path] = None) -> str:
+    """
+    Check several paths in one call: whether each exists, its type and its size.
+
+    Args:
+        paths: Paths to check (at most BATCH_MAX_ITEMS)
+        root: Optional workspace root override
+        additional_roots: Additional allowed paths
+
+    Returns:
+        One "path: file, N bytes" / "path: directory" / "path: not found" line per path
+    """
+    _check_batch(paths, "paths", "stat_files")
+
+    async def stat(path: str) -> str:
+        if not _is_safe_path(path, root, additional_roots):
+            return "access denied (outside workspace)"
+        target_path = _get_workspace_root(root) / path.lstrip('/\\')
+        try:
+            if AIOFILES_AVAILABLE:
+                st = await aiofiles.os.stat(target_path)
+            else:
+                st = await asyncio.to_thread(os.stat, target_path)
+        except FileNotFoundError:
+            return "not found"
+        if stat_module.S_ISDIR(st.st_mode):
+            return "directory"
+        return f"file, {st.st_size:,} bytes"
+
+    results = await _gather_limited(paths, stat)
+    return "\n".join(
+        f"{p}: {f'Error: {r}' if isinstance(r, Exception) else r}" for p, r in zip(paths, results)
+    )
+
+
 async def delete_file_async(path: str, confirm: bool, root: Optional[Path] = None, additional_roots: List[Path] = None) -> str:
     """
     Delete a file asynchronously.
@@ -334,6 +673,7 @@ async def delete_file_async(path: str, confirm: bool, root: Optional[Path] = Non
     else:
         await asyncio.to_thread(os.remove, target_path)
     
+    invalidate_path(target_path)
     return f"Successfully deleted {path}"
 
 
@@ -341,11 +681,6 @@ async def delete_file_async(path: str, confirm: bool, root: Optional[Path] = Non
 # Sync fallbacks for when aiofiles unavailable
 # ========================================
 
-def _read_file_sync(path: Path, encoding: str) -> str:
-    with open(path, 'r', encoding=encoding) as f:
-        return f.read()
-
-
 def _write_file_sync(path: Path, content: str, encoding: str) -> None:
     with open(path, 'w', encoding=encoding) as f:
         f.write(content)
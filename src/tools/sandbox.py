@@ -0,0 +1,579 @@
+"""
+Agent Orchestrator — Sandboxed Execution Backends
+=================================================
+Runs run_shell/run_python processes with per-call resource limits, so one
+task's runaway build or fork bomb cannot starve the other workers and the
+API server.
+
+Backends (SANDBOX_BACKEND=auto picks the first that works):
+- cgroup: a cgroup v2 child group per call under SANDBOX_CGROUP_ROOT
+  (cpu.max + cpu.weight, memory.max, pids.max). A relative root is created
+  inside the server's own cgroup (from /proc/self/cgroup), an absolute one
+  ("/agent-orchestrator") under the cgroup2 mount. Needs a delegated subtree
+  with the controllers enabled for it, e.g. run as root or under a systemd
+  unit with Delegate=yes.
+- rlimit: setrlimit in the child (RLIMIT_DATA, RLIMIT_CPU, RLIMIT_NPROC) plus
+  nice(10). Limits are per process rather than per process tree, and root
+  ignores RLIMIT_NPROC - a best-effort fallback.
+- host: no limits (the pre-sandbox behaviour; always used on Windows).
+
+Limits are applied by an exec trampoline (tools/sandbox_exec.py), not a
+preexec_fn: the server is threaded, and no Python may run in the forked
+child before exec.
+
+SANDBOX_ISOLATE_NETWORK=true also gives each call an empty network namespace
+(loopback only) when the kernel allows it.
+
+Every call reports CPU time, peak memory and any limit that was hit to the
+tool_sandbox_* metrics, labelled by task, so noisy tasks can be identified.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import platform
+import re
+import selectors
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from metrics import tool_metrics
+
+logger = logging.getLogger(__name__)
+
+SANDBOX_BACKEND = os.getenv("SANDBOX_BACKEND", "auto")  # auto | cgroup | rlimit | host
+SANDBOX_CGROUP_ROOT = os.getenv("SANDBOX_CGROUP_ROOT", "agent-orchestrator")  # Relative to our own cgroup; "/..." to the mount
+SANDBOX_MEMORY_MB = int(os.getenv("SANDBOX_MEMORY_MB", "2048"))
+SANDBOX_CPUS = float(os.getenv("SANDBOX_CPUS", "2"))
+SANDBOX_PIDS = int(os.getenv("SANDBOX_PIDS", "256"))
+SANDBOX_ISOLATE_NETWORK = os.getenv("SANDBOX_ISOLATE_NETWORK", "false").lower() in ("1", "true", "yes")
+SANDBOX_MAX_CONCURRENT_CALLS = 32  # Threads waiting on sandboxed processes (kept off the default executor)
+KILL_GRACE_S = 5.0  # How long to drain output after a kill before giving up on stray pipe holders
+RSS_SAMPLE_INTERVAL_S = 0.5  # rlimit backend: how often the process tree's memory is sampled
+TRAMPOLINE = str(Path(__file__).with_name("sandbox_exec.py"))
+
+
+@dataclass
+class ResourceLimits:
+    """Limits applied to one sandboxed call (None disables a limit)."""
+    memory_mb: Optional[int] = SANDBOX_MEMORY_MB
+    cpus: Optional[float] = SANDBOX_CPUS      # CPU bandwidth cap, in cores
+    pids: Optional[int] = SANDBOX_PIDS
+    cpu_weight: int = 100                     # cgroup cpu.weight: share under contention (1-10000)
+    isolate_network: bool = SANDBOX_ISOLATE_NETWORK
+
+
+@dataclass
+class ResourceUsage:
+    """What one call used. cpu/memory are None when the backend cannot measure them."""
+    wall_s: float
+    cpu_user_s: Optional[float] = None
+    cpu_system_s: Optional[float] = None
+    peak_memory_bytes: Optional[int] = None
+    cpu_throttled_s: float = 0.0
+    limit_hit: Optional[str] = None  # memory | pids | cpu
+
+    @property
+    def cpu_s(self) -> Optional[float]:
+        if self.cpu_user_s is None:
+            return None
+        return self.cpu_user_s + (self.cpu_system_s or 0.0)
+
+
+@dataclass
+class ExecResult:
+    returncode: Optional[int]
+    stdout: bytes
+    stderr: bytes
+    usage: ResourceUsage
+    timed_out: bool = False
+    backend: str = "host"
+    limits: ResourceLimits = field(default_factory=ResourceLimits)
+
+    def limit_note(self) -> str:
+        """Explanation for the agent when a limit stopped the process, else ''."""
+        hit = self.usage.limit_hit
+        if hit == "memory":
+            return f"Resource limit: memory cap of {self.limits.memory_mb} MB reached - the process was stopped. Use less memory (smaller inputs, streaming, fewer parallel jobs)."
+        if hit == "pids":
+            return f"Resource limit: process cap of {self.limits.pids} reached - could not start more processes/threads. Reduce parallelism."
+        if hit == "cpu":
+            return "Resource limit: CPU time cap reached - the process was stopped."
+        return ""
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class ExecutionBackend:
+    """Runs one command and reports its resource usage."""
+
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    async def run(
+        self,
+        cmd: Union[str, List[str]],
+        *,
+        shell: bool = False,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+        limits: Optional[ResourceLimits] = None,
+        task_id: Optional[str] = None,
+        tool: str = "run_shell",
+    ) -> ExecResult:
+        """
+        Run cmd (an argv list, or a command string with shell=True) to completion or timeout.
+
+        The whole process group (or cgroup) is killed on timeout or cancellation.
+        """
+        limits = limits or ResourceLimits()
+        result = await self._execute(cmd, shell, cwd or os.getcwd(), env, timeout, limits, task_id)
+        result.limits = limits
+        _record_usage(task_id, tool, result)
+        return result
+
+    async def _execute(self, cmd, shell, cwd, env, timeout, limits, task_id) -> ExecResult:
+        raise NotImplementedError
+
+
+class HostBackend(ExecutionBackend):
+    """No limits: a plain subprocess in its own process group, wall time only."""
+
+    name = "host"
+
+    async def _execute(self, cmd, shell, cwd, env, timeout, limits, task_id) -> ExecResult:
+        start = time.monotonic()
+        kwargs = {"stdout": asyncio.subprocess.PIPE, "stderr": asyncio.subprocess.PIPE, "cwd": cwd, "env": env}
+        if platform.system() == "Windows":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+        if shell:
+            process = await asyncio.create_subprocess_shell(cmd, **kwargs)
+        else:
+            process = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            timed_out = False
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            _kill_tree(process.pid, process)
+            await process.wait()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            stdout, stderr, timed_out = b"", b"", True
+        return ExecResult(process.returncode, stdout or b"", stderr or b"",
+                          ResourceUsage(wall_s=time.monotonic() - start), timed_out, self.name)
+
+
+def _kill_tree(pid: int, process=None):
+    """Kill a process and its children (process group on Unix, taskkill /T on Windows)."""
+    if platform.system() == "Windows":
+        # CRITICAL: Do NOT use CTRL_BREAK_EVENT - it kills the parent console too!
+        try:
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True, timeout=5)
+        except Exception:
+            pass
+    else:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, OSError, PermissionError):
+            pass  # Process group may not exist or we don't have permission
+    if process is not None:
+        try:
+            process.kill()
+        except (ProcessLookupError, OSError):
+            pass
+
+
+@dataclass
+class _Call:
+    """Per-call state: limits computed before the fork, and what the parent measured."""
+    limits: ResourceLimits
+    peak_rss: Optional[int] = None
+    cpu_seconds: Optional[int] = None
+    nproc_limit: Optional[int] = None
+    cgroup: Optional[Path] = None
+    netns: Optional[str] = None  # "netns" | "userns" | None
+
+
+class RlimitBackend(ExecutionBackend):
+    """setrlimit/nice in the child; usage from wait4()."""
+
+    name = "rlimit"
+    _pool: Optional[ThreadPoolExecutor] = None
+
+    def available(self) -> bool:
+        return os.name == "posix"
+
+    async def _execute(self, cmd, shell, cwd, env, timeout, limits, task_id) -> ExecResult:
+        argv = ["/bin/sh", "-c", cmd] if shell else list(cmd)
+        call = self._prepare(limits, task_id)
+        if limits.cpus and call.cgroup is None:
+            call.cpu_seconds = int(timeout * limits.cpus) + 1
+        if limits.isolate_network:
+            call.netns = _netns_mode()
+            if call.netns is None:
+                logger.warning("⚠️ Network isolation requested but network namespaces are unavailable - running with network")
+
+        if RlimitBackend._pool is None:
+            RlimitBackend._pool = ThreadPoolExecutor(SANDBOX_MAX_CONCURRENT_CALLS, thread_name_prefix="sandbox")
+        cancel = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(
+            RlimitBackend._pool, self._run_blocking, argv, cwd, env, timeout, call, cancel
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel.set()  # The worker thread kills the process and cleans up
+            raise
+
+    def _run_blocking(self, argv, cwd, env, timeout, call: _Call, cancel: threading.Event) -> ExecResult:
+        start = time.monotonic()
+        try:
+            proc = subprocess.Popen(
+                _trampoline_argv(self._exec_spec(call), argv), cwd=cwd, env=env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True
+            )
+            out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+            output = {out_fd: [], err_fd: []}
+            timed_out = False
+            with selectors.DefaultSelector() as sel:
+                for f in (proc.stdout, proc.stderr):
+                    sel.register(f, selectors.EVENT_READ)
+                # First sample once the trampoline has had time to exec the command
+                deadline, kill_deadline, next_sample = start + timeout, None, start + 0.05
+                while sel.get_map():
+                    now = time.monotonic()
+                    if now >= next_sample:
+                        self._sample(call, proc.pid)
+                        next_sample = now + RSS_SAMPLE_INTERVAL_S
+                    if kill_deadline is None and (now >= deadline or cancel.is_set()):
+                        timed_out = True
+                        self._kill(call, proc)
+                        kill_deadline = now + KILL_GRACE_S
+                    if kill_deadline is not None and now >= kill_deadline:
+                        break  # Something outside the group still holds the pipes
+                    for key, _ in sel.select(timeout=0.25):
+                        data = os.read(key.fd, 65536)
+                        if data:
+                            output[key.fd].append(data)
+                        else:
+                            sel.unregister(key.fileobj)
+            proc.stdout.close()
+            proc.stderr.close()
+
+            _, status, rusage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            stdout, stderr = b"".join(output[out_fd]), b"".join(output[err_fd])
+            usage = self._usage(call, proc.returncode, rusage, stderr, time.monotonic() - start)
+            return ExecResult(proc.returncode, stdout, stderr, usage, timed_out, self.name)
+        finally:
+            self._cleanup(call)
+
+    # -- hooks ---------------------------------------------------------------
+
+    def _prepare(self, limits: ResourceLimits, task_id: Optional[str]) -> _Call:
+        call = _Call(limits)
+        if limits.pids and os.geteuid() != 0:
+            # RLIMIT_NPROC counts every thread of the user, not just this call's
+            call.nproc_limit = _count_user_tasks(os.getuid()) + limits.pids
+        return call
+
+    def _exec_spec(self, call: _Call) -> dict:
+        """What the trampoline applies before exec (see tools/sandbox_exec.py)."""
+        import resource
+
+        limits, rlimits = call.limits, []
+        if limits.memory_mb:
+            size = limits.memory_mb * 1024 * 1024
+            rlimits.append([resource.RLIMIT_DATA, size, size])
+        if call.cpu_seconds:
+            rlimits.append([resource.RLIMIT_CPU, call.cpu_seconds, call.cpu_seconds + 1])  # SIGXCPU, then SIGKILL
+        if call.nproc_limit:
+            rlimits.append([resource.RLIMIT_NPROC, call.nproc_limit, call.nproc_limit])
+        spec = {"rlimits": rlimits, "netns": call.netns}
+        if call.cpu_seconds:
+            spec["nice"] = 10  # Lose to the server and other workers under contention
+        return spec
+
+    def _kill(self, call: _Call, proc: subprocess.Popen):
+        _kill_tree(proc.pid, proc)
+
+    def _sample(self, call: _Call, sid: int):
+        # Not ru_maxrss: after fork+exec it includes the parent's (the server's) RSS
+        rss = _session_rss(sid)
+        if rss and rss > (call.peak_rss or 0):
+            call.peak_rss = rss
+
+    def _usage(self, call: _Call, returncode: int, rusage, stderr: bytes, wall_s: float) -> ResourceUsage:
+        usage = ResourceUsage(
+            wall_s=wall_s, cpu_user_s=rusage.ru_utime, cpu_system_s=rusage.ru_stime,
+            peak_memory_bytes=call.peak_rss,  # Sampled, so short spikes can be missed
+        )
+        if returncode == -signal.SIGXCPU:
+            usage.limit_hit = "cpu"
+        elif returncode != 0 and call.limits.memory_mb and re.search(
+                rb"MemoryError|Cannot allocate memory|out of memory|std::bad_alloc", stderr[-4096:]):
+            usage.limit_hit = "memory"
+        elif returncode != 0 and call.nproc_limit and b"Resource temporarily unavailable" in stderr[-4096:]:
+            usage.limit_hit = "pids"
+        return usage
+
+    def _cleanup(self, call: _Call):
+        pass
+
+
+class CgroupBackend(RlimitBackend):
+    """One cgroup v2 group per call: cpu.max/cpu.weight, memory.max and pids.max, usage from cgroup stats."""
+
+    name = "cgroup"
+    CONTROLLERS = ("cpu", "memory", "pids")
+
+    def __init__(self, mount: Optional[Path] = None, root: str = SANDBOX_CGROUP_ROOT, own_cgroup: Optional[str] = None):
+        self.mount = mount if mount is not None else _cgroup2_mount()
+        self.root = None
+        if self.mount:
+            # Relative roots live in our own (delegated) cgroup, not at the top of the hierarchy
+            base = "/" if root.startswith("/") else (own_cgroup if own_cgroup is not None else _own_cgroup())
+            if base is not None:
+                self.root = self.mount / base.lstrip("/") / root.lstrip("/")
+        self._ready: Optional[bool] = None
+
+    def available(self) -> bool:
+        if self._ready is None:
+            self._ready = self._setup_root()
+        return self._ready
+
+    def _setup_root(self) -> bool:
+        if self.root is None or os.name != "posix":
+            return False
+        try:
+            self.root.mkdir(exist_ok=True)
+            enabled = set((self.root / "cgroup.controllers").read_text().split())
+            missing = [c for c in self.CONTROLLERS if c not in enabled]
+            if missing:
+                logger.info(f"cgroup sandbox unavailable: {self.root} lacks controllers {missing}")
+                return False
+            subtree = set((self.root / "cgroup.subtree_control").read_text().split())
+            if not set(self.CONTROLLERS) <= subtree:
+                (self.root / "cgroup.subtree_control").write_text(" ".join(f"+{c}" for c in self.CONTROLLERS))
+            return True
+        except OSError as e:
+            logger.info(f"cgroup sandbox unavailable: {e}")
+            return False
+
+    def _prepare(self, limits: ResourceLimits, task_id: Optional[str]) -> _Call:
+        label = re.sub(r"[^A-Za-z0-9_.-]", "_", task_id or "call")[:64]
+        group = self.root / f"{label}-{uuid.uuid4().hex[:8]}"
+        group.mkdir()
+        _write(group / "cpu.weight", str(limits.cpu_weight))
+        if limits.cpus:
+            _write(group / "cpu.max", f"{int(limits.cpus * 100000)} 100000")
+        if limits.memory_mb:
+            _write(group / "memory.max", str(limits.memory_mb * 1024 * 1024))
+            _write(group / "memory.swap.max", "0", required=False)  # No swap controller without swap accounting
+        if limits.pids:
+            _write(group / "pids.max", str(limits.pids))
+        return _Call(limits, cgroup=group)
+
+    def _exec_spec(self, call: _Call) -> dict:
+        return {"cgroup": str(call.cgroup / "cgroup.procs"), "netns": call.netns}
+
+    def _sample(self, call: _Call, sid: int):
+        pass  # memory.peak is exact
+
+    def _kill(self, call: _Call, proc: subprocess.Popen):
+        if not _write(call.cgroup / "cgroup.kill", "1", required=False):  # Linux 5.14+
+            _kill_tree(proc.pid, proc)
+
+    def _usage(self, call: _Call, returncode: int, rusage, stderr: bytes, wall_s: float) -> ResourceUsage:
+        usage = super()._usage(call, returncode, rusage, stderr, wall_s)
+        usage.limit_hit = None
+        cpu = _read_keyed(call.cgroup / "cpu.stat")
+        if "user_usec" in cpu:
+            usage.cpu_user_s = cpu["user_usec"] / 1e6
+            usage.cpu_system_s = cpu.get("system_usec", 0) / 1e6
+        usage.cpu_throttled_s = cpu.get("throttled_usec", 0) / 1e6
+        try:
+            usage.peak_memory_bytes = int((call.cgroup / "memory.peak").read_text())  # Linux 5.19+
+        except (OSError, ValueError):
+            pass
+        if _read_keyed(call.cgroup / "memory.events").get("oom_kill", 0):
+            usage.limit_hit = "memory"
+        elif _read_keyed(call.cgroup / "pids.events").get("max", 0):
+            usage.limit_hit = "pids"
+        return usage
+
+    def _cleanup(self, call: _Call):
+        if call.cgroup is None:
+            return
+        for _ in range(20):
+            try:
+                call.cgroup.rmdir()
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                # Stragglers still inside (e.g. after a timeout): kill them and retry
+                _write(call.cgroup / "cgroup.kill", "1", required=False)
+                time.sleep(0.05)
+        logger.warning(f"⚠️ Could not remove sandbox cgroup {call.cgroup}")
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _write(path: Path, value: str, required: bool = True) -> bool:
+    try:
+        path.write_text(value)
+        return True
+    except OSError:
+        if required:
+            raise
+        return False
+
+
+def _read_keyed(path: Path) -> Dict[str, int]:
+    """Parse a 'key value' per line cgroup file; {} if it doesn't exist."""
+    try:
+        return {k: int(v) for k, v in (line.split() for line in path.read_text().splitlines() if line)}
+    except (OSError, ValueError):
+        return {}
+
+
+def _own_cgroup() -> Optional[str]:
+    """This process's cgroup v2 path ("0::/system.slice/x.service" -> "/system.slice/x.service")."""
+    try:
+        with open("/proc/self/cgroup") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return None
+
+
+def _cgroup2_mount() -> Optional[Path]:
+    try:
+        with open("/proc/self/mountinfo") as f:
+            for line in f:
+                fields = line.split()
+                sep = fields.index("-")
+                if fields[sep + 1] == "cgroup2":
+                    return Path(fields[4])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _session_rss(sid: int) -> int:
+    """Total resident memory of the processes in session sid (the call's process tree)."""
+    total = 0
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        fields = stat[stat.rindex(b")") + 2:].split()
+        if int(fields[3]) == sid:
+            total += int(fields[21]) * _PAGE_SIZE
+    return total
+
+
+def _count_user_tasks(uid: int) -> int:
+    """Threads owned by uid - what RLIMIT_NPROC counts (the server's own threads included)."""
+    count = 0
+    for entry in os.scandir("/proc"):
+        if entry.name.isdigit():
+            try:
+                if entry.stat().st_uid == uid:
+                    count += len(os.listdir(f"/proc/{entry.name}/task"))
+            except OSError:
+                pass
+    return count
+
+
+def _trampoline_argv(spec: dict, argv: List[str]) -> List[str]:
+    """Run argv through the exec trampoline (isolated mode, no site: fast and immune to PYTHON* env)."""
+    return [sys.executable, "-I", "-S", TRAMPOLINE, json.dumps(spec), *argv]
+
+
+_netns_probe: Optional[List[Optional[str]]] = None
+
+
+def _netns_mode() -> Optional[str]:
+    """How this process can create network namespaces: 'netns' (privileged), 'userns', or None."""
+    global _netns_probe
+    if _netns_probe is None:
+        _netns_probe = [None]
+        for mode in ("netns", "userns"):
+            try:
+                subprocess.run(_trampoline_argv({"netns": mode}, ["/bin/sh", "-c", ":"]),
+                               stderr=subprocess.DEVNULL, check=True, timeout=10)
+                _netns_probe = [mode]
+                break
+            except (subprocess.SubprocessError, OSError):
+                continue
+    return _netns_probe[0]
+
+
+def _record_usage(task_id: Optional[str], tool: str, result: ExecResult):
+    usage = result.usage
+    task = task_id or "unknown"
+    if usage.cpu_s is not None:
+        tool_metrics.sandbox_cpu_seconds.labels(task_id=task, tool=tool).inc(usage.cpu_s)
+    if usage.peak_memory_bytes is not None:
+        tool_metrics.sandbox_peak_memory_bytes.labels(tool=tool).observe(usage.peak_memory_bytes)
+    if usage.limit_hit or result.timed_out:
+        tool_metrics.sandbox_limit_hits.labels(task_id=task, limit=usage.limit_hit or "timeout").inc()
+
+    cpu = f"{usage.cpu_s:.2f}s" if usage.cpu_s is not None else "n/a"
+    peak = f"{usage.peak_memory_bytes / 1e6:.0f} MB" if usage.peak_memory_bytes is not None else "n/a"
+    note = f", LIMIT {usage.limit_hit}" if usage.limit_hit else (", TIMEOUT" if result.timed_out else "")
+    logger.info(f"🧪 {tool} [{task}] via {result.backend}: wall {usage.wall_s:.2f}s, cpu {cpu}, peak {peak}{note}")
+
+
+_backend: Optional[ExecutionBackend] = None
+
+
+def get_execution_backend() -> ExecutionBackend:
+    """The process-wide backend chosen by SANDBOX_BACKEND (auto: cgroup, then rlimit, then host)."""
+    global _backend
+    if _backend is None:
+        candidates = {
+            "cgroup": [CgroupBackend, RlimitBackend, HostBackend],
+            "rlimit": [RlimitBackend, HostBackend],
+            "host": [HostBackend],
+        }.get(SANDBOX_BACKEND, [CgroupBackend, RlimitBackend, HostBackend])
+        for backend_cls in candidates:
+            backend = backend_cls()
+            if backend.available():
+                break
+        if SANDBOX_BACKEND not in ("auto", backend.name):
+            logger.warning(f"⚠️ SANDBOX_BACKEND={SANDBOX_BACKEND} unavailable - using {backend.name}")
+        logger.info(f"🧪 Execution sandbox: {backend.name}")
+        _backend = backend
+    return _backend
@@ -0,0 +1,85 @@
+"""
+Agent Orchestrator — Sandbox Exec Trampoline
+============================================
+Applies one sandboxed call's limits to its own process, then execs the
+command in place (same pid, same session):
+
+    python -I -S sandbox_exec.py '<spec json>' argv...
+
+The spec is computed by the parent (tools/sandbox.py) and may contain:
+- cgroup: path of a cgroup.procs file to join
+- netns: "netns" | "userns" - move into a fresh network namespace (loopback only)
+- rlimits: [[resource, soft, hard], ...] for setrlimit
+- nice: niceness increment
+
+This replaces a preexec_fn: the API server is threaded, and running Python
+between fork and exec there can deadlock on locks held by other threads.
+Here the work happens in a fresh interpreter instead. Setup failures exit
+with 126, a command that cannot be found with 127 (like a shell).
+"""
+
+import json
+import os
+import sys
+
+CLONE_NEWNET = 0x40000000
+CLONE_NEWUSER = 0x10000000
+
+
+def enter_netns(mode: str):
+    """Move into a fresh network namespace and bring up loopback."""
+    import ctypes
+    import fcntl
+    import socket
+    import struct
+
+    libc = ctypes.CDLL(None, use_errno=True)  # Symbols already loaded - no find_library/ldconfig
+    uid, gid = os.getuid(), os.getgid()
+    flags = CLONE_NEWNET | (CLONE_NEWUSER if mode == "userns" else 0)
+    if libc.unshare(flags) != 0:
+        raise OSError(ctypes.get_errno(), "unshare failed")
+    if mode == "userns":
+        # Map our own ids so file ownership in the worktree looks unchanged
+        with open("/proc/self/setgroups", "w") as f:
+            f.write("deny")
+        with open("/proc/self/uid_map", "w") as f:
+            f.write(f"{uid} {uid} 1")
+        with open("/proc/self/gid_map", "w") as f:
+            f.write(f"{gid} {gid} 1")
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        # SIOCSIFFLAGS lo: IFF_UP | IFF_LOOPBACK | IFF_RUNNING
+        fcntl.ioctl(s.fileno(), 0x8914, struct.pack("16sH22x", b"lo", 0x1 | 0x8 | 0x40))
+
+
+def apply(spec: dict):
+    if spec.get("cgroup"):
+        with open(spec["cgroup"], "w") as f:
+            f.write(str(os.getpid()))
+    if spec.get("netns"):
+        enter_netns(spec["netns"])
+    if spec.get("rlimits"):
+        import resource
+        for res, soft, hard in spec["rlimits"]:
+            resource.setrlimit(res, (soft, hard))
+    if spec.get("nice"):
+        os.nice(spec["nice"])
+
+
+def main():
+    spec, argv = json.loads(sys.argv[1]), sys.argv[2:]
+    try:
+        apply(spec)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"sandbox: setup failed: {e}\n")
+        sys.stderr.flush()
+        os._exit(126)
+    try:
+        os.execvp(argv[0], argv)
+    except OSError as e:
+        sys.stderr.write(f"sandbox: {argv[0]}: {e.strerror}\n")
+        sys.stderr.flush()
+        os._exit(127 if isinstance(e, FileNotFoundError) else 126)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,40 +2,71 @@
 Search Tools for Research Worker
 =================================
 
-LangChain-integrated web search tools using Tavily.
+Async web search for research workers, backed by Tavily.
 Tavily is optimized for AI agents and provides clean, structured results.
 
-Uses dedicated langchain-tavily package (not langchain-community).
+WebSearchClient sits between the agents and the provider:
+- one shared HTTP session (httpx.AsyncClient) instead of a tool object per call
+- a TTL cache keyed by the normalized query, so queries that differ only
+  in case, spacing or punctuation ("FastAPI auth: best practices?" /
+  "fastapi auth best practices") hit; word order is kept, so "python to
+  rust" and "rust to python" stay distinct
+- identical in-flight queries share one provider request
+- search_many fans several queries out concurrently and de-duplicates URLs
+
+Set WEB_SEARCH_PROVIDER=stub to use the offline StubSearchProvider
+(deterministic results, no API key) for benchmarks and offline runs.
+
+get_tavily_search_tool (the LangChain TavilySearch tool) is kept for callers
+that still bind it directly.
 """
 
-import os
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any
-from langchain_tavily import TavilySearch
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from metrics import tool_metrics
 
 logger = logging.getLogger(__name__)
 
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+WEB_SEARCH_PROVIDER = os.getenv("WEB_SEARCH_PROVIDER", "tavily")  # tavily | stub
+SEARCH_CACHE_TTL_S = float(os.getenv("WEB_SEARCH_CACHE_TTL_S", "900"))
+SEARCH_CACHE_MAX_ENTRIES = 512
+SEARCH_MAX_CONCURRENCY = 4  # Provider requests in flight per client
+SEARCH_TIMEOUT_S = 30.0
 
-def get_tavily_search_tool(max_results: int = 5) -> TavilySearch:
+_TRACKING_PARAMS = re.compile(r"^(utm_.*|ref|fbclid|gclid)$")
+
+
+def get_tavily_search_tool(max_results: int = 5):
     """
     Get configured Tavily search tool.
-    
+
     Args:
         max_results: Maximum number of search results to return
-        
+
     Returns:
         Configured TavilySearch tool
-        
+
     Raises:
         ValueError: If TAVILY_API_KEY is not set
     """
+    from langchain_tavily import TavilySearch
+
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
         raise ValueError(
             "TAVILY_API_KEY not found in environment. "
             "Get your key at https://app.tavily.com"
         )
-    
+
     return TavilySearch(
         max_results=max_results,
         topic="general",
@@ -46,43 +77,292 @@ def get_tavily_search_tool(max_results: int = 5) -> TavilySearch:
     )
 
 
+def normalize_query(query: str) -> str:
+    """Cache key for a query: its lowercase words in order, without surrounding punctuation or extra spaces."""
+    words = (w.strip(".-") for w in re.findall(r"[\w.+#-]+", query.lower()))
+    return " ".join(w for w in words if w)
+
+
+def normalize_url(url: str) -> str:
+    """Dedup key for a URL: no scheme, www., fragment, trailing slash or tracking parameters."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)])
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+
+
+# =============================================================================
+# PROVIDERS
+# =============================================================================
+
+class TavilySearchProvider:
+    """Tavily REST API over a shared httpx.AsyncClient."""
+
+    name = "tavily"
+
+    def __init__(self, api_key: Optional[str] = None, timeout: float = SEARCH_TIMEOUT_S):
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+        if not self.api_key:
+            raise ValueError(
+                "TAVILY_API_KEY not found in environment. "
+                "Get your key at https://app.tavily.com"
+            )
+        self.timeout = timeout
+        self._client = None
+        self._client_loop = None
+
+    def _http(self):
+        import httpx
+
+        # An AsyncClient's connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(max_connections=SEARCH_MAX_CONCURRENCY * 2, max_keepalive_connections=SEARCH_MAX_CONCURRENCY),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        response = await self._http().post(TAVILY_SEARCH_URL, json={
+            "query": query, "max_results": max_results, "topic": "general",
+        })
+        response.raise_for_status()
+        return [
+            {"title": r.get("title", ""), "url": r.get("url", ""), "content": r.get("content", ""),
+             "score": r.get("score", 0.0)}
+            for r in response.json().get("results", [])
+        ]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class StubSearchProvider:
+    """
+    Offline provider with deterministic results.
+
+    Results are derived from the query's words, so related queries share
+    URLs (exercising de-duplication). latency_s simulates the HTTP round-trip.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency_s: float = 0.05):
+        self.latency_s = latency_s
+        self.calls = 0
+
+    async def search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        words = normalize_query(query).split() or ["empty"]
+        results = []
+        for i in range(max_results):
+            word = words[i % len(words)]
+            page = int(hashlib.sha1(f"{word}:{i // len(words)}".encode()).hexdigest()[:6], 16) % 1000
+            results.append({
+                "title": f"{word.title()} guide, part {page}",
+                "url": f"https://docs.example.com/{word}/{page}?utm_source=search",
+                "content": f"Reference material about {word} ({query}).",
+                "score": round(1.0 - i / (max_results + 1), 3),
+            })
+        return results
+
+    async def aclose(self):
+        pass
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+class WebSearchClient:
+    """Cached, coalescing search client shared by all research workers."""
+
+    def __init__(self, provider, ttl_s: float = SEARCH_CACHE_TTL_S, max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+                 max_concurrency: int = SEARCH_MAX_CONCURRENCY):
+        self.provider = provider
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.max_concurrency = max_concurrency
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(id(loop))
+        if sem is None:
+            sem = self._semaphores[id(loop)] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Results for one query, from the cache when a matching query was searched within the TTL."""
+        key = (normalize_query(query) or query.strip().lower(), max_results)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            self.hits += 1
+            tool_metrics.web_search_requests.labels(result="hit").inc()
+            return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            tool_metrics.web_search_requests.labels(result="coalesced").inc()
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        tool_metrics.web_search_requests.labels(result="miss").inc()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            async with self._semaphore():
+                results = await self.provider.search(query, max_results)
+            self._cache[key] = (time.monotonic() + self.ttl_s, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            future.set_result(results)
+            logger.info(f"Web search ({self.provider.name}): '{query}' returned {len(results)} results")
+            return results
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved: waiters re-raise it, nobody else needs to
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def search_many(self, queries: List[str], max_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Run several queries concurrently and merge the results.
+
+        Each URL appears once (best score kept), tagged with every query that found it.
+        Failed queries are logged and skipped.
+        """
+        outcomes = await asyncio.gather(*(self.search(q, max_results) for q in queries), return_exceptions=True)
+        merged: Dict[str, Dict[str, Any]] = {}
+        for query, outcome in zip(queries, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Web search failed for '{query}': {outcome}")
+                continue
+            for result in outcome:
+                key = normalize_url(result.get("url", ""))
+                existing = merged.get(key)
+                if existing is None:
+                    merged[key] = {**result, "queries": [query]}
+                else:
+                    existing["queries"].append(query)
+                    if result.get("score", 0) > existing.get("score", 0):
+                        existing.update({k: v for k, v in result.items() if k != "queries"})
+        return sorted(merged.values(), key=lambda r: r.get("score", 0), reverse=True)
+
+    def clear(self):
+        self._cache.clear()
+
+    async def aclose(self):
+        await self.provider.aclose()
+
+
+_client: Optional[WebSearchClient] = None
+
+
+def get_search_client() -> WebSearchClient:
+    """
+    The process-wide search client (provider chosen by WEB_SEARCH_PROVIDER).
+
+    Raises:
+        ValueError: If the Tavily provider is selected and TAVILY_API_KEY is not set
+    """
+    global _client
+    if _client is None:
+        provider = StubSearchProvider() if WEB_SEARCH_PROVIDER == "stub" else TavilySearchProvider()
+        _client = WebSearchClient(provider)
+    return _client
+
+
+def format_search_results(results: List[Dict[str, Any]], max_content_chars: int = 500) -> str:
+    """Numbered title/url/snippet blocks for the agent."""
+    if not results:
+        return "No results."
+    blocks = []
+    for i, r in enumerate(results, start=1):
+        content = r.get("content", "")
+        if len(content) > max_content_chars:
+            content = content[:max_content_chars] + "..."
+        blocks.append(f"[{i}] {r.get('title', '')} (score {r.get('score', 0):.2f})\n{r.get('url', '')}\n{content}")
+    return "\n\n".join(blocks)
+
+
 # Tool wrapper for direct invocation (if needed)
 async def web_search(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
     """
-    Search the web using Tavily.
-    
+    Search the web through the shared client.
+
     Args:
         query: Search query
         max_results: Maximum number of results
-        
+
     Returns:
         List of search results, each containing:
         - title: Page title
         - url: Page URL
         - content: Page content snippet
         - score: Relevance score (0-1)
-        
+
     Example:
         results = await web_search("FastAPI authentication best practices")
         for result in results:
             print(f"{result['title']}: {result['url']}")
     """
     try:
-        tool = get_tavily_search_tool(max_results=max_results)
-        
-        # Tavily tool returns synchronously
-        results = tool.invoke({"query": query})
-        
-        logger.info(f"Tavily search: '{query}' returned {len(results)} results")
-        return results
-        
+        return await get_search_client().search(query, max_results)
     except Exception as e:
-        logger.error(f"Tavily search failed: {e}")
+        logger.error(f"Web search failed: {e}")
         raise
 
 
+def get_web_search_tool(max_results: int = 5):
+    """
+    LangChain tool for research workers: several queries per call, merged and de-duplicated.
+
+    Raises:
+        ValueError: If the Tavily provider is selected and TAVILY_API_KEY is not set
+    """
+    from langchain_core.tools import StructuredTool
+
+    client = get_search_client()
+
+    async def web_search_tool(queries: List[str]) -> str:
+        """Search the web. Pass several related queries at once; results are merged and de-duplicated."""
+        results = await client.search_many(queries[:8], max_results)
+        return format_search_results(results[:max_results * 2])
+
+    return StructuredTool.from_function(
+        coroutine=web_search_tool,
+        name="web_search",
+        description="Search the web. Pass 1-8 queries (different angles on the topic); results come back merged, de-duplicated by URL, with title, url, snippet and score.",
+        handle_tool_error=True,
+    )
+
+
 # Export for tool binding
 __all__ = [
     "get_tavily_search_tool",
+    "get_web_search_tool",
+    "get_search_client",
     "web_search",
+    "WebSearchClient",
+    "TavilySearchProvider",
+    "StubSearchProvider",
+    "normalize_query",
+    "normalize_url",
 ]
@@ -0,0 +1,179 @@
+"""
+Agent Orchestrator — Worker Pool
+================================
+Process-wide worker slot budget shared by every continuous dispatch loop.
+
+Each run's TaskCompletionQueue acquires a slot from the pool before it
+spawns a worker and releases it when the worker finishes. Slots are
+allocated by:
+
+  1. Minimums - every run with work first gets up to its min_slots.
+  2. Priority classes - "high" runs are filled before "normal", "normal"
+     before "low".
+  3. Weighted fair share - within a class, slots go to the run with the
+     fewest slots per unit of weight, up to each run's max_slots and demand.
+
+Running workers are never preempted: a run above its share simply cannot
+acquire new slots until enough of its workers finish.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List
+
+from metrics import dispatch_metrics
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_CLASSES = {"high": 0, "normal": 1, "low": 2}
+
+
+@dataclass
+class RunShare:
+    """Scheduling parameters and live counters for one run."""
+    run_id: str
+    weight: float = 1.0
+    min_slots: int = 0
+    max_slots: int = 5
+    priority: str = "normal"
+    active: int = 0
+    demand: int = 0  # Active workers plus tasks ready to dispatch
+
+
+class WorkerPool:
+    """
+    Global worker slot budget with weighted fair sharing between runs.
+
+    Usage:
+        worker_pool.register(run_id, weight=1.0, min_slots=1, max_slots=5, priority="normal")
+        worker_pool.set_demand(run_id, ready_count)
+        if worker_pool.try_acquire(run_id):
+            ...  # spawn worker, then worker_pool.release(run_id) when it finishes
+    """
+
+    def __init__(self, total_slots: int = 16):
+        self.total_slots = total_slots
+        self.runs: Dict[str, RunShare] = {}
+        self._waiters: List[asyncio.Future] = []
+
+    def register(self, run_id: str, weight: float = 1.0, min_slots: int = 0,
+                 max_slots: int = 5, priority: str = "normal") -> RunShare:
+        """Add a run to the pool (or update its parameters)."""
+        if priority not in PRIORITY_CLASSES:
+            logger.warning(f"Unknown priority class '{priority}' for run {run_id}, using 'normal'")
+            priority = "normal"
+        share = self.runs.get(run_id)
+        if share is None:
+            share = self.runs[run_id] = RunShare(run_id)
+        share.weight = max(weight, 0.01)
+        share.max_slots = max(max_slots, 1)
+        share.min_slots = max(0, min(min_slots, share.max_slots))
+        share.priority = priority
+        self._update_gauge(share)
+        return share
+
+    def unregister(self, run_id: str):
+        """Remove a finished run and hand its slots to the others."""
+        share = self.runs.pop(run_id, None)
+        if share is None:
+            return
+        try:
+            dispatch_metrics.worker_slots_active.remove(run_id)
+        except KeyError:
+            pass
+        self._wake_waiters()
+
+    def set_demand(self, run_id: str, ready: int):
+        """Record how many tasks the run could dispatch right now."""
+        share = self.runs.get(run_id)
+        if share is not None:
+            share.demand = share.active + max(ready, 0)
+
+    @property
+    def active_total(self) -> int:
+        return sum(share.active for share in self.runs.values())
+
+    def active_slots(self, run_id: str) -> int:
+        """Number of workers currently holding a slot for the run."""
+        share = self.runs.get(run_id)
+        return share.active if share else 0
+
+    def allocation(self) -> Dict[str, int]:
+        """Current slot entitlement of every registered run."""
+        capacity = self.total_slots
+        alloc = {run_id: 0 for run_id in self.runs}
+        wants = {run_id: min(max(share.demand, share.active), share.max_slots)
+                 for run_id, share in self.runs.items()}
+        ordered = sorted(self.runs.values(), key=lambda s: PRIORITY_CLASSES[s.priority])
+
+        # 1. Minimums, highest priority first
+        for share in ordered:
+            granted = min(share.min_slots, wants[share.run_id], capacity)
+            alloc[share.run_id] = granted
+            capacity -= granted
+
+        # 2. Weighted fair share within each priority class, one slot at a time
+        for priority in sorted(set(PRIORITY_CLASSES[s.priority] for s in ordered)):
+            members = [s for s in ordered if PRIORITY_CLASSES[s.priority] == priority]
+            while capacity > 0:
+                hungry = [s for s in members if alloc[s.run_id] < wants[s.run_id]]
+                if not hungry:
+                    break
+                share = min(hungry, key=lambda s: (alloc[s.run_id] + 1) / s.weight)
+                alloc[share.run_id] += 1
+                capacity -= 1
+        return alloc
+
+    def available_slots(self, run_id: str) -> int:
+        """Slots the run may acquire now: its entitlement minus what it holds, within the global budget."""
+        share = self.runs.get(run_id)
+        if share is None:
+            return 0
+        entitled = self.allocation().get(run_id, 0)
+        free = self.total_slots - self.active_total
+        return max(0, min(entitled - share.active, free))
+
+    def try_acquire(self, run_id: str) -> bool:
+        """Take one slot for the run if its share allows it."""
+        if self.available_slots(run_id) <= 0:
+            return False
+        share = self.runs[run_id]
+        share.active += 1
+        share.demand = max(share.demand, share.active)
+        self._update_gauge(share)
+        return True
+
+    def release(self, run_id: str):
+        """Return one slot held by the run."""
+        share = self.runs.get(run_id)
+        if share is not None and share.active > 0:
+            share.active -= 1
+            share.demand = max(share.demand - 1, share.active)
+            self._update_gauge(share)
+        self._wake_waiters()
+
+    async def wait_for_release(self, timeout: float = 1.0) -> None:
+        """Wait until any slot is released (or a run leaves the pool), or timeout."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _wake_waiters(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _update_gauge(self, share: RunShare):
+        dispatch_metrics.worker_slots_active.labels(run_id=share.run_id).set(share.active)
+
+
+worker_pool = WorkerPool(total_slots=int(os.getenv("WORKER_POOL_SLOTS", "16")))
@@ -0,0 +1,86 @@
+"""
+Unit tests for background guardian checks.
+"""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from langchain_core.messages import HumanMessage
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from config import OrchestratorConfig
+from orchestrator_types import Task, TaskPhase, GuardianNudge, GuardianVerdict
+from nodes import guardian
+from nodes.guardian import BackgroundGuardian
+
+
+def _task():
+    return Task(id="task_1", title="Build API", component="api", phase=TaskPhase.BUILD, description="Build it")
+
+
+def _fake_check(delay: float, nudge: bool, seen: list = None):
+    async def check(task, messages, config, iteration_count):
+        if seen is not None:
+            seen.append(len(messages))
+        await asyncio.sleep(delay)
+        if not nudge:
+            return None
+        return GuardianNudge(task_id=task.id, verdict=GuardianVerdict.DRIFTING, message="Refocus on the API",
+                             detected_issue="drift")
+    return check
+
+
+class TestBackgroundGuardian:
+    """Test BackgroundGuardian."""
+
+    @pytest.mark.asyncio
+    async def test_check_does_not_block(self, monkeypatch):
+        """start_check returns immediately; the nudge is collected once finished."""
+        monkeypatch.setattr(guardian, "check_agent_alignment", _fake_check(0.05, nudge=True))
+        bg = BackgroundGuardian(_task(), OrchestratorConfig())
+
+        assert bg.start_check([HumanMessage(content="hi")], 10)
+        assert bg.collect() is None  # Still running
+
+        await asyncio.sleep(0.1)
+        nudge = bg.collect()
+        assert nudge is not None and nudge.message == "Refocus on the API"
+        assert bg.collect() is None
+
+    @pytest.mark.asyncio
+    async def test_on_track_yields_no_nudge(self, monkeypatch):
+        """Checks that find no drift inject nothing."""
+        monkeypatch.setattr(guardian, "check_agent_alignment", _fake_check(0, nudge=False))
+        bg = BackgroundGuardian(_task(), OrchestratorConfig())
+        bg.start_check([], 10)
+        await asyncio.sleep(0.01)
+
+        assert bg.collect() is None
+
+    @pytest.mark.asyncio
+    async def test_deadline_drops_check(self, monkeypatch):
+        """Checks past the deadline are cancelled and counted as dropped."""
+        monkeypatch.setattr(guardian, "check_agent_alignment", _fake_check(1.0, nudge=True))
+        bg = BackgroundGuardian(_task(), OrchestratorConfig(), deadline_seconds=0.01)
+        bg.start_check([], 10)
+        await asyncio.sleep(0.05)
+
+        assert bg.collect() is None
+        assert bg.checks_dropped == 1
+        assert not bg.in_flight
+
+    @pytest.mark.asyncio
+    async def test_snapshot_of_recent_messages(self, monkeypatch):
+        """The check sees a bounded snapshot, unaffected by later appends."""
+        seen = []
+        monkeypatch.setattr(guardian, "check_agent_alignment", _fake_check(0, nudge=False, seen=seen))
+        bg = BackgroundGuardian(_task(), OrchestratorConfig(guardian_context_window=5))
+        messages = [HumanMessage(content=str(i)) for i in range(12)]
+        bg.start_check(messages, 10)
+        messages.append(HumanMessage(content="later"))
+        await asyncio.sleep(0.01)
+
+        assert seen == [5]
+        await bg.cancel()
@@ -0,0 +1,76 @@
+"""
+Unit tests for the batch file tools (write_files, stat_files).
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from tools.filesystem_async import read_file_async, stat_files_async, write_files_async
+from nodes.tools_binding import ReadTracker, _create_read_file_wrapper, _create_write_files_wrapper
+
+
+class TestWriteFiles:
+    @pytest.mark.asyncio
+    async def test_writes_every_file_and_reports_each(self, tmp_path):
+        result = await write_files_async(
+            [{"path": "app/__init__.py", "content": ""}, {"path": "app/main.py", "content": "print(1)\n"}],
+            root=tmp_path
+        )
+        assert (tmp_path / "app" / "main.py").read_text() == "print(1)\n"
+        assert result.splitlines()[0] == "app/__init__.py: Successfully wrote 0 bytes to app/__init__.py"
+        assert result.endswith("2/2 files written")
+
+    @pytest.mark.asyncio
+    async def test_one_bad_item_does_not_stop_the_rest(self, tmp_path):
+        result = await write_files_async(
+            [{"path": "../outside.py", "content": "x"}, {"path": "ok.py", "content": "y"}], root=tmp_path
+        )
+        assert "../outside.py: Error: Access denied" in result
+        assert (tmp_path / "ok.py").read_text() == "y"
+        assert result.endswith("1/2 files written")
+
+    @pytest.mark.asyncio
+    async def test_rejects_duplicate_paths(self, tmp_path):
+        with pytest.raises(ValueError, match="more than once"):
+            await write_files_async([{"path": "a.py", "content": "1"}, {"path": "/a.py", "content": "2"}], root=tmp_path)
+
+
+class TestWriteFilesGuard:
+    @pytest.mark.asyncio
+    async def test_read_before_write_applies_per_file(self, tmp_path):
+        """Unread existing files are blocked; new files and fully read files in the same batch are written."""
+        (tmp_path / "read.py").write_text("old\n")
+        (tmp_path / "unread.py").write_text("keep\n")
+        tracker = ReadTracker()
+        read = _create_read_file_wrapper(read_file_async, tmp_path, tmp_path, tracker)
+        write_files = _create_write_files_wrapper(write_files_async, tmp_path, tmp_path, tracker)
+
+        await read("read.py")
+        result = await write_files([
+            {"path": "read.py", "content": "new\n"},
+            {"path": "unread.py", "content": "lost\n"},
+            {"path": "fresh.py", "content": "a\nb\n"},
+        ])
+
+        assert "unread.py: BLOCKED" in result and result.endswith("2/3 files written")
+        assert (tmp_path / "unread.py").read_text() == "keep\n"
+        assert (tmp_path / "read.py").read_text() == "new\n"
+        assert tracker.covers("fresh.py")
+
+
+class TestStatFiles:
+    @pytest.mark.asyncio
+    async def test_reports_type_size_and_missing(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "requirements.txt").write_text("flask\n")
+        result = await stat_files_async(["requirements.txt", "src", "missing.py", "../etc"], root=tmp_path)
+        assert result.splitlines() == [
+            "requirements.txt: file, 6 bytes",
+            "src: directory",
+            "missing.py: not found",
+            "../etc: access denied (outside workspace)",
+        ]
@@ -0,0 +1,81 @@
+"""
+Unit tests for per-run broadcast debouncing.
+"""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from api.broadcast import RunBroadcastDebouncer
+
+
+def _recorder():
+    sent = []
+
+    async def send(run_id, state):
+        sent.append((run_id, state["n"]))
+
+    return sent, send
+
+
+class TestRunBroadcastDebouncer:
+    @pytest.mark.asyncio
+    async def test_burst_coalesces_to_latest(self):
+        """A burst sends the first update now and only the latest one at the end of the interval."""
+        sent, send = _recorder()
+        debouncer = RunBroadcastDebouncer(send, interval_ms=50)
+
+        for n in range(5):
+            await debouncer.update("run_1", {"n": n}, "running")
+        assert sent == [("run_1", 0)]
+
+        await asyncio.sleep(0.08)
+        assert sent == [("run_1", 0), ("run_1", 4)]
+        assert debouncer.requested == 5 and debouncer.flushed == 2
+
+    @pytest.mark.asyncio
+    async def test_terminal_status_flushes_immediately(self):
+        """A terminal run status is sent without waiting for the interval."""
+        sent, send = _recorder()
+        debouncer = RunBroadcastDebouncer(send, interval_ms=1000)
+
+        await debouncer.update("run_1", {"n": 0}, "running")
+        await debouncer.update("run_1", {"n": 1}, "running")
+        await debouncer.update("run_1", {"n": 2}, "completed")
+
+        assert sent == [("run_1", 0), ("run_1", 2)]
+        assert not debouncer._timers
+
+    @pytest.mark.asyncio
+    async def test_task_needing_attention_flushes_immediately(self):
+        """A task entering waiting_human or failed is sent at once; staying there is debounced again."""
+        from orchestrator_types import TaskStatus
+        sent, send = _recorder()
+        debouncer = RunBroadcastDebouncer(send, interval_ms=1000)
+
+        def state(n, status):
+            return {"n": n, "tasks": [{"id": "task_a", "status": status}]}
+
+        await debouncer.update("run_1", state(0, "active"), "running")
+        await debouncer.update("run_1", state(1, TaskStatus.WAITING_HUMAN), "running")
+        await debouncer.update("run_1", state(2, TaskStatus.WAITING_HUMAN), "running")
+        await debouncer.update("run_1", state(3, "failed"), "running")
+
+        assert sent == [("run_1", 0), ("run_1", 1), ("run_1", 3)]
+        debouncer.discard("run_1")
+
+    @pytest.mark.asyncio
+    async def test_runs_are_independent(self):
+        """Each run has its own interval."""
+        sent, send = _recorder()
+        debouncer = RunBroadcastDebouncer(send, interval_ms=1000)
+
+        await debouncer.update("run_1", {"n": 0}, "running")
+        await debouncer.update("run_2", {"n": 1}, "running")
+
+        assert sent == [("run_1", 0), ("run_2", 1)]
+        debouncer.discard("run_1")
+        debouncer.discard("run_2")
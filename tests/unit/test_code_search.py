@@ -0,0 +1,114 @@
+"""
+Unit tests for the search_code tool.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from tools.code_search import search_code_async, get_code_index, parse_js_symbols, parse_python_symbols
+
+PY_SOURCE = '''\
+MAX_USERS = 10
+
+
+class UserService:
+    def get_user(self, user_id):
+        return lookup(user_id)
+
+
+async def lookup(user_id):
+    return {"id": user_id}
+'''
+
+TS_SOURCE = '''\
+export interface User { id: string }
+export default class Api {}
+export async function fetchUser(id: string) {}
+export const BASE_URL = "/api";
+export { fetchUser as getUser, helper };
+module.exports.legacy = 1;
+'''
+
+
+@pytest.fixture
+def worktree(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "users.py").write_text(PY_SOURCE)
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "api.ts").write_text(TS_SOURCE)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "lib.js").write_text("function lookup() {}\n")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\x00lookup")
+    return tmp_path
+
+
+class TestSymbolParsers:
+    def test_python_symbols_are_qualified(self):
+        """Methods are qualified by their class; module-level assignments are included."""
+        assert parse_python_symbols(PY_SOURCE) == [
+            (1, "variable", "MAX_USERS"),
+            (4, "class", "UserService"),
+            (5, "method", "UserService.get_user"),
+            (9, "function", "lookup"),
+        ]
+
+    def test_js_exports(self):
+        """Declarations, export lists (with aliases) and CommonJS exports are found."""
+        assert [(kind, name) for _, kind, name in parse_js_symbols(TS_SOURCE)] == [
+            ("interface", "User"), ("class", "Api"), ("function", "fetchUser"), ("variable", "BASE_URL"),
+            ("export", "getUser"), ("export", "helper"), ("export", "legacy"),
+        ]
+
+
+class TestSearchCode:
+    @pytest.mark.asyncio
+    async def test_regex_and_literal_modes(self, worktree):
+        """Matches come back as path:line snippets; excluded dirs and binaries are skipped."""
+        result = await search_code_async(r"lookup\(", root=worktree)
+        assert result.splitlines()[:2] == ["app/users.py:6: return lookup(user_id)", "app/users.py:9: async def lookup(user_id):"]
+        assert result.endswith("[2 match(es) in 1 file(s)]")
+
+        literal = await search_code_async("lookup(", mode="literal", glob="*.ts", root=worktree)
+        assert literal == "No matches for 'lookup('."
+        assert "invalid regex" in await search_code_async("lookup(", root=worktree)
+
+    @pytest.mark.asyncio
+    async def test_anchors_match_at_every_line(self, worktree):
+        """^ and $ anchor at line boundaries, like grep, not only at the start and end of the file."""
+        defs = await search_code_async(r"^(async )?def ", glob="*.py", root=worktree)
+        assert defs.splitlines()[0] == "app/users.py:9: async def lookup(user_id):"
+        classes = await search_code_async(r"^class \w+", root=worktree)
+        assert classes.splitlines()[0] == "app/users.py:4: class UserService:"
+        ends = await search_code_async(r"user_id\)$", glob="*.py", root=worktree)
+        assert ends.endswith("[1 match(es) in 1 file(s)]") and "app/users.py:6:" in ends
+
+    @pytest.mark.asyncio
+    async def test_match_across_lines_reports_span(self, worktree):
+        """A match that runs through a line break is reported once, with its line range."""
+        result = await search_code_async(r"class UserService:\s+def", root=worktree)
+        assert result.splitlines()[0] == "app/users.py:4-5: class UserService:"
+
+    @pytest.mark.asyncio
+    async def test_symbol_lookup_and_caps(self, worktree):
+        """Exact symbol matches rank first; max_results caps the output."""
+        result = await search_code_async("user", mode="symbol", root=worktree, max_results=2)
+        assert result.splitlines()[0] == "web/api.ts:1: [interface User] export interface User { id: string }"
+        assert "stopped at 2 results" in result
+
+    @pytest.mark.asyncio
+    async def test_symbols_reparsed_only_after_change(self, worktree):
+        """Unchanged files reuse their symbol table; an edited file is reparsed."""
+        index = get_code_index(worktree)
+        await search_code_async("lookup", mode="symbol", root=worktree)
+        parses = index.parses
+        await search_code_async("lookup", mode="symbol", root=worktree)
+        assert index.parses == parses
+
+        path = worktree / "app" / "users.py"
+        path.write_text(PY_SOURCE + "\n\ndef lookup_all():\n    pass\n")
+        result = await search_code_async("lookup", mode="symbol", root=worktree)
+        assert index.parses == parses + 1
+        assert "app/users.py:13: [function lookup_all]" in result
@@ -0,0 +1,163 @@
+"""
+Unit tests for ReAct context compaction.
+"""
+import pytest
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from nodes.context_compaction import compact_messages, estimate_tokens, COMPACTED_MARKER
+from nodes.director.phoenix_summary import _extract_conversation_digest
+
+
+def _tool_round(call_id: str, name: str, args: dict, output: str):
+    """One AI tool call plus its result."""
+    return [
+        AIMessage(content="", tool_calls=[{"id": call_id, "name": name, "args": args}]),
+        ToolMessage(content=output, tool_call_id=call_id),
+    ]
+
+
+def _conversation(rounds: int, output_chars: int = 4000):
+    messages = [SystemMessage(content="system prompt"), HumanMessage(content="Task: build it")]
+    for i in range(rounds):
+        messages += _tool_round(f"call_{i}", "read_file", {"path": f"src/file_{i}.py"}, "x" * output_chars)
+    return messages
+
+
+class TestCompactMessages:
+    """Test compact_messages."""
+
+    def test_short_conversation_unchanged(self):
+        """Conversations within budget are passed through verbatim."""
+        messages = _conversation(2, output_chars=100)
+        compacted, stats = compact_messages(messages)
+
+        assert [m.content for m in compacted] == [m.content for m in messages]
+        assert stats.messages_compacted == 0
+
+    def test_original_messages_not_modified(self):
+        """The full history is never mutated."""
+        messages = _conversation(40)
+        before = [m.content for m in messages]
+        compact_messages(messages, role_budgets={"tool": 1000})
+
+        assert [m.content for m in messages] == before
+
+    def test_structure_preserved(self):
+        """Message count, types and tool_call pairing survive compaction."""
+        messages = _conversation(40)
+        compacted, _ = compact_messages(messages, role_budgets={"tool": 1000})
+
+        assert len(compacted) == len(messages)
+        for original, new in zip(messages, compacted):
+            assert type(original) is type(new)
+            if isinstance(original, ToolMessage):
+                assert new.tool_call_id == original.tool_call_id
+            if isinstance(original, AIMessage):
+                assert new.tool_calls == original.tool_calls
+
+    def test_stale_tool_outputs_digested(self):
+        """Old tool outputs beyond the budget become digests; recent ones stay."""
+        messages = _conversation(40)
+        compacted, stats = compact_messages(messages, keep_recent=4, role_budgets={"tool": 2000})
+
+        assert stats.messages_compacted > 0
+        assert compacted[3].content.startswith(COMPACTED_MARKER)
+        assert "read_file('src/file_0.py')" in compacted[3].content
+        assert compacted[-1].content == messages[-1].content
+        assert estimate_tokens(compacted) < estimate_tokens(messages) // 4
+
+    def test_prompt_size_stays_flat(self):
+        """Compacted size grows far slower than the raw history."""
+        small, _ = compact_messages(_conversation(30), role_budgets={"tool": 2000})
+        large, _ = compact_messages(_conversation(90), role_budgets={"tool": 2000})
+
+        assert estimate_tokens(large) < estimate_tokens(small) * 1.5
+
+    def test_repeated_reads_deduplicated(self):
+        """Only the latest read of a file keeps its content."""
+        messages = [SystemMessage(content="system prompt"), HumanMessage(content="Task")]
+        messages += _tool_round("a", "read_file", {"path": "app.py"}, "old content " * 100)
+        messages += _tool_round("b", "read_file", {"path": "App.py"}, "new content " * 100)
+        compacted, stats = compact_messages(messages)
+
+        assert stats.reads_deduplicated == 1
+        assert "Superseded" in compacted[3].content
+        assert compacted[5].content == messages[5].content
+
+    def test_read_superseded_by_write(self):
+        """A read followed by a write to the same path is stale."""
+        messages = [SystemMessage(content="system prompt"), HumanMessage(content="Task")]
+        messages += _tool_round("a", "read_file", {"path": "app.py"}, "old content " * 100)
+        messages += _tool_round("b", "write_file", {"path": "app.py", "content": "new"}, "Wrote 3 bytes")
+        compacted, stats = compact_messages(messages)
+
+        assert stats.reads_deduplicated == 1
+        assert "Superseded" in compacted[3].content
+
+    def test_read_superseded_by_batch_write(self):
+        """write_files supersedes reads of every path in its files list."""
+        messages = [SystemMessage(content="system prompt"), HumanMessage(content="Task")]
+        messages += _tool_round("a", "read_file", {"path": "app.py"}, "old content " * 100)
+        messages += _tool_round("b", "read_file", {"path": "other.py"}, "other content " * 100)
+        files = [{"path": "app.py", "content": "new"}, {"path": "new.py", "content": "x"}]
+        messages += _tool_round("c", "write_files", {"files": files}, "2/2 files written")
+        compacted, stats = compact_messages(messages)
+
+        assert stats.reads_deduplicated == 1
+        assert "Superseded" in compacted[3].content
+        assert compacted[5].content == messages[5].content
+
+    def test_batch_write_digest_lists_paths(self):
+        digest = _extract_conversation_digest(
+            _tool_round("a", "write_files", {"files": [{"path": "a.py", "content": "12"}, {"path": "b.py", "content": "3"}]},
+                        "2/2 files written")
+        )
+        assert "[Tool] write_files('a.py', 'b.py', 3 chars)" in digest
+
+    def test_task_message_protected(self):
+        """System prompt and task message are never compacted."""
+        messages = [SystemMessage(content="s" * 50000), HumanMessage(content="t" * 50000)]
+        messages += _conversation(20)[2:]
+        compacted, _ = compact_messages(messages, role_budgets={"human": 10, "tool": 10})
+
+        assert compacted[0].content == messages[0].content
+        assert compacted[1].content == messages[1].content
+
+
+class TestCompactionChunks:
+    @pytest.mark.asyncio
+    async def test_chunk_stops_on_tool_budget(self):
+        """A compaction chunk ends after its tool results, without an extra LLM turn for the step limit."""
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.tools import tool
+        from langgraph.prebuilt import create_react_agent
+        from nodes.execution import _run_chunk_to_tool_budget
+
+        @tool
+        def read_file(path: str) -> str:
+            """Read a file."""
+            return "contents"
+
+        class ToolCallingModel(GenericFakeChatModel):
+            def bind_tools(self, tools, **kwargs):
+                return self
+
+        turns = []
+
+        def replies():
+            for i in range(10):
+                turns.append(i)
+                yield _tool_round(f"call_{i}", "read_file", {"path": f"f{i}.py"}, "")[0]
+
+        agent = create_react_agent(ToolCallingModel(messages=replies()), [read_file])
+        messages = [HumanMessage(content="Task: read everything")]
+        result = await _run_chunk_to_tool_budget(agent, messages, max_tool_calls=3, recursion_limit=14)
+
+        assert len(turns) == 3
+        assert isinstance(result["messages"][-1], ToolMessage)
+        assert sum(isinstance(m, ToolMessage) for m in result["messages"]) == 3
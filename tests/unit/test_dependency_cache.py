@@ -0,0 +1,124 @@
+"""
+Unit tests for the shared dependency-install cache.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import dependency_cache
+from dependency_cache import clone_venv, prepare_workspace_venv, template_key
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="venv templates are POSIX-only")
+
+
+def _fake_venv(path: Path):
+    (path / "bin").mkdir(parents=True)
+    (path / "lib" / "site-packages" / "pkg").mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text(f"home = /usr/bin\ncommand = python -m venv {path}\n")
+    script = path / "bin" / "pip"
+    script.write_text(f"#!{path}/bin/python\nimport pip\n")
+    script.chmod(0o755)
+    (path / "lib" / "site-packages" / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    os.symlink(str(path / "lib"), str(path / "lib64"))
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEPENDENCY_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def fake_build(monkeypatch):
+    """Replace the pip/venv build with a local fake and count the builds."""
+    builds = []
+
+    async def build(venv_path, packages, with_node, python, status):
+        builds.append(venv_path)
+        _fake_venv(venv_path)
+        return True
+
+    monkeypatch.setattr(dependency_cache, "_build_venv", build)
+    return builds
+
+
+@posix_only
+class TestCloneVenv:
+    def test_rewrites_embedded_paths_and_links_the_rest(self, tmp_path):
+        """Scripts and pyvenv.cfg point at the clone; package files share inodes with the template."""
+        template, target = tmp_path / "template", tmp_path / "ws" / ".venv"
+        _fake_venv(template)
+        target.parent.mkdir()
+
+        stats = clone_venv(template, target)
+
+        assert (target / "bin" / "pip").read_text().startswith(f"#!{target}/bin/python")
+        assert os.access(target / "bin" / "pip", os.X_OK)
+        assert str(template) not in (target / "pyvenv.cfg").read_text()
+        module = "lib/site-packages/pkg/__init__.py"
+        assert os.stat(target / module).st_ino == os.stat(template / module).st_ino
+        assert os.readlink(target / "lib64") == str(target / "lib")
+        assert stats["rewritten"] == 2 and stats["linked"] >= 1
+
+
+@posix_only
+class TestPrepareWorkspaceVenv:
+    @pytest.mark.asyncio
+    async def test_second_workspace_is_cloned_from_template(self, tmp_path, cache_dir, fake_build):
+        """The first run builds and caches a template; the next run with the same packages clones it."""
+        first = await prepare_workspace_venv(tmp_path / "a" / ".venv", packages=["requests"])
+        second = await prepare_workspace_venv(tmp_path / "b" / ".venv", packages=["requests"])
+
+        assert (first, second) == ("miss", "hit")
+        assert len(fake_build) == 1
+        assert (tmp_path / "b" / ".venv" / "bin" / "pip").read_text().startswith(f"#!{tmp_path}/b/.venv")
+
+    @pytest.mark.asyncio
+    async def test_existing_venv_is_left_alone(self, tmp_path, cache_dir, fake_build):
+        venv = tmp_path / ".venv"
+        venv.mkdir()
+        assert await prepare_workspace_venv(venv) == "existing"
+        assert fake_build == []
+
+    @pytest.mark.asyncio
+    async def test_template_published_concurrently_is_cloned(self, tmp_path, cache_dir, monkeypatch):
+        """If another process publishes the template while we build, our rename fails and theirs is used."""
+        template = cache_dir / "venv-templates" / template_key(["requests"], True)
+
+        async def build(venv_path, packages, with_node, python, status):
+            _fake_venv(venv_path)
+            _fake_venv(template)  # The other process finishes first
+            (template / "theirs").write_text("")
+            (template / dependency_cache.COMPLETE_MARKER).write_text(json.dumps({"built_at": str(template)}))
+            return True
+
+        monkeypatch.setattr(dependency_cache, "_build_venv", build)
+        assert await prepare_workspace_venv(tmp_path / ".venv", packages=["requests"]) == "miss"
+        assert (tmp_path / ".venv" / "theirs").exists()
+        assert (tmp_path / ".venv" / "bin" / "pip").read_text().startswith(f"#!{tmp_path}/.venv")
+        assert [p.name for p in template.parent.iterdir()] == [template.name]  # Staging cleaned up
+
+    @pytest.mark.asyncio
+    async def test_failed_node_setup_is_not_cached(self, tmp_path, cache_dir, monkeypatch):
+        """A venv without Node.js is usable but must not become the template."""
+        async def build(venv_path, packages, with_node, python, status):
+            _fake_venv(venv_path)
+            return False
+
+        monkeypatch.setattr(dependency_cache, "_build_venv", build)
+        outcome = await prepare_workspace_venv(tmp_path / ".venv", packages=["requests"])
+
+        assert outcome == "uncached"
+        assert (tmp_path / ".venv" / "bin" / "pip").exists()
+        assert not any((cache_dir / "venv-templates").iterdir())
+
+
+def test_template_key_ignores_package_order_and_case():
+    assert template_key(["Requests", "nodeenv"], True) == template_key(["nodeenv", "requests"], True)
+    assert template_key(["requests"], True) != template_key(["requests"], False)
@@ -0,0 +1,80 @@
+"""
+Unit tests for the BM25 dependency query pre-filter.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from nodes.director.dependency_matching import BM25Index, prefilter_queries, tokenize
+
+
+DOCS = [
+    {"id": "t1", "title": "Create user profile API endpoint", "component": "backend",
+     "description": "GET/PUT /api/profile returning user profile data"},
+    {"id": "t2", "title": "Build profile page UI", "component": "frontend",
+     "description": "React page showing the user profile"},
+    {"id": "t3", "title": "Initialize SQLite database with user tables", "component": "backend",
+     "description": "Schema for users and sessions"},
+    {"id": "t4", "title": "Add billing service layer", "component": "billing",
+     "description": "Business logic for invoices"},
+    {"id": "t5", "title": "Add auth service layer", "component": "auth",
+     "description": "Business logic for login"},
+]
+
+
+def _query(text: str, task_id: str = "t2"):
+    return {"task_title": "Build profile page UI", "task_id": task_id, "query": text}
+
+
+class TestTokenize:
+    """Test tokenize."""
+
+    def test_stopwords_and_plurals(self):
+        """Stopwords are dropped and simple plurals folded."""
+        assert tokenize("The completed API endpoints for users") == ["api", "endpoint", "user"]
+
+
+class TestBM25Index:
+    """Test BM25Index ranking."""
+
+    def test_best_match_ranked_first(self):
+        """The lexically closest task ranks first."""
+        index = BM25Index(DOCS)
+        ranked = index.rank("Backend API endpoint for user profile data")
+
+        assert ranked[0][0]["id"] == "t1"
+
+    def test_excluded_ids_skipped(self):
+        """A task never matches its own query."""
+        index = BM25Index(DOCS)
+        ranked = index.rank("profile page UI", exclude_ids={"t2"})
+
+        assert all(doc["id"] != "t2" for doc, _ in ranked)
+
+
+class TestPrefilterQueries:
+    """Test prefilter_queries classification."""
+
+    def test_clear_match_resolved(self):
+        """Queries with a dominant, well-covered match resolve locally."""
+        [result] = prefilter_queries([_query("User profile API endpoint")], DOCS)
+
+        assert not result.ambiguous
+        assert result.match["id"] == "t1"
+
+    def test_close_scores_ambiguous(self):
+        """Two near-identical candidates leave the query for the LLM."""
+        [result] = prefilter_queries([_query("service layer business logic")], DOCS)
+
+        assert result.ambiguous
+        assert {doc["id"] for doc, _ in result.candidates[:2]} == {"t4", "t5"}
+
+    def test_no_lexical_overlap_ambiguous(self):
+        """Queries without lexical overlap are never resolved locally."""
+        [result] = prefilter_queries([_query("Payments processing")], DOCS)
+
+        assert result.ambiguous
+        assert result.candidates == []
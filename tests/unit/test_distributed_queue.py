@@ -0,0 +1,156 @@
+"""
+Unit tests for the distributed task queue (SQLite backend).
+"""
+import asyncio
+import pytest
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+# Add src to path
+SRC = Path(__file__).parent.parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+import run_persistence
+import distributed_queue
+from distributed_queue import (
+    DistributedTaskQueue, init_task_envelopes_table, enqueue_envelope, lease_envelope,
+    heartbeat_envelope, complete_envelope, collect_finished_envelopes
+)
+
+WORKER_SCRIPT = textwrap.dedent("""
+    import asyncio, os, sys
+    sys.path.insert(0, sys.argv[1])
+    import run_persistence
+    run_persistence._get_db_config = lambda: ("sqlite", sys.argv[2])
+    from remote_worker import run_worker
+
+    async def echo(envelope):
+        await asyncio.sleep(0.05)
+        return {"tasks": [{"id": envelope["task_id"], "status": "pending_awaiting_qa"}], "pid": os.getpid()}
+
+    asyncio.run(run_worker(concurrency=2, poll_interval=0.05, idle_exit=1.0, execute=echo))
+""")
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "runs.db")
+    monkeypatch.setattr(run_persistence, "_get_db_config", lambda: ("sqlite", path))
+    return path
+
+
+def _state(task_id: str) -> dict:
+    return {"task_id": task_id, "tasks": [{"id": task_id, "status": "active"}], "objective": "Build",
+            "_workspace_path": "/tmp/ws", "_wt_manager": object(), "task_memories": {}}
+
+
+class TestEnvelopeLeases:
+    @pytest.mark.asyncio
+    async def test_result_reaches_phase_one(self, sqlite_db):
+        """A submitted task comes back as a CompletedTask once a worker completes its envelope."""
+        queue = DistributedTaskQueue("run_1", max_concurrent=2, poll_interval=0.01)
+        await queue.start()
+        assert await queue.submit("task_a", _state("task_a"), {"configurable": {"thread_id": "t"}})
+
+        envelope = await lease_envelope("w1")
+        assert envelope["task_id"] == "task_a"
+        assert envelope["payload"]["worktree"]["workspace_path"] == "/tmp/ws"
+        assert "_wt_manager" not in envelope["payload"]["state"]
+        assert await lease_envelope("w2") is None
+
+        await complete_envelope(envelope["envelope_id"], "w1", result={"tasks": [{"id": "task_a", "status": "done"}]})
+        await queue.wait_for_any(timeout=1.0)
+
+        completed = queue.collect_completed()
+        assert [(c.task_id, c.result["tasks"][0]["status"], c.error) for c in completed] == [("task_a", "done", None)]
+        assert not queue.has_work
+
+    @pytest.mark.asyncio
+    async def test_remote_memories_become_langchain_messages(self, sqlite_db):
+        """Serialized task memories are rebuilt into messages, so Phoenix digests see the tool calls."""
+        from langchain_core.messages import AIMessage, ToolMessage
+        from orchestrator_types import serialize_messages
+
+        queue = DistributedTaskQueue("run_1", max_concurrent=1, poll_interval=0.01)
+        await queue.start()
+        await queue.submit("task_a", _state("task_a"), {})
+        envelope = await lease_envelope("w1")
+        call = {"id": "c1", "name": "read_file", "args": {"path": "a.py"}}
+        memories = serialize_messages([AIMessage(content="", tool_calls=[call]), ToolMessage(content="x", tool_call_id="c1")])
+        await complete_envelope(envelope["envelope_id"], "w1", result={"task_memories": {"task_a": memories}})
+        await queue.wait_for_any(timeout=1.0)
+
+        messages = queue.collect_completed()[0].result["task_memories"]["task_a"]
+        assert isinstance(messages[0], AIMessage) and messages[0].tool_calls[0]["args"] == {"path": "a.py"}
+        assert isinstance(messages[1], ToolMessage) and messages[1].tool_call_id == "c1"
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_retaken_then_failed(self, sqlite_db):
+        """An expired lease moves to another worker; the stale worker's result is rejected."""
+        await init_task_envelopes_table()
+        envelope_id = await enqueue_envelope("run_1", "task_a", {"state": {}})
+
+        first = await lease_envelope("w1", lease_seconds=-1, max_attempts=2)
+        second = await lease_envelope("w2", lease_seconds=-1, max_attempts=2)
+        assert first["envelope_id"] == second["envelope_id"] == envelope_id
+        assert second["attempts"] == 2
+        assert not await heartbeat_envelope(envelope_id, "w1")
+        assert not await complete_envelope(envelope_id, "w1", result={})
+        assert await lease_envelope("w3", max_attempts=2) is None
+
+        rows = await collect_finished_envelopes("run_1", max_attempts=2)
+        assert [(r["status"], r["error"]) for r in rows] == [("failed", "Worker lease expired")]
+
+    @pytest.mark.asyncio
+    async def test_cancel_revokes_lease(self, sqlite_db):
+        """Cancelling a task makes the worker's next heartbeat fail."""
+        queue = DistributedTaskQueue("run_1")
+        await queue.start()
+        await queue.submit("task_a", _state("task_a"))
+        envelope = await lease_envelope("w1")
+
+        assert await queue.cancel_task("task_a")
+        assert not await heartbeat_envelope(envelope["envelope_id"], "w1")
+
+
+class TestRemoteWorkerProcesses:
+    @pytest.mark.asyncio
+    async def test_two_processes_complete_each_envelope_once(self, sqlite_db):
+        """Two worker processes drain the queue without running any envelope twice."""
+        queue = DistributedTaskQueue("run_1", max_concurrent=8, poll_interval=0.05)
+        await queue.start()
+        for i in range(8):
+            assert await queue.submit(f"task_{i}", _state(f"task_{i}"))
+
+        workers = [
+            await asyncio.create_subprocess_exec(sys.executable, "-c", WORKER_SCRIPT, str(SRC), sqlite_db,
+                                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for _ in range(2)
+        ]
+        completed = []
+        for _ in range(100):
+            if not queue.has_work:
+                break
+            await queue.wait_for_any(timeout=0.5)
+            completed.extend(queue.collect_completed())
+        await asyncio.wait_for(asyncio.gather(*(w.wait() for w in workers)), timeout=30)
+
+        assert sorted(c.task_id for c in completed) == [f"task_{i}" for i in range(8)]
+        assert all(c.error is None for c in completed)
+        rows = await distributed_queue._execute("SELECT attempts FROM task_envelopes", fetch="all")
+        assert [r["attempts"] for r in rows] == [1] * 8
+
+
+class TestEnvelopeConfig:
+    def test_default_config_round_trips(self):
+        """Nested config dataclasses are rebuilt by declared type; plain dict fields stay dicts."""
+        from config import ModelConfig, OrchestratorConfig, RetryConfig
+        config = OrchestratorConfig(coder_model=ModelConfig(provider="openai", model_name="gpt-4o-mini"))
+        rebuilt = distributed_queue.config_from_dict(distributed_queue.config_to_dict(config))
+
+        assert rebuilt == config
+        assert isinstance(rebuilt.coder_model, ModelConfig) and rebuilt.tester_model is None
+        assert isinstance(rebuilt.retry_config, RetryConfig)
+        assert rebuilt.compaction_role_budgets == config.compaction_role_budgets
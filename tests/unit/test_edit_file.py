@@ -0,0 +1,83 @@
+"""
+Unit tests for the patch-based edit_file tool.
+"""
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from tools import filesystem_async
+from tools.file_edit import apply_edits, edit_file_async
+from tools.filesystem_async import read_file_async
+from nodes.tools_binding import ReadTracker, _create_edit_file_wrapper, _create_read_file_wrapper, _create_write_file_wrapper
+
+
+def _lines(count: int) -> str:
+    return "".join(f"line {i}\n" for i in range(1, count + 1))
+
+
+class TestApplyEdits:
+    def test_unified_diff_tolerates_shifted_lines(self):
+        """A diff hunk applies at the nearest matching position when the file has shifted."""
+        text = "header\n" + _lines(5)
+        diff = "--- a/f\n+++ b/f\n@@ -2,2 +2,2 @@\n line 2\n-line 3\n+line three\n"
+        new_text, line_edits, hunks = apply_edits(text, diff=diff)
+        assert new_text == "header\nline 1\nline 2\nline three\nline 4\nline 5\n"
+        assert (line_edits, hunks) == ([(3, 4, 2)], 1)
+
+
+class TestEditFile:
+    @pytest.mark.asyncio
+    async def test_conflict_leaves_file_untouched(self, tmp_path):
+        """If any hunk conflicts, no hunk is applied."""
+        (tmp_path / "a.py").write_text("x = 1\ny = 1\n")
+        result = await edit_file_async("a.py", edits=[
+            {"search": "x = 1", "replace": "x = 2"},
+            {"search": "= 1", "replace": "= 3"},
+        ], root=tmp_path)
+        assert result.startswith("❌ EDIT CONFLICT") and "matches 2 places (lines 1, 2)" in result
+        assert (tmp_path / "a.py").read_text() == "x = 1\ny = 1\n"
+
+    @pytest.mark.asyncio
+    async def test_edit_is_visible_to_cached_reads(self, tmp_path):
+        """edit_file replaces the file atomically and invalidates the read cache."""
+        (tmp_path / "a.py").write_text(_lines(3))
+        assert await read_file_async("a.py", root=tmp_path) == _lines(3)
+        result = await edit_file_async("a.py", edits=[{"search": "line 2\n", "replace": "two\n2b\n"}], root=tmp_path)
+        assert result.startswith("Edited a.py: 1 hunk(s)") and "File now has 4 lines" in result
+        assert await read_file_async("a.py", root=tmp_path) == "line 1\ntwo\n2b\nline 3\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["a.py"]
+
+
+class TestEditReadTracking:
+    @pytest.mark.asyncio
+    async def test_edited_region_counts_as_read(self, tmp_path):
+        """Edited lines join the read ranges (shifted to new numbering) and savings are logged."""
+        (tmp_path / "big.py").write_text(_lines(2000))
+        tracker = ReadTracker()
+        savings = []
+        read = _create_read_file_wrapper(read_file_async, tmp_path, tmp_path, tracker)
+        edit = _create_edit_file_wrapper(edit_file_async, tmp_path, tmp_path, tracker, on_savings=savings.append)
+        write = _create_write_file_wrapper(filesystem_async.write_file_async, tmp_path, tmp_path, tracker)
+
+        await read("big.py", start_line=1990)
+        await edit("big.py", edits=[{"search": "line 10\n", "replace": "line 10\nline 10b\n"}])
+
+        assert tracker.covers("big.py", 10, 11) and not tracker.covers("big.py", 12, 12)
+        assert tracker.covers("big.py", 1991, 2001) and not tracker.covers("big.py", 1990, 1990)
+        assert "WRITE BLOCKED" in await write("big.py", "new\n")
+        assert savings[0]["tool"] == "edit_file" and savings[0]["tokens_saved"] > 5000
+
+    def test_savings_are_totalled_in_response_log(self, tmp_path):
+        """log_llm_response sums the task's tool_savings.jsonl."""
+        from llm_logger import log_llm_response, log_tool_savings
+
+        log_tool_savings("task_1", {"tool": "edit_file", "tokens_saved": 900}, logs_base_path=str(tmp_path))
+        log_tool_savings("task_1", {"tool": "edit_file", "tokens_saved": 100}, logs_base_path=str(tmp_path))
+        log_file = log_llm_response("task_1", {"messages": []}, logs_base_path=str(tmp_path))
+
+        summary = json.loads(Path(log_file).read_text())["tool_savings"]
+        assert summary == {"edit_file": {"calls": 2, "estimated_tokens_saved": 1000}}
@@ -0,0 +1,74 @@
+"""
+Unit tests for the per-worktree file content cache.
+"""
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from tools.file_cache import FileContentCache, get_worktree_cache
+from tools.filesystem_async import read_file_async, write_file_async
+
+
+class TestFileContentCache:
+    def test_unchanged_file_is_a_hit(self, tmp_path):
+        """A second read of an unchanged file comes from memory; a rewrite is re-read."""
+        path = tmp_path / "spec.md"
+        path.write_text("v1")
+        cache = FileContentCache(tmp_path)
+
+        assert cache.read(path) == b"v1"
+        assert cache.read(path) == b"v1"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        path.write_text("version 2")
+        assert cache.read(path) == b"version 2"
+        assert cache.misses == 2 and cache.resident_bytes == len(b"version 2")
+
+    def test_byte_budget_evicts_least_recently_used(self, tmp_path):
+        """Entries are evicted oldest-first once the byte budget is exceeded."""
+        for name in "abc":
+            (tmp_path / name).write_bytes(name.encode() * 40)
+        cache = FileContentCache(tmp_path, max_bytes=100)
+
+        cache.read(tmp_path / "a")
+        cache.read(tmp_path / "b")
+        cache.read(tmp_path / "a")
+        cache.read(tmp_path / "c")
+
+        assert tmp_path / "a" in cache and tmp_path / "c" in cache
+        assert tmp_path / "b" not in cache
+        assert cache.resident_bytes == 80
+
+    def test_same_size_rewrite_with_same_mtime_needs_invalidation(self, tmp_path):
+        """Explicit invalidation covers rewrites the stat signature cannot see."""
+        path = tmp_path / "a.py"
+        path.write_text("aaaa")
+        cache = FileContentCache(tmp_path)
+        cache.read(path)
+        stat = path.stat()
+
+        path.write_text("bbbb")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert cache.read(path) == b"aaaa"
+
+        cache.invalidate(path)
+        assert cache.read(path) == b"bbbb"
+
+
+class TestToolIntegration:
+    @pytest.mark.asyncio
+    async def test_write_file_invalidates_shared_cache(self, tmp_path):
+        """read_file fills the worktree cache and write_file drops the stale entry."""
+        (tmp_path / "a.py").write_text("old = 1\n")
+        cache = get_worktree_cache(tmp_path)
+
+        assert await read_file_async("a.py", root=tmp_path) == "old = 1\n"
+        assert tmp_path / "a.py" in cache
+
+        await write_file_async("a.py", "new = 2\n", root=tmp_path)
+        assert tmp_path / "a.py" not in cache
+        assert await read_file_async("a.py", root=tmp_path) == "new = 2\n"
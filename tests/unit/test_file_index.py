@@ -0,0 +1,72 @@
+"""
+Unit tests for the incremental workspace file index.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from tools import file_index
+from tools.file_index import WorkspaceFileIndex
+from tools.filesystem_async import list_directory_async
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in ["README.md", "src/app.py", "src/util/io.py", "src/util/deep/x/y.py",
+                "tests/test_app.py", "node_modules/pkg/index.js", "pkg.egg-info/PKG-INFO"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+    return tmp_path
+
+
+@pytest.fixture(params=["stat", "auto"])
+def backend(request, monkeypatch):
+    # Every directory counts as recently changed, so the stat backend rechecks it on each query
+    monkeypatch.setattr(file_index, "RACY_WINDOW_NS", 0)
+    return request.param
+
+
+class TestWorkspaceFileIndex:
+    def test_queries_skip_excluded_dirs(self, tree, backend):
+        """Name globs honour max_depth; path globs and prefixes use the same index."""
+        index = WorkspaceFileIndex(tree, backend=backend)
+
+        assert index.list("", recursive=True, pattern="*.py", max_depth=3)[0] == [
+            "src/app.py", "src/util/io.py", "tests/test_app.py"
+        ]
+        assert index.list("")[0] == ["README.md", "src", "tests"]
+        assert index.glob("src/**/*.py")[0] == ["src/app.py", "src/util/deep/x/y.py", "src/util/io.py"]
+        assert index.prefix("src/ut") == ["src/util/deep/x/y.py", "src/util/io.py"]
+        assert index.list("", recursive=True, max_results=2) == (["README.md", "src"], True)
+        index.close()
+
+    def test_updates_incrementally(self, tree, backend):
+        """Created, deleted and renamed entries show up without rescanning unchanged directories."""
+        index = WorkspaceFileIndex(tree, backend=backend)
+        index.files()
+        scans = index.scans
+
+        (tree / "src" / "new.py").write_text("")
+        (tree / "tests" / "test_app.py").unlink()
+        (tree / "src" / "util").rename(tree / "src" / "lib")
+
+        assert index.files() == ["README.md", "src/app.py", "src/lib/deep/x/y.py", "src/lib/io.py", "src/new.py"]
+        if index.backend == "inotify":
+            # Only src, tests and the moved subtree were rescanned
+            assert index.scans - scans == 5
+        index.close()
+
+
+class TestListDirectory:
+    @pytest.mark.asyncio
+    async def test_matches_previous_walk_output(self, tree):
+        """list_directory keeps its output format on top of the index."""
+        assert await list_directory_async(".", root=tree) == ["README.md", "src", "tests"]
+        assert await list_directory_async("src", recursive=True, max_depth=2, root=tree) == [
+            "src/app.py", "src/util", "src/util/deep", "src/util/io.py"
+        ]
+        assert await list_directory_async(".", pattern="tests/test_*.py", root=tree) == ["tests/test_app.py"]
+        assert await list_directory_async("src", pattern="*.md", root=tree) == ["Directory is empty."]
@@ -0,0 +1,46 @@
+"""
+Unit tests for integration context selection (compact existing-task summaries).
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from nodes.director.integration import select_integration_context
+
+
+def _existing(count: int, component: str = "misc", status: str = "planned"):
+    return [{
+        "id": f"{component}_{i}", "title": f"{component} task {i}", "component": component,
+        "status": status, "description": "long description " * 50, "depends_on": [],
+    } for i in range(count)]
+
+
+class TestSelectIntegrationContext:
+    """Test select_integration_context."""
+
+    def test_compact_fields_only(self):
+        """Only id, title, component and depends_on are sent."""
+        context = select_integration_context(_existing(3), [{"title": "New", "component": "api"}])
+
+        assert len(context) == 3
+        assert set(context[0]) == {"id", "title", "component", "depends_on"}
+
+    def test_bounded_and_relevant(self):
+        """Large plans are cut to the limit, preferring related components."""
+        existing = _existing(100) + _existing(5, component="billing")
+        context = select_integration_context(
+            existing, [{"title": "Billing invoices API", "component": "billing"}], limit=10
+        )
+
+        assert len(context) == 10
+        assert {t["id"] for t in context} >= {f"billing_{i}" for i in range(5)}
+
+    def test_terminal_and_input_tasks_excluded(self):
+        """Completed tasks and the suggestions themselves are not context."""
+        existing = _existing(2, status="complete") + _existing(1, component="api")
+        context = select_integration_context(existing, [{"title": "api task 0", "component": "api"}])
+
+        assert context == []
@@ -0,0 +1,112 @@
+"""
+Unit tests for the director LLM response cache.
+"""
+import pytest
+import sys
+from pathlib import Path
+from typing import List
+from pydantic import BaseModel
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from config import OrchestratorConfig, ModelConfig
+from llm_cache import LLMResponseCache, cached_ainvoke, make_cache_key
+
+
+class FakeResponse(BaseModel):
+    titles: List[str]
+
+
+class FakeStructuredLLM:
+    """Counts ainvoke calls and returns a fixed structured response."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt, **kwargs):
+        self.calls += 1
+        return FakeResponse(titles=[f"call {self.calls}"])
+
+
+def _state(tmp_path, **overrides):
+    config = OrchestratorConfig(enable_llm_cache=True, llm_cache_path=str(tmp_path / "cache.db"), **overrides)
+    return {"orch_config": config}
+
+
+class TestCacheKey:
+    """Test make_cache_key."""
+
+    def test_key_depends_on_model_prompt_and_schema(self):
+        """Changing model, temperature, prompt or schema changes the key."""
+        model = ModelConfig(provider="openai", model_name="gpt-4.1", temperature=0.7)
+        base = make_cache_key(model, "prompt", FakeResponse)
+
+        assert base == make_cache_key(model, "prompt", FakeResponse)
+        assert base != make_cache_key(model, "other prompt", FakeResponse)
+        assert base != make_cache_key(ModelConfig("openai", "gpt-4.1", temperature=0.2), "prompt", FakeResponse)
+        assert base != make_cache_key(model, "prompt", None)
+
+
+class TestCachedInvoke:
+    """Test cached_ainvoke."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, tmp_path):
+        """Without enable_llm_cache every call reaches the LLM."""
+        llm = FakeStructuredLLM()
+        state = {"orch_config": OrchestratorConfig(llm_cache_path=str(tmp_path / "cache.db"))}
+        await cached_ainvoke(llm, "p", state, "test", schema=FakeResponse)
+        await cached_ainvoke(llm, "p", state, "test", schema=FakeResponse)
+
+        assert llm.calls == 2
+        assert not (tmp_path / "cache.db").exists()
+
+    @pytest.mark.asyncio
+    async def test_hit_returns_parsed_schema(self, tmp_path):
+        """Identical prompts are answered from the cache."""
+        llm = FakeStructuredLLM()
+        state = _state(tmp_path)
+        first = await cached_ainvoke(llm, "p", state, "test", schema=FakeResponse)
+        second = await cached_ainvoke(llm, "p", state, "test", schema=FakeResponse)
+
+        assert llm.calls == 1
+        assert isinstance(second, FakeResponse)
+        assert second == first
+
+    @pytest.mark.asyncio
+    async def test_bypass_refreshes_entry(self, tmp_path):
+        """Bypass forces a fresh call and overwrites the cached response."""
+        llm = FakeStructuredLLM()
+        state = _state(tmp_path)
+        await cached_ainvoke(llm, "p", state, "test", schema=FakeResponse)
+        fresh = await cached_ainvoke(llm, "p", {**state, "bypass_llm_cache": True}, "test", schema=FakeResponse)
+        cached = await cached_ainvoke(llm, "p", state, "test", schema=FakeResponse)
+
+        assert llm.calls == 2
+        assert cached == fresh
+
+
+class TestResponseCache:
+    """Test LLMResponseCache TTL and eviction."""
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, tmp_path):
+        """Expired entries are treated as misses."""
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), ttl_seconds=-1)
+        await cache.set("k", "{}")
+
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, tmp_path):
+        """Least recently used entries are evicted beyond max_entries."""
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), max_entries=2)
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        await cache.get("a")
+        await cache.set("c", "3")
+
+        assert await cache.get("a") == "1"
+        assert await cache.get("b") is None
+        assert await cache.get("c") == "3"
@@ -0,0 +1,103 @@
+"""
+Unit tests for windowed read_file and partial-read tracking.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from tools import filesystem_async
+from tools.filesystem_async import read_file_async, read_file_window_async, read_files_async
+from nodes.tools_binding import ReadTracker, _create_read_file_wrapper, _create_write_file_wrapper
+
+
+def _lines(count: int) -> str:
+    return "".join(f"line {i}\n" for i in range(1, count + 1))
+
+
+class TestReadFileWindow:
+    @pytest.mark.asyncio
+    async def test_small_file_is_returned_unchanged(self, tmp_path):
+        """Whole-file reads under the cap keep the old output."""
+        (tmp_path / "a.py").write_text("print('hi')\n")
+        assert await read_file_async("a.py", root=tmp_path) == "print('hi')\n"
+
+    @pytest.mark.asyncio
+    async def test_line_window_has_metadata(self, tmp_path):
+        """A window returns only its lines, with size, line count and where to continue."""
+        (tmp_path / "a.txt").write_text(_lines(100))
+        result = await read_file_async("a.txt", root=tmp_path, start_line=10, end_line=12)
+
+        header, body = result.split("\n", 1)
+        assert body == "line 10\nline 11\nline 12\n"
+        assert "100 lines" in header and "lines 10-12" in header and "start_line=13" in header
+
+    @pytest.mark.asyncio
+    async def test_large_file_uses_line_index(self, tmp_path, monkeypatch):
+        """mmap-indexed windows match the plain reader, including the max_bytes cut."""
+        monkeypatch.setattr(filesystem_async, "MMAP_THRESHOLD_BYTES", 1)
+        monkeypatch.setattr(filesystem_async, "LINE_INDEX_STRIDE", 7)
+        (tmp_path / "big.log").write_text(_lines(1000))
+
+        window = await read_file_window_async("big.log", root=tmp_path, start_line=500, end_line=503)
+        assert window.content == "line 500\nline 501\nline 502\nline 503\n"
+        assert window.total_lines == 1000 and not window.truncated
+
+        capped = await read_file_window_async("big.log", root=tmp_path, start_line=990, max_bytes=30)
+        assert capped.content == "line 990\nline 991\nline 992\n"
+        assert (capped.end_line, capped.truncated) == (992, True)
+
+    @pytest.mark.asyncio
+    async def test_read_files_batch(self, tmp_path):
+        """read_files returns each file under its own heading and reports missing files inline."""
+        (tmp_path / "a.py").write_text("A\n")
+        (tmp_path / "b.py").write_text("B\n")
+        result = await read_files_async(["a.py", "b.py", "c.py"], root=tmp_path)
+        assert result == "=== a.py ===\nA\n\n\n=== b.py ===\nB\n\n\n=== c.py ===\nFile not found: c.py"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mmap_threshold", [10_000_000, 1])
+    async def test_line_longer_than_max_bytes_continues_by_offset(self, tmp_path, monkeypatch, mmap_threshold):
+        """A single line over the cap is shown in pieces, each saying where the next one starts."""
+        monkeypatch.setattr(filesystem_async, "MMAP_THRESHOLD_BYTES", mmap_threshold)
+        line = "".join(f"{i:04d}," for i in range(200))  # 1000 bytes, no newline
+        (tmp_path / "bundle.min.js").write_text(line)
+
+        first = await read_file_window_async("bundle.min.js", root=tmp_path, max_bytes=400)
+        assert (first.content, first.end_line, first.end_offset) == (line[:400], 1, 400)
+        assert "start_line=1, line_offset=400" in await read_file_async("bundle.min.js", root=tmp_path, max_bytes=400)
+
+        rest = await read_file_window_async("bundle.min.js", root=tmp_path, max_bytes=400, line_offset=800)
+        assert (rest.content, rest.line_offset, rest.end_offset) == (line[800:], 800, None)
+
+
+class TestPartialReadTracking:
+    @pytest.mark.asyncio
+    async def test_write_requires_every_line_read(self, tmp_path):
+        """A partial read allows nothing to be overwritten until the rest has been read."""
+        (tmp_path / "a.txt").write_text(_lines(50))
+        tracker = ReadTracker()
+        read = _create_read_file_wrapper(read_file_async, tmp_path, tmp_path, tracker)
+        write = _create_write_file_wrapper(filesystem_async.write_file_async, tmp_path, tmp_path, tracker)
+
+        await read("a.txt", start_line=1, end_line=20)
+        assert "a.txt" in tracker and tracker.covers("a.txt", 5, 15)
+        assert "WRITE BLOCKED" in await write("a.txt", "new\n")
+
+        await read("a.txt", start_line=21)
+        assert tracker.covers("a.txt")
+        assert "Successfully wrote" in await write("a.txt", "new\n")
+
+    @pytest.mark.asyncio
+    async def test_cut_line_never_counts_as_read(self, tmp_path):
+        """A one-line file longer than max_bytes can't be overwritten after reading only part of it."""
+        (tmp_path / "data.json").write_text('{"items": [' + ", ".join(["1"] * 2000) + "]}")
+        tracker = ReadTracker()
+        read = _create_read_file_wrapper(read_file_async, tmp_path, tmp_path, tracker)
+        write = _create_write_file_wrapper(filesystem_async.write_file_async, tmp_path, tmp_path, tracker)
+
+        await read("data.json", max_bytes=1000)
+        assert "data.json" in tracker and not tracker.covers("data.json")
+        assert "WRITE BLOCKED" in await write("data.json", "{}")
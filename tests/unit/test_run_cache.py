@@ -0,0 +1,156 @@
+"""
+Unit tests for the bounded in-memory run caches.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import api.state as api_state
+import run_persistence
+from api.state import BoundedRunCache, estimate_state_bytes
+
+
+def _finished(run_id, data):
+    return data["status"] in ("completed", "failed", "cancelled")
+
+
+class TestBoundedRunCache:
+    def test_evicts_oldest_terminal_runs(self):
+        """Beyond max_entries, the least recently used finished runs are dropped."""
+        cache = BoundedRunCache(3, _finished)
+        cache["a"] = {"status": "completed"}
+        cache["b"] = {"status": "running"}
+        cache["c"] = {"status": "failed"}
+        cache["d"] = {"status": "completed"}
+
+        assert list(cache) == ["b", "c", "d"]
+        assert cache.evictions == 1
+
+    def test_live_runs_are_never_evicted(self):
+        """Live runs stay even if that leaves the cache over its bound."""
+        cache = BoundedRunCache(2, _finished)
+        for run_id in "abc":
+            cache[run_id] = {"status": "running"}
+
+        assert list(cache) == ["a", "b", "c"]
+        cache["a"] = {"status": "completed"}  # stored again: now most recent
+        cache["d"] = {"status": "running"}
+        assert list(cache) == ["b", "c", "d"]
+
+    def test_restore_refreshes_recency(self):
+        """Storing a run again protects it from the next eviction."""
+        cache = BoundedRunCache(2, _finished)
+        cache["a"] = {"status": "completed"}
+        cache["b"] = {"status": "completed"}
+        cache["a"] = {"status": "completed"}
+        cache["c"] = {"status": "completed"}
+
+        assert list(cache) == ["a", "c"]
+
+    def test_reads_refresh_recency(self):
+        """Reading a run (item access or get) protects it; membership tests and peek do not."""
+        cache = BoundedRunCache(2, _finished)
+        cache["a"] = {"status": "completed"}
+        cache["b"] = {"status": "completed"}
+        assert cache["a"]["status"] == "completed"
+        cache["c"] = {"status": "completed"}
+        assert list(cache) == ["a", "c"]
+
+        assert cache.get("a") is not None and cache.get("missing", {}) == {}
+        assert "c" in cache and cache.peek("c") is not None
+        cache["d"] = {"status": "completed"}
+        assert list(cache) == ["a", "d"]
+
+    def test_byte_budget_spills_inactive_runs(self):
+        """Exceeding max_bytes evicts the oldest inactive runs and hands them to on_evict."""
+        spilled = []
+        cache = BoundedRunCache(
+            10, lambda run_id, state: run_id != "live",
+            max_bytes=250, size_of=lambda state: state["size"],
+            on_evict=lambda run_id, state: spilled.append(run_id)
+        )
+        cache["live"] = {"size": 100}
+        cache["idle_1"] = {"size": 100}
+        cache["idle_2"] = {"size": 100}
+
+        assert list(cache) == ["live", "idle_2"]
+        assert spilled == ["idle_1"]
+        assert cache.resident_bytes == 200
+
+        cache.pop("idle_2")
+        assert cache.resident_bytes == 100
+
+    def test_write_back_of_same_state_is_not_remeasured(self):
+        """Storing the same object again defers measuring to the refresh interval; a new object is measured."""
+        measured = []
+        cache = BoundedRunCache(10, _finished, max_bytes=10_000, size_of=lambda s: measured.append(1) or s["size"],
+                                size_refresh_s=60)
+        state = {"status": "running", "size": 100}
+        cache["run"] = state
+        for _ in range(5):
+            state["size"] += 100
+            cache["run"] = state
+        assert len(measured) == 1 and cache.resident_bytes == 100
+
+        cache.size_refresh_s, cache._next_measure = 0, 0
+        cache["run"] = state
+        assert cache.resident_bytes == 600
+        cache["run"] = {"status": "running", "size": 50}
+        assert len(measured) == 3 and cache.resident_bytes == 50
+
+
+class TestEstimateStateBytes:
+    def test_memories_dominate(self):
+        """Message content counts toward the estimate; private keys and config don't."""
+        small = {"tasks": [{"id": "t1"}], "_wt_manager": object(), "orch_config": object()}
+        big = dict(small, task_memories={"t1": [HumanMessage(content="x" * 10_000), AIMessage(content="ok")]})
+
+        assert estimate_state_bytes(small) < 100
+        assert estimate_state_bytes(big) > 10_000
+
+
+class TestSpillReload:
+    @pytest.mark.asyncio
+    async def test_reload_waits_for_pending_spill(self, monkeypatch):
+        """A run reloaded while its spill is still being written sees the spilled state, not the old row."""
+        db = {"idle": {"tasks": [], "version": "old"}}
+
+        async def save_run_state(run_id, state, status="running"):
+            await asyncio.sleep(0.05)
+            db[run_id] = state
+
+        async def load_run_state(run_id):
+            return db.get(run_id)
+
+        monkeypatch.setattr(run_persistence, "save_run_state", save_run_state)
+        monkeypatch.setattr(run_persistence, "load_run_state", load_run_state)
+        monkeypatch.setitem(api_state.runs_index, "idle", {"status": "paused"})
+
+        api_state._spill_run_state("idle", {"tasks": [], "version": "new"})
+        state = await api_state.get_run_state("idle", keep=True)
+
+        assert state["version"] == "new"
+        assert api_state.run_states.pop("idle") is state
+
+    @pytest.mark.asyncio
+    async def test_rehydrate_restores_runtime_fields(self, tmp_path):
+        """A state reloaded from the database gets its worktree manager, paths and config back."""
+        from config import OrchestratorConfig
+        (tmp_path / "ws").mkdir()
+        state = {"tasks": [{"id": "task_a"}], "_workspace_path": str(tmp_path / "ws"),
+                 "_worktree_base_path": str(tmp_path / "worktrees"), "_logs_base_path": str(tmp_path / "logs")}
+
+        config = await api_state.rehydrate_run_state("run_1", state)
+
+        assert isinstance(config, OrchestratorConfig) and state["orch_config"] is config
+        manager = state["_wt_manager"]
+        assert manager is not None and (tmp_path / "worktrees").is_dir()
+        await api_state.rehydrate_run_state("run_1", state)
+        assert state["_wt_manager"] is manager  # A state still in memory keeps its manager
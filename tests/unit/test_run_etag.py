@@ -0,0 +1,48 @@
+"""
+Unit tests for GET /runs/{run_id} field selection and ETags.
+"""
+import pytest
+import sys
+from pathlib import Path
+from fastapi import HTTPException
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from api import state as api_state
+from api.routes.runs import DEFAULT_RUN_SECTIONS, RUN_SECTIONS, _parse_include
+
+
+class TestParseInclude:
+    def test_default_excludes_memories(self):
+        """Without ?include, everything but task_memories is returned."""
+        assert _parse_include(None) == DEFAULT_RUN_SECTIONS
+        assert "task_memories" not in DEFAULT_RUN_SECTIONS
+
+    def test_selection_and_all(self):
+        """Listed sections are returned as given; 'all' adds task_memories."""
+        assert _parse_include("tasks, insights") == ("tasks", "insights")
+        assert _parse_include("all") == RUN_SECTIONS
+
+    def test_unknown_section_rejected(self):
+        """Unknown section names are a 400."""
+        with pytest.raises(HTTPException) as exc:
+            _parse_include("tasks,secrets")
+        assert exc.value.status_code == 400
+
+
+class TestRunStateEtag:
+    def test_changes_with_version_status_and_variant(self, monkeypatch):
+        """The ETag is stable until the state version, run status or query variant changes."""
+        monkeypatch.setitem(api_state.runs_index, "run_etag", {"status": "running"})
+        etag = api_state.run_state_etag("run_etag", "tasks")
+        assert api_state.run_state_etag("run_etag", "tasks") == etag
+        assert api_state.run_state_etag("run_etag", "tasks,insights") != etag
+
+        api_state.bump_run_version("run_etag")
+        bumped = api_state.run_state_etag("run_etag", "tasks")
+        assert bumped != etag
+
+        api_state.runs_index["run_etag"]["status"] = "paused"
+        assert api_state.run_state_etag("run_etag", "tasks") != bumped
+        api_state.run_versions.pop("run_etag", None)
@@ -0,0 +1,104 @@
+"""
+Unit tests for the sandboxed execution backends.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+resource = pytest.importorskip("resource")
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from metrics import tool_metrics
+from tools.sandbox import CgroupBackend, ResourceLimits, RlimitBackend
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="rlimit backend is POSIX-only")
+
+
+@posix_only
+class TestRlimitBackend:
+    @pytest.mark.asyncio
+    async def test_memory_cap_is_reported(self):
+        """An allocation over the cap fails and the result explains which limit was hit."""
+        result = await RlimitBackend().run(
+            [sys.executable, "-c", "x = bytearray(512 * 1024 * 1024)"], limits=ResourceLimits(memory_mb=128)
+        )
+        assert result.returncode != 0 and result.usage.limit_hit == "memory"
+        assert "memory cap of 128 MB" in result.limit_note()
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_background_children(self):
+        """The whole session is killed on timeout, including processes sent to the background."""
+        start = time.monotonic()
+        result = await RlimitBackend().run("sleep 30 & sleep 30", shell=True, timeout=1)
+        assert result.timed_out and time.monotonic() - start < 5
+
+    @pytest.mark.asyncio
+    async def test_cpu_usage_recorded_per_task(self):
+        """CPU time of each call is added to the task's metric; the child's limits don't leak into the server."""
+        counter = tool_metrics.sandbox_cpu_seconds.labels(task_id="task_busy", tool="run_python")
+        before, server_limit = counter._value.get(), resource.getrlimit(resource.RLIMIT_DATA)
+        result = await RlimitBackend().run(
+            [sys.executable, "-c", "import time\nt = time.process_time()\nwhile time.process_time() - t < 0.3: pass"],
+            task_id="task_busy", tool="run_python"
+        )
+        assert result.returncode == 0 and result.usage.cpu_s >= 0.25
+        assert counter._value.get() - before >= 0.25
+        assert resource.getrlimit(resource.RLIMIT_DATA) == server_limit
+
+    @pytest.mark.asyncio
+    async def test_missing_command_exits_127(self):
+        """Limits are applied by an exec trampoline; a command it cannot exec fails like it would in a shell."""
+        result = await RlimitBackend().run(["definitely-not-a-command"])
+        assert result.returncode == 127 and b"definitely-not-a-command" in result.stderr
+
+
+    def test_nproc_headroom_counts_threads(self):
+        """RLIMIT_NPROC counts threads, so the server's threads are part of the baseline."""
+        import threading
+        from tools.sandbox import _count_user_tasks
+        before, stop = _count_user_tasks(os.getuid()), threading.Event()
+        threads = [threading.Thread(target=stop.wait) for _ in range(4)]
+        for t in threads:
+            t.start()
+        try:
+            assert _count_user_tasks(os.getuid()) >= before + 4
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+
+
+class TestCgroupBackend:
+    def test_relative_root_is_inside_own_cgroup(self, tmp_path):
+        """A relative SANDBOX_CGROUP_ROOT nests under the server's cgroup; an absolute one under the mount."""
+        own = "/system.slice/agent.service"
+        assert CgroupBackend(mount=tmp_path, root="sandbox", own_cgroup=own).root == tmp_path / own[1:] / "sandbox"
+        assert CgroupBackend(mount=tmp_path, root="/sandbox", own_cgroup=own).root == tmp_path / "sandbox"
+
+    def test_limits_written_and_events_read(self, tmp_path):
+        """Each call gets its own group with cpu/memory/pids limits; oom_kill events mark a memory hit."""
+        root = tmp_path / "agent-orchestrator"
+        root.mkdir()
+        (root / "cgroup.controllers").write_text("cpuset cpu io memory pids\n")
+        (root / "cgroup.subtree_control").write_text("")
+        backend = CgroupBackend(mount=tmp_path, own_cgroup="/")
+        assert backend.available()
+        assert (root / "cgroup.subtree_control").read_text() == "+cpu +memory +pids"
+
+        call = backend._prepare(ResourceLimits(memory_mb=64, cpus=0.5, pids=10, cpu_weight=50), "task/1")
+        assert call.cgroup.parent == root and call.cgroup.name.startswith("task_1-")
+        assert (call.cgroup / "cpu.max").read_text() == "50000 100000"
+        assert (call.cgroup / "memory.max").read_text() == str(64 * 1024 * 1024)
+        assert (call.cgroup / "pids.max").read_text() == "10"
+        assert (call.cgroup / "cpu.weight").read_text() == "50"
+
+        (call.cgroup / "cpu.stat").write_text("usage_usec 1500000\nuser_usec 1000000\nsystem_usec 500000\nthrottled_usec 200000\n")
+        (call.cgroup / "memory.peak").write_text("52428800\n")
+        (call.cgroup / "memory.events").write_text("low 0\nhigh 0\nmax 3\noom 1\noom_kill 1\n")
+        usage = backend._usage(call, -9, resource.struct_rusage((0,) * 16), b"", 2.0)
+        assert (usage.cpu_s, usage.cpu_throttled_s, usage.peak_memory_bytes, usage.limit_hit) == (1.5, 0.2, 52428800, "memory")
@@ -0,0 +1,57 @@
+"""
+Unit tests for the shared JSON serializer.
+"""
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import serialization
+from serialization import dumps, dumps_str, loads
+from orchestrator_types import TaskStatus
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+SAMPLE = {
+    "when": datetime(2025, 1, 2, 3, 4, 5),
+    "status": TaskStatus.COMPLETE,
+    "color": Color.RED,
+    "point": Point(1, 2),
+    "tags": ["a", "b"],
+    "text": "naïve ✓",
+}
+
+
+class TestSerialization:
+    def test_native_types(self):
+        """Datetimes, enums and dataclasses encode without a custom encoder."""
+        data = loads(dumps(SAMPLE))
+        assert data["when"] == "2025-01-02T03:04:05"
+        assert data["status"] == "complete"
+        assert data["color"] == "red"
+        assert data["point"] == {"x": 1, "y": 2}
+        assert data["text"] == "naïve ✓"
+
+    def test_backends_agree(self):
+        """The stdlib fallback produces the same document as the active backend."""
+        assert json.loads(serialization._stdlib_dumps(SAMPLE)) == loads(dumps(SAMPLE))
+
+    def test_dumps_str_round_trip(self):
+        """dumps_str returns text the stdlib parser accepts."""
+        text = dumps_str({"tasks": [{"id": "task_1", "depends_on": []}]})
+        assert isinstance(text, str)
+        assert json.loads(text) == {"tasks": [{"id": "task_1", "depends_on": []}]}
@@ -0,0 +1,79 @@
+"""
+Unit tests for streaming task-memory export.
+"""
+import json
+import pytest
+import sys
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from langchain_core.messages import AIMessage, HumanMessage
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import run_persistence
+from api import state as api_state
+from api.routes import runs
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_persistence, "_get_db_config", lambda: ("sqlite", str(tmp_path / "runs.db")))
+
+
+def _app():
+    app = FastAPI()
+    app.state.limiter = runs.limiter
+    app.include_router(runs.router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def _conversation(n):
+    return [HumanMessage(content=f"m{i}") if i % 2 == 0 else AIMessage(content=f"m{i}") for i in range(n)]
+
+
+class TestLoadTaskMemories:
+    @pytest.mark.asyncio
+    async def test_extracts_one_task(self, sqlite_db):
+        """Only the requested task's messages are returned from state_json."""
+        await run_persistence.init_runs_table()
+        await run_persistence.save_run_state("run_mem", {
+            "tasks": [], "task_memories": {"task_a": _conversation(3), "task-b": _conversation(1)}
+        })
+
+        assert [m["content"] for m in await run_persistence.load_task_memories("run_mem", "task_a")] == ["m0", "m1", "m2"]
+        assert len(await run_persistence.load_task_memories("run_mem", "task-b")) == 1
+        assert await run_persistence.load_task_memories("run_mem", "missing") is None
+
+
+class TestStreamEndpoint:
+    @pytest.mark.asyncio
+    async def test_streams_range_from_memory(self, monkeypatch):
+        """In-memory conversations stream as NDJSON lines with their index."""
+        monkeypatch.setitem(api_state.run_states, "run_live", {"task_memories": {"task_a": _conversation(10)}})
+        async with _app() as client:
+            response = await client.get("/api/v1/runs/run_live/tasks/task_a/memories/stream?offset=3&limit=4")
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["x-total-count"] == "10"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [(m["index"], m["content"]) for m in lines] == [(3, "m3"), (4, "m4"), (5, "m5"), (6, "m6")]
+        assert lines[0]["type"] == "ai"
+
+    @pytest.mark.asyncio
+    async def test_streams_from_persistence(self, sqlite_db, monkeypatch):
+        """Runs not in memory stream from the database."""
+        await run_persistence.init_runs_table()
+        await run_persistence.save_run_state("run_db", {"objective": "x", "task_memories": {"task_a": _conversation(2)}})
+        monkeypatch.delitem(api_state.run_states, "run_db", raising=False)
+        monkeypatch.delitem(api_state.runs_index, "run_db", raising=False)
+
+        async with _app() as client:
+            response = await client.get("/api/v1/runs/run_db/tasks/task_a/memories/stream")
+            missing = await client.get("/api/v1/runs/run_nope/tasks/task_a/memories/stream")
+
+        assert [json.loads(line)["content"] for line in response.text.splitlines()] == ["m0", "m1"]
+        assert missing.status_code == 404
+        api_state.runs_index.pop("run_db", None)
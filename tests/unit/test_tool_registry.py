@@ -0,0 +1,55 @@
+"""
+Unit tests for the tool registry search index and cached tool binding.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from orchestrator_types import WorkerProfile
+from nodes import tools_binding
+from tools import read_file_async
+from tools.base import DEFAULT_REGISTRY, DetailLevel, ToolCategory, ToolDefinition, ToolRegistry
+
+
+def _tool(name: str, description: str, docs: str = "") -> ToolDefinition:
+    return ToolDefinition(name=name, category=ToolCategory.WEB, description=description,
+                          detailed_docs=docs, parameters=[], returns="text")
+
+
+class TestRegistrySearch:
+    def test_terms_match_word_prefixes_and_all_must_match(self):
+        """Each query term matches the start of a word (compound names split); results keep registration order."""
+        assert DEFAULT_REGISTRY.search_tools("write_file", DetailLevel.NAME_ONLY)[0] == "write_file"
+        assert "read_files" in DEFAULT_REGISTRY.search_tools("file", "name_only")
+        assert DEFAULT_REGISTRY.search_tools("commit", "name_only", ToolCategory.GIT)[0] == "git_commit"
+        assert DEFAULT_REGISTRY.search_tools("web search", "name_only") == ["web_search"]
+        assert DEFAULT_REGISTRY.search_tools("  ", "name_only") == []
+
+    def test_reregistering_updates_index_and_renderings(self):
+        """Replacing a definition drops its old tokens and precomputed schema."""
+        registry = ToolRegistry()
+        registry.register(_tool("fetch_page", "Download a page"))
+        registry.register(_tool("fetch_page", "Retrieve a URL"))
+        assert registry.search_tools("download") == []
+        assert registry.search_tools("retrieve", DetailLevel.FULL_SCHEMA)[0]["description"] == "Retrieve a URL"
+        assert registry.categories[ToolCategory.WEB] == ["fetch_page"]
+
+
+class TestToolBinding:
+    @pytest.mark.asyncio
+    async def test_schema_inferred_once_across_tasks(self, tmp_path):
+        """A second task's bound tool reuses the first task's args schema and runs against its own worktree."""
+        tools_binding._ARGS_SCHEMAS.clear()
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        (tmp_path / "b" / "x.txt").write_text("hello\n")
+
+        first = tools_binding._bind_tools([read_file_async], {"worktree_path": str(tmp_path / "a")}, WorkerProfile.CODER)[0]
+        second = tools_binding._bind_tools([read_file_async], {"worktree_path": str(tmp_path / "b")}, WorkerProfile.CODER)[0]
+
+        assert second.args_schema is first.args_schema and len(tools_binding._ARGS_SCHEMAS) == 1
+        assert "start_line" in second.args
+        assert await second.ainvoke({"path": "x.txt"}) == "hello\n"
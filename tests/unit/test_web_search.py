@@ -0,0 +1,82 @@
+"""
+Unit tests for the cached web search client.
+"""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from tools.search_tools import StubSearchProvider, WebSearchClient, normalize_query, normalize_url
+
+
+class TestNormalization:
+    def test_query_and_url_keys(self):
+        """Case, spacing and punctuation do not change the query key; tracking params do not change the URL key."""
+        assert normalize_query("FastAPI  auth: best practices?") == normalize_query("fastapi auth best practices")
+        assert normalize_query("node.js vs c++") == "node.js vs c++"
+        assert normalize_url("https://www.Example.com/a/?utm_source=x&id=3#top") == normalize_url("http://example.com/a?id=3")
+
+    def test_distinct_queries_keep_distinct_keys(self):
+        """Word order and small words carry meaning, so they are part of the key."""
+        assert normalize_query("migrate python to rust") != normalize_query("migrate rust to python")
+        assert normalize_query("errors in flask") != normalize_query("flask errors")
+
+
+class TestWebSearchClient:
+    @pytest.mark.asyncio
+    async def test_near_identical_queries_hit_cache_until_ttl(self):
+        """A query differing only in case and punctuation is served from the cache; an expired entry goes back to the provider."""
+        provider = StubSearchProvider(latency_s=0)
+        client = WebSearchClient(provider, ttl_s=60)
+        first = await client.search("FastAPI auth best practices")
+        assert await client.search("fastapi auth: Best practices?") == first
+        assert (provider.calls, client.hits, client.misses) == (1, 1, 1)
+
+        client.ttl_s = 0
+        client.clear()
+        await client.search("fastapi auth")
+        await client.search("fastapi auth")
+        assert provider.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_queries_share_one_request(self):
+        """Queries already in flight are awaited, not re-sent."""
+        provider = StubSearchProvider(latency_s=0.05)
+        client = WebSearchClient(provider)
+        results = await asyncio.gather(*(client.search("redis caching") for _ in range(5)))
+        assert provider.calls == 1 and all(r == results[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_search_many_dedupes_urls(self):
+        """Results from several queries are merged by URL, tagged with the queries that found them."""
+        client = WebSearchClient(StubSearchProvider(latency_s=0))
+        merged = await client.search_many(["redis caching", "redis persistence"], max_results=4)
+        urls = [normalize_url(r["url"]) for r in merged]
+        assert len(urls) == len(set(urls)) < 8
+        assert any(r["queries"] == ["redis caching", "redis persistence"] for r in merged)
+
+
+class TestResearchHandlerBinding:
+    @pytest.mark.asyncio
+    async def test_web_search_tool_is_bound(self, tmp_path, monkeypatch):
+        """The research handler binds the web_search StructuredTool alongside the filesystem tools."""
+        import tools.search_tools as search_tools
+        from nodes.handlers import research_handler
+        from orchestrator_types import Task, TaskPhase
+
+        monkeypatch.setattr(search_tools, "_client", WebSearchClient(StubSearchProvider(latency_s=0)))
+        bound = {}
+
+        async def react_loop(task, tools, system_prompt, state, config):
+            bound.update({t.name: t for t in tools})
+            return "done"
+
+        monkeypatch.setattr(research_handler, "_execute_react_loop", react_loop)
+        task = Task(id="task_r", title="Research", component="research", phase=TaskPhase.PLAN, description="Auth options")
+        assert await research_handler._research_handler(task, {"worktree_path": str(tmp_path), "task_id": "task_r"}) == "done"
+
+        assert {"read_file", "web_search"} <= set(bound)
+        assert "docs.example.com" in await bound["web_search"].ainvoke({"queries": ["fastapi auth"]})
@@ -0,0 +1,218 @@
+"""
+Unit tests for versioned websocket task patches and per-connection send queues.
+"""
+import asyncio
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from api.websocket import ConnectionManager, diff_tasks
+from orchestrator_types import Task, TaskPhase
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0, fail: bool = False):
+        self.sent = []
+        self.delay = delay
+        self.fail = fail
+        self.close_codes = []
+
+    async def close(self, code: int = 1000):
+        self.close_codes.append(code)
+
+    async def send_bytes(self, frame):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(frame))
+
+
+def _tasks():
+    return [
+        {"id": "task_a", "title": "A", "status": "planned", "depends_on": []},
+        {"id": "task_b", "title": "B", "status": "planned", "depends_on": ["task_a"]},
+    ]
+
+
+def _state(tasks):
+    return {"run_1": {"tasks": tasks}}
+
+
+RUNS_INDEX = {"run_1": {"status": "running", "task_counts": {"planned": 2}, "objective": "Build it"}}
+
+
+class TestDiffTasks:
+    def test_only_changed_fields(self):
+        """Changed tasks carry only their id and the changed fields."""
+        previous = {t["id"]: t for t in _tasks()}
+        current = _tasks()
+        current[1]["status"] = "active"
+        current.append({"id": "task_c", "title": "C", "status": "planned"})
+
+        patches, removed = diff_tasks(previous, current[1:])
+
+        assert patches == [{"id": "task_b", "status": "active"}, current[2]]
+        assert removed == ["task_a"]
+
+
+class TestConnectionManagerPatches:
+    @pytest.mark.asyncio
+    async def test_subscribe_sends_snapshot(self):
+        """Subscribing sends the full task list with the current sequence number."""
+        manager, ws = ConnectionManager(), FakeWebSocket()
+        await manager.subscribe(ws, "run_1", RUNS_INDEX, _state(_tasks()))
+        await manager.flush()
+
+        assert len(ws.sent) == 1
+        message = ws.sent[0]
+        assert message["type"] == "state_update"
+        assert message["payload"]["snapshot"] is True
+        assert message["payload"]["seq"] == 1
+        assert [t["id"] for t in message["payload"]["tasks"]] == ["task_a", "task_b"]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_serializes_task_objects(self):
+        """Task objects in the run state are serialized like in broadcasts, not dropped."""
+        manager, ws = ConnectionManager(), FakeWebSocket()
+        task = Task(id="task_c", title="C", component="api", phase=TaskPhase.BUILD, description="Build C")
+        await manager.subscribe(ws, "run_1", RUNS_INDEX, _state(_tasks() + [task]))
+        await manager.flush()
+
+        tasks = ws.sent[0]["payload"]["tasks"]
+        assert [t["id"] for t in tasks] == ["task_a", "task_b", "task_c"]
+        assert tasks[-1]["status"] == "planned"
+
+    @pytest.mark.asyncio
+    async def test_patch_increments_seq(self):
+        """Each broadcast with changes sends a patch with the next sequence number."""
+        manager, ws = ConnectionManager(), FakeWebSocket()
+        tasks = _tasks()
+        await manager.subscribe(ws, "run_1", RUNS_INDEX, _state(tasks))
+
+        tasks[0]["status"] = "complete"
+        await manager.broadcast_state("run_1", tasks, status="running", task_counts={"planned": 2})
+        tasks[1]["depends_on"].append("task_x")
+        await manager.broadcast_state("run_1", tasks, status="running", task_counts={"planned": 2})
+        await manager.flush()
+
+        patches = ws.sent[1:]
+        assert [p["type"] for p in patches] == ["task_patch", "task_patch"]
+        assert patches[0]["payload"] == {"seq": 2, "tasks": [{"id": "task_a", "status": "complete"}]}
+        assert patches[1]["payload"]["seq"] == 3
+        assert patches[1]["payload"]["tasks"] == [{"id": "task_b", "depends_on": ["task_a", "task_x"]}]
+
+    @pytest.mark.asyncio
+    async def test_nested_in_place_edit_is_patched(self):
+        """Edits inside nested values (e.g. a list of dicts) are not shared with the shadow."""
+        manager, ws = ConnectionManager(), FakeWebSocket()
+        tasks = _tasks()
+        tasks[0]["aar"] = {"files_modified": [{"path": "a.py"}]}
+        await manager.subscribe(ws, "run_1", RUNS_INDEX, _state(tasks))
+
+        tasks[0]["aar"]["files_modified"][0]["path"] = "b.py"
+        await manager.broadcast_state("run_1", tasks, status="running", task_counts={"planned": 2})
+        await manager.flush()
+
+        assert ws.sent[1]["payload"]["tasks"] == [{"id": "task_a", "aar": {"files_modified": [{"path": "b.py"}]}}]
+
+    @pytest.mark.asyncio
+    async def test_no_send_without_changes(self):
+        """Unchanged state, or a run without subscribers, sends nothing."""
+        manager, ws = ConnectionManager(), FakeWebSocket()
+        await manager.broadcast_state("run_1", _tasks())
+        assert "run_1" not in manager.run_shadows
+
+        await manager.subscribe(ws, "run_1", RUNS_INDEX, _state(_tasks()))
+        await manager.broadcast_state("run_1", _tasks(), status="running", task_counts={"planned": 2})
+        await manager.flush()
+        assert len(ws.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_catches_up_others(self):
+        """A new subscriber's snapshot patches existing subscribers to the same seq."""
+        manager, first, second = ConnectionManager(), FakeWebSocket(), FakeWebSocket()
+        tasks = _tasks()
+        await manager.subscribe(first, "run_1", RUNS_INDEX, _state(tasks))
+
+        tasks[1]["status"] = "active"
+        await manager.subscribe(second, "run_1", RUNS_INDEX, _state(tasks))
+        await manager.flush()
+
+        assert first.sent[-1]["type"] == "task_patch"
+        assert first.sent[-1]["payload"]["seq"] == second.sent[0]["payload"]["seq"] == 2
+        assert second.sent[0]["payload"]["tasks"][1]["status"] == "active"
+
+
+class TestConnectionSendQueues:
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        """Broadcast returns immediately; a slow socket only delays itself."""
+        manager, slow, fast = ConnectionManager(), FakeWebSocket(delay=0.2), FakeWebSocket()
+        manager.subscriptions["run_1"] = [slow, fast]
+
+        await asyncio.wait_for(manager.broadcast_to_run("run_1", {"type": "status", "payload": {}}), timeout=0.05)
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == 1
+        assert slow.sent == []
+        await manager.flush()
+        assert len(slow.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_socket_is_evicted(self):
+        """A socket whose send fails is removed from connections and subscriptions, then closed."""
+        manager, dead = ConnectionManager(), FakeWebSocket(fail=True)
+        manager.active_connections.append(dead)
+        manager.subscriptions["run_1"] = [dead]
+
+        await manager.broadcast_to_run("run_1", {"type": "status", "payload": {}})
+        await asyncio.sleep(0.01)
+
+        assert dead not in manager.active_connections
+        assert "run_1" not in manager.subscriptions
+        assert dead not in manager.senders
+        assert dead.close_codes == [1011]
+
+    @pytest.mark.asyncio
+    async def test_overflow_keeps_events_and_evicts_when_nothing_droppable(self):
+        """Overflow drops the oldest task state, never an event; a queue of only events evicts the client."""
+        manager, ws = ConnectionManager(max_queue=3), FakeWebSocket(delay=0.05)
+        manager.active_connections.append(ws)
+        manager.subscriptions["run_1"] = [ws]
+
+        await manager.broadcast_to_run("run_1", {"type": "interrupt", "payload": {"n": 1}})
+        for seq in range(1, 4):
+            await manager.broadcast_to_run("run_1", {"type": "task_patch", "payload": {"seq": seq}})
+        assert [json.loads(frame)["payload"] for _, _, frame in manager.senders[ws].queue] == [
+            {"n": 1}, {"seq": 2}, {"seq": 3}
+        ]
+
+        for n in range(2, 5):
+            await manager.broadcast_to_run("run_1", {"type": "human_needed", "payload": {"n": n}})
+        await asyncio.sleep(0.01)
+        assert ws not in manager.senders and ws not in manager.active_connections
+        assert ws.close_codes == [1011]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest_and_snapshot_coalesces(self):
+        """Overflow drops the oldest patch; a snapshot replaces queued state for its run."""
+        manager, ws = ConnectionManager(max_queue=3), FakeWebSocket(delay=0.05)
+        manager.subscriptions["run_1"] = [ws]
+
+        for seq in range(1, 6):
+            await manager.broadcast_to_run("run_1", {"type": "task_patch", "payload": {"seq": seq}})
+        assert [json.loads(frame)["payload"]["seq"] for _, _, frame in manager.senders[ws].queue] == [3, 4, 5]
+
+        await manager.broadcast_to_run("run_1", {"type": "state_update", "payload": {"status": "paused"}})
+        await manager.broadcast_to_run("run_1", {"type": "status", "payload": {}})
+        assert len(manager.senders[ws].queue) == 3
+
+        await manager.send_snapshot(ws, "run_1", RUNS_INDEX, _state(_tasks()))
+        await manager.flush()
+
+        assert [m["type"] for m in ws.sent] == ["status", "state_update"]
+        assert ws.sent[-1]["payload"]["snapshot"] is True
@@ -0,0 +1,92 @@
+"""
+Unit tests for the process-wide worker pool.
+"""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from task_queue import TaskCompletionQueue
+from worker_pool import WorkerPool
+
+
+class TestWorkerPoolAllocation:
+    def test_weighted_fair_share(self):
+        """Slots split in proportion to weight when both runs want more than the pool has."""
+        pool = WorkerPool(total_slots=9)
+        pool.register("a", weight=2.0, max_slots=20)
+        pool.register("b", weight=1.0, max_slots=20)
+        pool.set_demand("a", 20)
+        pool.set_demand("b", 20)
+
+        assert pool.allocation() == {"a": 6, "b": 3}
+
+    def test_max_slots_and_demand_cap_share(self):
+        """Unused share flows to runs that still have ready work."""
+        pool = WorkerPool(total_slots=10)
+        pool.register("a", max_slots=2)
+        pool.register("b", max_slots=20)
+        pool.register("idle", max_slots=20)
+        pool.set_demand("a", 5)
+        pool.set_demand("b", 20)
+
+        assert pool.allocation() == {"a": 2, "b": 8, "idle": 0}
+
+    def test_priority_classes_and_minimums(self):
+        """High priority is filled first, but a low priority run keeps its minimum."""
+        pool = WorkerPool(total_slots=6)
+        pool.register("urgent", priority="high", max_slots=10)
+        pool.register("batch", priority="low", min_slots=1, max_slots=10)
+        pool.set_demand("urgent", 10)
+        pool.set_demand("batch", 10)
+
+        assert pool.allocation() == {"urgent": 5, "batch": 1}
+
+
+class TestTaskQueueWithPool:
+    @pytest.mark.asyncio
+    async def test_spawn_holds_and_releases_slots(self):
+        """Queues draw from the shared budget and slots return when workers finish."""
+        pool = WorkerPool(total_slots=2)
+        pool.register("a", max_slots=5)
+        pool.register("b", max_slots=5)
+        queue_a = TaskCompletionQueue(max_concurrent=5, run_id="a", pool=pool)
+        queue_b = TaskCompletionQueue(max_concurrent=5, run_id="b", pool=pool)
+        queue_a.set_demand(3)
+        queue_b.set_demand(3)
+        gate = asyncio.Event()
+
+        async def worker():
+            await gate.wait()
+            return "ok"
+
+        assert queue_a.available_slots == 1 and queue_b.available_slots == 1
+        assert queue_a.spawn("t1", worker())
+        coro = worker()
+        assert not queue_a.spawn("t2", coro)
+        coro.close()
+        assert queue_b.spawn("t3", worker())
+        assert pool.active_slots("a") == 1 and pool.active_slots("b") == 1
+
+        waiter = asyncio.create_task(queue_b.wait_for_slot(timeout=1.0))
+        gate.set()
+        await asyncio.wait_for(waiter, timeout=0.5)
+        await asyncio.sleep(0)
+        assert pool.active_total == 0
+        assert len(queue_a.collect_completed()) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_before_start_releases_slot(self):
+        """A worker cancelled before it runs still gives its slot back."""
+        pool = WorkerPool(total_slots=1)
+        pool.register("a", max_slots=1)
+        queue = TaskCompletionQueue(max_concurrent=1, run_id="a", pool=pool)
+        queue.set_demand(1)
+
+        assert queue.spawn("t1", asyncio.sleep(10))
+        await queue.cancel_all()
+        await asyncio.sleep(0)
+        assert pool.active_slots("a") == 0